@@ -0,0 +1,218 @@
+"""
+Módulo de agenda semanal para el sistema de gimnasio.
+Cada clase ocupa intervalos semanales [inicio, fin) en minutos desde el lunes
+00:00 (ver validaciones.intervalos_semanales). La agenda guarda, por socio, los
+intervalos de las clases en las que está inscripto y, por profesor, los de sus
+clases activas, en listas ordenadas por inicio. Como las agendas no tienen
+superposiciones (se verifican antes de agregar), una superposición con un
+intervalo nuevo solo puede darse con sus vecinos: verificarla cuesta O(log n).
+"""
+
+from bisect import bisect_left, insort
+
+from almacen_inscripciones import socios_de_clase, iterar_inscripciones
+from indices_clases import clave_profesor
+from validaciones import intervalos_semanales
+
+def intervalos_de_clase(datos):
+    """
+    Devuelve los intervalos semanales de una clase.
+
+    Args:
+        datos (dict): Datos de la clase
+
+    Returns:
+        tuple: Intervalos (inicio, fin) ordenados
+    """
+    return intervalos_semanales(datos['horario'], datos['duracion'])
+
+def crear_agenda(clases, inscripciones):
+    """
+    Crea la agenda de socios y profesores.
+
+    Args:
+        clases (dict): Clases {id: datos}
+        inscripciones (dict): Almacén de inscripciones
+
+    Returns:
+        dict: {'socios': {id: [(inicio, fin, id_clase)]}, 'profesores': {clave: [(inicio, fin, id_clase)]}}
+    """
+    agenda = {'socios': {}, 'profesores': {}}
+    for id_clase, datos in clases.items():
+        if datos['activa']:
+            _agregar(agenda['profesores'], clave_profesor(datos['profesor']), intervalos_de_clase(datos), id_clase)
+    for id_socio, id_clase in iterar_inscripciones(inscripciones):
+        if id_clase in clases:
+            _agregar(agenda['socios'], id_socio, intervalos_de_clase(clases[id_clase]), id_clase)
+    return agenda
+
+def _agregar(agendas, clave, intervalos, id_clase):
+    """
+    Agrega los intervalos de una clase a la agenda de un socio o profesor.
+
+    Args:
+        agendas (dict): Agendas por clave
+        clave: ID del socio o clave del profesor
+        intervalos (tuple): Intervalos de la clase
+        id_clase (int): ID de la clase
+    """
+    if not intervalos:
+        return
+    ocupados = agendas.setdefault(clave, [])
+    for inicio, fin in intervalos:
+        insort(ocupados, (inicio, fin, id_clase))
+
+def _quitar(agendas, clave, intervalos, id_clase):
+    """
+    Quita los intervalos de una clase de la agenda de un socio o profesor.
+
+    Args:
+        agendas (dict): Agendas por clave
+        clave: ID del socio o clave del profesor
+        intervalos (tuple): Intervalos de la clase
+        id_clase (int): ID de la clase
+    """
+    ocupados = agendas.get(clave)
+    if not ocupados:
+        return
+    for inicio, fin in intervalos:
+        posicion = bisect_left(ocupados, (inicio, fin, id_clase))
+        if posicion < len(ocupados) and ocupados[posicion] == (inicio, fin, id_clase):
+            del ocupados[posicion]
+    if not ocupados:
+        del agendas[clave]
+
+def buscar_superposicion(ocupados, intervalos, excluir=None):
+    """
+    Busca una clase de una agenda que se superponga con alguno de los intervalos.
+    Solo se miran los vecinos de cada intervalo en el orden por inicio.
+
+    Args:
+        ocupados (list): Agenda ordenada [(inicio, fin, id_clase)]
+        intervalos (tuple): Intervalos (inicio, fin) a verificar
+        excluir (int, optional): Clase a ignorar (la misma clase que se modifica)
+
+    Returns:
+        int: ID de la clase superpuesta, o None
+    """
+    for inicio, fin in intervalos:
+        posicion = bisect_left(ocupados, (inicio,))
+        # Anterior: el último que empieza antes (saltando la clase excluida)
+        anterior = posicion - 1
+        while anterior >= 0 and ocupados[anterior][2] == excluir:
+            anterior -= 1
+        if anterior >= 0 and ocupados[anterior][1] > inicio:
+            return ocupados[anterior][2]
+        # Siguiente: el primero que empieza en o después del inicio
+        siguiente = posicion
+        while siguiente < len(ocupados) and ocupados[siguiente][2] == excluir:
+            siguiente += 1
+        if siguiente < len(ocupados) and ocupados[siguiente][0] < fin:
+            return ocupados[siguiente][2]
+    return None
+
+def superposicion_socio(agenda, id_socio, datos_clase):
+    """
+    Busca una clase del socio que se superponga con una clase.
+
+    Args:
+        agenda (dict): Agenda
+        id_socio (int): ID del socio
+        datos_clase (dict): Datos de la clase a la que se inscribe
+
+    Returns:
+        int: ID de la clase superpuesta, o None
+    """
+    intervalos = intervalos_de_clase(datos_clase)
+    if not intervalos:
+        return None
+    return buscar_superposicion(agenda['socios'].get(id_socio, ()), intervalos)
+
+def superposicion_profesor(agenda, datos_clase, id_clase=None):
+    """
+    Busca otra clase activa del mismo profesor que se superponga con una clase.
+
+    Args:
+        agenda (dict): Agenda
+        datos_clase (dict): Datos (nuevos) de la clase
+        id_clase (int, optional): ID de la clase si ya existe (se ignora a sí misma)
+
+    Returns:
+        int: ID de la clase superpuesta, o None
+    """
+    intervalos = intervalos_de_clase(datos_clase)
+    if not intervalos:
+        return None
+    ocupados = agenda['profesores'].get(clave_profesor(datos_clase['profesor']), ())
+    return buscar_superposicion(ocupados, intervalos, id_clase)
+
+def agendar_inscripcion(agenda, clases, id_socio, id_clase):
+    """
+    Agrega a la agenda del socio los intervalos de una clase en la que se inscribió.
+
+    Args:
+        agenda (dict): Agenda
+        clases (dict): Clases {id: datos}
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+    """
+    if id_clase in clases:
+        _agregar(agenda['socios'], id_socio, intervalos_de_clase(clases[id_clase]), id_clase)
+
+def desagendar_inscripcion(agenda, clases, id_socio, id_clase):
+    """
+    Quita de la agenda del socio los intervalos de una clase (antes de eliminar la clase).
+
+    Args:
+        agenda (dict): Agenda
+        clases (dict): Clases {id: datos}
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+    """
+    if id_clase in clases:
+        _quitar(agenda['socios'], id_socio, intervalos_de_clase(clases[id_clase]), id_clase)
+
+def agendar_clase(agenda, inscripciones, id_clase, datos):
+    """
+    Agrega una clase a la agenda de su profesor (si está activa) y de sus inscriptos.
+    Con quitar_clase_de_agenda se usa antes y después de cambiar el horario, la
+    duración, el profesor o el estado de una clase.
+
+    Args:
+        agenda (dict): Agenda
+        inscripciones (dict): Almacén de inscripciones
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    """
+    intervalos = intervalos_de_clase(datos)
+    if datos['activa']:
+        _agregar(agenda['profesores'], clave_profesor(datos['profesor']), intervalos, id_clase)
+    for id_socio in socios_de_clase(inscripciones, id_clase):
+        _agregar(agenda['socios'], id_socio, intervalos, id_clase)
+
+def desagendar_profesor(agenda, id_clase, datos):
+    """
+    Quita una clase de la agenda de su profesor (al darla de baja; las
+    inscripciones se quitan en cascada).
+
+    Args:
+        agenda (dict): Agenda
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    """
+    _quitar(agenda['profesores'], clave_profesor(datos['profesor']), intervalos_de_clase(datos), id_clase)
+
+def quitar_clase_de_agenda(agenda, inscripciones, id_clase, datos):
+    """
+    Quita una clase de la agenda de su profesor y de sus inscriptos.
+
+    Args:
+        agenda (dict): Agenda
+        inscripciones (dict): Almacén de inscripciones
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    """
+    desagendar_profesor(agenda, id_clase, datos)
+    intervalos = intervalos_de_clase(datos)
+    for id_socio in socios_de_clase(inscripciones, id_clase):
+        _quitar(agenda['socios'], id_socio, intervalos, id_clase)
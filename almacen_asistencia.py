@@ -0,0 +1,192 @@
+"""
+Módulo de almacenamiento de asistencia para el sistema de gimnasio.
+Implementa una matriz dispersa (socios × clases): solo existen los pares con
+asistencias registradas, con índices por socio y por clase para recorrerlos.
+Las fechas se guardan como ordinales de día (ver validaciones.fecha_a_ordinal)
+en un BitmapDias por par (ver bitmap_dias.py): los duplicados, los totales y los
+rangos se resuelven sin recorrer los días y las uniones entre pares son OR de bits.
+"""
+
+from bitmap_dias import BitmapDias, unir_dias
+
+def crear_asistencia():
+    """
+    Crea el almacén de asistencia vacío.
+    El almacén es un diccionario con:
+    'registros' {(socio_id, clase_id): BitmapDias} solo para pares con asistencias,
+    'por_socio' {socio_id: {clase_id, ...}}, 'por_clase' {clase_id: {socio_id, ...}}
+    y el total de registros.
+
+    Returns:
+        dict: Almacén de asistencia
+    """
+    return {'registros': {}, 'por_socio': {}, 'por_clase': {}, 'total': 0}
+
+def agregar_fecha(matriz_asistencia, socio_id, clase_id, dia):
+    """
+    Agrega un día de asistencia al par (socio_id, clase_id).
+    El par se materializa recién con su primera asistencia. El duplicado se
+    detecta con un test de bit (o búsqueda binaria en pares con pocos días).
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        dia (int): Ordinal del día de asistencia
+
+    Returns:
+        bool: True si se agregó, False si el día ya estaba registrado
+    """
+    clave = (socio_id, clase_id)
+    dias = matriz_asistencia['registros'].get(clave)
+
+    if dias is None:
+        dias = matriz_asistencia['registros'][clave] = BitmapDias()
+        matriz_asistencia['por_socio'].setdefault(socio_id, set()).add(clase_id)
+        matriz_asistencia['por_clase'].setdefault(clase_id, set()).add(socio_id)
+
+    if not dias.agregar(dia):
+        return False
+    matriz_asistencia['total'] += 1
+    return True
+
+def fechas_de(matriz_asistencia, socio_id, clase_id, desde=None, hasta=None):
+    """
+    Devuelve los días de asistencia de un socio a una clase, opcionalmente
+    limitados a un rango (incluye ambos extremos).
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        desde (int, optional): Primer día del rango (ordinal)
+        hasta (int, optional): Último día del rango (ordinal)
+
+    Returns:
+        list: Días registrados en orden (vacía si no hay asistencias)
+    """
+    dias = matriz_asistencia['registros'].get((socio_id, clase_id))
+    if dias is None:
+        return []
+    return dias.rango(desde, hasta)
+
+def contar_en_rango(matriz_asistencia, socio_id, clase_id, desde=None, hasta=None):
+    """
+    Cuenta las asistencias de un socio a una clase en un rango de días, sin
+    recorrerlas (contador, búsqueda binaria o popcount según el contenedor).
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        desde (int, optional): Primer día del rango (ordinal)
+        hasta (int, optional): Último día del rango (ordinal)
+
+    Returns:
+        int: Cantidad de asistencias en el rango
+    """
+    dias = matriz_asistencia['registros'].get((socio_id, clase_id))
+    if dias is None:
+        return 0
+    return dias.contar(desde, hasta)
+
+def eliminar_registros_de(matriz_asistencia, socio_id=None, clase_id=None):
+    """
+    Elimina todos los pares con asistencias de un socio o de una clase usando
+    los índices por socio y por clase (O(grado)), sin revisar el resto de la matriz.
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int, optional): ID del socio
+        clase_id (int, optional): ID de la clase (si no se indica socio_id)
+
+    Returns:
+        list: Tuplas ((socio_id, clase_id), dias) eliminadas
+    """
+    registros = matriz_asistencia['registros']
+    por_socio = matriz_asistencia['por_socio']
+    por_clase = matriz_asistencia['por_clase']
+    if socio_id is not None:
+        claves = [(socio_id, otro) for otro in por_socio.pop(socio_id, ())]
+    else:
+        claves = [(otro, clase_id) for otro in por_clase.pop(clase_id, ())]
+
+    eliminados = []
+    for socio, clase in claves:
+        dias = registros.pop((socio, clase))
+        matriz_asistencia['total'] -= len(dias)
+        eliminados.append(((socio, clase), dias))
+        # Quitar el par del índice del otro extremo
+        if socio_id is not None:
+            indice, clave, otro = por_clase, clase, socio
+        else:
+            indice, clave, otro = por_socio, socio, clase
+        indice[clave].discard(otro)
+        if not indice[clave]:
+            del indice[clave]
+    return eliminados
+
+def dias_de_socio(matriz_asistencia, socio_id):
+    """
+    Devuelve los días distintos en que un socio asistió a alguna clase (OR de sus pares).
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int): ID del socio
+
+    Returns:
+        BitmapDias: Días con al menos una asistencia
+    """
+    registros = matriz_asistencia['registros']
+    return unir_dias(registros[(socio_id, clase_id)]
+                     for clase_id in matriz_asistencia['por_socio'].get(socio_id, ()))
+
+def clases_con_asistencia(matriz_asistencia, socio_id):
+    """
+    Devuelve las clases a las que asistió un socio, ordenadas.
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        socio_id (int): ID del socio
+
+    Returns:
+        list: IDs de clases
+    """
+    return sorted(matriz_asistencia['por_socio'].get(socio_id, ()))
+
+def socios_con_asistencia(matriz_asistencia, clase_id):
+    """
+    Devuelve los socios que asistieron a una clase, ordenados.
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+        clase_id (int): ID de la clase
+
+    Returns:
+        list: IDs de socios
+    """
+    return sorted(matriz_asistencia['por_clase'].get(clase_id, ()))
+
+def total_registros(matriz_asistencia):
+    """
+    Devuelve la cantidad total de asistencias registradas (O(1)).
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+
+    Returns:
+        int: Total de registros
+    """
+    return matriz_asistencia['total']
+
+def iterar_registros(matriz_asistencia):
+    """
+    Recorre los pares con asistencias registradas.
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+
+    Yields:
+        tuple: ((socio_id, clase_id), dias) con dias como BitmapDias
+    """
+    yield from matriz_asistencia['registros'].items()
@@ -0,0 +1,173 @@
+"""
+Módulo de almacenamiento de inscripciones para el sistema de gimnasio.
+Mantiene un índice bidireccional socio ↔ clase usando diccionarios de conjuntos,
+de modo que las verificaciones de duplicados y cupo no recorren todas las inscripciones.
+"""
+
+def crear_inscripciones(pares=()):
+    """
+    Crea el almacén de inscripciones.
+    El almacén es un diccionario con dos índices de adyacencia:
+    'por_socio' {socio_id: {clase_id, ...}} y 'por_clase' {clase_id: {socio_id, ...}},
+    más el total de inscripciones. El tamaño de cada conjunto de 'por_clase'
+    funciona como contador de inscriptos de la clase.
+
+    Args:
+        pares (iterable, optional): Tuplas (socio_id, clase_id) iniciales
+
+    Returns:
+        dict: Almacén de inscripciones
+    """
+    inscripciones = {'por_socio': {}, 'por_clase': {}, 'total': 0}
+    for socio_id, clase_id in pares:
+        agregar_inscripcion(inscripciones, socio_id, clase_id)
+    return inscripciones
+
+def esta_inscripto(inscripciones, socio_id, clase_id):
+    """
+    Indica si un socio está inscripto en una clase (O(1)).
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+
+    Returns:
+        bool: True si existe la inscripción
+    """
+    return clase_id in inscripciones['por_socio'].get(socio_id, ())
+
+def agregar_inscripcion(inscripciones, socio_id, clase_id):
+    """
+    Agrega la inscripción (socio_id, clase_id) si no existía.
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+
+    Returns:
+        bool: True si se agregó, False si ya existía
+    """
+    clases_socio = inscripciones['por_socio'].setdefault(socio_id, set())
+    if clase_id in clases_socio:
+        return False
+    clases_socio.add(clase_id)
+    inscripciones['por_clase'].setdefault(clase_id, set()).add(socio_id)
+    inscripciones['total'] += 1
+    return True
+
+def eliminar_inscripcion(inscripciones, socio_id, clase_id):
+    """
+    Elimina la inscripción (socio_id, clase_id) en O(1).
+    Los conjuntos que quedan vacíos se descartan para no acumular claves.
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+
+    Returns:
+        bool: True si se eliminó, False si no existía
+    """
+    clases_socio = inscripciones['por_socio'].get(socio_id)
+    if not clases_socio or clase_id not in clases_socio:
+        return False
+
+    clases_socio.discard(clase_id)
+    if not clases_socio:
+        del inscripciones['por_socio'][socio_id]
+
+    socios_clase = inscripciones['por_clase'][clase_id]
+    socios_clase.discard(socio_id)
+    if not socios_clase:
+        del inscripciones['por_clase'][clase_id]
+
+    inscripciones['total'] -= 1
+    return True
+
+def eliminar_inscripciones_de(inscripciones, socio_id=None, clase_id=None):
+    """
+    Elimina todas las inscripciones de un socio o de una clase recorriendo solo
+    su conjunto de adyacencia (O(grado)), sin revisar el resto.
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        socio_id (int, optional): ID del socio
+        clase_id (int, optional): ID de la clase (si no se indica socio_id)
+
+    Returns:
+        list: Pares (socio_id, clase_id) eliminados
+    """
+    if socio_id is not None:
+        pares = [(socio_id, otro) for otro in inscripciones['por_socio'].get(socio_id, ())]
+    else:
+        pares = [(otro, clase_id) for otro in inscripciones['por_clase'].get(clase_id, ())]
+    for socio, clase in pares:
+        eliminar_inscripcion(inscripciones, socio, clase)
+    return pares
+
+def cantidad_inscriptos(inscripciones, clase_id):
+    """
+    Devuelve la cantidad de socios inscriptos en una clase (O(1)).
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        clase_id (int): ID de la clase
+
+    Returns:
+        int: Cantidad de inscriptos
+    """
+    return len(inscripciones['por_clase'].get(clase_id, ()))
+
+def clases_de_socio(inscripciones, socio_id):
+    """
+    Devuelve los IDs de las clases de un socio, ordenados.
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        socio_id (int): ID del socio
+
+    Returns:
+        list: IDs de clases
+    """
+    return sorted(inscripciones['por_socio'].get(socio_id, ()))
+
+def socios_de_clase(inscripciones, clase_id):
+    """
+    Devuelve los IDs de los socios inscriptos en una clase, ordenados.
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+        clase_id (int): ID de la clase
+
+    Returns:
+        list: IDs de socios
+    """
+    return sorted(inscripciones['por_clase'].get(clase_id, ()))
+
+def total_inscripciones(inscripciones):
+    """
+    Devuelve la cantidad total de inscripciones (O(1)).
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+
+    Returns:
+        int: Total de inscripciones
+    """
+    return inscripciones['total']
+
+def iterar_inscripciones(inscripciones):
+    """
+    Recorre todas las inscripciones como tuplas (socio_id, clase_id).
+
+    Args:
+        inscripciones (dict): Almacén de inscripciones
+
+    Yields:
+        tuple: (socio_id, clase_id)
+    """
+    for socio_id, clases_socio in inscripciones['por_socio'].items():
+        for clase_id in clases_socio:
+            yield (socio_id, clase_id)
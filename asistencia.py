@@ -1,196 +1,279 @@
 """
 Módulo de gestión de asistencia para el sistema de gimnasio.
 Implementa una matriz de asistencia (socios × clases) para registrar la presencia.
+La matriz es dispersa: solo se guardan los pares con asistencias registradas.
 """
 
-def inicializar_matriz_asistencia(socios, clases):
-    """
-    Inicializa la matriz de asistencia.
-    La matriz es un diccionario donde las claves son tuplas (socio_id, clase_id)
-    y los valores son listas de fechas de asistencia.
-    
-    Args:
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        dict: Matriz de asistencia inicializada
-    """
-    matriz_asistencia = {}
-    
-    # Crear entradas para todas las combinaciones socio-clase
-    for socio_id in socios.keys():
-        for clase_id in clases.keys():
-            matriz_asistencia[(socio_id, clase_id)] = []
-    
-    return matriz_asistencia
+from errores import ErrorGimnasio
+from instrumentacion import instrumentar, instrumentar_menu
+from metricas import maximo_contador
+from persistencia import confirmar_diario
+from servicios import (marcar_asistencia, obtener_socio, obtener_clase, asistencia_de_socio, asistencia_de_clase,
+                       dias_con_asistencia, estadisticas_de_asistencia)
+from validaciones import ordinal_a_fecha
+from cubo import DIAS_SEMANA, DIMENSIONES
+from estadisticas import mostrar_corte, nombre_socio, nombre_clase
+from socios import elegir_socio
 
-def registrar_asistencia(matriz_asistencia, socio_id, clase_id, fecha):
+@instrumentar
+def registrar_asistencia(gimnasio, socio_id, clase_id, fecha, diario=None):
     """
     Registra la asistencia de un socio a una clase en una fecha específica.
     
     Args:
-        matriz_asistencia (dict): Matriz de asistencia
+        gimnasio (dict): Estado del gimnasio
         socio_id (int): ID del socio
         clase_id (int): ID de la clase
         fecha (str): Fecha de asistencia
-        
-    Returns:
-        dict: Matriz de asistencia actualizada
+        diario (dict, optional): Diario donde registrar el cambio
     """
-    clave = (socio_id, clase_id)
-    
-    if clave not in matriz_asistencia:
-        matriz_asistencia[clave] = []
-    
-    # Evitar duplicados usando conjunto
-    if fecha not in matriz_asistencia[clave]:
-        matriz_asistencia[clave].append(fecha)
-        print(f"Asistencia registrada: Socio {socio_id} en clase {clase_id} el {fecha}")
-    else:
-        print(f"La asistencia ya estaba registrada para esa fecha.")
+    # Evitar fechas duplicadas para el mismo par socio-clase
+    try:
+        if marcar_asistencia(gimnasio, socio_id, clase_id, fecha, diario):
+            print(f"Asistencia registrada: Socio {socio_id} en clase {clase_id} el {fecha}")
+        else:
+            print(f"La asistencia ya estaba registrada para esa fecha.")
+    except ErrorGimnasio as error:
+        print(error)
+
+def mostrar_fechas(dias):
+    """
+    Muestra las fechas de asistencia (ordinales de día) en formato DD/MM/AAAA.
     
-    return matriz_asistencia
+    Args:
+        dias (list): Ordinales de día ordenados
+    """
+    print(f"  Fechas: {', '.join(map(ordinal_a_fecha, dias))}")
 
-def consultar_asistencia_socio(matriz_asistencia, socio_id, socios, clases):
+@instrumentar
+def consultar_asistencia_socio(gimnasio, socio_id, desde=None, hasta=None):
     """
     Consulta la asistencia de un socio específico a todas las clases.
+    Si se indica un rango de fechas, cuenta y lista solo las asistencias dentro del rango.
     
     Args:
-        matriz_asistencia (dict): Matriz de asistencia
+        gimnasio (dict): Estado del gimnasio
         socio_id (int): ID del socio
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
+        desde (str, optional): Fecha inicial (DD/MM/AAAA), inclusive
+        hasta (str, optional): Fecha final (DD/MM/AAAA), inclusive
     """
-    if socio_id not in socios:
+    try:
+        socio = obtener_socio(gimnasio, socio_id)
+    except ErrorGimnasio:
         print("No se encontró el socio.")
         return
     
-    socio = socios[socio_id]
+    try:
+        # Sin rango alcanzan los totales (contadores de cada par), sin listar días
+        listar = bool(desde or hasta)
+        asistencias_socio = asistencia_de_socio(gimnasio, socio_id, desde, hasta, solo_totales=not listar)
+        dias_distintos = dias_con_asistencia(gimnasio, socio_id, desde, hasta)
+    except ErrorGimnasio as error:
+        print(error)
+        return
+    
     print(f"\n--- ASISTENCIA DE {socio['nombre']} {socio['apellido']} ---")
     
+    # Recorrer solo las clases con asistencias del socio (índice por socio)
     total_asistencias = 0
-    for clase_id in clases.keys():
-        clave = (socio_id, clase_id)
-        if clave in matriz_asistencia and matriz_asistencia[clave]:
-            clase = clases[clase_id]
-            asistencias = matriz_asistencia[clave]
-            print(f"Clase: {clase['nombre']} - {len(asistencias)} asistencias")
-            total_asistencias += len(asistencias)
+    for clase_id, asistencias in asistencias_socio:
+        cantidad = len(asistencias) if listar else asistencias
+        print(f"Clase: {nombre_clase(gimnasio, clase_id)} - {cantidad} asistencias")
+        if listar:
+            mostrar_fechas(asistencias)
+        total_asistencias += cantidad
     
     if total_asistencias == 0:
         print("No hay registros de asistencia para este socio.")
     else:
         print(f"Total de asistencias: {total_asistencias}")
+        print(f"Días distintos con asistencia: {dias_distintos}")
 
-def consultar_asistencia_clase(matriz_asistencia, clase_id, socios, clases):
+@instrumentar
+def consultar_asistencia_clase(gimnasio, clase_id, desde=None, hasta=None):
     """
     Consulta la asistencia de todos los socios a una clase específica.
+    Si se indica un rango de fechas, cuenta y lista solo las asistencias dentro del rango.
     
     Args:
-        matriz_asistencia (dict): Matriz de asistencia
+        gimnasio (dict): Estado del gimnasio
         clase_id (int): ID de la clase
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
+        desde (str, optional): Fecha inicial (DD/MM/AAAA), inclusive
+        hasta (str, optional): Fecha final (DD/MM/AAAA), inclusive
     """
-    if clase_id not in clases:
+    try:
+        clase = obtener_clase(gimnasio, clase_id)
+    except ErrorGimnasio:
         print("No se encontró la clase.")
         return
     
-    clase = clases[clase_id]
+    try:
+        listar = bool(desde or hasta)
+        asistencias_clase = asistencia_de_clase(gimnasio, clase_id, desde, hasta, solo_totales=not listar)
+    except ErrorGimnasio as error:
+        print(error)
+        return
+    
     print(f"\n--- ASISTENCIA A LA CLASE {clase['nombre']} ---")
     
+    # Recorrer solo los socios con asistencias a la clase (índice por clase)
     total_asistencias = 0
-    socios_con_asistencia = set()
+    socios_presentes = set()
     
-    for socio_id in socios.keys():
-        clave = (socio_id, clase_id)
-        if clave in matriz_asistencia and matriz_asistencia[clave]:
-            socio = socios[socio_id]
-            asistencias = matriz_asistencia[clave]
-            print(f"Socio: {socio['nombre']} {socio['apellido']} - {len(asistencias)} asistencias")
-            total_asistencias += len(asistencias)
-            socios_con_asistencia.add(socio_id)
+    for socio_id, asistencias in asistencias_clase:
+        cantidad = len(asistencias) if listar else asistencias
+        print(f"Socio: {nombre_socio(gimnasio, socio_id)} - {cantidad} asistencias")
+        if listar:
+            mostrar_fechas(asistencias)
+        total_asistencias += cantidad
+        socios_presentes.add(socio_id)
     
     if total_asistencias == 0:
         print("No hay registros de asistencia para esta clase.")
     else:
         print(f"Total de asistencias: {total_asistencias}")
-        print(f"Socios con asistencia: {len(socios_con_asistencia)}")
+        print(f"Socios con asistencia: {len(socios_presentes)}")
 
-def estadisticas_asistencia(matriz_asistencia, socios, clases):
+@instrumentar
+def estadisticas_asistencia(gimnasio):
     """
     Muestra estadísticas de asistencia del sistema.
+    Los totales y máximos salen de las métricas incrementales, sin recorrer la matriz.
     
     Args:
-        matriz_asistencia (dict): Matriz de asistencia
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- ESTADÍSTICAS DE ASISTENCIA ---")
     
-    if not matriz_asistencia:
+    metricas = gimnasio['metricas']
+    
+    if not metricas['asistencias']:
         print("No hay datos de asistencia.")
         return
     
     # Calcular estadísticas generales
-    total_registros = sum(len(fechas) for fechas in matriz_asistencia.values())
-    print(f"Total de registros de asistencia: {total_registros}")
-    
-    # Socio con más asistencias
-    asistencias_por_socio = {}
-    for (socio_id, clase_id), fechas in matriz_asistencia.items():
-        if socio_id not in asistencias_por_socio:
-            asistencias_por_socio[socio_id] = 0
-        asistencias_por_socio[socio_id] += len(fechas)
-    
-    if asistencias_por_socio:
-        socio_mas_asistencia = max(asistencias_por_socio, key=asistencias_por_socio.get)
-        max_asistencias = asistencias_por_socio[socio_mas_asistencia]
-        socio = socios[socio_mas_asistencia]
-        print(f"Socio con más asistencias: {socio['nombre']} {socio['apellido']} ({max_asistencias} asistencias)")
+    registros = metricas['asistencias']
+    print(f"Total de registros de asistencia: {registros}")
+    
+    # Socio con más asistencias (puede estar dado de baja con el historial conservado)
+    socio_mas_asistencia, max_asistencias = maximo_contador(metricas['asistencias_socio'])
+    if socio_mas_asistencia is not None:
+        print(f"Socio con más asistencias: {nombre_socio(gimnasio, socio_mas_asistencia)} ({max_asistencias} asistencias)")
     
     # Clase con más asistencias
-    asistencias_por_clase = {}
-    for (socio_id, clase_id), fechas in matriz_asistencia.items():
-        if clase_id not in asistencias_por_clase:
-            asistencias_por_clase[clase_id] = 0
-        asistencias_por_clase[clase_id] += len(fechas)
-    
-    if asistencias_por_clase:
-        clase_mas_asistencia = max(asistencias_por_clase, key=asistencias_por_clase.get)
-        max_asistencias_clase = asistencias_por_clase[clase_mas_asistencia]
-        clase = clases[clase_mas_asistencia]
-        print(f"Clase con más asistencias: {clase['nombre']} ({max_asistencias_clase} asistencias)")
+    clase_mas_asistencia, max_asistencias_clase = maximo_contador(metricas['asistencias_clase'])
+    if clase_mas_asistencia is not None:
+        print(f"Clase con más asistencias: {nombre_clase(gimnasio, clase_mas_asistencia)} ({max_asistencias_clase} asistencias)")
     
     # Promedio de asistencias por socio
-    if socios:
-        promedio_por_socio = total_registros / len(socios)
+    if metricas['socios']['total']:
+        promedio_por_socio = registros / metricas['socios']['total']
         print(f"Promedio de asistencias por socio: {promedio_por_socio:.1f}")
     
     # Promedio de asistencias por clase
-    if clases:
-        promedio_por_clase = total_registros / len(clases)
+    if metricas['clases']['total']:
+        promedio_por_clase = registros / metricas['clases']['total']
         print(f"Promedio de asistencias por clase: {promedio_por_clase:.1f}")
+    
+    # Distribución por día de la semana y por mes (rollups del cubo)
+    mostrar_corte(gimnasio, "ASISTENCIA POR DÍA DE LA SEMANA", 'asistencia', ('dia_semana',),
+                  ordenar_por_cantidad=False)
+    mostrar_corte(gimnasio, "ASISTENCIA POR MES", 'asistencia', ('mes',), ordenar_por_cantidad=False)
+
+@instrumentar
+def estadisticas_asistencia_rango(gimnasio, desde=None, hasta=None):
+    """
+    Muestra estadísticas de asistencia de un rango de fechas.
+    Se calculan con agrupaciones vectorizadas sobre el registro columnar de asistencias.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        desde (str, optional): Fecha inicial (DD/MM/AAAA), inclusive
+        hasta (str, optional): Fecha final (DD/MM/AAAA), inclusive
+    """
+    try:
+        datos = estadisticas_de_asistencia(gimnasio, desde, hasta)
+    except ErrorGimnasio as error:
+        print(error)
+        return
+    
+    print(f"\n--- ESTADÍSTICAS DE ASISTENCIA ({desde or 'inicio'} - {hasta or 'fin'}) ---")
+    
+    if not datos['total']:
+        print("No hay datos de asistencia en el rango.")
+        return
+    
+    print(f"Total de registros de asistencia: {datos['total']}")
+    print(f"Socios con asistencia: {datos['socios_distintos']}")
+    print(f"Clases con asistencia: {datos['clases_distintas']}")
+    
+    socio_mas_asistencia, max_asistencias = datos['max_socio']
+    if socio_mas_asistencia is not None:
+        print(f"Socio con más asistencias: {nombre_socio(gimnasio, socio_mas_asistencia)} ({max_asistencias} asistencias)")
+    
+    clase_mas_asistencia, max_asistencias_clase = datos['max_clase']
+    if clase_mas_asistencia is not None:
+        print(f"Clase con más asistencias: {nombre_clase(gimnasio, clase_mas_asistencia)} ({max_asistencias_clase} asistencias)")
+    
+    print("Asistencias por día de la semana:")
+    for nombre_dia, cantidad in zip(DIAS_SEMANA, datos['por_dia_semana']):
+        print(f"  {nombre_dia}: {cantidad}")
 
-def menu_asistencia(matriz_asistencia, socios, clases):
+@instrumentar_menu
+def tabla_cruzada_asistencia(gimnasio):
+    """
+    Muestra una tabla cruzada de asistencia por las dimensiones que elija el usuario
+    (por ejemplo clase × día de la semana × mes), leída de los rollups del cubo.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+    """
+    dimensiones = DIMENSIONES['asistencia']
+    nombres = {'clase': 'Clase', 'profesor': 'Profesor', 'dia_semana': 'Día de la semana',
+               'mes': 'Mes', 'cohorte': 'Cohorte de alta'}
+    print("\n--- TABLA CRUZADA DE ASISTENCIA ---")
+    for numero, dimension in enumerate(dimensiones, 1):
+        print(f"[{numero}] {nombres[dimension]}")
+    
+    try:
+        elegidas = [int(numero) for numero in input("Agrupar por (números separados por coma, ej: 1,3,4): ").split(',')
+                    if numero.strip()]
+        agrupar = tuple(dimensiones[numero - 1] for numero in dict.fromkeys(elegidas) if numero >= 1)
+    except (ValueError, IndexError):
+        print("Error: Debe ingresar números de la lista.")
+        return
+    
+    filtros = {}
+    mes = input("Filtrar por mes (AAAA-MM, vacío = todos): ").strip()
+    if mes:
+        filtros['mes'] = mes
+    profesor = input("Filtrar por profesor (vacío = todos): ").strip().title()
+    if profesor:
+        filtros['profesor'] = profesor
+    
+    titulo = " × ".join(nombres[dimension] for dimension in agrupar) or "Total"
+    mostrar_corte(gimnasio, f"ASISTENCIA POR {titulo.upper()}", 'asistencia', agrupar, filtros,
+                  ordenar_por_cantidad=False)
+
+def menu_asistencia(gimnasio, diario=None):
     """
     Menú para gestionar la asistencia.
     
     Args:
-        matriz_asistencia (dict): Matriz de asistencia
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        dict: Matriz de asistencia actualizada
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar los cambios
     """
     while True:
+        confirmar_diario(diario)
         print("\n---- MENÚ DE ASISTENCIA ----")
         print("[1] Registrar asistencia")
         print("[2] Consultar asistencia de socio")
         print("[3] Consultar asistencia de clase")
         print("[4] Estadísticas de asistencia")
+        print("[5] Asistencia de socio por rango de fechas")
+        print("[6] Asistencia de clase por rango de fechas")
+        print("[7] Estadísticas de asistencia por rango de fechas")
+        print("[8] Tabla cruzada de asistencia")
         print("[0] Volver")
         
         opcion = input("Seleccione una opción: ")
@@ -199,27 +282,47 @@ def menu_asistencia(matriz_asistencia, socios, clases):
             break
         elif opcion == "1":
             try:
-                socio_id = int(input("Ingrese ID del socio: "))
+                socio_id = elegir_socio(gimnasio, "Ingrese ID del socio: ", listar=False)
                 clase_id = int(input("Ingrese ID de la clase: "))
                 fecha = input("Ingrese la fecha (DD/MM/AAAA): ")
-                matriz_asistencia = registrar_asistencia(matriz_asistencia, socio_id, clase_id, fecha)
+                registrar_asistencia(gimnasio, socio_id, clase_id, fecha, diario)
             except ValueError:
                 print("Error: Debe ingresar números válidos.")
         elif opcion == "2":
             try:
-                socio_id = int(input("Ingrese ID del socio: "))
-                consultar_asistencia_socio(matriz_asistencia, socio_id, socios, clases)
+                socio_id = elegir_socio(gimnasio, "Ingrese ID del socio: ", listar=False)
+                consultar_asistencia_socio(gimnasio, socio_id)
             except ValueError:
                 print("Error: Debe ingresar un número válido.")
         elif opcion == "3":
             try:
                 clase_id = int(input("Ingrese ID de la clase: "))
-                consultar_asistencia_clase(matriz_asistencia, clase_id, socios, clases)
+                consultar_asistencia_clase(gimnasio, clase_id)
             except ValueError:
                 print("Error: Debe ingresar un número válido.")
         elif opcion == "4":
-            estadisticas_asistencia(matriz_asistencia, socios, clases)
+            estadisticas_asistencia(gimnasio)
+        elif opcion in ("5", "6"):
+            try:
+                if opcion == "5":
+                    id_registro = elegir_socio(gimnasio, "Ingrese ID del socio: ", listar=False)
+                else:
+                    id_registro = int(input("Ingrese ID de la clase: "))
+            except ValueError:
+                print("Error: Debe ingresar un número válido.")
+                continue
+            # Un extremo vacío deja el rango abierto de ese lado
+            desde = input("Desde (DD/MM/AAAA, vacío = sin límite): ").strip() or None
+            hasta = input("Hasta (DD/MM/AAAA, vacío = sin límite): ").strip() or None
+            if opcion == "5":
+                consultar_asistencia_socio(gimnasio, id_registro, desde, hasta)
+            else:
+                consultar_asistencia_clase(gimnasio, id_registro, desde, hasta)
+        elif opcion == "7":
+            desde = input("Desde (DD/MM/AAAA, vacío = sin límite): ").strip() or None
+            hasta = input("Hasta (DD/MM/AAAA, vacío = sin límite): ").strip() or None
+            estadisticas_asistencia_rango(gimnasio, desde, hasta)
+        elif opcion == "8":
+            tabla_cruzada_asistencia(gimnasio)
         else:
             print("Opción inválida.")
-    
-    return matriz_asistencia
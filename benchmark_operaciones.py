@@ -0,0 +1,265 @@
+"""
+Benchmark de las operaciones de los menús a distintos tamaños de gimnasio.
+Para cada tamaño genera un gimnasio sintético (ver datos_sinteticos.py) y mide
+las operaciones centrales: alta de socio, verificación de DNI duplicado,
+inscripción, listado de inscriptos de una clase, registro de asistencia,
+estadísticas, resumen ejecutivo y estadísticas de asistencia. Los reportes
+se miden con la salida descartada.
+
+De cada operación informa la primera ejecución (que incluye armar los
+agregados diferidos), la mediana y el p95 de las siguientes, y la curva de
+escalado: el exponente de la mediana respecto de la cantidad de socios
+(≈0 constante, ≈1 lineal). Los resultados se pueden guardar en JSON y
+compararse contra una corrida anterior para detectar regresiones.
+
+Uso:
+    python benchmark_operaciones.py [--tamanos 1000,10000,100000] [--anios 0.5] [--repeticiones 200]
+                                    [--salida resultados.json] [--comparar base.json] [--tolerancia 1.5]
+"""
+
+import argparse
+import io
+import json
+import math
+import platform
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date
+
+from asistencia import estadisticas_asistencia
+from benchmark_registros import generar_socio
+from datos_sinteticos import generar_gimnasio, pesos_zipf, EXPONENTE_ZIPF
+from errores import ErrorGimnasio
+from estadisticas import estadisticas, mostrar_resumen_ejecutivo
+from servicios import crear_socio, inscribir, socios_inscriptos, marcar_asistencia
+from indices_socios import verificar_dni_duplicado
+
+# Operaciones en el orden del reporte
+OPERACIONES = ('alta_socio', 'dni_duplicado', 'inscribir', 'inscriptos_clase', 'asistencia',
+               'estadisticas', 'resumen_ejecutivo', 'estadisticas_asistencia')
+# Operaciones que imprimen un reporte completo: se repiten menos
+REPORTES = ('estadisticas', 'resumen_ejecutivo', 'estadisticas_asistencia')
+
+def percentil(ordenados, fraccion):
+    """
+    Devuelve un percentil de una lista ordenada (rango más cercano).
+
+    Args:
+        ordenados (list): Valores ordenados
+        fraccion (float): Percentil entre 0 y 1
+
+    Returns:
+        float: Valor del percentil
+    """
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta una operación varias veces y devuelve sus tiempos.
+
+    Args:
+        funcion (callable): Función que recibe el número de repetición
+        repeticiones (int): Cantidad de ejecuciones
+
+    Returns:
+        dict: Primera ejecución, mediana, p95 y operaciones por segundo (tiempos en µs)
+    """
+    tiempos = []
+    for numero in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(numero)
+        tiempos.append(time.perf_counter() - inicio)
+    siguientes = sorted(tiempos[1:] or tiempos)
+    mediana = percentil(siguientes, 0.5)
+    return {
+        'repeticiones': repeticiones,
+        'primera_us': round(tiempos[0] * 1e6, 2),
+        'mediana_us': round(mediana * 1e6, 2),
+        'p95_us': round(percentil(siguientes, 0.95) * 1e6, 2),
+        'por_segundo': round(1 / mediana, 1) if mediana else None
+    }
+
+def operaciones(generado, aleatorio):
+    """
+    Arma las operaciones a medir sobre un gimnasio generado.
+
+    Args:
+        generado (dict): Resultado de datos_sinteticos.generar_gimnasio
+        aleatorio (random.Random): Generador con semilla
+
+    Returns:
+        dict: {nombre: función (número de repetición)}
+    """
+    gimnasio = generado['gimnasio']
+    ids_socios = generado['socios']
+    populares = generado['clases']
+    acumulados = pesos_zipf(len(populares), EXPONENTE_ZIPF)
+    inscriptas = generado['inscripciones'] or [(ids_socios[0], populares[0])]
+    # Las altas nuevas usan índices posteriores a los generados (DNI, email y teléfono únicos)
+    primera_alta = len(ids_socios) + 1_000_000
+    # Las asistencias nuevas son posteriores a las generadas
+    dia_nuevo = date.today().toordinal() + 1
+    salida = io.StringIO()
+
+    def reporte(funcion):
+        def ejecutar(_):
+            with redirect_stdout(salida):
+                funcion(gimnasio)
+            salida.seek(0)
+            salida.truncate()
+        return ejecutar
+
+    def inscribir_uno(_):
+        try:
+            inscribir(gimnasio, aleatorio.choice(ids_socios),
+                      aleatorio.choices(populares, cum_weights=acumulados)[0])
+        except ErrorGimnasio:
+            # Los rechazos (cupo, superposición, ...) también son parte de la carga real
+            pass
+
+    def asistencia_una(numero):
+        socio, clase = aleatorio.choice(inscriptas)
+        marcar_asistencia(gimnasio, socio, clase, dia_nuevo + numero)
+
+    return {
+        'alta_socio': lambda numero: crear_socio(gimnasio, generar_socio(primera_alta + numero, aleatorio)),
+        'dni_duplicado': lambda _: verificar_dni_duplicado(gimnasio['socios'][aleatorio.choice(ids_socios)]['dni'],
+                                                            gimnasio['indices_socios']),
+        'inscribir': inscribir_uno,
+        'inscriptos_clase': lambda _: socios_inscriptos(gimnasio, aleatorio.choices(populares,
+                                                                                     cum_weights=acumulados)[0]),
+        'asistencia': asistencia_una,
+        'estadisticas': reporte(estadisticas),
+        'resumen_ejecutivo': reporte(mostrar_resumen_ejecutivo),
+        'estadisticas_asistencia': reporte(estadisticas_asistencia)
+    }
+
+def exponente_escalado(puntos):
+    """
+    Ajusta por cuadrados mínimos el exponente de tiempo ~ socios^k.
+
+    Args:
+        puntos (list): Pares (socios, mediana)
+
+    Returns:
+        float: Exponente k, o None con menos de dos tamaños
+    """
+    puntos = [(math.log(socios), math.log(mediana)) for socios, mediana in puntos if mediana > 0]
+    if len(puntos) < 2:
+        return None
+    media_x = sum(x for x, _ in puntos) / len(puntos)
+    media_y = sum(y for _, y in puntos) / len(puntos)
+    varianza = sum((x - media_x) ** 2 for x, _ in puntos)
+    if not varianza:
+        return None
+    return round(sum((x - media_x) * (y - media_y) for x, y in puntos) / varianza, 3)
+
+def correr(tamanos, anios, repeticiones, repeticiones_reportes, semilla, clases=None):
+    """
+    Corre el benchmark completo.
+
+    Args:
+        tamanos (list): Cantidades de socios
+        anios (float): Años de asistencia generados
+        repeticiones (int): Repeticiones de las operaciones puntuales
+        repeticiones_reportes (int): Repeticiones de los reportes
+        semilla (int): Semilla del generador
+        clases (int, optional): Cantidad fija de clases (por defecto según los socios)
+
+    Returns:
+        dict: Resultados con metadatos, mediciones por tamaño y exponentes de escalado
+    """
+    resultados = []
+    for socios in tamanos:
+        inicio = time.perf_counter()
+        generado = generar_gimnasio(socios, clases, anios, semilla)
+        generacion = time.perf_counter() - inicio
+        print(f"# {socios} socios, {len(generado['clases'])} clases, {len(generado['inscripciones'])} "
+              f"inscripciones, {generado['asistencias']} asistencias (generado en {generacion:.1f} s)",
+              file=sys.stderr)
+        aleatorio = random.Random(semilla)
+        for nombre, funcion in operaciones(generado, aleatorio).items():
+            medicion = medir(funcion, repeticiones_reportes if nombre in REPORTES else repeticiones)
+            resultados.append(dict(operacion=nombre, socios=socios, clases=len(generado['clases']),
+                                   inscripciones=len(generado['inscripciones']),
+                                   asistencias=generado['asistencias'], **medicion))
+
+    escalado = {nombre: exponente_escalado([(fila['socios'], fila['mediana_us'])
+                                            for fila in resultados if fila['operacion'] == nombre])
+                for nombre in OPERACIONES}
+    return {
+        'version': 1,
+        'python': platform.python_version(),
+        'semilla': semilla,
+        'anios': anios,
+        'resultados': resultados,
+        'escalado': escalado
+    }
+
+def comparar(actual, base, tolerancia):
+    """
+    Compara las medianas con una corrida anterior.
+
+    Args:
+        actual (dict): Resultados actuales
+        base (dict): Resultados anteriores
+        tolerancia (float): Cociente máximo aceptado entre la mediana actual y la anterior
+
+    Returns:
+        list: Regresiones (operación, socios, mediana anterior, mediana actual)
+    """
+    anteriores = {(fila['operacion'], fila['socios']): fila['mediana_us'] for fila in base['resultados']}
+    regresiones = []
+    for fila in actual['resultados']:
+        anterior = anteriores.get((fila['operacion'], fila['socios']))
+        if anterior and fila['mediana_us'] > anterior * tolerancia:
+            regresiones.append((fila['operacion'], fila['socios'], anterior, fila['mediana_us']))
+    return regresiones
+
+def mostrar(resumen, tamanos):
+    """
+    Muestra las medianas por operación y tamaño, con el exponente de escalado.
+
+    Args:
+        resumen (dict): Resultados de correr()
+        tamanos (list): Cantidades de socios
+    """
+    medianas = {(fila['operacion'], fila['socios']): fila['mediana_us'] for fila in resumen['resultados']}
+    print(f"{'mediana µs':<26}" + ''.join(f"{socios:>12}" for socios in tamanos) + f"{'exponente':>11}")
+    for nombre in OPERACIONES:
+        exponente = resumen['escalado'][nombre]
+        print(f"{nombre:<26}" + ''.join(f"{medianas[(nombre, socios)]:>12.1f}" for socios in tamanos)
+              + f"{exponente if exponente is not None else '-':>11}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las operaciones de los menús.")
+    parser.add_argument('--tamanos', default='1000,10000,100000', help="Cantidades de socios separadas por coma")
+    parser.add_argument('--clases', type=int, help="Cantidad fija de clases (por defecto socios / 500)")
+    parser.add_argument('--anios', type=float, default=0.5, help="Años de asistencia generados")
+    parser.add_argument('--repeticiones', type=int, default=200, help="Repeticiones por operación")
+    parser.add_argument('--repeticiones-reportes', type=int, default=5, help="Repeticiones por reporte")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="Archivo JSON de una corrida anterior")
+    parser.add_argument('--tolerancia', type=float, default=1.5, help="Cociente de mediana que cuenta como regresión")
+    argumentos = parser.parse_args()
+
+    tamanos = [int(valor) for valor in argumentos.tamanos.split(',')]
+    resumen = correr(tamanos, argumentos.anios, argumentos.repeticiones, argumentos.repeticiones_reportes,
+                     argumentos.semilla, argumentos.clases)
+    mostrar(resumen, tamanos)
+    if argumentos.salida:
+        with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(resumen, archivo, indent=2, ensure_ascii=False)
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(resumen, json.load(archivo), argumentos.tolerancia)
+        for nombre, socios, anterior, actual in regresiones:
+            print(f"REGRESIÓN {nombre} con {socios} socios: {anterior:.1f} -> {actual:.1f} µs")
+        if regresiones:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark de memoria del almacenamiento de socios y clases.
+Genera registros sintéticos y compara los bytes asignados (medidos con
+tracemalloc) por el diccionario de diccionarios original contra las columnas
+compactas de registros_compactos.py, junto con el costo de leer un campo.
+
+Uso:
+    python benchmark_registros.py [--cantidades 100000,1000000] [--semilla S]
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from registros_compactos import crear_socios, crear_clases
+
+NOMBRES = ['Ana', 'Juan', 'María', 'Pedro', 'Lucía', 'Martín', 'Sofía', 'Diego', 'Valentina', 'Tomás',
+           'Camila', 'Mateo', 'Julieta', 'Nicolás', 'Florencia', 'Santiago', 'Agustina', 'Facundo']
+APELLIDOS = ['González', 'Rodríguez', 'Gómez', 'Fernández', 'López', 'Díaz', 'Martínez', 'Pérez',
+             'García', 'Sánchez', 'Romero', 'Sosa', 'Álvarez', 'Torres', 'Ruiz', 'Ramírez']
+CIUDADES = ['Buenos Aires', 'Córdoba', 'Rosario', 'Mendoza', 'La Plata', 'Mar del Plata', 'Salta']
+CALLES = ['San Martín', 'Belgrano', 'Rivadavia', 'Mitre', 'Sarmiento', 'Moreno', 'Urquiza']
+ACTIVIDADES = ['Yoga', 'Spinning', 'Funcional', 'Pilates', 'Crossfit', 'Zumba', 'Boxeo', 'Natación']
+DIAS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado']
+
+def generar_socio(indice, aleatorio):
+    """
+    Genera un socio sintético con la forma que guarda servicios.preparar_socio.
+
+    Args:
+        indice (int): Número de socio (hace únicos DNI, email y teléfono)
+        aleatorio (random.Random): Generador con semilla
+
+    Returns:
+        dict: Datos del socio
+    """
+    return {
+        'nombre': aleatorio.choice(NOMBRES),
+        'apellido': aleatorio.choice(APELLIDOS),
+        'dni': str(10_000_000 + indice),
+        'email': f"socio{indice}@gimnasio.com",
+        'telefono': str(1_100_000_000 + indice),
+        'fecha_nacimiento': f"{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.randint(1950, 2008)}",
+        'direccion': f"{aleatorio.choice(CALLES)} {aleatorio.randint(1, 5000)}, {aleatorio.choice(CIUDADES)}",
+        'fecha_alta': f"{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.randint(2015, 2024)}",
+        'activo': aleatorio.random() < 0.8
+    }
+
+def generar_clase(indice, aleatorio):
+    """
+    Genera una clase sintética con la forma que guarda servicios.preparar_clase.
+
+    Args:
+        indice (int): Número de clase
+        aleatorio (random.Random): Generador con semilla
+
+    Returns:
+        dict: Datos de la clase
+    """
+    return {
+        'nombre': aleatorio.choice(ACTIVIDADES),
+        'profesor': f"Profesor {aleatorio.randint(1, 200)}",
+        'cupo': aleatorio.randint(5, 40),
+        'horario': f"{aleatorio.choice(DIAS)} {aleatorio.randint(7, 21):02d}:00",
+        'duracion': aleatorio.choice(['45', '60', '90']),
+        'activa': aleatorio.random() < 0.9
+    }
+
+def medir_memoria(construir):
+    """
+    Construye una estructura y mide los bytes que quedan asignados por ella.
+
+    Args:
+        construir (callable): Función sin argumentos que devuelve la estructura
+
+    Returns:
+        tuple: (estructura, bytes)
+    """
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    estructura = construir()
+    gc.collect()
+    fin, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return estructura, fin - inicio
+
+def medir_lectura(registros, campo, ids):
+    """
+    Mide el costo medio de leer un campo de un registro.
+
+    Args:
+        registros (dict): Socios o clases
+        campo (str): Campo a leer
+        ids (list): IDs a consultar
+
+    Returns:
+        float: Nanosegundos por lectura
+    """
+    inicio = time.perf_counter()
+    for clave in ids:
+        registros[clave][campo]
+    return (time.perf_counter() - inicio) / len(ids) * 1e9
+
+def comparar(entidad, generar, crear_compacto, cantidad, semilla, campo):
+    """
+    Compara ambos almacenes para una entidad y una cantidad de registros.
+
+    Args:
+        entidad (str): Nombre a mostrar
+        generar (callable): Generador de un registro (indice, aleatorio)
+        crear_compacto (callable): Constructor del almacén compacto
+        cantidad (int): Cantidad de registros
+        semilla (int): Semilla del generador
+        campo (str): Campo usado para medir la lectura
+    """
+    # Los registros se generan dentro de la medición: el diccionario de diccionarios
+    # es dueño de sus textos, mientras que el compacto los copia a sus columnas
+    def como_dicts():
+        aleatorio = random.Random(semilla)
+        return {indice: generar(indice, aleatorio) for indice in range(1, cantidad + 1)}
+
+    def como_columnas():
+        aleatorio = random.Random(semilla)
+        registros = crear_compacto()
+        for indice in range(1, cantidad + 1):
+            registros[indice] = generar(indice, aleatorio)
+        return registros
+
+    muestra = random.Random(semilla).sample(range(1, cantidad + 1), min(cantidad, 100_000))
+    dicts, bytes_dicts = medir_memoria(como_dicts)
+    lectura_dicts = medir_lectura(dicts, campo, muestra)
+    del dicts
+    columnas, bytes_columnas = medir_memoria(como_columnas)
+    lectura_columnas = medir_lectura(columnas, campo, muestra)
+    del columnas
+
+    print(f"{entidad:<8}{cantidad:>10}{bytes_dicts / 2**20:>12.1f}{bytes_columnas / 2**20:>12.1f}"
+          f"{bytes_dicts / cantidad:>10.0f}{bytes_columnas / cantidad:>10.0f}"
+          f"{bytes_dicts / bytes_columnas:>9.1f}x{lectura_dicts:>10.0f}{lectura_columnas:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de socios y clases.")
+    parser.add_argument('--cantidades', default='100000,1000000',
+                        help="Cantidades de registros separadas por coma")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    argumentos = parser.parse_args()
+
+    cantidades = [int(valor) for valor in argumentos.cantidades.split(',')]
+    print(f"{'entidad':<8}{'registros':>10}{'dicts MiB':>12}{'compact MiB':>12}"
+          f"{'B/reg':>10}{'B/reg':>10}{'ahorro':>10}{'ns dict':>10}{'ns comp':>10}")
+    for cantidad in cantidades:
+        comparar('socios', generar_socio, crear_socios, cantidad, argumentos.semilla, 'email')
+        comparar('clases', generar_clase, crear_clases, cantidad, argumentos.semilla, 'profesor')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Generador de carga del servidor de check-in (servidor_checkin.py).
+Abre varias conexiones HTTP persistentes que envían check-ins (y, en la
+proporción indicada, consultas de socio) sin pausa, cada una esperando su
+respuesta antes de mandar la siguiente, y reporta el caudal y los percentiles
+de latencia p50/p95/p99.
+
+Si no se indica un puerto, arma un gimnasio sintético en un directorio
+temporal y levanta el servidor en otro proceso, para que el generador no le
+quite tiempo de CPU a su bucle de eventos más que a través del sistema.
+
+Uso:
+    python benchmark_servidor.py [--socios 10000] [--clases 100] [--conexiones 64]
+                                 [--solicitudes 20000] [--consultas 0.1] [--semilla S]
+    python benchmark_servidor.py --puerto 8080 [--host 127.0.0.1] [...]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmark_registros import generar_socio, generar_clase
+from errores import ErrorGimnasio
+from persistencia import cargar_gimnasio, cerrar_diario, iniciar_lote, confirmar_lote
+from servicios import crear_socio, crear_clase
+
+def preparar_datos(directorio, socios, clases, semilla):
+    """
+    Crea un gimnasio sintético persistido en un directorio.
+
+    Args:
+        directorio (str): Directorio de datos
+        socios (int): Cantidad de socios
+        clases (int): Cantidad de clases
+        semilla (int): Semilla del generador
+
+    Returns:
+        tuple: (IDs de socios, IDs de clases)
+    """
+    aleatorio = random.Random(semilla)
+    gimnasio, diario = cargar_gimnasio(directorio)
+    iniciar_lote(diario)
+    ids_socios = [crear_socio(gimnasio, dict(generar_socio(indice, aleatorio), activo=True), diario)
+                  for indice in range(socios)]
+    ids_clases = []
+    for indice in range(clases):
+        try:
+            ids_clases.append(crear_clase(gimnasio, generar_clase(indice, aleatorio), diario))
+        except ErrorGimnasio:
+            # Clase que superpone a su profesor: se descarta
+            continue
+    confirmar_lote(diario)
+    cerrar_diario(diario)
+    return ids_socios, ids_clases
+
+def levantar_servidor(directorio):
+    """
+    Levanta el servidor de check-in en otro proceso sobre un puerto libre.
+
+    Args:
+        directorio (str): Directorio de datos
+
+    Returns:
+        tuple: (proceso, puerto)
+    """
+    programa = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servidor_checkin.py')
+    proceso = subprocess.Popen([sys.executable, programa, '--directorio', directorio, '--puerto', '0'],
+                               stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()
+    if not linea:
+        raise RuntimeError("El servidor no arrancó.")
+    return proceso, int(linea.rsplit(':', 1)[1])
+
+async def pedir(lector, escritor, metodo, ruta, datos=None):
+    """
+    Envía una solicitud HTTP por una conexión persistente y lee la respuesta.
+
+    Args:
+        lector (asyncio.StreamReader): Lector de la conexión
+        escritor (asyncio.StreamWriter): Escritor de la conexión
+        metodo (str): Método HTTP
+        ruta (str): Ruta
+        datos (dict, optional): Cuerpo JSON
+
+    Returns:
+        tuple: (estado, respuesta decodificada)
+    """
+    cuerpo = json.dumps(datos).encode('utf-8') if datos is not None else b''
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: gimnasio\r\nContent-Length: {len(cuerpo)}\r\n\r\n"
+                   .encode('latin-1') + cuerpo)
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        encabezado = await lector.readline()
+        if encabezado in (b'\r\n', b''):
+            break
+        nombre, _, valor = encabezado.decode('latin-1').partition(':')
+        if nombre.strip().lower() == 'content-length':
+            largo = int(valor)
+    return estado, json.loads(await lector.readexactly(largo))
+
+async def cliente(host, puerto, cantidad, ids_socios, ids_clases, consultas, aleatorio, latencias, estados):
+    """
+    Envía solicitudes por una conexión, una a la vez, registrando su latencia.
+
+    Args:
+        host (str): Servidor
+        puerto (int): Puerto
+        cantidad (int): Solicitudes a enviar
+        ids_socios (list): IDs de socios existentes
+        ids_clases (list): IDs de clases existentes
+        consultas (float): Proporción de consultas de socio
+        aleatorio (random.Random): Generador con semilla
+        latencias (list): Lista donde agregar las latencias en segundos
+        estados (dict): Conteo de respuestas por estado HTTP
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    hoy = date.today()
+    for _ in range(cantidad):
+        socio = aleatorio.choice(ids_socios)
+        inicio = time.perf_counter()
+        if aleatorio.random() < consultas:
+            estado, _ = await pedir(lector, escritor, 'GET', f'/socios/{socio}')
+        else:
+            fecha = (hoy - timedelta(days=aleatorio.randrange(365))).strftime('%d/%m/%Y')
+            estado, _ = await pedir(lector, escritor, 'POST', '/asistencias',
+                                    {'socio_id': socio, 'clase_id': aleatorio.choice(ids_clases), 'fecha': fecha})
+        latencias.append(time.perf_counter() - inicio)
+        estados[estado] = estados.get(estado, 0) + 1
+    escritor.close()
+
+def percentil(ordenados, fraccion):
+    """
+    Devuelve un percentil de una lista ordenada (rango más cercano).
+
+    Args:
+        ordenados (list): Valores ordenados
+        fraccion (float): Percentil entre 0 y 1
+
+    Returns:
+        float: Valor del percentil
+    """
+    return ordenados[min(len(ordenados) - 1, int(fraccion * len(ordenados)))]
+
+async def generar_carga(host, puerto, argumentos, ids_socios, ids_clases):
+    """
+    Corre la carga completa y devuelve el resumen.
+
+    Args:
+        host (str): Servidor
+        puerto (int): Puerto
+        argumentos (argparse.Namespace): Opciones de la línea de comandos
+        ids_socios (list): IDs de socios existentes
+        ids_clases (list): IDs de clases existentes
+
+    Returns:
+        dict: Resumen con caudal, percentiles y estados
+    """
+    latencias = []
+    estados = {}
+    # Las primeras conexiones mandan una solicitud más si la división no es exacta
+    por_conexion, resto = divmod(argumentos.solicitudes, argumentos.conexiones)
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, puerto, por_conexion + (numero < resto), ids_socios, ids_clases,
+                                   argumentos.consultas, random.Random(argumentos.semilla + numero), latencias,
+                                   estados)
+                           for numero in range(argumentos.conexiones)))
+    segundos = time.perf_counter() - inicio
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    _, servidor = await pedir(lector, escritor, 'GET', '/estado')
+    escritor.close()
+
+    latencias.sort()
+    return {
+        'solicitudes': len(latencias),
+        'conexiones': argumentos.conexiones,
+        'segundos': round(segundos, 3),
+        'por_segundo': round(len(latencias) / segundos, 1),
+        'p50_ms': round(percentil(latencias, 0.50) * 1000, 3),
+        'p95_ms': round(percentil(latencias, 0.95) * 1000, 3),
+        'p99_ms': round(percentil(latencias, 0.99) * 1000, 3),
+        'max_ms': round(latencias[-1] * 1000, 3),
+        'estados': {str(estado): cantidad for estado, cantidad in sorted(estados.items())},
+        'escrituras_por_lote': round(servidor['escrituras'] / max(servidor['lotes'], 1), 1),
+        'rechazadas': servidor['rechazadas']
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga del servidor de check-in.")
+    parser.add_argument('--host', default='127.0.0.1', help="Servidor")
+    parser.add_argument('--puerto', type=int, help="Puerto de un servidor ya levantado (si no, se levanta uno)")
+    parser.add_argument('--socios', type=int, default=10_000, help="Socios del gimnasio sintético (o a usar: IDs 1..N)")
+    parser.add_argument('--clases', type=int, default=100, help="Clases del gimnasio sintético (o a usar: IDs 1..N)")
+    parser.add_argument('--conexiones', type=int, default=64, help="Conexiones concurrentes")
+    parser.add_argument('--solicitudes', type=int, default=20_000, help="Solicitudes en total")
+    parser.add_argument('--consultas', type=float, default=0.1, help="Proporción de consultas de socio")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    parser.add_argument('--json', action='store_true', help="Imprimir el resumen como JSON")
+    argumentos = parser.parse_args()
+
+    directorio = proceso = None
+    try:
+        if argumentos.puerto is None:
+            directorio = tempfile.mkdtemp(prefix='gimnasio_carga_')
+            ids_socios, ids_clases = preparar_datos(directorio, argumentos.socios, argumentos.clases,
+                                                    argumentos.semilla)
+            proceso, puerto = levantar_servidor(directorio)
+        else:
+            puerto = argumentos.puerto
+            ids_socios = list(range(1, argumentos.socios + 1))
+            ids_clases = list(range(1, argumentos.clases + 1))
+        resumen = asyncio.run(generar_carga(argumentos.host, puerto, argumentos, ids_socios, ids_clases))
+    finally:
+        if proceso is not None:
+            proceso.send_signal(signal.SIGINT)
+            proceso.wait()
+        if directorio is not None:
+            shutil.rmtree(directorio, ignore_errors=True)
+
+    if argumentos.json:
+        print(json.dumps(resumen))
+        return
+    print(f"{resumen['solicitudes']} solicitudes en {resumen['segundos']} s "
+          f"({resumen['por_segundo']}/s, {resumen['conexiones']} conexiones)")
+    print(f"latencia ms  p50 {resumen['p50_ms']}  p95 {resumen['p95_ms']}  "
+          f"p99 {resumen['p99_ms']}  máx {resumen['max_ms']}")
+    print(f"estados {resumen['estados']}  escrituras por lote {resumen['escrituras_por_lote']}  "
+          f"rechazadas {resumen['rechazadas']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark de la validación por lotes de validaciones.py.
+Genera columnas sintéticas (mezcla de valores válidos e inválidos) y compara el
+costo por registro de la validación original (re.match con el patrón como texto,
+un valor por llamada) contra validar_lote (patrones precompilados con caminos rápidos).
+
+Uso:
+    python benchmark_validaciones.py [--cantidad N] [--semilla S]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from validaciones import validar_lote
+
+# Validadores tal como estaban antes de la API por lotes (línea de base)
+PATRONES_ORIGINALES = {
+    'email': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+    'dni': r'^\d{7,8}$',
+    'telefono': r'^(\+54\s?)?(\d{2,4}\s?)?\d{4}\s?\d{4}$',
+    'fecha': r'^\d{2}/\d{2}/\d{4}$'
+}
+
+def generar_columna(tipo, cantidad, aleatorio):
+    """
+    Genera una columna de valores de un tipo, con alrededor de un 10% de inválidos.
+
+    Args:
+        tipo (str): 'email', 'dni', 'telefono' o 'fecha'
+        cantidad (int): Cantidad de valores
+        aleatorio (random.Random): Generador con semilla
+
+    Returns:
+        list: Valores generados
+    """
+    valores = []
+    for indice in range(cantidad):
+        invalido = aleatorio.random() < 0.1
+        if tipo == 'email':
+            valor = f"socio{indice}@gimnasio.com" if not invalido else f"socio{indice}.gimnasio.com"
+        elif tipo == 'dni':
+            valor = str(aleatorio.randint(1000000, 99999999)) if not invalido else f"{indice}-x"
+        elif tipo == 'telefono':
+            valor = f"11{aleatorio.randint(10000000, 99999999)}" if not invalido else "12-34"
+        else:
+            dia = aleatorio.randint(1, 28) if not invalido else 31
+            valor = f"{dia:02d}/{aleatorio.randint(1, 12) if not invalido else 2:02d}/{aleatorio.randint(1950, 2024)}"
+        valores.append(valor)
+    return valores
+
+def medir(funcion):
+    """
+    Ejecuta una función y mide su duración.
+
+    Args:
+        funcion (callable): Función sin argumentos
+
+    Returns:
+        tuple: (resultado, segundos)
+    """
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de validación por lotes.")
+    parser.add_argument('--cantidad', type=int, default=1_000_000, help="Registros por columna")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    argumentos = parser.parse_args()
+
+    aleatorio = random.Random(argumentos.semilla)
+    cantidad = argumentos.cantidad
+    print(f"Registros por columna: {cantidad}")
+    print(f"{'tipo':<10}{'original ns/reg':>18}{'lote ns/reg':>14}{'aceleración':>13}{'inválidos':>11}")
+
+    for tipo, patron in PATRONES_ORIGINALES.items():
+        valores = generar_columna(tipo, cantidad, aleatorio)
+        _, segundos_original = medir(lambda: [re.match(patron, valor) is not None for valor in valores])
+        (mascara, _), segundos_lote = medir(lambda: validar_lote(tipo, valores))
+        invalidos = cantidad - sum(mascara)
+        print(f"{tipo:<10}{segundos_original / cantidad * 1e9:>18.0f}{segundos_lote / cantidad * 1e9:>14.0f}"
+              f"{segundos_original / segundos_lote:>12.1f}x{invalidos:>11}")
+
+    print("La línea de base de 'fecha' solo controla el formato; validar_lote además verifica el calendario.")
+
+if __name__ == "__main__":
+    main()
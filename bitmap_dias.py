@@ -0,0 +1,450 @@
+"""
+Módulo de conjuntos de días compactos para la asistencia del gimnasio.
+Cada par (socio, clase) guarda sus días de asistencia (ordinales, ver
+validaciones.fecha_a_ordinal) en un BitmapDias, que elige el contenedor más
+chico según cómo están distribuidos los días, al estilo de los roaring bitmaps:
+
+- arreglo: array('I') ordenado de días (4 bytes por día), para pares con pocas asistencias.
+- bits: un entero de Python donde el bit i es el día base + i (un bit por día
+  desde la época del bitmap), para asistencias frecuentes.
+- rachas: array('I') con pares [inicio, fin] de días consecutivos, para
+  asistencias diarias sin cortes.
+
+El total es un contador (o un popcount del entero), y las uniones e
+intersecciones entre pares se hacen con OR/AND sobre enteros.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+ARREGLO = 0
+BITS = 1
+RACHAS = 2
+
+# Los bitmaps alinean su época a múltiplos de 64 días
+ALINEACION = 64
+
+def _base_alineada(dia):
+    """
+    Devuelve la época (primer día representable) alineada para un día.
+
+    Args:
+        dia (int): Ordinal del día
+
+    Returns:
+        int: Época alineada
+    """
+    return dia - dia % ALINEACION
+
+def _tamano_arreglo(cantidad):
+    """
+    Estima los bytes del contenedor arreglo (objeto array más 4 bytes por día).
+
+    Args:
+        cantidad (int): Cantidad de días
+
+    Returns:
+        int: Bytes aproximados
+    """
+    return 64 + 4 * cantidad
+
+def _tamano_bits(primero, ultimo):
+    """
+    Estima los bytes del contenedor de bits para un rango de días
+    (un entero de Python usa 4 bytes cada 30 bits).
+
+    Args:
+        primero (int): Primer día
+        ultimo (int): Último día
+
+    Returns:
+        int: Bytes aproximados
+    """
+    return 28 + 4 * ((ultimo - _base_alineada(primero)) // 30 + 1)
+
+def _tamano_rachas(valores):
+    """
+    Estima los bytes del contenedor de rachas.
+
+    Args:
+        valores (int): Cantidad de valores (dos por racha)
+
+    Returns:
+        int: Bytes aproximados
+    """
+    return 64 + 4 * valores
+
+def _rachas_de(dias):
+    """
+    Agrupa días ordenados en rachas de días consecutivos.
+
+    Args:
+        dias (iterable): Días ordenados sin repetidos
+
+    Returns:
+        array: Pares [inicio, fin] aplanados
+    """
+    rachas = array('I')
+    for dia in dias:
+        if rachas and dia == rachas[-1] + 1:
+            rachas[-1] = dia
+        else:
+            rachas.append(dia)
+            rachas.append(dia)
+    return rachas
+
+def _bits_de(dias, base):
+    """
+    Arma el entero de bits para días ordenados.
+
+    Args:
+        dias (iterable): Días ordenados sin repetidos
+        base (int): Época del bitmap
+
+    Returns:
+        int: Entero con un bit prendido por día
+    """
+    # int.from_bytes sobre un bytearray evita armar enteros intermedios gigantes
+    dias = list(dias)
+    bits = bytearray((dias[-1] - base) // 8 + 1) if dias else bytearray()
+    for dia in dias:
+        posicion = dia - base
+        bits[posicion >> 3] |= 1 << (posicion & 7)
+    return int.from_bytes(bits, 'little')
+
+def _dias_de_bits(bits, base):
+    """
+    Recorre los días de un entero de bits en orden.
+
+    Args:
+        bits (int): Entero de bits
+        base (int): Época del bitmap
+
+    Yields:
+        int: Días presentes
+    """
+    datos = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for indice, byte in enumerate(datos):
+        while byte:
+            bajo = byte & -byte
+            yield base + (indice << 3) + bajo.bit_length() - 1
+            byte ^= bajo
+
+class BitmapDias:
+    """
+    Conjunto ordenado de días con contenedor adaptativo (arreglo, bits o rachas).
+    Se comporta como una secuencia de solo lectura: len() es O(1), la iteración
+    devuelve los días en orden y 'in' es O(1) en bits y O(log k) en los otros.
+    """
+
+    __slots__ = ('tipo', 'datos', 'base', 'cantidad')
+
+    def __init__(self):
+        self.tipo = ARREGLO
+        self.datos = array('I')
+        self.base = 0
+        self.cantidad = 0
+
+    @classmethod
+    def desde_ordenados(cls, dias):
+        """
+        Construye el bitmap a partir de días ordenados y sin repetidos,
+        con el contenedor más chico para esos días.
+
+        Args:
+            dias (iterable): Días ordenados
+
+        Returns:
+            BitmapDias: Bitmap construido
+        """
+        bitmap = cls()
+        bitmap.datos = array('I', dias)
+        bitmap.cantidad = len(bitmap.datos)
+        bitmap.optimizar()
+        return bitmap
+
+    @classmethod
+    def desde_bits(cls, bits, base):
+        """
+        Construye el bitmap a partir de un entero de bits (resultado de un OR/AND).
+
+        Args:
+            bits (int): Entero de bits
+            base (int): Época alineada del entero
+
+        Returns:
+            BitmapDias: Bitmap construido
+        """
+        bitmap = cls()
+        if bits:
+            bitmap.tipo, bitmap.datos, bitmap.base = BITS, bits, base
+            bitmap.cantidad = bits.bit_count()
+            bitmap.optimizar()
+        return bitmap
+
+    def __len__(self):
+        return self.cantidad
+
+    def __bool__(self):
+        return self.cantidad > 0
+
+    def __iter__(self):
+        if self.tipo == ARREGLO:
+            return iter(self.datos)
+        if self.tipo == BITS:
+            return _dias_de_bits(self.datos, self.base)
+        return (dia for inicio, fin in zip(self.datos[::2], self.datos[1::2])
+                for dia in range(inicio, fin + 1))
+
+    def __contains__(self, dia):
+        if self.tipo == BITS:
+            posicion = dia - self.base
+            return posicion >= 0 and (self.datos >> posicion) & 1 == 1
+        posicion = bisect_right(self.datos, dia)
+        if self.tipo == ARREGLO:
+            return posicion > 0 and self.datos[posicion - 1] == dia
+        # En las rachas, una posición impar cae entre un inicio y su fin
+        return posicion % 2 == 1 or (posicion > 0 and self.datos[posicion - 1] == dia)
+
+    def __eq__(self, otro):
+        if isinstance(otro, BitmapDias):
+            return self.cantidad == otro.cantidad and list(self) == list(otro)
+        return list(self) == otro
+
+    def __or__(self, otro):
+        return unir_dias([self, otro])
+
+    def __and__(self, otro):
+        return intersecar_dias([self, otro])
+
+    def __repr__(self):
+        return f"BitmapDias({list(self)!r})"
+
+    def primero(self):
+        """
+        Devuelve el primer día, o None si está vacío.
+        """
+        if not self.cantidad:
+            return None
+        if self.tipo == BITS:
+            return self.base + (self.datos & -self.datos).bit_length() - 1
+        return self.datos[0]
+
+    def ultimo(self):
+        """
+        Devuelve el último día, o None si está vacío.
+        """
+        if not self.cantidad:
+            return None
+        if self.tipo == BITS:
+            return self.base + self.datos.bit_length() - 1
+        return self.datos[-1]
+
+    def agregar(self, dia):
+        """
+        Agrega un día. Agregar después del último día (el caso común) no mueve
+        nada; el contenedor cambia si deja de ser el más chico.
+
+        Args:
+            dia (int): Ordinal del día
+
+        Returns:
+            bool: True si se agregó, False si ya estaba
+        """
+        if self.tipo == ARREGLO:
+            datos = self.datos
+            if not datos or dia > datos[-1]:
+                datos.append(dia)
+            else:
+                posicion = bisect_left(datos, dia)
+                if datos[posicion] == dia:
+                    return False
+                datos.insert(posicion, dia)
+            self.cantidad += 1
+            # Pasar a bits cuando el rango de días es lo bastante denso
+            if _tamano_bits(datos[0], datos[-1]) < _tamano_arreglo(self.cantidad):
+                self._convertir_a_bits()
+            return True
+
+        if self.tipo == RACHAS:
+            datos = self.datos
+            if dia == datos[-1] + 1:
+                datos[-1] = dia
+            elif dia > datos[-1]:
+                datos.append(dia)
+                datos.append(dia)
+                if _tamano_rachas(len(datos)) > 2 * _tamano_bits(datos[0], dia):
+                    self.cantidad += 1
+                    self.optimizar()
+                    return True
+            elif dia in self:
+                return False
+            else:
+                # Un día intercalado: rearmar como bits y seguir desde ahí
+                self._convertir_a_bits()
+                return self.agregar(dia)
+            self.cantidad += 1
+            return True
+
+        posicion = dia - self.base
+        if posicion < 0:
+            # Día anterior a la época: correr el entero hacia la nueva época
+            nueva_base = _base_alineada(dia)
+            self.datos <<= self.base - nueva_base
+            self.base = nueva_base
+            posicion = dia - nueva_base
+        bit = 1 << posicion
+        if self.datos & bit:
+            return False
+        self.datos |= bit
+        self.cantidad += 1
+        # Un día muy alejado puede dejar los bits más grandes que un arreglo
+        if 2 * _tamano_arreglo(self.cantidad) < _tamano_bits(self.base, self.ultimo()):
+            self.optimizar()
+        return True
+
+    def contar(self, desde=None, hasta=None):
+        """
+        Cuenta los días en un rango (incluye ambos extremos) sin recorrerlos:
+        búsqueda binaria en arreglos y rachas, popcount en bits.
+
+        Args:
+            desde (int, optional): Primer día del rango
+            hasta (int, optional): Último día del rango
+
+        Returns:
+            int: Cantidad de días en el rango
+        """
+        if desde is None and hasta is None:
+            return self.cantidad
+        if not self.cantidad:
+            return 0
+        desde = self.primero() if desde is None else max(desde, self.primero())
+        hasta = self.ultimo() if hasta is None else min(hasta, self.ultimo())
+        if desde > hasta:
+            return 0
+        if self.tipo == ARREGLO:
+            return bisect_right(self.datos, hasta) - bisect_left(self.datos, desde)
+        if self.tipo == BITS:
+            ventana = (self.datos >> (desde - self.base)) & ((1 << (hasta - desde + 1)) - 1)
+            return ventana.bit_count()
+        total = 0
+        for posicion in range(bisect_left(self.datos, desde) & ~1, len(self.datos), 2):
+            inicio, fin = self.datos[posicion], self.datos[posicion + 1]
+            if inicio > hasta:
+                break
+            total += min(fin, hasta) - max(inicio, desde) + 1
+        return total
+
+    def rango(self, desde=None, hasta=None):
+        """
+        Devuelve los días de un rango (incluye ambos extremos), en orden.
+
+        Args:
+            desde (int, optional): Primer día del rango
+            hasta (int, optional): Último día del rango
+
+        Returns:
+            list: Días en el rango
+        """
+        if desde is None and hasta is None or not self.cantidad:
+            return list(self)
+        desde = self.primero() if desde is None else max(desde, self.primero())
+        hasta = self.ultimo() if hasta is None else min(hasta, self.ultimo())
+        if desde > hasta:
+            return []
+        if self.tipo == ARREGLO:
+            return self.datos[bisect_left(self.datos, desde):bisect_right(self.datos, hasta)].tolist()
+        if self.tipo == BITS:
+            base = _base_alineada(desde)
+            ventana = (self.datos >> (base - self.base)) & ((1 << (hasta - base + 1)) - 1)
+            return [dia for dia in _dias_de_bits(ventana, base) if dia >= desde]
+        return [dia for dia in self if desde <= dia <= hasta]
+
+    def a_bits(self, base):
+        """
+        Devuelve los días como entero de bits respecto de una época dada.
+
+        Args:
+            base (int): Época alineada, menor o igual al primer día
+
+        Returns:
+            int: Entero de bits
+        """
+        if self.tipo == BITS:
+            corrimiento = self.base - base
+            return self.datos << corrimiento if corrimiento >= 0 else self.datos >> -corrimiento
+        return _bits_de(self, base)
+
+    def optimizar(self):
+        """
+        Cambia al contenedor más chico para los días actuales.
+        """
+        if not self.cantidad:
+            self.tipo, self.datos, self.base = ARREGLO, array('I'), 0
+            return
+        dias = self.datos if self.tipo == ARREGLO else array('I', self)
+        rachas = _rachas_de(dias)
+        tamanos = {
+            ARREGLO: _tamano_arreglo(len(dias)),
+            BITS: _tamano_bits(dias[0], dias[-1]),
+            RACHAS: _tamano_rachas(len(rachas))
+        }
+        tipo = min(tamanos, key=tamanos.get)
+        if tipo == self.tipo:
+            return
+        if tipo == ARREGLO:
+            self.tipo, self.datos, self.base = ARREGLO, dias, 0
+        elif tipo == RACHAS:
+            self.tipo, self.datos, self.base = RACHAS, rachas, 0
+        else:
+            base = _base_alineada(dias[0])
+            self.tipo, self.datos, self.base = BITS, _bits_de(dias, base), base
+
+    def _convertir_a_bits(self):
+        base = _base_alineada(self.primero())
+        self.datos, self.base, self.tipo = _bits_de(self, base), base, BITS
+
+def unir_dias(bitmaps):
+    """
+    Une varios conjuntos de días con OR sobre enteros de bits
+    (por ejemplo, los días en que un socio fue a cualquier clase).
+
+    Args:
+        bitmaps (iterable): BitmapDias a unir
+
+    Returns:
+        BitmapDias: Días presentes en al menos uno
+    """
+    bitmaps = [bitmap for bitmap in bitmaps if bitmap]
+    if not bitmaps:
+        return BitmapDias()
+    base = _base_alineada(min(bitmap.primero() for bitmap in bitmaps))
+    bits = 0
+    for bitmap in bitmaps:
+        bits |= bitmap.a_bits(base)
+    return BitmapDias.desde_bits(bits, base)
+
+def intersecar_dias(bitmaps):
+    """
+    Interseca varios conjuntos de días con AND sobre enteros de bits
+    (por ejemplo, los días en que dos socios coincidieron en una clase).
+
+    Args:
+        bitmaps (iterable): BitmapDias a intersecar
+
+    Returns:
+        BitmapDias: Días presentes en todos
+    """
+    bitmaps = list(bitmaps)
+    if not bitmaps or not all(bitmaps):
+        return BitmapDias()
+    desde = max(bitmap.primero() for bitmap in bitmaps)
+    hasta = min(bitmap.ultimo() for bitmap in bitmaps)
+    if desde > hasta:
+        return BitmapDias()
+    base = _base_alineada(min(bitmap.primero() for bitmap in bitmaps))
+    bits = -1
+    for bitmap in bitmaps:
+        bits &= bitmap.a_bits(base)
+    return BitmapDias.desde_bits(bits, base)
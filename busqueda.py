@@ -0,0 +1,310 @@
+"""
+Módulo de búsqueda de socios por prefijo para el sistema de gimnasio.
+Indexa las palabras de nombre, apellido, DNI y email normalizadas (sin acentos
+ni mayúsculas) para responder búsquedas mientras se escribe ("gonz", "perez ma",
+"3012") con los primeros resultados, sin recorrer los socios.
+
+Cada campo tiene su índice: las entradas (id del socio y número de palabra,
+8 bytes cada una) se guardan en bloques ordenados por (palabra, entrada), y de
+cada bloque se conoce su primera clave. Las palabras no se copian: se leen del
+socio al comparar, como en el orden por nombre de listados.py. Buscar un prefijo
+cuesta O(log N) más los resultados; agregar o quitar una entrada mueve solo un
+bloque, así las altas masivas no desplazan todo el índice.
+"""
+
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+# Campos indexados, en el orden en que desempatan los resultados
+CAMPOS_BUSQUEDA = ('apellido', 'nombre', 'dni', 'email')
+# Campos que se indexan enteros (una sola palabra)
+CAMPOS_ENTEROS = ('dni', 'email')
+# Cantidad de resultados por defecto
+LIMITE_RESULTADOS = 10
+# Entradas revisadas por campo antes de cortar una búsqueda de varias palabras
+LIMITE_REVISION = 2000
+# Entradas por bloque (un bloque se parte al superar el doble)
+TAMANO_BLOQUE = 1024
+# Palabras indexadas por campo: la entrada guarda el número de palabra en 3 bits
+BITS_PALABRA = 3
+MAXIMO_PALABRAS = 1 << BITS_PALABRA
+
+@lru_cache(maxsize=65536)
+def normalizar_texto(texto):
+    """
+    Normaliza un texto para buscar: sin acentos ni diacríticos y sin mayúsculas.
+
+    Args:
+        texto (str): Texto original
+
+    Returns:
+        str: Texto normalizado ("Núñez" -> "nunez")
+    """
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(letra for letra in descompuesto if not unicodedata.combining(letra)).casefold()
+
+def palabras_de(campo, valor):
+    """
+    Devuelve las palabras indexadas de un campo.
+
+    Args:
+        campo (str): Campo del socio
+        valor (str): Valor del campo
+
+    Returns:
+        list: Palabras normalizadas (a lo sumo MAXIMO_PALABRAS)
+    """
+    if not valor:
+        return []
+    normalizado = normalizar_texto(valor)
+    if campo in CAMPOS_ENTEROS:
+        return [normalizado.strip()]
+    return normalizado.split()[:MAXIMO_PALABRAS]
+
+def _clave(socios, campo, entrada):
+    # Clave de orden de una entrada: (palabra, entrada), leyendo la palabra del socio
+    return palabras_de(campo, socios[entrada >> BITS_PALABRA][campo])[entrada & (MAXIMO_PALABRAS - 1)], entrada
+
+def _crear_indice(claves):
+    """
+    Arma el índice de un campo a partir de sus claves ordenadas.
+
+    Args:
+        claves (list): Claves (palabra, entrada) ordenadas
+
+    Returns:
+        dict: {'bloques': [array de entradas], 'primeros': [primera clave de cada bloque]}
+    """
+    indice = {'bloques': [], 'primeros': []}
+    for inicio in range(0, len(claves), TAMANO_BLOQUE):
+        tramo = claves[inicio:inicio + TAMANO_BLOQUE]
+        indice['bloques'].append(array('Q', (entrada for _, entrada in tramo)))
+        indice['primeros'].append(tramo[0])
+    if not indice['bloques']:
+        indice['bloques'].append(array('Q'))
+        indice['primeros'].append(('', -1))
+    return indice
+
+def crear_busqueda(socios):
+    """
+    Crea el índice de búsqueda de los socios.
+
+    Args:
+        socios (dict): Socios {id: datos}
+
+    Returns:
+        dict: {campo: índice del campo}
+    """
+    busqueda = {}
+    for campo in CAMPOS_BUSQUEDA:
+        if hasattr(socios, 'columna'):
+            # Leer solo la columna del campo, sin decodificar los registros completos
+            valores = socios.columna(campo)
+        else:
+            valores = ((clave, datos[campo]) for clave, datos in socios.items())
+        claves = []
+        for clave, valor in valores:
+            for posicion, palabra in enumerate(palabras_de(campo, valor)):
+                claves.append((palabra, clave << BITS_PALABRA | posicion))
+        claves.sort()
+        busqueda[campo] = _crear_indice(claves)
+    return busqueda
+
+def _ubicar(indice, clave_buscada, clave):
+    """
+    Ubica la posición de una clave en el índice de un campo.
+
+    Args:
+        indice (dict): Índice del campo
+        clave_buscada (tuple): Clave (palabra, entrada)
+        clave (callable): Función entrada -> clave
+
+    Returns:
+        tuple: (número de bloque, posición dentro del bloque)
+    """
+    numero = max(bisect_right(indice['primeros'], clave_buscada) - 1, 0)
+    return numero, bisect_left(indice['bloques'][numero], clave_buscada, key=clave)
+
+def agregar_a_busqueda(busqueda, socios, id_socio, campos=CAMPOS_BUSQUEDA):
+    """
+    Agrega un socio (ya guardado en socios) al índice de búsqueda.
+
+    Args:
+        busqueda (dict): Índice de búsqueda
+        socios (dict): Socios {id: datos}
+        id_socio (int): ID del socio
+        campos (tuple, optional): Campos a indexar
+    """
+    datos = socios[id_socio]
+    for campo in campos:
+        indice = busqueda[campo]
+
+        def clave(entrada):
+            return _clave(socios, campo, entrada)
+
+        for posicion, palabra in enumerate(palabras_de(campo, datos[campo])):
+            entrada = id_socio << BITS_PALABRA | posicion
+            numero, lugar = _ubicar(indice, (palabra, entrada), clave)
+            bloque = indice['bloques'][numero]
+            bloque.insert(lugar, entrada)
+            if lugar == 0:
+                indice['primeros'][numero] = (palabra, entrada)
+            if len(bloque) > 2 * TAMANO_BLOQUE:
+                # Partir el bloque a la mitad
+                mitad = array('Q', bloque[TAMANO_BLOQUE:])
+                del bloque[TAMANO_BLOQUE:]
+                indice['bloques'].insert(numero + 1, mitad)
+                indice['primeros'].insert(numero + 1, clave(mitad[0]))
+
+def quitar_de_busqueda(busqueda, socios, id_socio, campos=CAMPOS_BUSQUEDA):
+    """
+    Quita un socio del índice de búsqueda. Debe llamarse antes de cambiar los
+    campos indexados y antes de eliminarlo.
+
+    Args:
+        busqueda (dict): Índice de búsqueda
+        socios (dict): Socios {id: datos}
+        id_socio (int): ID del socio
+        campos (tuple, optional): Campos a quitar
+    """
+    datos = socios[id_socio]
+    for campo in campos:
+        indice = busqueda[campo]
+
+        def clave(entrada):
+            return _clave(socios, campo, entrada)
+
+        for posicion, palabra in enumerate(palabras_de(campo, datos[campo])):
+            entrada = id_socio << BITS_PALABRA | posicion
+            numero, lugar = _ubicar(indice, (palabra, entrada), clave)
+            bloque = indice['bloques'][numero]
+            if lugar == len(bloque) or bloque[lugar] != entrada:
+                continue
+            del bloque[lugar]
+            if not bloque and len(indice['bloques']) > 1:
+                del indice['bloques'][numero]
+                del indice['primeros'][numero]
+            elif lugar == 0 and bloque:
+                indice['primeros'][numero] = clave(bloque[0])
+
+def _recorrer_prefijo(indice, socios, campo, prefijo):
+    """
+    Recorre en orden las entradas de un campo cuya palabra empieza con un prefijo.
+
+    Args:
+        indice (dict): Índice del campo
+        socios (dict): Socios {id: datos}
+        campo (str): Campo indexado
+        prefijo (str): Prefijo normalizado
+
+    Yields:
+        tuple: (palabra, id del socio)
+    """
+    def clave(entrada):
+        return _clave(socios, campo, entrada)
+
+    numero, lugar = _ubicar(indice, (prefijo, -1), clave)
+    bloques = indice['bloques']
+    while numero < len(bloques):
+        bloque = bloques[numero]
+        for posicion in range(lugar, len(bloque)):
+            palabra, entrada = clave(bloque[posicion])
+            if not palabra.startswith(prefijo):
+                return
+            yield palabra, entrada >> BITS_PALABRA
+        numero, lugar = numero + 1, 0
+
+def _extension(busqueda, prefijo):
+    """
+    Estima cuántas entradas empiezan con un prefijo contando los bloques que
+    abarca en cada campo (solo con las primeras claves, sin leer socios).
+
+    Args:
+        busqueda (dict): Índice de búsqueda
+        prefijo (str): Prefijo normalizado
+
+    Returns:
+        int: Cantidad aproximada de bloques
+    """
+    total = 0
+    for campo in CAMPOS_BUSQUEDA:
+        primeros = busqueda[campo]['primeros']
+        total += bisect_left(primeros, (prefijo + '\U0010ffff',)) - bisect_left(primeros, (prefijo, -1)) + 1
+    return total
+
+def _existe(busqueda, socios, prefijo):
+    """
+    Indica si alguna palabra indexada empieza con un prefijo.
+
+    Args:
+        busqueda (dict): Índice de búsqueda
+        socios (dict): Socios {id: datos}
+        prefijo (str): Prefijo normalizado
+
+    Returns:
+        bool: True si hay al menos una entrada
+    """
+    return any(next(_recorrer_prefijo(busqueda[campo], socios, campo, prefijo), None) is not None
+               for campo in CAMPOS_BUSQUEDA)
+
+def _coincide(socios, id_socio, prefijos):
+    """
+    Indica si cada prefijo empieza alguna palabra indexada del socio.
+
+    Args:
+        socios (dict): Socios {id: datos}
+        id_socio (int): ID del socio
+        prefijos (list): Prefijos normalizados
+
+    Returns:
+        bool: True si todos los prefijos coinciden
+    """
+    datos = socios[id_socio]
+    palabras = [palabra for campo in CAMPOS_BUSQUEDA for palabra in palabras_de(campo, datos[campo])]
+    return all(any(palabra.startswith(prefijo) for palabra in palabras) for prefijo in prefijos)
+
+def buscar_en_indice(busqueda, socios, texto, limite=LIMITE_RESULTADOS, filtro=None):
+    """
+    Busca socios cuyas palabras empiezan con las palabras del texto (en
+    cualquier campo y orden). Se recorre el índice con la palabra que abarca
+    menos entradas y el resto se verifica sobre cada candidato; si alguna
+    palabra no empieza ninguna entrada, no hay resultados. Primero van las palabras
+    completas, después los prefijos; luego por campo (apellido, nombre, DNI,
+    email), palabra e ID.
+
+    Args:
+        busqueda (dict): Índice de búsqueda
+        socios (dict): Socios {id: datos}
+        texto (str): Texto buscado
+        limite (int, optional): Cantidad máxima de resultados
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+
+    Returns:
+        list: IDs de los mejores resultados
+    """
+    prefijos = normalizar_texto(texto).split()
+    if not prefijos or limite < 1:
+        return []
+    guia = min(prefijos, key=lambda prefijo: (_extension(busqueda, prefijo), -len(prefijo)))
+    resto = list(prefijos)
+    resto.remove(guia)
+    if not all(_existe(busqueda, socios, prefijo) for prefijo in resto):
+        return []
+
+    mejores = {}
+    for orden, campo in enumerate(CAMPOS_BUSQUEDA):
+        encontrados = 0
+        for revisados, (palabra, id_socio) in enumerate(_recorrer_prefijo(busqueda[campo], socios, campo, guia)):
+            if revisados == LIMITE_REVISION or encontrados == limite:
+                break
+            if resto and not _coincide(socios, id_socio, resto):
+                continue
+            if filtro is not None and not filtro(id_socio, socios[id_socio]):
+                continue
+            rango = (palabra != guia, orden, palabra, id_socio)
+            if id_socio not in mejores or rango < mejores[id_socio]:
+                mejores[id_socio] = rango
+            encontrados += 1
+    return [id_socio for id_socio in sorted(mejores, key=mejores.get)[:limite]]
@@ -0,0 +1,150 @@
+"""
+Módulo de bajas en cascada para el sistema de gimnasio.
+Al dar de baja un socio o una clase se eliminan sus inscripciones y sus
+asistencias recorriendo solo los índices por socio y por clase de los almacenes
+(O(grado) del registro dado de baja), y se descuentan de las métricas, el cubo,
+los lugares libres de las clases, la agenda de los socios y el registro columnar.
+
+Con el historial conservado (baja lógica) el registro pasa al histórico del
+gimnasio y sus asistencias se mantienen para los reportes; solo se eliminan
+sus inscripciones, que ya no tienen sentido.
+"""
+
+from agenda import desagendar_inscripcion
+from almacen_inscripciones import eliminar_inscripciones_de, clases_de_socio, socios_de_clase
+from almacen_asistencia import eliminar_registros_de, clases_con_asistencia, socios_con_asistencia
+from cubo import contar_inscripcion_cubo, contar_asistencias_cubo
+from indices_clases import contar_lugar
+from metricas import contar_inscripcion, descontar_asistencias
+from registro_asistencia import quitar_filas_de
+from diferido import aplicar_en, Diferido
+
+def crear_historico(socios=None, clases=None):
+    """
+    Crea el histórico de socios y clases dados de baja con el historial conservado.
+
+    Args:
+        socios (dict, optional): Socios iniciales {id: datos}
+        clases (dict, optional): Clases iniciales {id: datos}
+
+    Returns:
+        dict: Histórico {'socios': {id: datos}, 'clases': {id: datos}}
+    """
+    return {'socios': dict(socios or {}), 'clases': dict(clases or {})}
+
+def buscar_registro(gimnasio, entidad, id_registro):
+    """
+    Busca un socio o una clase entre los vigentes y, si no está, en el histórico.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): 'socios' o 'clases'
+        id_registro (int): ID a buscar
+
+    Returns:
+        tuple: (datos, dado_de_baja), o (None, False) si no existe en ninguno
+    """
+    datos = gimnasio[entidad].get(id_registro)
+    if datos is not None:
+        return datos, False
+    datos = gimnasio.get('historico', {}).get(entidad, {}).get(id_registro)
+    return datos, datos is not None
+
+def existe_con_historial(gimnasio, entidad):
+    """
+    Devuelve un filtro que acepta los IDs vigentes y los del histórico.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): 'socios' o 'clases'
+
+    Returns:
+        callable: Función id -> bool
+    """
+    vigentes = gimnasio[entidad]
+    historicos = gimnasio.get('historico', {}).get(entidad, {})
+    return lambda id_registro: id_registro in vigentes or id_registro in historicos
+
+def _construido(almacen):
+    """
+    Indica si un almacén ya está construido (no es un Diferido pendiente).
+
+    Args:
+        almacen (dict): Almacén
+
+    Returns:
+        bool: True si las actualizaciones se aplican en el momento
+    """
+    return not (isinstance(almacen, Diferido) and almacen.pendiente)
+
+def eliminar_relaciones(gimnasio, socio_id=None, clase_id=None, conservar_asistencia=False):
+    """
+    Elimina las inscripciones (y, salvo que se conserven, las asistencias) de un
+    socio o de una clase, descontándolas de los agregados ya calculados.
+    Debe llamarse mientras el registro todavía se puede resolver (vigente o en el
+    histórico), para que el cubo reste los hechos con sus dimensiones.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        socio_id (int, optional): ID del socio
+        clase_id (int, optional): ID de la clase (si no se indica socio_id)
+        conservar_asistencia (bool, optional): Mantener las asistencias (baja lógica)
+    """
+    metricas = gimnasio['metricas']
+    cubo = gimnasio['cubo']
+    indices_clases = gimnasio['indices_clases']
+    agenda = gimnasio['agenda']
+    # Los agregados pendientes se calculan más tarde sobre los almacenes ya
+    # depurados; solo hace falta descontar de los que están construidos
+    if _construido(metricas) or _construido(cubo) or _construido(indices_clases) or _construido(agenda):
+        inscripciones = gimnasio['inscripciones']
+        matriz_asistencia = gimnasio['matriz_asistencia']
+        if socio_id is not None:
+            pares_inscripcion = [(socio_id, otro) for otro in clases_de_socio(inscripciones, socio_id)]
+            pares_asistencia = [(socio_id, otro) for otro in clases_con_asistencia(matriz_asistencia, socio_id)]
+        else:
+            pares_inscripcion = [(otro, clase_id) for otro in socios_de_clase(inscripciones, clase_id)]
+            pares_asistencia = [(otro, clase_id) for otro in socios_con_asistencia(matriz_asistencia, clase_id)]
+        if conservar_asistencia:
+            pares_asistencia = []
+
+        for socio, clase in pares_inscripcion:
+            aplicar_en(metricas, contar_inscripcion, clase, -1)
+            aplicar_en(cubo, contar_inscripcion_cubo, gimnasio, socio, clase, -1)
+            aplicar_en(indices_clases, contar_lugar, clase, -1)
+            aplicar_en(agenda, desagendar_inscripcion, gimnasio['clases'], socio, clase)
+        registros = matriz_asistencia['registros']
+        for socio, clase in pares_asistencia:
+            dias = registros[(socio, clase)]
+            aplicar_en(metricas, descontar_asistencias, socio, clase, len(dias))
+            aplicar_en(cubo, contar_asistencias_cubo, gimnasio, socio, clase, dias, -1)
+
+    aplicar_en(gimnasio['inscripciones'], eliminar_inscripciones_de, socio_id, clase_id)
+    if not conservar_asistencia:
+        aplicar_en(gimnasio['matriz_asistencia'], eliminar_registros_de, socio_id, clase_id)
+        aplicar_en(gimnasio['registro_asistencia'], quitar_filas_de, socio_id, clase_id)
+
+def dar_de_baja(gimnasio, entidad, id_registro, conservar_historial=False):
+    """
+    Quita un socio o una clase del gimnasio con todas sus relaciones.
+    Con conservar_historial el registro pasa al histórico y conserva sus asistencias.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): 'socios' o 'clases'
+        id_registro (int): ID del registro (debe existir)
+        conservar_historial (bool, optional): Baja lógica en lugar de borrado
+
+    Returns:
+        dict: Datos del registro dado de baja
+    """
+    if entidad == 'socios':
+        clave = {'socio_id': id_registro}
+    else:
+        clave = {'clase_id': id_registro}
+    datos = gimnasio[entidad][id_registro]
+    if conservar_historial:
+        gimnasio.setdefault('historico', crear_historico())[entidad][id_registro] = dict(datos)
+    eliminar_relaciones(gimnasio, conservar_asistencia=conservar_historial, **clave)
+    del gimnasio[entidad][id_registro]
+    return datos
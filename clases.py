@@ -1,35 +1,60 @@
 """
 Módulo de gestión de clases para el sistema de gimnasio.
-Implementa todas las operaciones CRUD para clases.
+Implementa los menús CRUD de clases sobre las operaciones de servicios.py.
 """
 
-from validaciones import generar_id_unico
+from errores import ErrorGimnasio
+from indices_clases import lugares_libres
+from instrumentacion import instrumentar_menu
+from paginacion import elegir_id, mostrar_pagina, COMANDO_NOMBRE, COMANDO_ESTADO
+from servicios import (crear_clase, eliminar_clase, actualizar_clase, obtener_clase, socios_inscriptos,
+                       paginar_clases)
 
-def mostrar_clases(clases):
+def fila_clase(id_clase, datos):
     """
-    Muestra la lista de clases disponibles.
+    Devuelve la línea de listado de una clase.
     
     Args:
-        clases (dict): Diccionario de clases
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    
+    Returns:
+        str: Línea con ID, nombre, profesor, cupo y estado
     """
-    if not clases:
-        print("No hay clases registradas.")
-        return
+    estado = "Activa" if datos['activa'] else "Inactiva"
+    return f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']} | Cupo: {datos['cupo']} | Estado: {estado}"
+
+def elegir_clase(gimnasio, mensaje, estado=None, filtro=None, formato=fila_clase, titulo="CLASES DISPONIBLES",
+                 comandos=COMANDO_NOMBRE + COMANDO_ESTADO, consulta=None):
+    """
+    Muestra las clases de a una página (con filtros por nombre y estado) y pide un ID.
     
-    print("\n--- CLASES DISPONIBLES ---")
-    for id_clase, datos in clases.items():
-        estado = "Activa" if datos['activa'] else "Inactiva"
-        print(f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']} | Cupo: {datos['cupo']} | Estado: {estado}")
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        mensaje (str): Texto del input
+        estado (str, optional): Estado inicial (None, 'activos' o 'inactivos')
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+        formato (callable, optional): Función (id, datos) -> str de cada fila
+        titulo (str, optional): Título del listado
+        comandos (str, optional): Comandos de filtro habilitados
+        consulta (dict, optional): Condiciones fijas sobre los índices de clases
+            (profesor, dia, desde, hasta, cupo_minimo; ver servicios.paginar_clases)
+    
+    Returns:
+        int: ID ingresado, o None si no hay clases para elegir
+    """
+    def paginar(**filtros):
+        return paginar_clases(gimnasio, filtro=filtro, **filtros, **(consulta or {}))
+    return elegir_id(paginar, formato, mensaje, titulo, "No hay clases para mostrar.", estado, comandos)
 
-def altaClase(clases):
+@instrumentar_menu
+def altaClase(gimnasio, diario=None):
     """
     Dar de alta una clase (CRUD - Create).
     
     Args:
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        dict: Diccionario de clases actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- ALTA DE CLASE ---")
     
@@ -47,189 +72,207 @@ def altaClase(clases):
             cupo = int(input("El cupo debe ser mayor a 0. Ingrese el cupo: "))
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-        return clases
+        return
     
     horario = input("Ingrese el horario (ej: Lunes 18:00): ").strip()
     duracion = input("Ingrese la duración en minutos: ").strip()
     
-    # Generar ID único
-    id_clase = generar_id_unico(clases)
-    
     # Crear la clase
-    clases[id_clase] = {
-        'nombre': nombre,
-        'profesor': profesor,
-        'cupo': cupo,
-        'horario': horario,
-        'duracion': duracion,
-        'activa': True
-    }
-    
-    print(f"Clase registrada exitosamente con ID: {id_clase}")
-    return clases
+    try:
+        id_clase = crear_clase(gimnasio, {
+            'nombre': nombre,
+            'profesor': profesor,
+            'cupo': cupo,
+            'horario': horario,
+            'duracion': duracion
+        }, diario)
+        print(f"Clase registrada exitosamente con ID: {id_clase}")
+    except ErrorGimnasio as error:
+        print(f"Error: {error}")
 
-def bajaClase(clases):
+@instrumentar_menu
+def bajaClase(gimnasio, diario=None):
     """
     Dar de baja una clase (CRUD - Delete).
     
     Args:
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        dict: Diccionario de clases actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- BAJA DE CLASE ---")
     
-    if not clases:
+    if not gimnasio['clases']:
         print("No hay clases registradas.")
-        return clases
-    
-    mostrar_clases(clases)
+        return
     
     try:
-        id_clase = int(input("\nIngrese el ID de la clase a dar de baja: "))
+        id_clase = elegir_clase(gimnasio, "\nIngrese el ID de la clase a dar de baja: ")
+        if id_clase is None:
+            return
+        clase = obtener_clase(gimnasio, id_clase)
+        print(f"\nClase a dar de baja:")
+        print(f"Nombre: {clase['nombre']}")
+        print(f"Profesor: {clase['profesor']}")
         
-        if id_clase in clases:
-            clase = clases[id_clase]
-            print(f"\nClase a dar de baja:")
-            print(f"Nombre: {clase['nombre']}")
-            print(f"Profesor: {clase['profesor']}")
-            
-            confirmar = input("¿Está seguro de dar de baja esta clase? (s/n): ").lower()
-            if confirmar == 's':
-                del clases[id_clase]
-                print("Clase dada de baja exitosamente.")
-            else:
-                print("Operación cancelada.")
+        confirmar = input("¿Está seguro de dar de baja esta clase? (s/n): ").lower()
+        if confirmar == 's':
+            conservar = input("¿Conservar el historial de asistencia para los reportes? (s/n): ").lower() == 's'
+            eliminar_clase(gimnasio, id_clase, diario, conservar_historial=conservar)
+            print("Clase dada de baja exitosamente.")
         else:
-            print("No se encontró una clase con ese ID.")
+            print("Operación cancelada.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return clases
+    except ErrorGimnasio as error:
+        print(error)
 
-def modificarClase(clases):
+@instrumentar_menu
+def modificarClase(gimnasio, diario=None):
     """
     Modificar datos de una clase (CRUD - Update).
     
     Args:
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        dict: Diccionario de clases actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- MODIFICAR CLASE ---")
     
-    if not clases:
+    if not gimnasio['clases']:
         print("No hay clases registradas.")
-        return clases
-    
-    mostrar_clases(clases)
+        return
     
     try:
-        id_clase = int(input("\nIngrese el ID de la clase a modificar: "))
+        id_clase = elegir_clase(gimnasio, "\nIngrese el ID de la clase a modificar: ")
+        if id_clase is None:
+            return
+        clase = obtener_clase(gimnasio, id_clase)
+        print(f"\nDatos actuales de la clase:")
+        print(f"1. Nombre: {clase['nombre']}")
+        print(f"2. Profesor: {clase['profesor']}")
+        print(f"3. Cupo: {clase['cupo']}")
+        print(f"4. Horario: {clase['horario']}")
+        print(f"5. Duración: {clase['duracion']}")
+        print(f"6. Estado: {'Activa' if clase['activa'] else 'Inactiva'}")
+        
+        campo = input("\nIngrese el número del campo a modificar (1-6): ")
         
-        if id_clase in clases:
-            clase = clases[id_clase]
-            print(f"\nDatos actuales de la clase:")
-            print(f"1. Nombre: {clase['nombre']}")
-            print(f"2. Profesor: {clase['profesor']}")
-            print(f"3. Cupo: {clase['cupo']}")
-            print(f"4. Horario: {clase['horario']}")
-            print(f"5. Duración: {clase['duracion']}")
-            print(f"6. Estado: {'Activa' if clase['activa'] else 'Inactiva'}")
-            
-            campo = input("\nIngrese el número del campo a modificar (1-6): ")
-            
-            if campo == "1":
-                nuevo_valor = input("Ingrese el nuevo nombre: ").strip().title()
-                if nuevo_valor:
-                    clase['nombre'] = nuevo_valor
-            elif campo == "2":
-                nuevo_valor = input("Ingrese el nuevo profesor: ").strip().title()
-                if nuevo_valor:
-                    clase['profesor'] = nuevo_valor
-            elif campo == "3":
-                try:
-                    nuevo_valor = int(input("Ingrese el nuevo cupo: "))
-                    if nuevo_valor > 0:
-                        clase['cupo'] = nuevo_valor
-                    else:
-                        print("El cupo debe ser mayor a 0.")
-                except ValueError:
-                    print("Error: Debe ingresar un número válido.")
-            elif campo == "4":
-                nuevo_valor = input("Ingrese el nuevo horario: ").strip()
-                if nuevo_valor:
-                    clase['horario'] = nuevo_valor
-            elif campo == "5":
-                nuevo_valor = input("Ingrese la nueva duración: ").strip()
-                if nuevo_valor:
-                    clase['duracion'] = nuevo_valor
-            elif campo == "6":
-                nuevo_valor = input("¿Activar clase? (s/n): ").lower()
-                clase['activa'] = (nuevo_valor == 's')
-            else:
-                print("Campo inválido.")
-                return clases
-            
-            print("Clase modificada exitosamente.")
+        cambios = {}
+        if campo == "1":
+            nuevo_valor = input("Ingrese el nuevo nombre: ").strip().title()
+            if nuevo_valor:
+                cambios['nombre'] = nuevo_valor
+        elif campo == "2":
+            nuevo_valor = input("Ingrese el nuevo profesor: ").strip().title()
+            if nuevo_valor:
+                cambios['profesor'] = nuevo_valor
+        elif campo == "3":
+            try:
+                cambios['cupo'] = int(input("Ingrese el nuevo cupo: "))
+            except ValueError:
+                print("Error: Debe ingresar un número válido.")
+        elif campo == "4":
+            nuevo_valor = input("Ingrese el nuevo horario: ").strip()
+            if nuevo_valor:
+                cambios['horario'] = nuevo_valor
+        elif campo == "5":
+            nuevo_valor = input("Ingrese la nueva duración: ").strip()
+            if nuevo_valor:
+                cambios['duracion'] = nuevo_valor
+        elif campo == "6":
+            nuevo_valor = input("¿Activar clase? (s/n): ").lower()
+            cambios['activa'] = (nuevo_valor == 's')
         else:
-            print("No se encontró una clase con ese ID.")
+            print("Campo inválido.")
+            return
+        
+        actualizar_clase(gimnasio, id_clase, cambios, diario)
+        print("Clase modificada exitosamente.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return clases
+    except ErrorGimnasio as error:
+        print(error)
 
-def consultarClase(clases, inscripciones, socios):
+@instrumentar_menu
+def consultarClase(gimnasio):
     """
     Consultar una clase y listar socios inscriptos.
     
     Args:
-        clases (dict): Diccionario de clases
-        inscripciones (list): Lista de inscripciones
-        socios (dict): Diccionario de socios
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- CONSULTAR CLASE ---")
     
-    if not clases:
+    if not gimnasio['clases']:
         print("No hay clases registradas.")
         return
     
-    mostrar_clases(clases)
-    
     try:
-        id_clase = int(input("\nIngrese el ID de la clase a consultar: "))
+        id_clase = elegir_clase(gimnasio, "\nIngrese el ID de la clase a consultar: ")
+        if id_clase is None:
+            return
+        clase = obtener_clase(gimnasio, id_clase)
+        print(f"\n--- DATOS DE LA CLASE ---")
+        print(f"ID: {id_clase}")
+        print(f"Nombre: {clase['nombre']}")
+        print(f"Profesor: {clase['profesor']}")
+        print(f"Cupo: {clase['cupo']}")
+        print(f"Horario: {clase['horario']}")
+        print(f"Duración: {clase['duracion']}")
+        print(f"Estado: {'Activa' if clase['activa'] else 'Inactiva'}")
+        
+        # Buscar socios inscriptos
+        inscriptos = socios_inscriptos(gimnasio, id_clase)
         
-        if id_clase in clases:
-            clase = clases[id_clase]
-            print(f"\n--- DATOS DE LA CLASE ---")
-            print(f"ID: {id_clase}")
-            print(f"Nombre: {clase['nombre']}")
-            print(f"Profesor: {clase['profesor']}")
-            print(f"Cupo: {clase['cupo']}")
-            print(f"Horario: {clase['horario']}")
-            print(f"Duración: {clase['duracion']}")
-            print(f"Estado: {'Activa' if clase['activa'] else 'Inactiva'}")
-            
-            # Buscar socios inscriptos
-            socios_inscriptos = []
-            for inscripcion in inscripciones:
-                if inscripcion[1] == id_clase:  # inscripcion es (socio_id, clase_id)
-                    socios_inscriptos.append(inscripcion[0])
-            
-            print(f"\n--- SOCIOS INSCRIPTOS ({len(socios_inscriptos)}/{clase['cupo']}) ---")
-            if socios_inscriptos:
-                for socio_id in socios_inscriptos:
-                    if socio_id in socios:
-                        socio = socios[socio_id]
-                        print(f"- {socio['nombre']} {socio['apellido']} (ID: {socio_id})")
-            else:
-                print("No hay socios inscriptos en esta clase.")
+        print(f"\n--- SOCIOS INSCRIPTOS ({len(inscriptos)}/{clase['cupo']}) ---")
+        if inscriptos:
+            for socio_id, socio in inscriptos:
+                print(f"- {socio['nombre']} {socio['apellido']} (ID: {socio_id})")
         else:
-            print("No se encontró una clase con ese ID.")
+            print("No hay socios inscriptos en esta clase.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
+    except ErrorGimnasio as error:
+        print(error)
+
+@instrumentar_menu
+def buscarClases(gimnasio):
+    """
+    Buscar clases por profesor, día, rango horario de inicio y lugares libres.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+    """
+    print("\n--- BUSCAR CLASES ---")
+    
+    if not gimnasio['clases']:
+        print("No hay clases registradas.")
+        return
+    
+    print("(Deje vacío cualquier criterio para no filtrar por él)")
+    consulta = {
+        'profesor': input("Profesor: ").strip() or None,
+        'dia': input("Día (ej: Lunes): ").strip() or None,
+        'desde': input("Desde la hora (HH:MM): ").strip() or None,
+        'hasta': input("Hasta la hora (HH:MM): ").strip() or None,
+        'cupo_minimo': 1 if input("¿Solo clases con lugar? (s/n): ").strip().lower() == 's' else None
+    }
+    estado = 'activos' if input("¿Solo clases activas? (s/n): ").strip().lower() == 's' else None
+    
+    def fila_con_lugares(id_clase, datos):
+        libres = lugares_libres(gimnasio['indices_clases'], id_clase)
+        return f"{fila_clase(id_clase, datos)} | Horario: {datos['horario']} | Libres: {libres}"
+    
+    try:
+        cursor = None
+        titulo = "CLASES ENCONTRADAS"
+        while True:
+            filas, cursor = paginar_clases(gimnasio, estado, cursor=cursor, **consulta)
+            mostrar_pagina(filas, fila_con_lugares, titulo, "No se encontraron clases.", cursor is not None)
+            if cursor is None or input().strip():
+                break
+            titulo = None
+    except ErrorGimnasio as error:
+        print(error)
@@ -0,0 +1,93 @@
+"""
+Módulo de acceso concurrente al gimnasio desde varios hilos (mostradores y
+terminales que escriben a la vez).
+
+Verificar una inscripción (no inscripto, cupo, horario) y registrarla son dos
+pasos: si otro hilo inscribe en la misma clase entre ambos, la clase queda con
+más inscriptos que su cupo. GimnasioConcurrente hace la inscripción atómica
+(compare-and-enroll) tomando el candado de la clase y el del socio durante los
+dos pasos. Los candados están rayados: hay una cantidad fija de franjas y
+cada ID usa la de su hash, así no hace falta un candado por clase y dos
+inscripciones en clases de franjas distintas no se esperan entre sí. La
+escritura en los agregados compartidos (métricas, cubo, índices, agenda,
+diario) es corta y va bajo un único candado de escritura.
+
+Orden de los candados (para no trabarse): franjas de clases en orden, luego
+franjas de socios en orden, luego el de escritura. Las altas, bajas y
+modificaciones de socios o clases, y los reportes, toman todos (exclusivo()).
+"""
+
+import threading
+from contextlib import contextmanager, ExitStack
+
+from persistencia import confirmar_diario
+from servicios import verificar_inscripcion, registrar_inscripcion, desinscribir, marcar_asistencia
+from diferido import Diferido
+
+# Cantidad de franjas de candados por entidad
+CANTIDAD_FRANJAS = 64
+# Almacenes que se construyen al crear el acceso concurrente y no desde un hilo cualquiera
+ALMACENES_COMPARTIDOS = ('inscripciones', 'matriz_asistencia', 'agenda')
+
+class CandadosRayados:
+    """
+    Candados repartidos en franjas fijas: cada clave usa el de su franja.
+    """
+
+    def __init__(self, cantidad=CANTIDAD_FRANJAS):
+        self.candados = [threading.Lock() for _ in range(cantidad)]
+
+    def franja(self, clave):
+        return hash(clave) % len(self.candados)
+
+    def candado(self, clave):
+        return self.candados[self.franja(clave)]
+
+class GimnasioConcurrente:
+    """
+    Acceso al gimnasio seguro entre hilos, con inscripción atómica por clase.
+    """
+
+    def __init__(self, gimnasio, diario=None, franjas=CANTIDAD_FRANJAS):
+        self.gimnasio = gimnasio
+        self.diario = diario
+        self.clases = CandadosRayados(franjas)
+        self.socios = CandadosRayados(franjas)
+        self.escritura = threading.Lock()
+        for nombre in ALMACENES_COMPARTIDOS:
+            if isinstance(gimnasio[nombre], Diferido):
+                gimnasio[nombre].construir()
+
+    @contextmanager
+    def _par(self, id_socio, id_clase):
+        # Candado de la clase y luego el del socio (en ese orden en todo el módulo)
+        with self.clases.candado(id_clase), self.socios.candado(id_socio):
+            yield
+
+    @contextmanager
+    def exclusivo(self):
+        """
+        Toma todos los candados: para altas, bajas, modificaciones y reportes.
+        """
+        with ExitStack() as pila:
+            for candado in self.clases.candados + self.socios.candados + [self.escritura]:
+                pila.enter_context(candado)
+            yield self.gimnasio
+
+    def inscribir(self, id_socio, id_clase):
+        with self._par(id_socio, id_clase):
+            verificar_inscripcion(self.gimnasio, id_socio, id_clase)
+            with self.escritura:
+                registrar_inscripcion(self.gimnasio, id_socio, id_clase, self.diario)
+
+    def desinscribir(self, id_socio, id_clase):
+        with self._par(id_socio, id_clase), self.escritura:
+            desinscribir(self.gimnasio, id_socio, id_clase, self.diario)
+
+    def marcar_asistencia(self, id_socio, id_clase, fecha):
+        with self._par(id_socio, id_clase), self.escritura:
+            return marcar_asistencia(self.gimnasio, id_socio, id_clase, fecha, self.diario)
+
+    def confirmar(self):
+        with self.escritura:
+            confirmar_diario(self.diario)
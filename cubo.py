@@ -0,0 +1,292 @@
+"""
+Módulo del cubo de agregados para los reportes del gimnasio.
+Mantiene pre-agregados (rollups) de asistencias e inscripciones para todas
+las combinaciones de sus dimensiones, así cualquier corte (por ejemplo, clase ×
+día de la semana × mes, o asistencia por profesor o por cohorte de alta) se
+responde con una búsqueda en lugar de recorrer los datos. Cada asistencia e
+inscripción suma en todos los rollups; cambiar una dimensión de un socio o una
+clase (profesor, fecha de alta) reatribuye solo los hechos de ese registro, y una
+baja descuenta solo los hechos que se eliminan en cascada.
+
+Dimensiones:
+    asistencia: clase, profesor, dia_semana (0 = lunes), mes ('AAAA-MM'), cohorte ('AAAA-MM' del alta)
+    inscripciones: clase, profesor, cohorte
+"""
+
+from datetime import date
+from functools import lru_cache
+from itertools import combinations
+
+from instrumentacion import instrumentar, contar_escaneados
+from almacen_inscripciones import iterar_inscripciones, clases_de_socio, socios_de_clase
+from almacen_asistencia import iterar_registros, clases_con_asistencia, socios_con_asistencia
+from validaciones import fecha_a_ordinal
+
+DIMENSIONES = {
+    'asistencia': ('clase', 'profesor', 'dia_semana', 'mes', 'cohorte'),
+    'inscripciones': ('clase', 'profesor', 'cohorte')
+}
+# Nombres de los días de la semana (dimensión dia_semana, 0 = lunes)
+DIAS_SEMANA = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+# Valor de la dimensión para socios o clases que ya no existen
+SIN_DATO = 'Sin dato'
+# Cohorte de los socios sin fecha de alta válida
+SIN_FECHA = 'Sin fecha'
+
+def _rollups(dimensiones):
+    """
+    Devuelve todas las combinaciones de dimensiones (de la vacía a la completa)
+    con las posiciones que proyectan desde las coordenadas completas.
+
+    Args:
+        dimensiones (tuple): Dimensiones del hecho
+
+    Returns:
+        list: Tuplas (combinacion, posiciones)
+    """
+    return [(combinacion, tuple(dimensiones.index(dimension) for dimension in combinacion))
+            for cantidad in range(len(dimensiones) + 1)
+            for combinacion in combinations(dimensiones, cantidad)]
+
+PROYECCIONES = {hecho: _rollups(dimensiones) for hecho, dimensiones in DIMENSIONES.items()}
+
+@lru_cache(maxsize=None)
+def _mes(dia):
+    """
+    Devuelve el mes de un ordinal de día.
+
+    Args:
+        dia (int): Ordinal del día
+
+    Returns:
+        str: Mes 'AAAA-MM'
+    """
+    fecha = date.fromordinal(dia)
+    return f"{fecha.year:04d}-{fecha.month:02d}"
+
+@lru_cache(maxsize=4096)
+def _cohorte_de_fecha(fecha_alta):
+    """
+    Devuelve la cohorte de una fecha de alta.
+
+    Args:
+        fecha_alta (str): Fecha de alta DD/MM/AAAA (puede estar vacía)
+
+    Returns:
+        str: Cohorte 'AAAA-MM', o SIN_FECHA si la fecha no es válida
+    """
+    try:
+        return _mes(fecha_a_ordinal(fecha_alta))
+    except ValueError:
+        return SIN_FECHA
+
+def _cohorte(gimnasio, socio_id):
+    """
+    Devuelve la cohorte actual de un socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        socio_id (int): ID del socio
+
+    Returns:
+        str: Cohorte, o SIN_DATO si el socio ya no existe (ni en el histórico)
+    """
+    socio = gimnasio['socios'].get(socio_id)
+    if socio is None:
+        socio = gimnasio.get('historico', {}).get('socios', {}).get(socio_id)
+    return _cohorte_de_fecha(socio['fecha_alta']) if socio is not None else SIN_DATO
+
+def _profesor(gimnasio, clase_id):
+    """
+    Devuelve el profesor actual de una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        clase_id (int): ID de la clase
+
+    Returns:
+        str: Profesor, o SIN_DATO si la clase ya no existe (ni en el histórico)
+    """
+    clase = gimnasio['clases'].get(clase_id)
+    if clase is None:
+        clase = gimnasio.get('historico', {}).get('clases', {}).get(clase_id)
+    return clase['profesor'] if clase is not None else SIN_DATO
+
+def crear_cubo():
+    """
+    Crea el cubo vacío.
+
+    Returns:
+        dict: {hecho: {combinacion_de_dimensiones: {coordenadas: cantidad}}}
+    """
+    return {hecho: {combinacion: {} for combinacion, _ in proyecciones}
+            for hecho, proyecciones in PROYECCIONES.items()}
+
+def _sumar(cubo, hecho, coordenadas, cantidad):
+    """
+    Suma una cantidad en todos los rollups de un hecho para unas coordenadas completas.
+
+    Args:
+        cubo (dict): Cubo
+        hecho (str): 'asistencia' o 'inscripciones'
+        coordenadas (tuple): Valor de cada dimensión, en el orden de DIMENSIONES
+        cantidad (int): Cantidad a sumar (negativa para restar)
+    """
+    rollups = cubo[hecho]
+    for combinacion, posiciones in PROYECCIONES[hecho]:
+        celdas = rollups[combinacion]
+        clave = tuple(coordenadas[posicion] for posicion in posiciones)
+        valor = celdas.get(clave, 0) + cantidad
+        if valor:
+            celdas[clave] = valor
+        else:
+            del celdas[clave]
+
+def calcular_cubo(gimnasio):
+    """
+    Calcula el cubo recorriendo una vez las asistencias y las inscripciones.
+    Primero arma el rollup completo y los demás se derivan de él.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+
+    Returns:
+        dict: Cubo
+    """
+    completos = {'asistencia': {}, 'inscripciones': {}}
+
+    asistencia = completos['asistencia']
+    for (socio_id, clase_id), dias in iterar_registros(gimnasio['matriz_asistencia']):
+        fijas = (clase_id, _profesor(gimnasio, clase_id))
+        cohorte = _cohorte(gimnasio, socio_id)
+        for dia in dias:
+            clave = fijas + ((dia - 1) % 7, _mes(dia), cohorte)
+            asistencia[clave] = asistencia.get(clave, 0) + 1
+
+    inscripciones = completos['inscripciones']
+    for socio_id, clase_id in iterar_inscripciones(gimnasio['inscripciones']):
+        clave = (clase_id, _profesor(gimnasio, clase_id), _cohorte(gimnasio, socio_id))
+        inscripciones[clave] = inscripciones.get(clave, 0) + 1
+
+    cubo = crear_cubo()
+    for hecho, celdas in completos.items():
+        for coordenadas, cantidad in celdas.items():
+            _sumar(cubo, hecho, coordenadas, cantidad)
+    return cubo
+
+def contar_asistencia_cubo(cubo, gimnasio, socio_id, clase_id, dia):
+    """
+    Registra una asistencia nueva en el cubo.
+
+    Args:
+        cubo (dict): Cubo
+        gimnasio (dict): Estado del gimnasio (para resolver profesor y cohorte)
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        dia (int): Ordinal del día
+    """
+    coordenadas = (clase_id, _profesor(gimnasio, clase_id), (dia - 1) % 7, _mes(dia), _cohorte(gimnasio, socio_id))
+    _sumar(cubo, 'asistencia', coordenadas, 1)
+
+def contar_inscripcion_cubo(cubo, gimnasio, socio_id, clase_id, cantidad=1):
+    """
+    Registra una inscripción (cantidad=1) o una desinscripción (cantidad=-1) en el cubo.
+
+    Args:
+        cubo (dict): Cubo
+        gimnasio (dict): Estado del gimnasio
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        cantidad (int, optional): Inscripciones agregadas (negativo si se eliminaron)
+    """
+    coordenadas = (clase_id, _profesor(gimnasio, clase_id), _cohorte(gimnasio, socio_id))
+    _sumar(cubo, 'inscripciones', coordenadas, cantidad)
+
+def contar_asistencias_cubo(cubo, gimnasio, socio_id, clase_id, dias, cantidad=1):
+    """
+    Suma o resta en el cubo los días de asistencia de un par (socio, clase),
+    agrupándolos por (día de la semana, mes) antes de tocar los rollups.
+
+    Args:
+        cubo (dict): Cubo
+        gimnasio (dict): Estado del gimnasio
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        dias (iterable): Ordinales de los días
+        cantidad (int, optional): 1 para sumar, -1 para restar
+    """
+    fijas = (clase_id, _profesor(gimnasio, clase_id))
+    cohorte = _cohorte(gimnasio, socio_id)
+    celdas = {}
+    for dia in dias:
+        clave = ((dia - 1) % 7, _mes(dia))
+        celdas[clave] = celdas.get(clave, 0) + 1
+    for (dia_semana, mes), veces in celdas.items():
+        _sumar(cubo, 'asistencia', fijas + (dia_semana, mes, cohorte), cantidad * veces)
+
+def contar_hechos_de(cubo, gimnasio, cantidad, socio_id=None, clase_id=None):
+    """
+    Suma o resta todos los hechos de un socio o de una clase con sus dimensiones actuales.
+    Para reatribuirlos después de un cambio (profesor o fecha de alta) se
+    restan antes del cambio (cantidad=-1) y se vuelven a sumar después (cantidad=1).
+    Recorre solo los pares del registro (O(grado)).
+
+    Args:
+        cubo (dict): Cubo
+        gimnasio (dict): Estado del gimnasio
+        cantidad (int): 1 para sumar, -1 para restar
+        socio_id (int, optional): ID del socio
+        clase_id (int, optional): ID de la clase (si no se indica socio_id)
+    """
+    matriz_asistencia = gimnasio['matriz_asistencia']
+    inscripciones = gimnasio['inscripciones']
+    if socio_id is not None:
+        pares_asistencia = [(socio_id, otro) for otro in clases_con_asistencia(matriz_asistencia, socio_id)]
+        pares_inscripcion = [(socio_id, otro) for otro in clases_de_socio(inscripciones, socio_id)]
+    else:
+        pares_asistencia = [(otro, clase_id) for otro in socios_con_asistencia(matriz_asistencia, clase_id)]
+        pares_inscripcion = [(otro, clase_id) for otro in socios_de_clase(inscripciones, clase_id)]
+
+    registros = matriz_asistencia['registros']
+    for socio, clase in pares_asistencia:
+        contar_asistencias_cubo(cubo, gimnasio, socio, clase, registros[(socio, clase)], cantidad)
+    for socio, clase in pares_inscripcion:
+        contar_inscripcion_cubo(cubo, gimnasio, socio, clase, cantidad)
+
+@instrumentar
+def consultar_cubo(cubo, hecho, agrupar=(), filtros=None):
+    """
+    Responde un corte del cubo: totales agrupados por unas dimensiones,
+    opcionalmente filtrando otras por igualdad. Se lee del rollup que tiene
+    exactamente esas dimensiones, sin recorrer los hechos.
+
+    Args:
+        cubo (dict): Cubo
+        hecho (str): 'asistencia' o 'inscripciones'
+        agrupar (tuple, optional): Dimensiones por las que agrupar
+        filtros (dict, optional): {dimension: valor} que deben cumplir los hechos
+
+    Returns:
+        dict: {valores de agrupar (tupla): cantidad}; sin agrupar, {(): total}
+    """
+    filtros = filtros or {}
+    dimensiones = DIMENSIONES[hecho]
+    pedidas = set(agrupar) | set(filtros)
+    desconocidas = pedidas - set(dimensiones)
+    if desconocidas:
+        raise ValueError(f"Dimensiones desconocidas para {hecho}: {', '.join(sorted(desconocidas))}")
+
+    combinacion = tuple(dimension for dimension in dimensiones if dimension in pedidas)
+    celdas = cubo[hecho][combinacion]
+    if not agrupar:
+        clave = tuple(filtros[dimension] for dimension in combinacion)
+        return {(): celdas.get(clave, 0)}
+
+    contar_escaneados(len(celdas))
+    posiciones_filtro = [(combinacion.index(dimension), valor) for dimension, valor in filtros.items()]
+    posiciones_grupo = [combinacion.index(dimension) for dimension in agrupar]
+    resultado = {}
+    for clave, cantidad in celdas.items():
+        if all(clave[posicion] == valor for posicion, valor in posiciones_filtro):
+            resultado[tuple(clave[posicion] for posicion in posiciones_grupo)] = cantidad
+    return resultado
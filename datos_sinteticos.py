@@ -0,0 +1,186 @@
+"""
+Generador de gimnasios sintéticos para benchmarks y pruebas de carga.
+Con una semilla fija arma siempre el mismo gimnasio: socios (80 % activos),
+clases con horarios que no superponen a sus profesores, inscripciones con
+popularidad de clases sesgada según una ley de Zipf (pocas clases muy pedidas
+y una cola larga) y años de asistencia semanal a las clases inscriptas.
+
+Todo pasa por servicios.py, con las mismas reglas que la carga interactiva
+(cupo, superposición de horarios, ...): las inscripciones rechazadas se
+descartan.
+
+Uso:
+    python datos_sinteticos.py --socios 100000 [--clases 200] [--anios 2] [--directorio datos] [--semilla S]
+"""
+
+import argparse
+import random
+from datetime import date
+from itertools import accumulate
+
+from benchmark_registros import generar_socio, ACTIVIDADES
+from errores import ErrorGimnasio
+from persistencia import crear_gimnasio, cargar_gimnasio, cerrar_diario, iniciar_lote, confirmar_lote
+from servicios import crear_socio, crear_clase, inscribir, marcar_asistencia
+from validaciones import DIAS_HORARIO, interpretar_horario
+
+# Exponente de la ley de Zipf de popularidad de clases (1 = Zipf clásica)
+EXPONENTE_ZIPF = 1.1
+# Clases por socio inscripto y probabilidad de asistir a cada clase de la semana
+CLASES_POR_SOCIO = (1, 3)
+PROBABILIDAD_ASISTENCIA = 0.6
+# Clases por profesor: una por día de la semana, así nunca se superponen
+CLASES_POR_PROFESOR = 6
+# Eventos por lote del diario al generar sobre un directorio
+TAMANO_LOTE = 10_000
+
+def clases_para(socios):
+    """
+    Cantidad de clases por defecto para un gimnasio (entre 10 y 2000).
+
+    Args:
+        socios (int): Cantidad de socios
+
+    Returns:
+        int: Cantidad de clases
+    """
+    return min(2000, max(10, socios // 500))
+
+def pesos_zipf(cantidad, exponente=EXPONENTE_ZIPF):
+    """
+    Devuelve los pesos acumulados de una ley de Zipf (peso 1 / rango^exponente).
+
+    Args:
+        cantidad (int): Cantidad de elementos
+        exponente (float, optional): Exponente de la ley
+
+    Returns:
+        list: Pesos acumulados, para random.choices(cum_weights=...)
+    """
+    return list(accumulate(1 / rango ** exponente for rango in range(1, cantidad + 1)))
+
+def generar_clase(indice, aleatorio, cupo_medio):
+    """
+    Genera una clase sintética. Cada profesor da una clase por día (lunes a
+    sábado), así las clases del mismo profesor no se superponen.
+
+    Args:
+        indice (int): Número de clase
+        aleatorio (random.Random): Generador con semilla
+        cupo_medio (int): Cupo medio de las clases
+
+    Returns:
+        dict: Datos de la clase
+    """
+    dia = DIAS_HORARIO[indice % CLASES_POR_PROFESOR].capitalize()
+    return {
+        'nombre': f"{aleatorio.choice(ACTIVIDADES)} {indice + 1}",
+        'profesor': f"Profesor {indice // CLASES_POR_PROFESOR + 1}",
+        'cupo': aleatorio.randint(max(1, cupo_medio // 2), max(1, cupo_medio * 3 // 2)),
+        'horario': f"{dia} {aleatorio.randint(7, 21):02d}:{aleatorio.choice(('00', '30'))}",
+        'duracion': aleatorio.choice(('45', '60', '90')),
+        'activa': aleatorio.random() < 0.95
+    }
+
+def _rotar_lote(diario, eventos):
+    """
+    Confirma el lote abierto y abre otro cada TAMANO_LOTE eventos.
+
+    Args:
+        diario (dict): Diario abierto, o None
+        eventos (int): Eventos registrados hasta ahora
+    """
+    if diario is not None and eventos % TAMANO_LOTE == 0:
+        confirmar_lote(diario)
+        iniciar_lote(diario)
+
+def generar_gimnasio(socios=1000, clases=None, anios=1, semilla=42, exponente=EXPONENTE_ZIPF,
+                     gimnasio=None, diario=None, hasta=None):
+    """
+    Genera un gimnasio sintético reproducible.
+
+    Args:
+        socios (int, optional): Cantidad de socios
+        clases (int, optional): Cantidad de clases (por defecto según los socios)
+        anios (float, optional): Años de asistencia hacia atrás (0 = sin asistencias)
+        semilla (int, optional): Semilla del generador
+        exponente (float, optional): Exponente de Zipf de la popularidad de clases
+        gimnasio (dict, optional): Estado donde generar (por defecto uno nuevo en memoria)
+        diario (dict, optional): Diario donde registrar los cambios
+        hasta (int, optional): Ordinal del último día de asistencia (por defecto hoy)
+
+    Returns:
+        dict: {'gimnasio', 'socios': [IDs], 'clases': [IDs por popularidad], 'inscripciones': [(socio, clase)],
+               'asistencias': cantidad}
+    """
+    aleatorio = random.Random(semilla)
+    gimnasio = crear_gimnasio() if gimnasio is None else gimnasio
+    clases = clases_para(socios) if clases is None else clases
+    # Cupo medio para que las clases alcancen para la mayoría de las inscripciones
+    cupo_medio = max(10, socios * sum(CLASES_POR_SOCIO) // (2 * clases))
+
+    iniciar_lote(diario)
+    ids_socios = []
+    for indice in range(socios):
+        ids_socios.append(crear_socio(gimnasio, generar_socio(indice, aleatorio), diario))
+        _rotar_lote(diario, len(ids_socios))
+    ids_clases = [crear_clase(gimnasio, generar_clase(indice, aleatorio, cupo_medio), diario)
+                  for indice in range(clases)]
+    # El orden de popularidad no sigue el de los IDs
+    populares = list(ids_clases)
+    aleatorio.shuffle(populares)
+    acumulados = pesos_zipf(len(populares), exponente)
+
+    inscriptas = []
+    for id_socio in ids_socios:
+        if not gimnasio['socios'][id_socio]['activo']:
+            continue
+        elegidas = aleatorio.choices(populares, cum_weights=acumulados, k=aleatorio.randint(*CLASES_POR_SOCIO))
+        for id_clase in dict.fromkeys(elegidas):
+            try:
+                inscribir(gimnasio, id_socio, id_clase, diario)
+            except ErrorGimnasio:
+                # Cupo completo, clase inactiva o superpuesta: como en el mostrador
+                continue
+            inscriptas.append((id_socio, id_clase))
+            _rotar_lote(diario, len(inscriptas))
+
+    asistencias = 0
+    hasta = date.today().toordinal() if hasta is None else hasta
+    desde = hasta - int(anios * 365)
+    for id_socio, id_clase in inscriptas:
+        for dia_semana, _ in interpretar_horario(gimnasio['clases'][id_clase]['horario']):
+            # Primer día de la semana de la clase desde el inicio del período
+            dia = desde + (dia_semana - date.fromordinal(desde).weekday()) % 7
+            while dia <= hasta:
+                if aleatorio.random() < PROBABILIDAD_ASISTENCIA:
+                    marcar_asistencia(gimnasio, id_socio, id_clase, dia, diario)
+                    asistencias += 1
+                    _rotar_lote(diario, asistencias)
+                dia += 7
+    confirmar_lote(diario)
+    return {'gimnasio': gimnasio, 'socios': ids_socios, 'clases': populares, 'inscripciones': inscriptas,
+            'asistencias': asistencias}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de gimnasios sintéticos.")
+    parser.add_argument('--socios', type=int, default=1000, help="Cantidad de socios")
+    parser.add_argument('--clases', type=int, help="Cantidad de clases (por defecto socios / 500, entre 10 y 2000)")
+    parser.add_argument('--anios', type=float, default=1, help="Años de asistencia")
+    parser.add_argument('--exponente', type=float, default=EXPONENTE_ZIPF, help="Exponente de Zipf")
+    parser.add_argument('--directorio', default='datos', help="Directorio de datos donde guardar el gimnasio")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    argumentos = parser.parse_args()
+
+    gimnasio, diario = cargar_gimnasio(argumentos.directorio)
+    if gimnasio['socios'] or gimnasio['clases']:
+        parser.error(f"El directorio {argumentos.directorio} ya tiene datos.")
+    resultado = generar_gimnasio(argumentos.socios, argumentos.clases, argumentos.anios, argumentos.semilla,
+                                 argumentos.exponente, gimnasio, diario)
+    cerrar_diario(diario)
+    print(f"{len(resultado['socios'])} socios, {len(resultado['clases'])} clases, "
+          f"{len(resultado['inscripciones'])} inscripciones, {resultado['asistencias']} asistencias "
+          f"en {argumentos.directorio}")
+
+if __name__ == "__main__":
+    main()
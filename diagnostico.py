@@ -0,0 +1,115 @@
+"""
+Módulo de diagnóstico del sistema de gimnasio.
+Menú para activar la medición de las operaciones (ver instrumentacion.py),
+ver las métricas por operación y volcarlas a un archivo, una vez o cada
+cierto intervalo, y para ver la memoria por entidad (ver memoria.py).
+"""
+
+import os
+
+from instrumentacion import (activar, desactivar, medicion_activa, reiniciar_metricas, resumen_metricas,
+                             volcar_metricas, iniciar_volcado, detener_volcado, volcado_en_curso, INTERVALO_VOLCADO)
+from memoria import medir_entidades, mostrar_memoria
+from persistencia import DIRECTORIO_DATOS
+
+# Archivo de métricas dentro del directorio de datos
+ARCHIVO_METRICAS = 'metricas.json'
+# Cantidad de socios a proyectar por defecto en el reporte de memoria
+SOCIOS_PROYECCION = 1_000_000
+
+def ruta_metricas(diario=None):
+    """
+    Devuelve la ruta del archivo de métricas.
+
+    Args:
+        diario (dict, optional): Diario abierto (el archivo va en su directorio)
+
+    Returns:
+        str: Ruta del archivo de métricas
+    """
+    directorio = diario['directorio'] if diario is not None else DIRECTORIO_DATOS
+    return os.path.join(directorio, ARCHIVO_METRICAS)
+
+def mostrar_metricas():
+    """
+    Muestra las métricas por operación, de mayor a menor tiempo total.
+    """
+    resumen = resumen_metricas()
+    print("\n--- MÉTRICAS POR OPERACIÓN ---")
+    if not resumen:
+        print("Sin mediciones." if medicion_activa() else "Sin mediciones (la medición está desactivada).")
+        return
+    print(f"{'Operación':<30}{'Llamadas':>9}{'Errores':>8}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}"
+          f"{'Máx µs':>11}{'Escan./llamada':>16}")
+    for nombre, metricas in resumen.items():
+        marca = '*' if metricas['reloj'] == 'cpu' else ''
+        print(f"{nombre + marca:<30}{metricas['llamadas']:>9}{metricas['errores']:>8}{metricas['p50_us']:>10.1f}"
+              f"{metricas['p95_us']:>10.1f}{metricas['p99_us']:>10.1f}{metricas['max_us']:>11.1f}"
+              f"{metricas['escaneados_por_llamada']:>16.1f}")
+    if any(metricas['reloj'] == 'cpu' for metricas in resumen.values()):
+        print("* Menú interactivo: tiempo de CPU, sin la espera de la entrada del usuario.")
+
+def menu_diagnostico(gimnasio, diario=None):
+    """
+    Menú de diagnóstico.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario abierto (ubica el archivo de métricas)
+    """
+    ruta = ruta_metricas(diario)
+    while True:
+        volcado = volcado_en_curso()
+        print("\n---- MENÚ DE DIAGNÓSTICO ----")
+        print(f"Medición: {'activa' if medicion_activa() else 'desactivada'}"
+              + (f" | Volcado cada {volcado[1]:g} s en {volcado[0]}" if volcado else ""))
+        print("[1] Desactivar medición" if medicion_activa() else "[1] Activar medición")
+        print("[2] Ver métricas por operación")
+        print("[3] Reiniciar métricas")
+        print(f"[4] Guardar métricas en {ruta}")
+        print("[5] Detener volcado periódico" if volcado else "[5] Volcado periódico de métricas")
+        print("[6] Memoria por entidad")
+        print("[0] Volver")
+        opcion = input("Seleccione una opción: ")
+
+        if opcion == "0":
+            break
+        elif opcion == "1":
+            if medicion_activa():
+                desactivar()
+                print("Medición desactivada (las métricas se conservan).")
+            else:
+                activar()
+                print("Medición activada.")
+        elif opcion == "2":
+            mostrar_metricas()
+        elif opcion == "3":
+            reiniciar_metricas()
+            print("Métricas reiniciadas.")
+        elif opcion == "4":
+            try:
+                volcar_metricas(ruta)
+                print(f"Métricas guardadas en {ruta}.")
+            except OSError as error:
+                print(f"No se pudieron guardar las métricas: {error}")
+        elif opcion == "5":
+            if volcado:
+                detener_volcado()
+                print("Volcado periódico detenido.")
+                continue
+            try:
+                intervalo = float(input(f"Intervalo en segundos [{INTERVALO_VOLCADO}]: ").strip() or INTERVALO_VOLCADO)
+                iniciar_volcado(ruta, intervalo)
+                activar()
+                print(f"Métricas cada {intervalo:g} s en {ruta} (medición activada).")
+            except ValueError:
+                print("Error: Debe ingresar un intervalo mayor a 0.")
+        elif opcion == "6":
+            try:
+                objetivo = int(input(f"Socios a proyectar [{SOCIOS_PROYECCION}]: ").strip() or SOCIOS_PROYECCION)
+            except ValueError:
+                print("Error: Debe ingresar un número válido.")
+                continue
+            mostrar_memoria(medir_entidades(gimnasio), objetivo)
+        else:
+            print("Opción inválida.")
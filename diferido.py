@@ -0,0 +1,69 @@
+"""
+Módulo de almacenes diferidos para el sistema de gimnasio.
+Un almacén derivado (índices, métricas, rollups, ...) o leído de un snapshot
+puede construirse recién la primera vez que se consulta: mientras tanto, las
+operaciones que lo modificarían se postergan y se aplican después de
+construirlo, o se descartan si se construye desde el estado ya actualizado.
+"""
+
+class Diferido(dict):
+    """
+    Diccionario que se construye recién la primera vez que se consulta una clave.
+    Mientras no se construyó, las operaciones encoladas con encolar() se guardan y
+    se aplican en orden después de construirlo (si reproducir es True).
+    """
+
+    def __init__(self, construir, reproducir=True):
+        super().__init__()
+        self._construir = construir
+        self._reproducir = reproducir
+        self._cola = []
+
+    @property
+    def pendiente(self):
+        return self._construir is not None
+
+    def encolar(self, funcion, *args):
+        """
+        Aplica una operación sobre el almacén, o la posterga si aún no se construyó.
+
+        Args:
+            funcion (callable): Función que recibe el almacén como primer argumento
+            *args: Resto de los argumentos
+        """
+        if not self.pendiente:
+            funcion(self, *args)
+        elif self._reproducir:
+            self._cola.append((funcion, args))
+
+    def construir(self):
+        """
+        Construye el almacén y aplica las operaciones postergadas, si todavía no se construyó.
+        """
+        if self._construir is None:
+            return
+        construir, self._construir = self._construir, None
+        self.update(construir())
+        for funcion, args in self._cola:
+            funcion(self, *args)
+        self._cola = []
+
+    def __missing__(self, clave):
+        if self._construir is None:
+            raise KeyError(clave)
+        self.construir()
+        return self[clave]
+
+def aplicar_en(almacen, funcion, *args):
+    """
+    Aplica una operación sobre un almacén, postergándola si es Diferido y aún no se construyó.
+
+    Args:
+        almacen (dict): Almacén (normal o Diferido)
+        funcion (callable): Función que recibe el almacén como primer argumento
+        *args: Resto de los argumentos
+    """
+    if isinstance(almacen, Diferido):
+        almacen.encolar(funcion, *args)
+    else:
+        funcion(almacen, *args)
@@ -0,0 +1,104 @@
+"""
+Módulo de errores del sistema de gimnasio.
+Define las excepciones que lanzan las operaciones de servicios.py; los menús
+las capturan y muestran su mensaje.
+"""
+
+class ErrorGimnasio(Exception):
+    """Error base de todas las operaciones del gimnasio."""
+
+class SocioNoEncontrado(ErrorGimnasio):
+    """No existe un socio con el ID o DNI indicado."""
+
+    def __init__(self, id_socio):
+        super().__init__("No se encontró un socio con ese ID." if isinstance(id_socio, int)
+                         else "No se encontró un socio con ese DNI.")
+        self.id_socio = id_socio
+
+class ClaseNoEncontrada(ErrorGimnasio):
+    """No existe una clase con el ID indicado."""
+
+    def __init__(self, id_clase):
+        super().__init__("No se encontró una clase con ese ID.")
+        self.id_clase = id_clase
+
+class DatoInvalido(ErrorGimnasio):
+    """Un campo no tiene un formato o valor válido."""
+
+    def __init__(self, campo, mensaje):
+        super().__init__(mensaje)
+        self.campo = campo
+
+class DatoDuplicado(ErrorGimnasio):
+    """Un campo único (DNI, email o teléfono) ya pertenece a otro socio."""
+
+    def __init__(self, campo, id_existente):
+        super().__init__(f"Ya existe otro socio con ese {NOMBRES_CAMPOS.get(campo, campo)}.")
+        self.campo = campo
+        self.id_existente = id_existente
+
+class SocioInactivo(ErrorGimnasio):
+    """La operación requiere un socio activo."""
+
+    def __init__(self, id_socio):
+        super().__init__("No se puede inscribir un socio inactivo.")
+        self.id_socio = id_socio
+
+class ClaseInactiva(ErrorGimnasio):
+    """La operación requiere una clase activa."""
+
+    def __init__(self, id_clase):
+        super().__init__("No se puede inscribir en una clase inactiva.")
+        self.id_clase = id_clase
+
+class YaInscripto(ErrorGimnasio):
+    """El socio ya está inscripto en la clase."""
+
+    def __init__(self, id_socio, id_clase):
+        super().__init__("El socio ya está inscripto en esta clase.")
+        self.id_socio = id_socio
+        self.id_clase = id_clase
+
+class NoInscripto(ErrorGimnasio):
+    """El socio no está inscripto en la clase."""
+
+    def __init__(self, id_socio, id_clase):
+        super().__init__("El socio no está inscripto en esa clase.")
+        self.id_socio = id_socio
+        self.id_clase = id_clase
+
+class CupoCompleto(ErrorGimnasio):
+    """La clase no tiene lugares libres."""
+
+    def __init__(self, id_clase):
+        super().__init__("La clase ya tiene el cupo completo.")
+        self.id_clase = id_clase
+
+class AsistenciaDuplicada(ErrorGimnasio):
+    """La asistencia ya estaba registrada para esa fecha."""
+
+    def __init__(self, id_clase, fecha):
+        super().__init__("La asistencia ya estaba registrada para esa fecha.")
+        self.id_clase = id_clase
+        self.fecha = fecha
+
+class HorarioSuperpuesto(ErrorGimnasio):
+    """El horario de la clase se superpone con otra clase del socio."""
+
+    def __init__(self, id_socio, id_clase, id_otra_clase):
+        super().__init__(f"El horario se superpone con otra clase del socio (ID: {id_otra_clase}).")
+        self.id_socio = id_socio
+        self.id_clase = id_clase
+        self.id_otra_clase = id_otra_clase
+
+class ProfesorOcupado(ErrorGimnasio):
+    """El profesor ya tiene otra clase activa en ese horario."""
+
+    def __init__(self, profesor, id_clase, id_otra_clase):
+        super().__init__(f"El profesor {profesor} ya tiene otra clase en ese horario (ID: {id_otra_clase}).")
+        self.profesor = profesor
+        self.id_clase = id_clase
+        self.id_otra_clase = id_otra_clase
+
+# Nombres legibles de los campos para los mensajes de error
+NOMBRES_CAMPOS = {'dni': 'DNI', 'email': 'email', 'telefono': 'teléfono'}
@@ -1,22 +1,108 @@
 """
 Módulo de estadísticas para el sistema de gimnasio.
-Calcula y muestra estadísticas del sistema usando las estructuras de datos.
+Muestra estadísticas del sistema leyendo las métricas incrementales (ver metricas.py)
+y los cortes por dimensión del cubo de agregados (ver cubo.py), sin recorrer
+socios, clases, inscripciones ni asistencias.
 """
 
-def estadisticas(socios, clases, inscripciones):
+from instrumentacion import instrumentar, contar_escaneados
+from metricas import maximo_contador
+from cubo import consultar_cubo, DIAS_SEMANA
+from cascada import buscar_registro
+
+def nombre_socio(gimnasio, socio_id):
+    """
+    Devuelve el nombre completo de un socio, vigente o del histórico de bajas.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        socio_id (int): ID del socio
+    
+    Returns:
+        str: Nombre y apellido, marcado si el socio fue dado de baja
+    """
+    socio, dado_de_baja = buscar_registro(gimnasio, 'socios', socio_id)
+    if socio is None:
+        return f"Socio eliminado ({socio_id})"
+    nombre = f"{socio['nombre']} {socio['apellido']}"
+    return f"{nombre} (baja)" if dado_de_baja else nombre
+
+def nombre_clase(gimnasio, clase_id):
+    """
+    Devuelve el nombre de una clase, vigente o del histórico de bajas.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        clase_id (int): ID de la clase
+    
+    Returns:
+        str: Nombre de la clase, marcado si la clase fue dada de baja
+    """
+    clase, dada_de_baja = buscar_registro(gimnasio, 'clases', clase_id)
+    if clase is None:
+        return f"Clase eliminada ({clase_id})"
+    return f"{clase['nombre']} (baja)" if dada_de_baja else clase['nombre']
+
+def etiqueta_dimension(gimnasio, dimension, valor):
+    """
+    Devuelve el texto a mostrar para el valor de una dimensión del cubo.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        dimension (str): Dimensión ('clase', 'profesor', 'dia_semana', 'mes' o 'cohorte')
+        valor: Valor de la dimensión
+    
+    Returns:
+        str: Texto legible
+    """
+    if dimension == 'clase':
+        return nombre_clase(gimnasio, valor)
+    if dimension == 'dia_semana':
+        return DIAS_SEMANA[valor]
+    return str(valor)
+
+def mostrar_corte(gimnasio, titulo, hecho, agrupar, filtros=None, ordenar_por_cantidad=True):
+    """
+    Muestra un corte del cubo de agregados (una búsqueda por rollup, sin recorrer los datos).
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        titulo (str): Título del reporte
+        hecho (str): 'asistencia' o 'inscripciones'
+        agrupar (tuple): Dimensiones por las que agrupar
+        filtros (dict, optional): {dimension: valor} a cumplir
+        ordenar_por_cantidad (bool, optional): Ordenar de mayor a menor cantidad (si no, por clave)
+    """
+    corte = consultar_cubo(gimnasio['cubo'], hecho, agrupar, filtros)
+    print(f"\n--- {titulo} ---")
+    if not any(corte.values()):
+        print("Sin datos.")
+        return
+    
+    if ordenar_por_cantidad:
+        filas = sorted(corte.items(), key=lambda item: (-item[1], item[0]))
+    else:
+        filas = sorted(corte.items())
+    for clave, cantidad in filas:
+        etiquetas = " × ".join(etiqueta_dimension(gimnasio, dimension, valor) for dimension, valor in zip(agrupar, clave))
+        print(f"- {etiquetas or 'Total'}: {cantidad}")
+
+@instrumentar
+def estadisticas(gimnasio):
     """
     Mostrar estadísticas del sistema.
-    Calcula todas las estadísticas requeridas usando las estructuras de datos.
+    Lee los totales y contadores que mantienen las métricas incrementales.
     
     Args:
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        inscripciones (list): Lista de inscripciones
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- ESTADÍSTICAS DEL SISTEMA ---")
     
+    clases = gimnasio['clases']
+    metricas = gimnasio['metricas']
+    
     # 1. Cantidad total de socios
-    total_socios = len(socios)
+    total_socios = metricas['socios']['total']
     print(f"1. Cantidad total de socios: {total_socios}")
     
     if total_socios == 0:
@@ -24,12 +110,12 @@ def estadisticas(socios, clases, inscripciones):
         return
     
     # 2. Porcentaje de socios activos sobre el total
-    socios_activos = sum(1 for socio in socios.values() if socio['activo'])
+    socios_activos = metricas['socios']['activos']
     porcentaje_activos = (socios_activos / total_socios) * 100 if total_socios > 0 else 0
     print(f"2. Porcentaje de socios activos: {porcentaje_activos:.1f}% ({socios_activos}/{total_socios})")
     
     # 3. Cantidad total de clases
-    total_clases = len(clases)
+    total_clases = metricas['clases']['total']
     print(f"3. Cantidad total de clases: {total_clases}")
     
     if total_clases == 0:
@@ -37,111 +123,90 @@ def estadisticas(socios, clases, inscripciones):
         return
     
     # 4. Clase con más inscriptos
-    if inscripciones:
-        # Contar inscriptos por clase usando diccionario
-        inscriptos_por_clase = {}
-        for inscripcion in inscripciones:
-            clase_id = inscripcion[1]
-            inscriptos_por_clase[clase_id] = inscriptos_por_clase.get(clase_id, 0) + 1
-        
-        if inscriptos_por_clase:
-            # Encontrar la clase con más inscriptos
-            clase_mas_inscriptos = max(inscriptos_por_clase, key=inscriptos_por_clase.get)
-            max_inscriptos = inscriptos_por_clase[clase_mas_inscriptos]
-            
-            if clase_mas_inscriptos in clases:
-                clase_nombre = clases[clase_mas_inscriptos]['nombre']
-                print(f"4. Clase con más inscriptos: {clase_nombre} ({max_inscriptos} inscriptos)")
-            else:
-                print("4. Clase con más inscriptos: Clase eliminada ({max_inscriptos} inscriptos)")
+    total_insc = metricas['inscripciones']
+    clase_mas_inscriptos, max_inscriptos = maximo_contador(metricas['inscriptos'])
+    if clase_mas_inscriptos is not None:
+        if clase_mas_inscriptos in clases:
+            clase_nombre = clases[clase_mas_inscriptos]['nombre']
+            print(f"4. Clase con más inscriptos: {clase_nombre} ({max_inscriptos} inscriptos)")
         else:
-            print("4. Clase con más inscriptos: No hay inscripciones")
+            print(f"4. Clase con más inscriptos: Clase eliminada ({max_inscriptos} inscriptos)")
     else:
         print("4. Clase con más inscriptos: No hay inscripciones")
     
     # 5. Promedio de socios por clase
-    if inscripciones and total_clases > 0:
-        total_inscripciones = len(inscripciones)
-        promedio_por_clase = total_inscripciones / total_clases
+    if total_insc and total_clases > 0:
+        promedio_por_clase = total_insc / total_clases
         print(f"5. Promedio de inscriptos por clase: {promedio_por_clase:.1f}")
     else:
         print("5. Promedio de inscriptos por clase: 0.0")
     
     # Estadísticas adicionales
     print(f"\n--- ESTADÍSTICAS ADICIONALES ---")
-    print(f"Total de inscripciones: {len(inscripciones)}")
-    
-    if clases:
-        clases_activas = sum(1 for clase in clases.values() if clase['activa'])
-        print(f"Clases activas: {clases_activas}/{total_clases}")
+    print(f"Total de inscripciones: {total_insc}")
+    print(f"Clases activas: {metricas['clases']['activos']}/{total_clases}")
     
     # Distribución de inscriptos por clase
-    if inscripciones:
+    if total_insc:
         print(f"\n--- DISTRIBUCIÓN POR CLASE ---")
-        inscriptos_por_clase = {}
-        for inscripcion in inscripciones:
-            clase_id = inscripcion[1]
-            inscriptos_por_clase[clase_id] = inscriptos_por_clase.get(clase_id, 0) + 1
-        
-        for clase_id, cantidad in sorted(inscriptos_por_clase.items()):
+        contar_escaneados(len(metricas['inscriptos']['valores']))
+        for clase_id, cantidad in sorted(metricas['inscriptos']['valores'].items()):
             if clase_id in clases:
                 clase = clases[clase_id]
                 porcentaje_ocupacion = (cantidad / clase['cupo']) * 100
                 print(f"- {clase['nombre']}: {cantidad} inscriptos ({porcentaje_ocupacion:.1f}% del cupo)")
+    
+    # Cortes por profesor y por cohorte de alta (rollups del cubo)
+    mostrar_corte(gimnasio, "INSCRIPCIONES POR PROFESOR", 'inscripciones', ('profesor',))
+    mostrar_corte(gimnasio, "INSCRIPCIONES POR COHORTE DE ALTA", 'inscripciones', ('cohorte',))
+    mostrar_corte(gimnasio, "ASISTENCIA POR PROFESOR", 'asistencia', ('profesor',))
+    mostrar_corte(gimnasio, "ASISTENCIA POR COHORTE DE ALTA", 'asistencia', ('cohorte',))
 
-def calcular_estadisticas_avanzadas(socios, clases, inscripciones):
+def calcular_estadisticas_avanzadas(gimnasio):
     """
-    Calcula estadísticas avanzadas y devuelve una tupla con los resultados.
+    Calcula estadísticas avanzadas y devuelve una tupla con los resultados (O(1)).
     
     Args:
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        inscripciones (list): Lista de inscripciones
-        
+        gimnasio (dict): Estado del gimnasio
+    
     Returns:
-        tuple: Tupla con estadísticas (total_socios, socios_activos, total_clases, 
-               clase_mas_inscriptos, promedio_por_clase)
+        tuple: Tupla con estadísticas (total_socios, socios_activos, total_clases,
+               clase_mas_inscriptos, max_inscriptos, promedio_por_clase)
     """
-    total_socios = len(socios)
-    socios_activos = sum(1 for socio in socios.values() if socio['activo'])
-    total_clases = len(clases)
+    metricas = gimnasio['metricas']
+    total_socios = metricas['socios']['total']
+    socios_activos = metricas['socios']['activos']
+    total_clases = metricas['clases']['total']
     
     # Clase con más inscriptos
-    clase_mas_inscriptos = None
-    max_inscriptos = 0
-    if inscripciones:
-        inscriptos_por_clase = {}
-        for inscripcion in inscripciones:
-            clase_id = inscripcion[1]
-            inscriptos_por_clase[clase_id] = inscriptos_por_clase.get(clase_id, 0) + 1
-        
-        if inscriptos_por_clase:
-            clase_mas_inscriptos = max(inscriptos_por_clase, key=inscriptos_por_clase.get)
-            max_inscriptos = inscriptos_por_clase[clase_mas_inscriptos]
+    clase_mas_inscriptos, max_inscriptos = maximo_contador(metricas['inscriptos'])
     
     # Promedio por clase
-    promedio_por_clase = len(inscripciones) / total_clases if total_clases > 0 else 0
+    promedio_por_clase = metricas['inscripciones'] / total_clases if total_clases > 0 else 0
     
     return (total_socios, socios_activos, total_clases, clase_mas_inscriptos, max_inscriptos, promedio_por_clase)
 
-def mostrar_resumen_ejecutivo(socios, clases, inscripciones):
+@instrumentar
+def mostrar_resumen_ejecutivo(gimnasio):
     """
     Muestra un resumen ejecutivo del estado del gimnasio.
+    Se arma en tiempo constante a partir de las métricas incrementales.
     
     Args:
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        inscripciones (list): Lista de inscripciones
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- RESUMEN EJECUTIVO ---")
     
+    clases = gimnasio['clases']
+    metricas = gimnasio['metricas']
+    
     # Calcular estadísticas usando la función que devuelve tupla
-    stats = calcular_estadisticas_avanzadas(socios, clases, inscripciones)
+    stats = calcular_estadisticas_avanzadas(gimnasio)
     total_socios, socios_activos, total_clases, clase_mas_inscriptos, max_inscriptos, promedio_por_clase = stats
     
     print(f"SOCIOS: {total_socios} total, {socios_activos} activos")
     print(f"CLASES: {total_clases} registradas")
-    print(f"INSCRIPCIONES: {len(inscripciones)} totales")
+    print(f"INSCRIPCIONES: {metricas['inscripciones']} totales")
     
     if clase_mas_inscriptos and clase_mas_inscriptos in clases:
         clase_nombre = clases[clase_mas_inscriptos]['nombre']
@@ -150,9 +215,8 @@ def mostrar_resumen_ejecutivo(socios, clases, inscripciones):
     print(f"PROMEDIO: {promedio_por_clase:.1f} inscriptos por clase")
     
     # Análisis de ocupación
-    if clases:
-        clases_con_inscriptos = set(inscripcion[1] for inscripcion in inscripciones)
-        clases_sin_inscriptos = total_clases - len(clases_con_inscriptos)
+    if total_clases:
+        clases_sin_inscriptos = total_clases - len(metricas['inscriptos']['valores'])
         print(f"CLASES SIN INSCRIPTOS: {clases_sin_inscriptos}")
 
 print("probando rama")
\ No newline at end of file
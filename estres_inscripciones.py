@@ -0,0 +1,195 @@
+"""
+Prueba de estrés de inscripciones concurrentes (ver concurrencia.py).
+Muchos hilos inscriben y desinscriben socios al azar en pocas clases de cupo
+chico mientras un hilo monitor revisa los inscriptos de cada clase. Al final
+verifica que ninguna clase superó su cupo en ninguna muestra y que los
+inscriptos de cada clase son exactamente las inscripciones exitosas menos
+las desinscripciones (ninguna escritura se pisó con otra).
+
+Con --sin-candados se usan las operaciones de servicios.py directamente, para
+ver la carrera entre la verificación del cupo y la inscripción. Con --snapshot
+el gimnasio se guarda y se vuelve a abrir desde un snapshot binario, así los
+socios y las clases se decodifican desde el archivo mapeado durante la prueba
+(y al final se verifica que ningún registro quedó mezclado con otro).
+
+Uso:
+    python estres_inscripciones.py [--hilos 16] [--operaciones 200000] [--clases 20] [--cupo 5]
+                                   [--socios 2000] [--sin-candados] [--snapshot] [--semilla S]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from almacen_inscripciones import cantidad_inscriptos
+from concurrencia import GimnasioConcurrente
+from errores import ErrorGimnasio
+from persistencia import crear_gimnasio
+from servicios import crear_socio, crear_clase, inscribir, desinscribir
+from snapshot_binario import escribir_snapshot_binario, cargar_snapshot_binario
+
+def dni_de(indice):
+    """
+    Devuelve el DNI del socio creado en una posición.
+
+    Args:
+        indice (int): Posición del socio
+
+    Returns:
+        str: DNI
+    """
+    return str(10_000_000 + indice)
+
+def preparar(socios, clases, cupo, mapeado=False):
+    """
+    Crea un gimnasio con socios activos y clases sin horario.
+
+    Args:
+        socios (int): Cantidad de socios
+        clases (int): Cantidad de clases
+        cupo (int): Cupo de cada clase
+        mapeado (bool, optional): Reabrir el gimnasio desde un snapshot binario
+
+    Returns:
+        tuple: (gimnasio, IDs de socios, IDs de clases)
+    """
+    gimnasio = crear_gimnasio()
+    ids_socios = [crear_socio(gimnasio, {'nombre': 'Socio', 'apellido': f'Estres {indice}',
+                                         'dni': dni_de(indice), 'email': f's{indice}@estres.com',
+                                         'telefono': str(1_100_000_000 + indice)})
+                  for indice in range(socios)]
+    ids_clases = [crear_clase(gimnasio, {'nombre': f'Clase {indice}', 'profesor': f'Profesor {indice}',
+                                         'cupo': cupo})
+                  for indice in range(clases)]
+    if mapeado:
+        # Si el sistema no deja borrar un archivo mapeado (Windows), el directorio queda
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as directorio:
+            ruta = os.path.join(directorio, 'estres.bin')
+            with open(ruta, 'wb') as archivo:
+                escribir_snapshot_binario(archivo, gimnasio, 0)
+            gimnasio, _ = cargar_snapshot_binario(ruta)
+    # Los lugares libres se mantienen durante la prueba (y se verifican al final)
+    gimnasio['indices_clases'].construir()
+    return gimnasio, ids_socios, ids_clases
+
+def trabajar(operaciones, inscribir_uno, desinscribir_uno, ids_socios, ids_clases, semilla, balance, candado):
+    """
+    Ejecuta operaciones al azar y acumula el balance de inscripciones por clase.
+
+    Args:
+        operaciones (int): Operaciones a ejecutar
+        inscribir_uno (callable): Función (socio, clase)
+        desinscribir_uno (callable): Función (socio, clase)
+        ids_socios (list): IDs de socios
+        ids_clases (list): IDs de clases
+        semilla (int): Semilla del hilo
+        balance (dict): Inscripciones menos desinscripciones exitosas por clase
+        candado (threading.Lock): Candado del balance
+    """
+    aleatorio = random.Random(semilla)
+    propio = {}
+    for _ in range(operaciones):
+        socio, clase = aleatorio.choice(ids_socios), aleatorio.choice(ids_clases)
+        try:
+            if aleatorio.random() < 0.7:
+                inscribir_uno(socio, clase)
+                propio[clase] = propio.get(clase, 0) + 1
+            else:
+                desinscribir_uno(socio, clase)
+                propio[clase] = propio.get(clase, 0) - 1
+        except ErrorGimnasio:
+            pass
+    with candado:
+        for clase, cantidad in propio.items():
+            balance[clase] = balance.get(clase, 0) + cantidad
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de estrés de inscripciones concurrentes.")
+    parser.add_argument('--hilos', type=int, default=16, help="Hilos del pool")
+    parser.add_argument('--operaciones', type=int, default=200_000, help="Operaciones en total")
+    parser.add_argument('--socios', type=int, default=2_000, help="Cantidad de socios")
+    parser.add_argument('--clases', type=int, default=20, help="Cantidad de clases")
+    parser.add_argument('--cupo', type=int, default=5, help="Cupo de cada clase")
+    parser.add_argument('--sin-candados', action='store_true', help="Usar servicios.py sin candados")
+    parser.add_argument('--snapshot', action='store_true', help="Reabrir el gimnasio desde un snapshot binario")
+    parser.add_argument('--semilla', type=int, default=42, help="Semilla del generador")
+    argumentos = parser.parse_args()
+
+    gimnasio, ids_socios, ids_clases = preparar(argumentos.socios, argumentos.clases, argumentos.cupo,
+                                                argumentos.snapshot)
+    if argumentos.sin_candados:
+        def inscribir_uno(socio, clase):
+            inscribir(gimnasio, socio, clase)
+
+        def desinscribir_uno(socio, clase):
+            desinscribir(gimnasio, socio, clase)
+
+        def muestrear():
+            return {clase: cantidad_inscriptos(gimnasio['inscripciones'], clase) for clase in ids_clases}
+    else:
+        concurrente = GimnasioConcurrente(gimnasio)
+        inscribir_uno, desinscribir_uno = concurrente.inscribir, concurrente.desinscribir
+
+        def muestrear():
+            with concurrente.exclusivo():
+                return {clase: cantidad_inscriptos(gimnasio['inscripciones'], clase) for clase in ids_clases}
+
+    # Cambiar de hilo muy seguido para provocar intercalados entre verificar e inscribir
+    sys.setswitchinterval(1e-6)
+    balance = {}
+    candado = threading.Lock()
+    terminado = threading.Event()
+    excedidas = {}
+    muestras = 0
+
+    def monitorear():
+        nonlocal muestras
+        while not terminado.is_set():
+            for clase, cantidad in muestrear().items():
+                if cantidad > argumentos.cupo:
+                    excedidas[clase] = max(excedidas.get(clase, 0), cantidad)
+            muestras += 1
+            time.sleep(0.001)
+
+    monitor = threading.Thread(target=monitorear)
+    monitor.start()
+    inicio = time.perf_counter()
+    por_hilo = argumentos.operaciones // argumentos.hilos
+    with ThreadPoolExecutor(argumentos.hilos) as pool:
+        for numero in range(argumentos.hilos):
+            pool.submit(trabajar, por_hilo, inscribir_uno, desinscribir_uno, ids_socios, ids_clases,
+                        argumentos.semilla + numero, balance, candado)
+    segundos = time.perf_counter() - inicio
+    terminado.set()
+    monitor.join()
+
+    finales = muestrear()
+    for clase, cantidad in finales.items():
+        if cantidad > argumentos.cupo:
+            excedidas[clase] = max(excedidas.get(clase, 0), cantidad)
+    perdidas = {clase: (balance.get(clase, 0), cantidad) for clase, cantidad in finales.items()
+                if balance.get(clase, 0) != cantidad}
+    libres = gimnasio['indices_clases']['libres']
+    desfasadas = [clase for clase in ids_clases if libres.get(clase) != argumentos.cupo - finales[clase]]
+    mezclados = [socio for indice, socio in enumerate(ids_socios)
+                 if gimnasio['socios'][socio]['dni'] != dni_de(indice)
+                 or gimnasio['socios'][socio]['apellido'] != f'Estres {indice}']
+
+    print(f"{por_hilo * argumentos.hilos} operaciones en {segundos:.2f} s con {argumentos.hilos} hilos "
+          f"({'sin candados' if argumentos.sin_candados else 'con candados'}"
+          f"{', desde snapshot' if argumentos.snapshot else ''}), {muestras} muestras")
+    print(f"inscriptos finales: {sum(finales.values())} de {argumentos.cupo * len(ids_clases)} lugares")
+    print(f"clases que superaron el cupo: {excedidas or 'ninguna'}")
+    print(f"balances que no coinciden (esperado, real): {perdidas or 'ninguno'}")
+    print(f"lugares libres desfasados: {desfasadas or 'ninguno'}")
+    print(f"socios con datos mezclados: {len(mezclados) or 'ninguno'}")
+    if excedidas or perdidas or desfasadas or mezclados:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Módulo de importación masiva para el sistema de gimnasio.
+Carga socios, clases, inscripciones y asistencias históricas desde archivos CSV
+(con encabezado) o JSONL (un objeto por línea), leyéndolos por lotes para usar
+memoria acotada. Cada fila pasa por las mismas reglas que el alta interactiva
+(formato de DNI, email y teléfono, duplicados, cupo, ...); las rechazadas se
+escriben en un reporte con su número de fila y el motivo. Cada lote se confirma
+en el diario de forma atómica.
+
+Uso:
+    python importacion.py socios socios.csv [--lote N] [--procesos N] [--rechazos archivo]
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from errores import ErrorGimnasio, DatoInvalido, AsistenciaDuplicada
+from persistencia import (cargar_gimnasio, cerrar_diario, iniciar_lote, confirmar_lote, tomar_snapshot,
+                          DIRECTORIO_DATOS)
+from servicios import (preparar_socio, preparar_clase, crear_socio, crear_clase, inscribir, marcar_asistencia,
+                       obtener_socio_por_dni, convertir_fecha, reservar_bloque_ids)
+
+ENTIDADES = ('socios', 'clases', 'inscripciones', 'asistencia')
+TAMANO_LOTE = 10000
+# Valores de texto que se interpretan como verdadero en las columnas activo/activa
+VALORES_VERDADEROS = {'1', 'true', 'verdadero', 's', 'si', 'sí'}
+
+def _convertir_estado(datos, campo):
+    """
+    Convierte la columna de estado de un CSV (texto) a booleano.
+    Una celda vacía se omite para que se use el valor por defecto.
+
+    Args:
+        datos (dict): Fila leída
+        campo (str): 'activo' o 'activa'
+    """
+    valor = datos.get(campo)
+    if isinstance(valor, str):
+        if valor.strip():
+            datos[campo] = valor.strip().lower() in VALORES_VERDADEROS
+        else:
+            del datos[campo]
+
+def _entero(datos, campo):
+    """
+    Lee un campo entero obligatorio de una fila.
+
+    Args:
+        datos (dict): Fila leída
+        campo (str): Campo a leer
+
+    Returns:
+        int: Valor del campo
+    """
+    try:
+        return int(datos[campo])
+    except KeyError:
+        raise DatoInvalido(campo, f"Falta el campo {campo}.")
+    except (TypeError, ValueError):
+        raise DatoInvalido(campo, f"Valor inválido para {campo}.")
+
+def _preparar_referencia(datos):
+    """
+    Lee la referencia a socio (socio_id o dni) y clase (clase_id) de una inscripción o asistencia.
+
+    Args:
+        datos (dict): Fila leída
+
+    Returns:
+        dict: {'socio_id' o 'dni', 'clase_id'}
+    """
+    if datos.get('socio_id') not in (None, ''):
+        referencia = {'socio_id': _entero(datos, 'socio_id')}
+    elif datos.get('dni'):
+        referencia = {'dni': str(datos['dni']).strip()}
+    else:
+        raise DatoInvalido('socio_id', "Falta el socio (socio_id o dni).")
+    referencia['clase_id'] = _entero(datos, 'clase_id')
+    return referencia
+
+def _preparar_asistencia(datos):
+    """
+    Lee una fila de asistencia: socio, clase y fecha.
+
+    Args:
+        datos (dict): Fila leída
+
+    Returns:
+        dict: {'socio_id' o 'dni', 'clase_id', 'fecha'} con la fecha como ordinal de día
+    """
+    referencia = _preparar_referencia(datos)
+    if not str(datos.get('fecha', '')).strip():
+        raise DatoInvalido('fecha', "Falta la fecha.")
+    # Se convierte acá para que el análisis de fechas corra en los procesos del pool
+    referencia['fecha'] = convertir_fecha(str(datos['fecha']))
+    return referencia
+
+def _preparar_socio(datos):
+    """
+    Valida una fila de socio (ver servicios.preparar_socio).
+
+    Args:
+        datos (dict): Fila leída
+
+    Returns:
+        dict: Socio completo
+    """
+    _convertir_estado(datos, 'activo')
+    return preparar_socio(datos)
+
+def _preparar_clase(datos):
+    """
+    Valida una fila de clase (ver servicios.preparar_clase).
+
+    Args:
+        datos (dict): Fila leída
+
+    Returns:
+        dict: Clase completa
+    """
+    _convertir_estado(datos, 'activa')
+    return preparar_clase(datos)
+
+# Validación sin estado de cada entidad (se puede correr en otro proceso)
+PREPARADORES = {
+    'socios': _preparar_socio,
+    'clases': _preparar_clase,
+    'inscripciones': _preparar_referencia,
+    'asistencia': _preparar_asistencia
+}
+
+def _preparar_lote(entidad, encabezado, filas):
+    """
+    Interpreta y valida el formato de un lote de filas, sin consultar el estado.
+
+    Args:
+        entidad (str): Entidad importada
+        encabezado (list): Columnas del CSV, o None si el archivo es JSONL
+        filas (list): Tuplas (numero_fila, fila) con la fila cruda (lista o línea JSON)
+
+    Returns:
+        list: Tuplas (numero_fila, datos, motivo); datos es None si la fila se rechaza
+    """
+    preparar = PREPARADORES[entidad]
+    resultado = []
+    for numero, fila in filas:
+        try:
+            if encabezado is not None:
+                if len(fila) != len(encabezado):
+                    raise DatoInvalido(None, f"Se esperaban {len(encabezado)} columnas y hay {len(fila)}.")
+                datos = dict(zip(encabezado, fila))
+            else:
+                datos = json.loads(fila)
+                if not isinstance(datos, dict):
+                    raise DatoInvalido(None, "La línea no es un objeto JSON.")
+            resultado.append((numero, preparar(datos), None))
+        except json.JSONDecodeError:
+            resultado.append((numero, None, "JSON mal formado."))
+        except ErrorGimnasio as error:
+            resultado.append((numero, None, str(error)))
+    return resultado
+
+def _leer_lotes(archivo, formato, tamano_lote):
+    """
+    Lee un archivo por lotes de filas crudas.
+
+    Args:
+        archivo (file): Archivo abierto en modo texto
+        formato (str): 'csv' o 'jsonl'
+        tamano_lote (int): Filas por lote
+
+    Yields:
+        list: Tuplas (numero_fila, fila); el número de fila cuenta desde 1 sin el encabezado
+    """
+    filas = csv.reader(archivo) if formato == 'csv' else (linea for linea in archivo if linea.strip())
+    lote = []
+    for numero, fila in enumerate(filas, start=1):
+        lote.append((numero, fila))
+        if len(lote) >= tamano_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def _resolver_socio(gimnasio, datos):
+    """
+    Devuelve el ID del socio de una inscripción o asistencia (por ID o por DNI).
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        datos (dict): Fila preparada
+
+    Returns:
+        int: ID del socio
+    """
+    if 'socio_id' in datos:
+        return datos['socio_id']
+    return obtener_socio_por_dni(gimnasio, datos['dni'])
+
+def _aplicar_fila(gimnasio, entidad, datos, diario, id_nuevo=None):
+    """
+    Aplica una fila ya preparada con las operaciones de servicios.py, que
+    verifican duplicados, existencia, estado y cupo contra el estado actual.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): Entidad importada
+        datos (dict): Fila preparada
+        diario (dict): Diario donde registrar el cambio, o None
+        id_nuevo (int, optional): ID reservado para el alta de socios o clases
+    """
+    if entidad == 'socios':
+        crear_socio(gimnasio, datos, diario, preparado=True, id_socio=id_nuevo)
+    elif entidad == 'clases':
+        crear_clase(gimnasio, datos, diario, preparado=True, id_clase=id_nuevo)
+    elif entidad == 'inscripciones':
+        inscribir(gimnasio, _resolver_socio(gimnasio, datos), datos['clase_id'], diario)
+    elif not marcar_asistencia(gimnasio, _resolver_socio(gimnasio, datos), datos['clase_id'],
+                               datos['fecha'], diario):
+        raise AsistenciaDuplicada(datos['clase_id'], datos['fecha'])
+
+def _lotes_preparados(entidad, encabezado, lotes, procesos):
+    """
+    Prepara los lotes en orden, en este proceso o en un pool de procesos.
+    Con pool se mantienen a lo sumo dos lotes en vuelo por proceso, así la
+    memoria sigue acotada aunque el archivo sea enorme.
+
+    Args:
+        entidad (str): Entidad importada
+        encabezado (list): Columnas del CSV, o None
+        lotes (iterable): Lotes de filas crudas
+        procesos (int): Procesos del pool (0 para no usar pool)
+
+    Yields:
+        list: Lotes preparados (ver _preparar_lote)
+    """
+    if not procesos:
+        for lote in lotes:
+            yield _preparar_lote(entidad, encabezado, lote)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        en_vuelo = deque()
+        for lote in lotes:
+            en_vuelo.append(pool.submit(_preparar_lote, entidad, encabezado, lote))
+            if len(en_vuelo) >= 2 * procesos:
+                yield en_vuelo.popleft().result()
+        while en_vuelo:
+            yield en_vuelo.popleft().result()
+
+def importar(gimnasio, entidad, ruta, diario=None, tamano_lote=TAMANO_LOTE, ruta_rechazos=None, procesos=0):
+    """
+    Importa un archivo CSV o JSONL de socios, clases, inscripciones o asistencias.
+
+    Columnas esperadas:
+        socios: nombre, apellido, dni, email, telefono y opcionalmente
+                fecha_nacimiento, direccion, fecha_alta, activo
+        clases: nombre, profesor, cupo y opcionalmente horario, duracion, activa
+        inscripciones: socio_id (o dni) y clase_id
+        asistencia: socio_id (o dni), clase_id y fecha
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): 'socios', 'clases', 'inscripciones' o 'asistencia'
+        ruta (str): Archivo a importar (.csv o .jsonl)
+        diario (dict, optional): Diario donde registrar los cambios
+        tamano_lote (int, optional): Filas por lote (cada lote se confirma de forma atómica)
+        ruta_rechazos (str, optional): Reporte de filas rechazadas (por defecto, ruta + '.rechazos.csv')
+        procesos (int, optional): Procesos para interpretar y validar en paralelo (0 = sin pool)
+
+    Returns:
+        dict: Resumen {'filas', 'aceptadas', 'rechazadas', 'lotes', 'rechazos'}
+    """
+    if entidad not in ENTIDADES:
+        raise ValueError(f"Entidad desconocida: {entidad}")
+    if tamano_lote <= 0:
+        raise ValueError("El tamaño de lote debe ser mayor a 0.")
+    formato = 'jsonl' if ruta.endswith(('.jsonl', '.json')) else 'csv'
+    if ruta_rechazos is None:
+        ruta_rechazos = ruta + '.rechazos.csv'
+
+    resumen = {'filas': 0, 'aceptadas': 0, 'rechazadas': 0, 'lotes': 0, 'rechazos': ruta_rechazos}
+    with open(ruta, encoding='utf-8-sig', newline='') as archivo, \
+            open(ruta_rechazos, 'w', encoding='utf-8', newline='') as archivo_rechazos:
+        encabezado = None
+        if formato == 'csv':
+            encabezado = [columna.strip() for columna in next(csv.reader([archivo.readline()]), [])]
+        rechazos = csv.writer(archivo_rechazos)
+        rechazos.writerow(['fila', 'motivo'])
+
+        lotes = _leer_lotes(archivo, formato, tamano_lote)
+        for lote in _lotes_preparados(entidad, encabezado, lotes, procesos):
+            iniciar_lote(diario)
+            # Un solo bloque de IDs por lote para las filas válidas; una fila rechazada
+            # al aplicarla no consume ID y los sobrantes quedan como huecos
+            ids = iter(())
+            if entidad in ('socios', 'clases'):
+                validas = sum(motivo is None for _, _, motivo in lote)
+                ids = iter(reservar_bloque_ids(gimnasio, entidad, validas, diario))
+            id_nuevo = next(ids, None)
+            for numero, datos, motivo in lote:
+                if motivo is None:
+                    try:
+                        _aplicar_fila(gimnasio, entidad, datos, diario, id_nuevo)
+                        id_nuevo = next(ids, None)
+                        resumen['aceptadas'] += 1
+                        continue
+                    except ErrorGimnasio as error:
+                        motivo = str(error)
+                rechazos.writerow([numero, motivo])
+                resumen['rechazadas'] += 1
+            confirmar_lote(diario)
+            resumen['filas'] += len(lote)
+            resumen['lotes'] += 1
+
+    # Compactar una sola vez al final en lugar de después de cada lote
+    if diario is not None and diario['eventos_en_diario'] >= diario['eventos_por_snapshot']:
+        tomar_snapshot(diario)
+    return resumen
+
+def main():
+    """
+    Punto de entrada de línea de comandos para importar un archivo sobre los datos persistidos.
+    """
+    parser = argparse.ArgumentParser(description="Importación masiva de datos del gimnasio.")
+    parser.add_argument('entidad', choices=ENTIDADES)
+    parser.add_argument('archivo', help="Archivo CSV (con encabezado) o JSONL")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por lote")
+    parser.add_argument('--procesos', type=int, default=0,
+                        help="Procesos para validar en paralelo (0 = sin pool, -1 = uno por CPU)")
+    parser.add_argument('--rechazos', help="Archivo del reporte de filas rechazadas")
+    parser.add_argument('--directorio', default=DIRECTORIO_DATOS, help="Directorio de datos")
+    argumentos = parser.parse_args()
+
+    procesos = os.cpu_count() if argumentos.procesos < 0 else argumentos.procesos
+    gimnasio, diario = cargar_gimnasio(argumentos.directorio)
+    try:
+        resumen = importar(gimnasio, argumentos.entidad, argumentos.archivo, diario, argumentos.lote,
+                           argumentos.rechazos, procesos)
+    finally:
+        cerrar_diario(diario)
+
+    print(f"Filas leídas: {resumen['filas']}")
+    print(f"Aceptadas: {resumen['aceptadas']}")
+    print(f"Rechazadas: {resumen['rechazadas']} (ver {resumen['rechazos']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Módulo de índices secundarios de clases para el sistema de gimnasio.
+Mantiene, para las consultas sobre clases, las clases de cada profesor, los
+inicios de cada día de la semana ordenados por hora (ver
+validaciones.interpretar_horario) y los lugares libres de cada clase agrupados
+por cantidad en niveles ordenados, actualizados en cada inscripción y
+desinscripción. Una consulta ("clases activas del lunes después de las 18:00
+con lugar, de tal profesor") parte del índice más selectivo y verifica el resto
+sobre esos candidatos, sin recorrer todas las clases ni recontar inscriptos.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+
+from almacen_inscripciones import cantidad_inscriptos
+from busqueda import normalizar_texto
+from validaciones import interpretar_horario
+
+# Minutos de un día: los rangos horarios van de 0 a MINUTOS_DIA - 1
+MINUTOS_DIA = 24 * 60
+
+def clave_profesor(profesor):
+    """
+    Devuelve la clave de un profesor en el índice (sin acentos ni mayúsculas).
+
+    Args:
+        profesor (str): Nombre del profesor
+
+    Returns:
+        str: Clave normalizada
+    """
+    return ' '.join(normalizar_texto(profesor or '').split())
+
+def crear_indices_clases(clases, inscripciones):
+    """
+    Crea los índices secundarios de las clases.
+
+    Args:
+        clases (dict): Clases {id: datos}
+        inscripciones (dict): Almacén de inscripciones
+
+    Returns:
+        dict: {'profesor': {clave: {ids}}, 'horario': {dia: [(minuto, id)]},
+               'libres': {id: lugares}, 'por_libres': {lugares: {ids}}, 'niveles': [lugares ordenados]}
+    """
+    indices = {'profesor': {}, 'horario': {}, 'libres': {}, 'por_libres': {}, 'niveles': []}
+    for id_clase, datos in clases.items():
+        indexar_clase(indices, id_clase, datos, cantidad_inscriptos(inscripciones, id_clase))
+    return indices
+
+def _mover_libres(indices, id_clase, nuevo):
+    """
+    Cambia los lugares libres de una clase (o la quita si nuevo es None).
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        nuevo (int): Lugares libres, o None para quitarla
+    """
+    por_libres = indices['por_libres']
+    niveles = indices['niveles']
+    anterior = indices['libres'].pop(id_clase, None)
+    if anterior is not None:
+        ids = por_libres[anterior]
+        ids.discard(id_clase)
+        if not ids:
+            del por_libres[anterior]
+            del niveles[bisect_left(niveles, anterior)]
+    if nuevo is not None:
+        indices['libres'][id_clase] = nuevo
+        if nuevo not in por_libres:
+            por_libres[nuevo] = set()
+            insort(niveles, nuevo)
+        por_libres[nuevo].add(id_clase)
+
+def _quitar_profesor(indices, id_clase, profesor):
+    """
+    Quita una clase del índice por profesor.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        profesor (str): Profesor de la clase
+    """
+    clave = clave_profesor(profesor)
+    ids = indices['profesor'].get(clave)
+    if ids is not None:
+        ids.discard(id_clase)
+        if not ids:
+            del indices['profesor'][clave]
+
+def _cambiar_horario(indices, id_clase, horario, agregar):
+    """
+    Agrega o quita los inicios de un horario del índice por día.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        horario (str): Horario de la clase
+        agregar (bool): True para agregar, False para quitar
+    """
+    por_dia = indices['horario']
+    for dia, minuto in interpretar_horario(horario):
+        inicios = por_dia.setdefault(dia, [])
+        if agregar:
+            insort(inicios, (minuto, id_clase))
+            continue
+        posicion = bisect_left(inicios, (minuto, id_clase))
+        if posicion < len(inicios) and inicios[posicion] == (minuto, id_clase):
+            del inicios[posicion]
+
+def indexar_clase(indices, id_clase, datos, inscriptos=0):
+    """
+    Agrega una clase a los índices.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+        inscriptos (int, optional): Inscriptos actuales
+    """
+    indices['profesor'].setdefault(clave_profesor(datos['profesor']), set()).add(id_clase)
+    _cambiar_horario(indices, id_clase, datos['horario'], True)
+    _mover_libres(indices, id_clase, datos['cupo'] - inscriptos)
+
+def desindexar_clase(indices, id_clase, datos):
+    """
+    Quita una clase de los índices (antes de eliminarla).
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    """
+    _quitar_profesor(indices, id_clase, datos['profesor'])
+    _cambiar_horario(indices, id_clase, datos['horario'], False)
+    _mover_libres(indices, id_clase, None)
+
+def reindexar_clase(indices, id_clase, campo, anterior, nuevo):
+    """
+    Actualiza los índices cuando cambia un campo de una clase.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        campo (str): Campo modificado
+        anterior: Valor anterior
+        nuevo: Valor nuevo
+    """
+    if campo == 'profesor':
+        _quitar_profesor(indices, id_clase, anterior)
+        indices['profesor'].setdefault(clave_profesor(nuevo), set()).add(id_clase)
+    elif campo == 'horario':
+        _cambiar_horario(indices, id_clase, anterior, False)
+        _cambiar_horario(indices, id_clase, nuevo, True)
+    elif campo == 'cupo' and id_clase in indices['libres']:
+        _mover_libres(indices, id_clase, indices['libres'][id_clase] + nuevo - anterior)
+
+def contar_lugar(indices, id_clase, cantidad):
+    """
+    Descuenta lugares libres por inscripciones nuevas (cantidad=1) o los devuelve
+    por desinscripciones (cantidad=-1). Las clases que ya no están se ignoran.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+        cantidad (int): Inscripciones agregadas (negativo si se eliminaron)
+    """
+    if id_clase in indices['libres']:
+        _mover_libres(indices, id_clase, indices['libres'][id_clase] - cantidad)
+
+def lugares_libres(indices, id_clase):
+    """
+    Devuelve los lugares libres de una clase.
+
+    Args:
+        indices (dict): Índices de clases
+        id_clase (int): ID de la clase
+
+    Returns:
+        int: Lugares libres (negativo si el cupo quedó por debajo de los inscriptos)
+    """
+    return indices['libres'][id_clase]
+
+def _en_horario(datos, dia, desde, hasta):
+    """
+    Indica si una clase empieza en un día y rango horario.
+
+    Args:
+        datos (dict): Datos de la clase
+        dia (int): Día de la semana, o None para cualquiera
+        desde (int): Primer minuto del rango
+        hasta (int): Último minuto del rango
+
+    Returns:
+        bool: True si algún inicio de la clase cae en el rango
+    """
+    return any((dia is None or inicio_dia == dia) and desde <= minuto <= hasta
+               for inicio_dia, minuto in interpretar_horario(datos['horario']))
+
+def candidatos_clases(indices, clases, profesor=None, dia=None, desde=None, hasta=None, cupo_minimo=None):
+    """
+    Devuelve los IDs de las clases que cumplen una consulta. Se parte del índice
+    con menos candidatos (profesor, día y rango horario o lugares libres) y se
+    verifican las demás condiciones sobre cada candidato.
+
+    Args:
+        indices (dict): Índices de clases
+        clases (dict): Clases {id: datos}
+        profesor (str, optional): Profesor (sin distinguir acentos ni mayúsculas)
+        dia (int, optional): Día de la semana (0 = lunes)
+        desde (int, optional): Inicio mínimo, en minutos del día
+        hasta (int, optional): Inicio máximo, en minutos del día
+        cupo_minimo (int, optional): Lugares libres mínimos
+
+    Returns:
+        list: IDs ordenados, o None si la consulta no usa ningún índice
+    """
+    planes = []
+    if profesor is not None:
+        clave = clave_profesor(profesor)
+        ids = indices['profesor'].get(clave, ())
+        planes.append((len(ids), lambda: ids))
+    por_horario = dia is not None or desde is not None or hasta is not None
+    desde = 0 if desde is None else desde
+    hasta = MINUTOS_DIA - 1 if hasta is None else hasta
+    if por_horario:
+        tramos = []
+        for numero in (range(7) if dia is None else (dia,)):
+            inicios = indices['horario'].get(numero, [])
+            tramos.append((inicios, bisect_left(inicios, (desde, -1)), bisect_right(inicios, (hasta, float('inf')))))
+        cantidad = sum(fin - inicio for _, inicio, fin in tramos)
+        planes.append((cantidad, lambda: (id_clase for inicios, inicio, fin in tramos
+                                          for _, id_clase in inicios[inicio:fin])))
+    if cupo_minimo is not None:
+        niveles = indices['niveles'][bisect_left(indices['niveles'], cupo_minimo):]
+        cantidad = sum(len(indices['por_libres'][nivel]) for nivel in niveles)
+        planes.append((cantidad, lambda: chain.from_iterable(indices['por_libres'][nivel] for nivel in niveles)))
+    if not planes:
+        return None
+
+    _, recorrer = min(planes, key=lambda plan: plan[0])
+    resultado = set()
+    for id_clase in recorrer():
+        datos = clases[id_clase]
+        if profesor is not None and clave_profesor(datos['profesor']) != clave:
+            continue
+        if por_horario and not _en_horario(datos, dia, desde, hasta):
+            continue
+        if cupo_minimo is not None and indices['libres'][id_clase] < cupo_minimo:
+            continue
+        resultado.add(id_clase)
+    return sorted(resultado)
@@ -0,0 +1,161 @@
+"""
+Módulo de índices únicos de socios para el sistema de gimnasio.
+Mantiene, por cada campo con restricción de unicidad (DNI, email y teléfono),
+un diccionario {valor_normalizado: id_socio} actualizado en cada alta, baja y
+modificación, de modo que detectar un duplicado o buscar un socio por DNI es
+O(1) en vez de recorrer todos los socios.
+"""
+
+import re
+
+from instrumentacion import instrumentar, contar_escaneados
+
+def normalizar_dni(dni):
+    """
+    Normaliza un DNI para compararlo: quita espacios y puntos separadores.
+
+    Args:
+        dni (str): DNI a normalizar
+
+    Returns:
+        str: DNI normalizado
+    """
+    return dni.strip().replace('.', '')
+
+def normalizar_email(email):
+    """
+    Normaliza un email para compararlo: sin espacios y en minúsculas.
+
+    Args:
+        email (str): Email a normalizar
+
+    Returns:
+        str: Email normalizado
+    """
+    return email.strip().lower()
+
+def normalizar_telefono(telefono):
+    """
+    Normaliza un teléfono para compararlo: solo dígitos y sin el código de país 54.
+
+    Args:
+        telefono (str): Teléfono a normalizar
+
+    Returns:
+        str: Teléfono normalizado
+    """
+    digitos = re.sub(r'\D', '', telefono)
+    if digitos.startswith('54') and len(digitos) > 10:
+        digitos = digitos[2:]
+    return digitos
+
+# Campos de socio con restricción de unicidad y su función de normalización
+CAMPOS_UNICOS = {
+    'dni': normalizar_dni,
+    'email': normalizar_email,
+    'telefono': normalizar_telefono
+}
+
+def crear_indices_socios(socios):
+    """
+    Crea los índices únicos de socios sobre DNI, email y teléfono.
+    Cada índice es un diccionario {valor_normalizado: id_socio}.
+
+    Args:
+        socios (dict): Diccionario de socios
+
+    Returns:
+        dict: Índices {campo: {valor_normalizado: id_socio}}
+    """
+    indices = {campo: {} for campo in CAMPOS_UNICOS}
+    for id_socio, datos in socios.items():
+        indexar_socio(indices, id_socio, datos)
+    return indices
+
+def indexar_socio(indices, id_socio, datos):
+    """
+    Agrega un socio a los índices únicos.
+
+    Args:
+        indices (dict): Índices únicos de socios
+        id_socio (int): ID del socio
+        datos (dict): Datos del socio
+    """
+    for campo, normalizar in CAMPOS_UNICOS.items():
+        indices[campo][normalizar(datos[campo])] = id_socio
+
+def desindexar_socio(indices, id_socio, datos):
+    """
+    Quita un socio de los índices únicos.
+
+    Args:
+        indices (dict): Índices únicos de socios
+        id_socio (int): ID del socio
+        datos (dict): Datos del socio
+    """
+    for campo, normalizar in CAMPOS_UNICOS.items():
+        clave = normalizar(datos[campo])
+        if indices[campo].get(clave) == id_socio:
+            del indices[campo][clave]
+
+def reindexar_campo(indices, id_socio, campo, valor_anterior, valor_nuevo):
+    """
+    Actualiza un índice único cuando cambia el valor de un campo del socio.
+
+    Args:
+        indices (dict): Índices únicos de socios
+        id_socio (int): ID del socio
+        campo (str): Campo modificado ('dni', 'email' o 'telefono')
+        valor_anterior (str): Valor previo del campo
+        valor_nuevo (str): Valor nuevo del campo
+    """
+    normalizar = CAMPOS_UNICOS[campo]
+    clave_anterior = normalizar(valor_anterior)
+    if indices[campo].get(clave_anterior) == id_socio:
+        del indices[campo][clave_anterior]
+    indices[campo][normalizar(valor_nuevo)] = id_socio
+
+def verificar_duplicado(campo, valor, indices, id_excluir=None):
+    """
+    Verifica en O(1) si un valor de un campo único ya pertenece a otro socio.
+
+    Args:
+        campo (str): Campo a verificar ('dni', 'email' o 'telefono')
+        valor (str): Valor a verificar
+        indices (dict): Índices únicos de socios
+        id_excluir (int, optional): ID a excluir de la verificación (para modificaciones)
+
+    Returns:
+        bool: True si el valor está duplicado, False en caso contrario
+    """
+    contar_escaneados(1)
+    id_existente = indices[campo].get(CAMPOS_UNICOS[campo](valor))
+    return id_existente is not None and id_existente != id_excluir
+
+@instrumentar
+def verificar_dni_duplicado(dni, indices, id_excluir=None):
+    """
+    Verifica si un DNI ya existe en el sistema.
+
+    Args:
+        dni (str): DNI a verificar
+        indices (dict): Índices únicos de socios
+        id_excluir (int, optional): ID a excluir de la verificación (para modificaciones)
+
+    Returns:
+        bool: True si el DNI está duplicado, False en caso contrario
+    """
+    return verificar_duplicado('dni', dni, indices, id_excluir)
+
+def buscar_socio_por_dni(dni, indices):
+    """
+    Busca en O(1) el ID del socio con un DNI dado.
+
+    Args:
+        dni (str): DNI a buscar
+        indices (dict): Índices únicos de socios
+
+    Returns:
+        int: ID del socio, o None si no existe
+    """
+    return indices['dni'].get(normalizar_dni(dni))
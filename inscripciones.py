@@ -1,261 +1,231 @@
 """
 Módulo de gestión de inscripciones para el sistema de gimnasio.
-Maneja la relación entre socios y clases usando conjuntos para evitar duplicados.
+Implementa los menús de inscripción sobre las operaciones de servicios.py.
 """
 
-def inscribirSocio(inscripciones, socios, clases):
+from almacen_inscripciones import cantidad_inscriptos, total_inscripciones
+from clases import elegir_clase
+from errores import ErrorGimnasio
+from instrumentacion import instrumentar_menu
+from paginacion import SalidaBuffer, COMANDO_NOMBRE, COMANDO_DNI
+from servicios import inscribir, desinscribir, obtener_socio, obtener_clase, clases_inscriptas, socios_inscriptos
+from socios import elegir_socio
+
+def fila_socio_activo(id_socio, datos):
     """
-    Inscribir un socio en una clase.
-    Usa conjuntos para evitar inscripciones duplicadas.
+    Devuelve la línea de listado de un socio activo.
     
     Args:
-        inscripciones (list): Lista de inscripciones
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        
+        id_socio (int): ID del socio
+        datos (dict): Datos del socio
+    
+    Returns:
+        str: Línea con ID, nombre y DNI
+    """
+    return f"ID: {id_socio} | {datos['nombre']} {datos['apellido']} | DNI: {datos['dni']}"
+
+def fila_socio_corta(id_socio, datos):
+    """
+    Devuelve la línea de listado de un socio con su nombre.
+    
+    Args:
+        id_socio (int): ID del socio
+        datos (dict): Datos del socio
+    
     Returns:
-        list: Lista de inscripciones actualizada
+        str: Línea con ID y nombre
+    """
+    return f"ID: {id_socio} | {datos['nombre']} {datos['apellido']}"
+
+def fila_clase_corta(id_clase, datos):
+    """
+    Devuelve la línea de listado de una clase con su profesor.
+    
+    Args:
+        id_clase (int): ID de la clase
+        datos (dict): Datos de la clase
+    
+    Returns:
+        str: Línea con ID, nombre y profesor
+    """
+    return f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']}"
+
+@instrumentar_menu
+def inscribirSocio(gimnasio, diario=None):
+    """
+    Inscribir un socio en una clase.
+    Usa el índice por clase para verificar duplicados y cupo en O(1).
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- INSCRIBIR SOCIO EN CLASE ---")
     
-    if not socios:
+    if not gimnasio['socios']:
         print("No hay socios registrados.")
-        return inscripciones
+        return
     
-    if not clases:
+    if not gimnasio['clases']:
         print("No hay clases registradas.")
-        return inscripciones
-    
-    # Mostrar socios activos
-    print("\n--- SOCIOS ACTIVOS ---")
-    socios_activos = {id_socio: datos for id_socio, datos in socios.items() if datos['activo']}
-    if not socios_activos:
-        print("No hay socios activos.")
-        return inscripciones
-    
-    for id_socio, datos in socios_activos.items():
-        print(f"ID: {id_socio} | {datos['nombre']} {datos['apellido']} | DNI: {datos['dni']}")
+        return
     
     try:
-        id_socio = int(input("\nIngrese el ID del socio a inscribir: "))
-        
-        if id_socio not in socios:
-            print("No se encontró un socio con ese ID.")
-            return inscripciones
-        
-        if not socios[id_socio]['activo']:
+        # Socios activos, de a una página
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio a inscribir: ", estado='activos',
+                                formato=fila_socio_activo, titulo="SOCIOS ACTIVOS",
+                                comandos=COMANDO_NOMBRE + COMANDO_DNI)
+        if id_socio is None:
+            return
+        if not obtener_socio(gimnasio, id_socio)['activo']:
             print("No se puede inscribir un socio inactivo.")
-            return inscripciones
-        
-        # Mostrar clases activas
-        print("\n--- CLASES ACTIVAS ---")
-        clases_activas = {id_clase: datos for id_clase, datos in clases.items() if datos['activa']}
-        if not clases_activas:
-            print("No hay clases activas.")
-            return inscripciones
-        
-        for id_clase, datos in clases_activas.items():
-            # Contar inscriptos en esta clase
-            inscriptos_en_clase = sum(1 for insc in inscripciones if insc[1] == id_clase)
-            print(f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']} | Inscriptos: {inscriptos_en_clase}/{datos['cupo']}")
-        
-        id_clase = int(input("Ingrese el ID de la clase: "))
-        
-        if id_clase not in clases:
-            print("No se encontró una clase con ese ID.")
-            return inscripciones
-        
-        if not clases[id_clase]['activa']:
-            print("No se puede inscribir en una clase inactiva.")
-            return inscripciones
-        
-        # Verificar si ya está inscripto usando conjunto
-        inscripcion_existente = (id_socio, id_clase)
-        inscripciones_set = set(inscripciones)
+            return
         
-        if inscripcion_existente in inscripciones_set:
-            print("El socio ya está inscripto en esta clase.")
-            return inscripciones
+        # Clases activas con lugar, desde el índice de lugares libres
+        def fila_clase_con_cupo(id_clase, datos):
+            inscriptos_en_clase = cantidad_inscriptos(gimnasio['inscripciones'], id_clase)
+            return f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']} | Inscriptos: {inscriptos_en_clase}/{datos['cupo']}"
         
-        # Verificar cupo
-        inscriptos_en_clase = sum(1 for insc in inscripciones if insc[1] == id_clase)
-        if inscriptos_en_clase >= clases[id_clase]['cupo']:
-            print("La clase ya tiene el cupo completo.")
-            return inscripciones
+        id_clase = elegir_clase(gimnasio, "Ingrese el ID de la clase: ", estado='activos',
+                                formato=fila_clase_con_cupo, titulo="CLASES ACTIVAS CON LUGAR", comandos=COMANDO_NOMBRE,
+                                consulta={'cupo_minimo': 1})
+        if id_clase is None:
+            return
         
-        # Agregar inscripción
-        inscripciones.append(inscripcion_existente)
-        socio = socios[id_socio]
-        clase = clases[id_clase]
+        # Verifica clase activa, inscripción duplicada y cupo
+        inscribir(gimnasio, id_socio, id_clase, diario)
+        socio = obtener_socio(gimnasio, id_socio)
+        clase = obtener_clase(gimnasio, id_clase)
         print(f"Socio {socio['nombre']} {socio['apellido']} inscripto exitosamente en {clase['nombre']}.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return inscripciones
+    except ErrorGimnasio as error:
+        print(error)
 
-def desinscribirSocio(inscripciones, socios, clases):
+@instrumentar_menu
+def desinscribirSocio(gimnasio, diario=None):
     """
     Eliminar la inscripción de un socio en una clase.
     
     Args:
-        inscripciones (list): Lista de inscripciones
-        socios (dict): Diccionario de socios
-        clases (dict): Diccionario de clases
-        
-    Returns:
-        list: Lista de inscripciones actualizada
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- DESINSCRIBIR SOCIO DE CLASE ---")
     
-    if not inscripciones:
-        print("No hay inscripciones registradas.")
-        return inscripciones
-    
-    # Mostrar socios con inscripciones
-    socios_con_inscripciones = set()
-    for inscripcion in inscripciones:
-        socios_con_inscripciones.add(inscripcion[0])
-    
-    if not socios_con_inscripciones:
-        print("No hay socios con inscripciones.")
-        return inscripciones
+    socios = gimnasio['socios']
+    clases = gimnasio['clases']
+    inscripciones = gimnasio['inscripciones']
     
-    print("\n--- SOCIOS CON INSCRIPCIONES ---")
-    for id_socio in sorted(socios_con_inscripciones):
-        if id_socio in socios:
-            socio = socios[id_socio]
-            print(f"ID: {id_socio} | {socio['nombre']} {socio['apellido']}")
+    if not total_inscripciones(inscripciones):
+        print("No hay inscripciones registradas.")
+        return
     
     try:
-        id_socio = int(input("\nIngrese el ID del socio a desinscribir: "))
-        
-        if id_socio not in socios:
-            print("No se encontró un socio con ese ID.")
-            return inscripciones
+        # Socios con inscripciones, de a una página
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio a desinscribir: ",
+                                filtro=lambda clave, datos: clave in inscripciones['por_socio'],
+                                formato=fila_socio_corta, titulo="SOCIOS CON INSCRIPCIONES")
+        if id_socio is None:
+            return
         
         # Buscar inscripciones del socio
-        inscripciones_socio = [insc for insc in inscripciones if insc[0] == id_socio]
+        clases_socio = clases_inscriptas(gimnasio, id_socio)
         
-        if not inscripciones_socio:
+        if not clases_socio:
             print("El socio no está inscripto en ninguna clase.")
-            return inscripciones
+            return
         
-        print(f"\nClases en las que está inscripto:")
-        for inscripcion in inscripciones_socio:
-            clase_id = inscripcion[1]
-            if clase_id in clases:
-                clase = clases[clase_id]
-                print(f"ID: {clase_id} - {clase['nombre']}")
+        with SalidaBuffer() as salida:
+            salida.escribir(f"\nClases en las que está inscripto:")
+            for clase_id, clase in clases_socio:
+                salida.escribir(f"ID: {clase_id} - {clase['nombre']}")
         
         id_clase = int(input("Ingrese el ID de la clase de la cual desinscribir: "))
         
         # Verificar y eliminar inscripción
-        inscripcion_a_eliminar = (id_socio, id_clase)
-        if inscripcion_a_eliminar in inscripciones:
-            inscripciones.remove(inscripcion_a_eliminar)
-            socio = socios[id_socio]
-            clase = clases[id_clase]
-            print(f"Socio {socio['nombre']} {socio['apellido']} desinscripto exitosamente de {clase['nombre']}.")
-        else:
-            print("El socio no está inscripto en esa clase.")
+        desinscribir(gimnasio, id_socio, id_clase, diario)
+        socio = socios[id_socio]
+        nombre_clase = clases[id_clase]['nombre'] if id_clase in clases else f"la clase {id_clase}"
+        print(f"Socio {socio['nombre']} {socio['apellido']} desinscripto exitosamente de {nombre_clase}.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return inscripciones
+    except ErrorGimnasio as error:
+        print(error)
 
-def ver_clases_de_socio(socios, inscripciones, clases):
+@instrumentar_menu
+def ver_clases_de_socio(gimnasio):
     """
     Ver todas las clases de un socio específico.
     
     Args:
-        socios (dict): Diccionario de socios
-        inscripciones (list): Lista de inscripciones
-        clases (dict): Diccionario de clases
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- VER CLASES DE UN SOCIO ---")
     
-    if not socios:
+    if not gimnasio['socios']:
         print("No hay socios registrados.")
         return
     
-    # Mostrar socios
-    for id_socio, datos in socios.items():
-        print(f"ID: {id_socio} | {datos['nombre']} {datos['apellido']}")
-    
     try:
-        id_socio = int(input("\nIngrese el ID del socio: "))
-        
-        if id_socio not in socios:
-            print("No se encontró un socio con ese ID.")
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio: ", formato=fila_socio_corta, titulo="SOCIOS")
+        if id_socio is None:
             return
-        
-        socio = socios[id_socio]
-        print(f"\n--- CLASES DE {socio['nombre']} {socio['apellido']} ---")
+        socio = obtener_socio(gimnasio, id_socio)
         
         # Buscar clases del socio
-        clases_socio = []
-        for inscripcion in inscripciones:
-            if inscripcion[0] == id_socio:
-                clases_socio.append(inscripcion[1])
+        clases_socio = clases_inscriptas(gimnasio, id_socio)
         
-        if clases_socio:
-            for clase_id in clases_socio:
-                if clase_id in clases:
-                    clase = clases[clase_id]
+        with SalidaBuffer() as salida:
+            salida.escribir(f"\n--- CLASES DE {socio['nombre']} {socio['apellido']} ---")
+            if clases_socio:
+                for clase_id, clase in clases_socio:
                     estado = "Activa" if clase['activa'] else "Inactiva"
-                    print(f"- {clase['nombre']} | Profesor: {clase['profesor']} | Horario: {clase['horario']} | Estado: {estado}")
-        else:
-            print("El socio no está inscripto en ninguna clase.")
+                    salida.escribir(f"- {clase['nombre']} | Profesor: {clase['profesor']} | Horario: {clase['horario']} | Estado: {estado}")
+            else:
+                salida.escribir("El socio no está inscripto en ninguna clase.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
+    except ErrorGimnasio as error:
+        print(error)
 
-def listar_socios_de_clase(socios, inscripciones, clases):
+@instrumentar_menu
+def listar_socios_de_clase(gimnasio):
     """
     Listar todos los socios inscriptos en una clase específica.
     
     Args:
-        socios (dict): Diccionario de socios
-        inscripciones (list): Lista de inscripciones
-        clases (dict): Diccionario de clases
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- LISTAR SOCIOS DE UNA CLASE ---")
     
-    if not clases:
+    if not gimnasio['clases']:
         print("No hay clases registradas.")
         return
     
-    # Mostrar clases
-    for id_clase, datos in clases.items():
-        print(f"ID: {id_clase} | {datos['nombre']} | Profesor: {datos['profesor']}")
-    
     try:
-        id_clase = int(input("\nIngrese el ID de la clase: "))
-        
-        if id_clase not in clases:
-            print("No se encontró una clase con ese ID.")
+        id_clase = elegir_clase(gimnasio, "\nIngrese el ID de la clase: ", formato=fila_clase_corta, titulo="CLASES")
+        if id_clase is None:
             return
-        
-        clase = clases[id_clase]
-        print(f"\n--- SOCIOS INSCRIPTOS EN {clase['nombre']} ---")
+        clase = obtener_clase(gimnasio, id_clase)
         
         # Buscar socios inscriptos
-        socios_inscriptos = []
-        for inscripcion in inscripciones:
-            if inscripcion[1] == id_clase:
-                socios_inscriptos.append(inscripcion[0])
+        inscriptos = socios_inscriptos(gimnasio, id_clase)
         
-        if socios_inscriptos:
-            print(f"Total de inscriptos: {len(socios_inscriptos)}/{clase['cupo']}")
-            for socio_id in socios_inscriptos:
-                if socio_id in socios:
-                    socio = socios[socio_id]
+        with SalidaBuffer() as salida:
+            salida.escribir(f"\n--- SOCIOS INSCRIPTOS EN {clase['nombre']} ---")
+            if inscriptos:
+                salida.escribir(f"Total de inscriptos: {len(inscriptos)}/{clase['cupo']}")
+                for socio_id, socio in inscriptos:
                     estado = "Activo" if socio['activo'] else "Inactivo"
-                    print(f"- {socio['nombre']} {socio['apellido']} | DNI: {socio['dni']} | Estado: {estado}")
-        else:
-            print("No hay socios inscriptos en esta clase.")
+                    salida.escribir(f"- {socio['nombre']} {socio['apellido']} | DNI: {socio['dni']} | Estado: {estado}")
+            else:
+                salida.escribir("No hay socios inscriptos en esta clase.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
+    except ErrorGimnasio as error:
+        print(error)
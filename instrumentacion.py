@@ -0,0 +1,321 @@
+"""
+Módulo de instrumentación de las operaciones del sistema de gimnasio.
+Las funciones decoradas con instrumentar() cuentan llamadas y errores, y
+acumulan un histograma de latencia (p50/p95/p99) y los elementos recorridos
+(contar_escaneados) de cada operación. Los elementos recorridos por una
+operación anidada también se suman a la que la llamó.
+
+Con la medición desactivada (el estado inicial) cada llamada instrumentada
+solo consulta un indicador antes de llamar a la función original.
+
+Los menús interactivos esperan input() en el medio: se miden con
+instrumentar_menu(), que usa tiempo de CPU del proceso en lugar de tiempo de
+reloj para no contar lo que tarda el usuario en escribir.
+"""
+
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+# Medición activa (se lee en cada llamada instrumentada)
+ACTIVO = False
+# Intervalo por defecto del volcado periódico de métricas, en segundos
+INTERVALO_VOLCADO = 60
+# Subdivisiones por potencia de 2 del histograma (2^3 = 8: error relativo < 12.5 %)
+BITS_SUBDIVISION = 3
+
+class Histograma:
+    """
+    Histograma logarítmico de latencias en nanosegundos, de tamaño acotado.
+    """
+
+    def __init__(self):
+        self.cubetas = {}
+        self.cantidad = 0
+
+    @staticmethod
+    def cubeta(valor):
+        bits = valor.bit_length()
+        if bits <= BITS_SUBDIVISION + 1:
+            return valor
+        desplazamiento = bits - BITS_SUBDIVISION - 1
+        return (bits << BITS_SUBDIVISION) | ((valor >> desplazamiento) & ((1 << BITS_SUBDIVISION) - 1))
+
+    @staticmethod
+    def limite(cubeta):
+        # Mayor valor que cae en la cubeta
+        if cubeta < 1 << (BITS_SUBDIVISION + 1):
+            return cubeta
+        bits, resto = cubeta >> BITS_SUBDIVISION, cubeta & ((1 << BITS_SUBDIVISION) - 1)
+        desplazamiento = bits - BITS_SUBDIVISION - 1
+        return (((1 << BITS_SUBDIVISION) | resto) + 1 << desplazamiento) - 1
+
+    def agregar(self, valor):
+        cubeta = self.cubeta(valor)
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+        self.cantidad += 1
+
+    def percentil(self, fraccion):
+        objetivo = max(1, fraccion * self.cantidad)
+        acumulado = 0
+        for cubeta in sorted(self.cubetas):
+            acumulado += self.cubetas[cubeta]
+            if acumulado >= objetivo:
+                return self.limite(cubeta)
+        return 0
+
+class Operacion:
+    """
+    Mediciones acumuladas de una operación instrumentada.
+    """
+
+    def __init__(self, nombre, reloj):
+        self.nombre = nombre
+        self.reloj = reloj
+        self.candado = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.total_ns = 0
+        self.maximo_ns = 0
+        self.escaneados = 0
+        self.histograma = Histograma()
+
+    def registrar(self, duracion, escaneados, error):
+        with self.candado:
+            self.llamadas += 1
+            self.errores += error
+            self.total_ns += duracion
+            self.maximo_ns = max(self.maximo_ns, duracion)
+            self.escaneados += escaneados
+            self.histograma.agregar(duracion)
+
+    def resumen(self):
+        # Devuelve None si no hubo llamadas (se verifica con el candado: otro hilo puede reiniciar)
+        with self.candado:
+            if not self.llamadas:
+                return None
+            # El límite de la cubeta puede pasar el máximo observado
+            percentil = lambda fraccion: min(self.histograma.percentil(fraccion), self.maximo_ns) / 1000
+            return {
+                'reloj': self.reloj,
+                'llamadas': self.llamadas,
+                'errores': self.errores,
+                'medio_us': round(self.total_ns / self.llamadas / 1000, 2),
+                'p50_us': round(percentil(0.50), 2),
+                'p95_us': round(percentil(0.95), 2),
+                'p99_us': round(percentil(0.99), 2),
+                'max_us': round(self.maximo_ns / 1000, 2),
+                'total_ms': round(self.total_ns / 1e6, 3),
+                'escaneados': self.escaneados,
+                'escaneados_por_llamada': round(self.escaneados / self.llamadas, 1)
+            }
+
+# Operaciones registradas {nombre: Operacion}
+_operaciones = {}
+# Pila por hilo de elementos escaneados de las operaciones en curso
+_hilo = threading.local()
+# Volcado periódico en curso
+_volcado = {'hilo': None, 'detener': None, 'ruta': None, 'intervalo': None}
+
+def _pila():
+    """
+    Devuelve la pila de operaciones en curso del hilo actual.
+
+    Returns:
+        list: Elementos escaneados por cada operación abierta
+    """
+    pila = getattr(_hilo, 'pila', None)
+    if pila is None:
+        pila = _hilo.pila = []
+    return pila
+
+def _medir(operacion, reloj, funcion, args, kwargs):
+    """
+    Ejecuta una función instrumentada registrando su duración y lo escaneado.
+
+    Args:
+        operacion (Operacion): Mediciones de la operación
+        reloj (callable): Reloj en nanosegundos
+        funcion (callable): Función original
+        args (tuple): Argumentos posicionales
+        kwargs (dict): Argumentos por nombre
+
+    Returns:
+        object: Lo que devuelva la función
+    """
+    pila = _pila()
+    pila.append(0)
+    error = 0
+    inicio = reloj()
+    try:
+        return funcion(*args, **kwargs)
+    except Exception:
+        error = 1
+        raise
+    finally:
+        duracion = reloj() - inicio
+        escaneados = pila.pop()
+        if pila:
+            pila[-1] += escaneados
+        operacion.registrar(duracion, escaneados, error)
+
+def instrumentar(funcion=None, nombre=None, reloj=time.perf_counter_ns):
+    """
+    Decorador que registra una operación y la mide mientras la medición esté activa.
+
+    Args:
+        funcion (callable, optional): Función a instrumentar (uso como @instrumentar)
+        nombre (str, optional): Nombre de la operación (por defecto el de la función)
+        reloj (callable, optional): Reloj en nanosegundos
+
+    Returns:
+        callable: La función instrumentada, o el decorador si no se pasó la función
+    """
+    def decorar(funcion):
+        operacion = _operaciones.setdefault(nombre or funcion.__name__,
+                                            Operacion(nombre or funcion.__name__,
+                                                      'cpu' if reloj is time.process_time_ns else 'pared'))
+
+        @wraps(funcion)
+        def medida(*args, **kwargs):
+            if not ACTIVO:
+                return funcion(*args, **kwargs)
+            return _medir(operacion, reloj, funcion, args, kwargs)
+        return medida
+    return decorar(funcion) if funcion is not None else decorar
+
+def instrumentar_menu(funcion):
+    """
+    Decorador para las funciones de menú: mide tiempo de CPU (sin la espera de input()).
+
+    Args:
+        funcion (callable): Función de menú
+
+    Returns:
+        callable: Función instrumentada
+    """
+    return instrumentar(funcion, reloj=time.process_time_ns)
+
+def contar_escaneados(cantidad):
+    """
+    Suma elementos recorridos a la operación instrumentada en curso.
+    Se llama una vez por operación (no por elemento) para no pesar con la medición apagada.
+
+    Args:
+        cantidad (int): Elementos recorridos
+    """
+    if ACTIVO:
+        pila = getattr(_hilo, 'pila', None)
+        if pila:
+            pila[-1] += cantidad
+
+def activar():
+    """
+    Activa la medición de las operaciones instrumentadas.
+    """
+    global ACTIVO
+    ACTIVO = True
+
+def desactivar():
+    """
+    Desactiva la medición (las métricas acumuladas se conservan).
+    """
+    global ACTIVO
+    ACTIVO = False
+
+def medicion_activa():
+    """
+    Indica si la medición está activa.
+
+    Returns:
+        bool: True si las operaciones instrumentadas se están midiendo
+    """
+    return ACTIVO
+
+def reiniciar_metricas():
+    """
+    Descarta las métricas acumuladas de todas las operaciones.
+    """
+    for operacion in list(_operaciones.values()):
+        with operacion.candado:
+            operacion.reiniciar()
+
+def resumen_metricas():
+    """
+    Devuelve las métricas de las operaciones que tuvieron llamadas.
+
+    Returns:
+        dict: {nombre: métricas}, de mayor a menor tiempo total
+    """
+    resumen = {}
+    for nombre, operacion in list(_operaciones.items()):
+        metricas = operacion.resumen()
+        if metricas is not None:
+            resumen[nombre] = metricas
+    return dict(sorted(resumen.items(), key=lambda item: -item[1]['total_ms']))
+
+def volcar_metricas(ruta):
+    """
+    Escribe las métricas en un archivo JSON (archivo temporal + rename).
+
+    Args:
+        ruta (str): Archivo destino
+    """
+    contenido = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'activo': ACTIVO,
+        'operaciones': resumen_metricas()
+    }
+    ruta_temporal = ruta + '.tmp'
+    with open(ruta_temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(contenido, archivo, indent=2, ensure_ascii=False)
+    os.replace(ruta_temporal, ruta)
+
+def iniciar_volcado(ruta, intervalo=INTERVALO_VOLCADO):
+    """
+    Vuelca las métricas a un archivo cada cierto intervalo desde un hilo aparte.
+    Reemplaza el volcado periódico anterior, si había uno.
+
+    Args:
+        ruta (str): Archivo destino
+        intervalo (float, optional): Segundos entre volcados
+    """
+    if intervalo <= 0:
+        raise ValueError("El intervalo debe ser mayor a 0.")
+    detener_volcado()
+    detener = threading.Event()
+
+    def volcar_periodicamente():
+        while not detener.wait(intervalo):
+            volcar_metricas(ruta)
+
+    hilo = threading.Thread(target=volcar_periodicamente, name='volcado-metricas', daemon=True)
+    _volcado.update(hilo=hilo, detener=detener, ruta=ruta, intervalo=intervalo)
+    hilo.start()
+
+def detener_volcado():
+    """
+    Detiene el volcado periódico, si hay uno, y hace un último volcado.
+    """
+    if _volcado['hilo'] is None:
+        return
+    _volcado['detener'].set()
+    _volcado['hilo'].join()
+    volcar_metricas(_volcado['ruta'])
+    _volcado.update(hilo=None, detener=None, ruta=None, intervalo=None)
+
+def volcado_en_curso():
+    """
+    Devuelve el volcado periódico en curso.
+
+    Returns:
+        tuple: (ruta, intervalo), o None si no hay volcado periódico
+    """
+    if _volcado['hilo'] is None:
+        return None
+    return _volcado['ruta'], _volcado['intervalo']
@@ -0,0 +1,203 @@
+"""
+Módulo de índices de listado para el sistema de gimnasio.
+Mantiene, para socios y clases, los IDs activos e inactivos en arrays ordenados
+y, para socios, los IDs ordenados por apellido y nombre. Con ellos los listados
+se recorren por páginas con un cursor (el último elemento mostrado): cada
+página cuesta O(log N + tamaño de página) en lugar de recorrer todos los registros.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from heapq import merge
+
+# Filtros de estado: None (todos), 'activos' o 'inactivos'
+ESTADOS = {None: (True, False), 'activos': (True,), 'inactivos': (False,)}
+# Campo de estado de cada entidad
+CAMPO_ESTADO = {'socios': 'activo', 'clases': 'activa'}
+# Filas por página de los listados
+TAMANO_PAGINA = 20
+
+def _desde(ids, inicio):
+    # Recorre por índice: islice avanzaría elemento por elemento hasta el inicio
+    for posicion in range(inicio, len(ids)):
+        yield ids[posicion]
+
+def crear_listados(socios, clases):
+    """
+    Crea los conjuntos de IDs activos e inactivos de socios y clases.
+
+    Args:
+        socios (dict): Socios {id: datos}
+        clases (dict): Clases {id: datos}
+
+    Returns:
+        dict: {entidad: {True: array ordenado de activos, False: array ordenado de inactivos}}
+    """
+    listados = {}
+    for entidad, registros in (('socios', socios), ('clases', clases)):
+        campo = CAMPO_ESTADO[entidad]
+        conjuntos = listados[entidad] = {True: array('I'), False: array('I')}
+        if hasattr(registros, 'columna'):
+            valores = registros.columna(campo)
+        else:
+            valores = ((clave, datos[campo]) for clave, datos in registros.items())
+        for clave, activo in sorted(valores):
+            conjuntos[bool(activo)].append(clave)
+    return listados
+
+def agregar_a_listado(listados, entidad, clave, activo):
+    """
+    Agrega un ID al conjunto de su estado. Los IDs nuevos son los mayores, así
+    que en las altas es un append.
+
+    Args:
+        listados (dict): Índices de listado
+        entidad (str): 'socios' o 'clases'
+        clave (int): ID del registro
+        activo (bool): Estado del registro
+    """
+    ids = listados[entidad][bool(activo)]
+    if not ids or clave > ids[-1]:
+        ids.append(clave)
+    else:
+        insort(ids, clave)
+
+def quitar_de_listado(listados, entidad, clave, activo):
+    """
+    Quita un ID del conjunto de su estado.
+
+    Args:
+        listados (dict): Índices de listado
+        entidad (str): 'socios' o 'clases'
+        clave (int): ID del registro
+        activo (bool): Estado del registro
+    """
+    ids = listados[entidad][bool(activo)]
+    posicion = bisect_left(ids, clave)
+    if posicion < len(ids) and ids[posicion] == clave:
+        del ids[posicion]
+
+def mover_en_listado(listados, entidad, clave, anterior, nuevo):
+    """
+    Mueve un ID de conjunto cuando cambia su estado.
+
+    Args:
+        listados (dict): Índices de listado
+        entidad (str): 'socios' o 'clases'
+        clave (int): ID del registro
+        anterior (bool): Estado previo
+        nuevo (bool): Estado nuevo
+    """
+    if bool(anterior) != bool(nuevo):
+        quitar_de_listado(listados, entidad, clave, anterior)
+        agregar_a_listado(listados, entidad, clave, nuevo)
+
+def recorrer_desde(listados, entidad, estado=None, cursor=None):
+    """
+    Recorre los IDs de un estado en orden ascendente, a partir del siguiente al cursor.
+
+    Args:
+        listados (dict): Índices de listado
+        entidad (str): 'socios' o 'clases'
+        estado (str, optional): None, 'activos' o 'inactivos'
+        cursor (int, optional): Último ID ya recorrido
+
+    Returns:
+        iterator: IDs
+    """
+    partes = []
+    for activo in ESTADOS[estado]:
+        ids = listados[entidad][activo]
+        inicio = bisect_right(ids, cursor) if cursor is not None else 0
+        partes.append(_desde(ids, inicio))
+    return partes[0] if len(partes) == 1 else merge(*partes)
+
+# ---- Orden por nombre (socios) ----
+
+def clave_nombre(datos):
+    """
+    Devuelve la clave de orden alfabético de un socio (apellido y nombre, sin mayúsculas).
+
+    Args:
+        datos (dict): Datos del socio
+
+    Returns:
+        str: Clave de orden
+    """
+    return f"{datos['apellido']} {datos['nombre']}".casefold()
+
+def crear_orden_nombres(socios):
+    """
+    Crea el índice de socios ordenados por apellido y nombre.
+
+    Args:
+        socios (dict): Socios {id: datos}
+
+    Returns:
+        dict: {'ids': array de IDs ordenados por (clave_nombre, id)}
+    """
+    if hasattr(socios, 'columna'):
+        # Leer solo las dos columnas, sin decodificar los registros completos
+        filas = ({'apellido': apellido, 'nombre': nombre, 'id': clave}
+                 for (clave, apellido), (_, nombre) in zip(socios.columna('apellido'), socios.columna('nombre')))
+        claves = sorted((clave_nombre(fila), fila['id']) for fila in filas)
+    else:
+        claves = sorted((clave_nombre(datos), clave) for clave, datos in socios.items())
+    return {'ids': array('I', (clave for _, clave in claves))}
+
+def _posicion_nombre(orden, socios, clave_orden):
+    # Bisección por (clave_nombre, id) leyendo la clave de cada socio visitado
+    return bisect_left(orden['ids'], clave_orden,
+                       key=lambda clave: (clave_nombre(socios[clave]), clave))
+
+def agregar_por_nombre(orden, socios, clave):
+    """
+    Agrega un socio (ya guardado en socios) al índice por nombre.
+
+    Args:
+        orden (dict): Índice por nombre
+        socios (dict): Socios {id: datos}
+        clave (int): ID del socio
+    """
+    posicion = _posicion_nombre(orden, socios, (clave_nombre(socios[clave]), clave))
+    orden['ids'].insert(posicion, clave)
+
+def quitar_por_nombre(orden, socios, clave):
+    """
+    Quita un socio del índice por nombre. Debe llamarse antes de cambiar su
+    nombre o apellido y antes de eliminarlo.
+
+    Args:
+        orden (dict): Índice por nombre
+        socios (dict): Socios {id: datos}
+        clave (int): ID del socio
+    """
+    ids = orden['ids']
+    posicion = _posicion_nombre(orden, socios, (clave_nombre(socios[clave]), clave))
+    if posicion < len(ids) and ids[posicion] == clave:
+        del ids[posicion]
+
+def recorrer_por_nombre(orden, socios, prefijo, cursor=None):
+    """
+    Recorre en orden alfabético los socios cuyo 'apellido nombre' empieza con un prefijo.
+
+    Args:
+        orden (dict): Índice por nombre
+        socios (dict): Socios {id: datos}
+        prefijo (str): Prefijo buscado (sin distinguir mayúsculas)
+        cursor (tuple, optional): (clave_nombre, id) del último socio ya recorrido
+
+    Yields:
+        tuple: ((clave_nombre, id), id)
+    """
+    prefijo = prefijo.casefold()
+    ids = orden['ids']
+    if cursor is None:
+        posicion = _posicion_nombre(orden, socios, (prefijo, -1))
+    else:
+        posicion = bisect_right(ids, cursor, key=lambda clave: (clave_nombre(socios[clave]), clave))
+    for clave in _desde(ids, posicion):
+        nombre = clave_nombre(socios[clave])
+        if not nombre.startswith(prefijo):
+            return
+        yield (nombre, clave), clave
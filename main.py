@@ -4,25 +4,33 @@ Archivo principal con el menú interactivo.
 """
 
 # Importar todos los módulos
-from socios import altaSocio, bajaSocio, modificarSocio, consultarSocio
-from clases import altaClase, bajaClase, modificarClase, consultarClase
+from socios import altaSocio, bajaSocio, modificarSocio, consultarSocio, buscarSocioPorDni
+from clases import altaClase, bajaClase, modificarClase, consultarClase, buscarClases
 from inscripciones import inscribirSocio, desinscribirSocio, ver_clases_de_socio, listar_socios_de_clase
+from persistencia import cargar_gimnasio, confirmar_diario, cerrar_diario
 from estadisticas import estadisticas, mostrar_resumen_ejecutivo
-from asistencia import inicializar_matriz_asistencia, menu_asistencia
+from asistencia import menu_asistencia
+from diagnostico import menu_diagnostico
+from instrumentacion import detener_volcado
 
 def main():
     """
     Función principal del sistema de gestión de gimnasio.
-    Inicializa las estructuras de datos y maneja el menú principal.
+    Carga las estructuras de datos persistidas y maneja el menú principal.
     """
-    # Inicialización de estructuras de datos
-    socios = {}          # Diccionario de socios {id: {...}}
-    clases = {}          # Diccionario de clases {id: {...}}
-    inscripciones = []   # Lista de tuplas (socio_id, clase_id)
-    inscripciones_set = set()  # Conjunto para evitar duplicados
-    matriz_asistencia = {}  # Matriz de asistencia (socio_id, clase_id): [fechas]
+    # Carga del último snapshot más la cola del diario
+    gimnasio, diario = cargar_gimnasio()
+    # Los menús operan sobre el estado a través de servicios.py:
+    #   socios, clases          Diccionarios {id: {...}} guardados en columnas compactas
+    #   indices_socios          Índices únicos {campo: {valor: id}}
+    #   inscripciones           Índice bidireccional socio ↔ clase
+    #   matriz_asistencia       Días por par (socio_id, clase_id) en un BitmapDias, con índices
+    #                           por_socio y por_clase (ver almacen_asistencia.py)
+    #   registro_asistencia     Las mismas asistencias en columnas, para los reportes por rango
+    #   secuencias              Próximo ID por entidad, nunca se reutiliza
 
     while True:
+        confirmar_diario(diario)
         print("\n===================================")
         print(" MENÚ PRINCIPAL - GIMNASIO")
         print("===================================")
@@ -32,6 +40,7 @@ def main():
         print("[4] Consultas")
         print("[5] Estadísticas")
         print("[6] Asistencia")
+        print("[7] Diagnóstico")
         print("[0] Salir")
         print("===================================")
 
@@ -39,56 +48,67 @@ def main():
 
         if opcion == "0":
             print("Saliendo del sistema...")
+            detener_volcado()
+            cerrar_diario(diario)
             break
 
         elif opcion == "1":   # SOCIOS
             while True:
+                confirmar_diario(diario)
                 print("\n---- MENÚ DE SOCIOS ----")
                 print("[1] Alta socio")
                 print("[2] Baja socio")
                 print("[3] Modificar socio")
                 print("[4] Consultar socio")
+                print("[5] Buscar socio por DNI")
                 print("[0] Volver")
                 sub = input("Seleccione una opción: ")
 
                 if sub == "0":
                     break
                 elif sub == "1":
-                    socios = altaSocio(socios)
+                    altaSocio(gimnasio, diario)
                 elif sub == "2":
-                    socios = bajaSocio(socios)
+                    bajaSocio(gimnasio, diario)
                 elif sub == "3":
-                    socios = modificarSocio(socios)
+                    modificarSocio(gimnasio, diario)
                 elif sub == "4":
-                    consultarSocio(socios, inscripciones, clases)
+                    consultarSocio(gimnasio)
+                elif sub == "5":
+                    buscarSocioPorDni(gimnasio)
                 else:
                     print("Opción inválida.")
 
         elif opcion == "2":   # CLASES
             while True:
+                confirmar_diario(diario)
                 print("\n---- MENÚ DE CLASES ----")
                 print("[1] Alta clase")
                 print("[2] Baja clase")
                 print("[3] Modificar clase")
                 print("[4] Consultar clase")
+                print("[5] Buscar clases")
                 print("[0] Volver")
                 sub = input("Seleccione una opción: ")
 
                 if sub == "0":
                     break
                 elif sub == "1":
-                    clases = altaClase(clases)
+                    altaClase(gimnasio, diario)
                 elif sub == "2":
-                    clases = bajaClase(clases)
+                    bajaClase(gimnasio, diario)
                 elif sub == "3":
-                    clases = modificarClase(clases)
+                    modificarClase(gimnasio, diario)
                 elif sub == "4":
-                    consultarClase(clases, inscripciones, socios)
+                    consultarClase(gimnasio)
+                elif sub == "5":
+                    buscarClases(gimnasio)
                 else:
                     print("Opción inválida.")
 
         elif opcion == "3":   # INSCRIPCIONES
             while True:
+                confirmar_diario(diario)
                 print("\n---- MENÚ DE INSCRIPCIONES ----")
                 print("[1] Inscribir socio en clase")
                 print("[2] Desinscribir socio de clase")
@@ -98,14 +118,15 @@ def main():
                 if sub == "0":
                     break
                 elif sub == "1":
-                    inscripciones = inscribirSocio(inscripciones, socios, clases)
+                    inscribirSocio(gimnasio, diario)
                 elif sub == "2":
-                    inscripciones = desinscribirSocio(inscripciones, socios, clases)
+                    desinscribirSocio(gimnasio, diario)
                 else:
                     print("Opción inválida.")
 
         elif opcion == "4":   # CONSULTAS
             while True:
+                confirmar_diario(diario)
                 print("\n---- MENÚ DE CONSULTAS ----")
                 print("[1] Ver clases de un socio")
                 print("[2] Listar socios de una clase")
@@ -115,14 +136,15 @@ def main():
                 if sub == "0":
                     break
                 elif sub == "1":
-                    ver_clases_de_socio(socios, inscripciones, clases)
+                    ver_clases_de_socio(gimnasio)
                 elif sub == "2":
-                    listar_socios_de_clase(socios, inscripciones, clases)
+                    listar_socios_de_clase(gimnasio)
                 else:
                     print("Opción inválida.")
 
         elif opcion == "5":   # ESTADÍSTICAS
             while True:
+                confirmar_diario(diario)
                 print("\n---- MENÚ DE ESTADÍSTICAS ----")
                 print("[1] Estadísticas completas")
                 print("[2] Resumen ejecutivo")
@@ -132,24 +154,17 @@ def main():
                 if sub == "0":
                     break
                 elif sub == "1":
-                    estadisticas(socios, clases, inscripciones)
+                    estadisticas(gimnasio)
                 elif sub == "2":
-                    mostrar_resumen_ejecutivo(socios, clases, inscripciones)
+                    mostrar_resumen_ejecutivo(gimnasio)
                 else:
                     print("Opción inválida.")
 
         elif opcion == "6":   # ASISTENCIA
-            # Inicializar matriz de asistencia si es necesario
-            if not matriz_asistencia and socios and clases:
-                matriz_asistencia = inicializar_matriz_asistencia(socios, clases)
-            elif socios and clases:
-                # Actualizar matriz con nuevos socios/clases
-                for socio_id in socios.keys():
-                    for clase_id in clases.keys():
-                        if (socio_id, clase_id) not in matriz_asistencia:
-                            matriz_asistencia[(socio_id, clase_id)] = []
-            
-            matriz_asistencia = menu_asistencia(matriz_asistencia, socios, clases)
+            menu_asistencia(gimnasio, diario)
+
+        elif opcion == "7":   # DIAGNÓSTICO
+            menu_diagnostico(gimnasio, diario)
 
         else:
             print("Opción inválida.")
@@ -0,0 +1,241 @@
+"""
+Módulo de contabilidad de memoria del sistema de gimnasio.
+Mide cuánto ocupan los almacenes de socios, clases, inscripciones y asistencia
+(y el resto de los índices y agregados) recorriendo sus objetos con
+sys.getsizeof, informa los bytes por registro y proyecta la memoria para
+otra cantidad de socios. Los datos que siguen en el snapshot mapeado (ver
+snapshot_binario.py) se informan aparte: los carga el sistema operativo a
+demanda y no ocupan memoria de Python.
+
+Como script, además mide con tracemalloc lo que se asigna al cargar un
+directorio de datos (o al generar un gimnasio sintético), separado por el
+módulo que hizo cada asignación, para contrastar el recorrido.
+
+Uso:
+    python memoria.py [--directorio datos] [--objetivo 1000000]
+    python memoria.py --socios 20000 [--anios 0.5] [--objetivo 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+from types import FunctionType, MethodType, BuiltinFunctionType, ModuleType, CodeType
+
+from almacen_asistencia import total_registros
+from almacen_inscripciones import total_inscripciones
+from datos_sinteticos import generar_gimnasio
+from persistencia import cargar_gimnasio
+from diferido import Diferido
+
+# Almacenes medidos por entidad, con la cantidad de registros de cada uno
+ENTIDADES = {
+    'socios': len,
+    'clases': len,
+    'inscripciones': total_inscripciones,
+    'matriz_asistencia': total_registros
+}
+# Objetos que no se recorren ni se cuentan: código compartido, no datos
+NO_CONTABLES = (FunctionType, MethodType, BuiltinFunctionType, ModuleType, CodeType, type)
+
+def tamano_profundo(objeto, vistos=None):
+    """
+    Suma sys.getsizeof de un objeto y de todo lo que alcanza (contenedores,
+    atributos y __slots__), contando una sola vez cada objeto.
+
+    Args:
+        objeto (object): Objeto a medir
+        vistos (set, optional): IDs ya contados (compartido entre mediciones
+                                para no contar dos veces lo que comparten)
+
+    Returns:
+        tuple: (bytes en memoria de Python, bytes leídos del snapshot mapeado)
+    """
+    vistos = set() if vistos is None else vistos
+    total = mapeados = 0
+    pendientes = [objeto]
+    while pendientes:
+        actual = pendientes.pop()
+        if id(actual) in vistos or actual is None or isinstance(actual, bool):
+            continue
+        vistos.add(id(actual))
+        if isinstance(actual, NO_CONTABLES):
+            continue
+        if isinstance(actual, int) and -5 <= actual <= 256:
+            # Enteros chicos: el intérprete los tiene precreados
+            continue
+        total += sys.getsizeof(actual)
+        if isinstance(actual, memoryview):
+            # Sección del snapshot mapeado: no se recorre el mapa entero
+            mapeados += actual.nbytes
+            continue
+        if isinstance(actual, (str, bytes, bytearray, array, int, float)):
+            continue
+        if isinstance(actual, dict):
+            pendientes.extend(actual.keys())
+            pendientes.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            pendientes.extend(actual)
+        atributos = getattr(actual, '__dict__', None)
+        if atributos is not None:
+            pendientes.append(atributos)
+        for clase in type(actual).__mro__:
+            for nombre in clase.__dict__.get('__slots__', ()):
+                if hasattr(actual, nombre):
+                    pendientes.append(getattr(actual, nombre))
+    return total, mapeados
+
+def medir_entidades(gimnasio):
+    """
+    Mide la memoria de los almacenes de cada entidad y del resto del estado.
+    Construye antes los almacenes diferidos, para medirlos como quedan en uso.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+
+    Returns:
+        dict: {almacén: {'registros', 'bytes', 'mapeados', 'por_registro'}}; 'otros'
+              agrupa índices y agregados y se expresa por socio
+    """
+    for almacen in gimnasio.values():
+        if isinstance(almacen, Diferido):
+            almacen.construir()
+    vistos = set()
+    # El diccionario del estado no es de ninguna entidad
+    vistos.add(id(gimnasio))
+    medicion = {}
+    for nombre, contar in ENTIDADES.items():
+        registros = contar(gimnasio[nombre])
+        tamano, mapeados = tamano_profundo(gimnasio[nombre], vistos)
+        medicion[nombre] = {'registros': registros, 'bytes': tamano, 'mapeados': mapeados,
+                            'por_registro': (tamano + mapeados) / registros if registros else 0}
+    tamano, mapeados = tamano_profundo([almacen for nombre, almacen in gimnasio.items() if nombre not in ENTIDADES],
+                                       vistos)
+    socios = medicion['socios']['registros']
+    medicion['otros'] = {'registros': socios, 'bytes': tamano, 'mapeados': mapeados,
+                         'por_registro': (tamano + mapeados) / socios if socios else 0}
+    return medicion
+
+def proyectar(medicion, socios_objetivo):
+    """
+    Proyecta la memoria para otra cantidad de socios, suponiendo las mismas
+    clases, inscripciones y asistencias por socio y el mismo costo por registro.
+
+    Args:
+        medicion (dict): Resultado de medir_entidades
+        socios_objetivo (int): Cantidad de socios proyectada
+
+    Returns:
+        dict: {almacén: (registros, bytes)} proyectados, más 'total'
+    """
+    socios = medicion['socios']['registros']
+    if not socios:
+        raise ValueError("Sin socios no hay base para proyectar.")
+    factor = socios_objetivo / socios
+    proyeccion = {}
+    for nombre, datos in medicion.items():
+        registros = round(datos['registros'] * factor)
+        proyeccion[nombre] = (registros, round(datos['por_registro'] * registros))
+    proyeccion['total'] = (socios_objetivo, sum(bytes_ for _, bytes_ in proyeccion.values()))
+    return proyeccion
+
+def formatear_bytes(cantidad):
+    """
+    Formatea una cantidad de bytes con la unidad más cómoda.
+
+    Args:
+        cantidad (float): Bytes
+
+    Returns:
+        str: Cantidad con unidad (B, KB, MB o GB)
+    """
+    for unidad in ('B', 'KB', 'MB'):
+        if abs(cantidad) < 1024:
+            return f"{cantidad:.0f} {unidad}" if unidad == 'B' else f"{cantidad:.1f} {unidad}"
+        cantidad /= 1024
+    return f"{cantidad:.2f} GB"
+
+def mostrar_memoria(medicion, socios_objetivo=None):
+    """
+    Muestra la memoria por entidad y, si se indica, la proyección.
+
+    Args:
+        medicion (dict): Resultado de medir_entidades
+        socios_objetivo (int, optional): Cantidad de socios a proyectar
+    """
+    print("\n--- MEMORIA POR ENTIDAD ---")
+    print(f"{'Almacén':<20}{'Registros':>12}{'Memoria':>14}{'Mapeado':>14}{'Por registro':>14}")
+    for nombre, datos in medicion.items():
+        etiqueta = "otros (por socio)" if nombre == 'otros' else nombre
+        print(f"{etiqueta:<20}{datos['registros']:>12}{formatear_bytes(datos['bytes']):>14}"
+              f"{formatear_bytes(datos['mapeados']):>14}{datos['por_registro']:>12.1f} B")
+    total = sum(datos['bytes'] for datos in medicion.values())
+    mapeados = sum(datos['mapeados'] for datos in medicion.values())
+    print(f"{'Total':<20}{'':>12}{formatear_bytes(total):>14}{formatear_bytes(mapeados):>14}")
+    if any(datos['mapeados'] for datos in medicion.values()):
+        print("Mapeado: datos del snapshot que el sistema operativo carga a demanda.")
+
+    if socios_objetivo and medicion['socios']['registros']:
+        print(f"\n--- PROYECCIÓN PARA {socios_objetivo} SOCIOS ---")
+        proyeccion = proyectar(medicion, socios_objetivo)
+        for nombre, (registros, bytes_) in proyeccion.items():
+            if nombre != 'total':
+                print(f"{nombre:<20}{registros:>12}{formatear_bytes(bytes_):>14}")
+        print(f"{'Total':<20}{'':>12}{formatear_bytes(proyeccion['total'][1]):>14}")
+
+def medir_asignaciones(cargar):
+    """
+    Ejecuta una carga bajo tracemalloc y devuelve lo asignado que sigue vivo,
+    por módulo que hizo la asignación.
+
+    Args:
+        cargar (callable): Función sin argumentos que devuelve el estado del gimnasio
+
+    Returns:
+        tuple: (gimnasio, total en bytes, [(módulo, bytes)] de mayor a menor)
+    """
+    tracemalloc.start()
+    try:
+        gimnasio = cargar()
+        for almacen in gimnasio.values():
+            if isinstance(almacen, Diferido):
+                almacen.construir()
+        estadisticas = tracemalloc.take_snapshot().statistics('filename')
+    finally:
+        tracemalloc.stop()
+    por_modulo = [(os.path.basename(estadistica.traceback[0].filename), estadistica.size)
+                  for estadistica in estadisticas]
+    return gimnasio, sum(tamano for _, tamano in por_modulo), por_modulo
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria por entidad del gimnasio.")
+    parser.add_argument('--directorio', default='datos', help="Directorio de datos a medir")
+    parser.add_argument('--socios', type=int, help="Medir un gimnasio sintético de esta cantidad de socios")
+    parser.add_argument('--anios', type=float, default=0.5, help="Años de asistencia del gimnasio sintético")
+    parser.add_argument('--objetivo', type=int, default=1_000_000, help="Cantidad de socios a proyectar")
+    parser.add_argument('--modulos', type=int, default=10, help="Módulos a mostrar en el detalle de tracemalloc")
+    argumentos = parser.parse_args()
+
+    if argumentos.socios:
+        def cargar():
+            return generar_gimnasio(argumentos.socios, anios=argumentos.anios)['gimnasio']
+    else:
+        def cargar():
+            gimnasio, diario = cargar_gimnasio(argumentos.directorio)
+            # Solo lectura: se cierra sin escribir nada
+            diario['archivo'].close()
+            return gimnasio
+
+    inicio = time.perf_counter()
+    gimnasio, asignado, por_modulo = medir_asignaciones(cargar)
+    print(f"Carga bajo tracemalloc en {time.perf_counter() - inicio:.1f} s: {formatear_bytes(asignado)} asignados")
+    for modulo, tamano in por_modulo[:argumentos.modulos]:
+        print(f"  {modulo:<28}{formatear_bytes(tamano):>12}")
+
+    medicion = medir_entidades(gimnasio)
+    mostrar_memoria(medicion, argumentos.objetivo)
+
+if __name__ == "__main__":
+    main()
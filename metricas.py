@@ -0,0 +1,206 @@
+"""
+Módulo de métricas incrementales para el sistema de gimnasio.
+Mantiene los agregados que usan las estadísticas (totales, activos, inscriptos
+por clase, asistencias por socio y por clase, y sus máximos) actualizados en O(1)
+por cada alta, baja, modificación, inscripción o asistencia, para que los reportes
+no tengan que recorrer los almacenes.
+"""
+
+from almacen_inscripciones import iterar_inscripciones
+from almacen_asistencia import iterar_registros
+
+def crear_contador(valores=None):
+    """
+    Crea un contador por clave que conoce en todo momento su valor máximo.
+    Las claves se agrupan por nivel (valor actual) en 'niveles' {valor: {clave: None}},
+    así sumar o restar uno solo mueve la clave al nivel vecino y el máximo se
+    corrige sin recorrer el resto.
+
+    Args:
+        valores (dict, optional): Valores iniciales {clave: valor}
+
+    Returns:
+        dict: Contador {'valores', 'niveles', 'maximo'}
+    """
+    contador = {'valores': {}, 'niveles': {}, 'maximo': 0}
+    for clave, valor in (valores or {}).items():
+        if valor > 0:
+            contador['valores'][clave] = valor
+            contador['niveles'].setdefault(valor, {})[clave] = None
+            contador['maximo'] = max(contador['maximo'], valor)
+    return contador
+
+def sumar_contador(contador, clave, cantidad=1):
+    """
+    Suma (o resta, si cantidad es negativa) al valor de una clave.
+    Las claves que llegan a 0 se eliminan del contador.
+
+    Args:
+        contador (dict): Contador
+        clave: Clave a actualizar
+        cantidad (int, optional): Cantidad a sumar
+    """
+    valores = contador['valores']
+    niveles = contador['niveles']
+    anterior = valores.get(clave, 0)
+    nuevo = anterior + cantidad
+
+    if anterior:
+        nivel = niveles[anterior]
+        del nivel[clave]
+        if not nivel:
+            del niveles[anterior]
+    if nuevo > 0:
+        valores[clave] = nuevo
+        niveles.setdefault(nuevo, {})[clave] = None
+    else:
+        valores.pop(clave, None)
+
+    if nuevo > contador['maximo']:
+        contador['maximo'] = nuevo
+    elif contador['maximo'] not in niveles:
+        # Se vació el nivel máximo: tomar el mayor nivel ocupado en vez de bajar
+        # de a uno, que costaría O(cantidad restada)
+        contador['maximo'] = max(niveles, default=0)
+
+def maximo_contador(contador):
+    """
+    Devuelve la clave con mayor valor (O(1)). Ante empates, la primera que llegó a ese valor.
+
+    Args:
+        contador (dict): Contador
+
+    Returns:
+        tuple: (clave, valor), o (None, 0) si el contador está vacío
+    """
+    if not contador['maximo']:
+        return None, 0
+    return next(iter(contador['niveles'][contador['maximo']])), contador['maximo']
+
+def _valores_campo(registros, campo):
+    """
+    Recorre un campo de todos los registros, leyendo solo esa columna si el
+    almacén lo permite (socios y clases mapeados desde el snapshot binario).
+
+    Args:
+        registros (dict): Socios o clases
+        campo (str): Campo a recorrer
+
+    Returns:
+        iterable: Valores del campo
+    """
+    if hasattr(registros, 'columna'):
+        return (valor for _, valor in registros.columna(campo))
+    return (datos[campo] for datos in registros.values())
+
+def calcular_metricas(gimnasio):
+    """
+    Calcula las métricas recorriendo una vez el estado completo.
+    Se usa al crear o cargar el gimnasio; después se actualizan incrementalmente.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+
+    Returns:
+        dict: Métricas {'socios': {'total', 'activos'}, 'clases': {'total', 'activos'},
+              'inscripciones', 'inscriptos', 'asistencias', 'asistencias_socio',
+              'asistencias_clase'}
+    """
+    inscriptos = {}
+    for socio_id, clase_id in iterar_inscripciones(gimnasio['inscripciones']):
+        inscriptos[clase_id] = inscriptos.get(clase_id, 0) + 1
+
+    asistencias_socio = {}
+    asistencias_clase = {}
+    asistencias = 0
+    for (socio_id, clase_id), fechas in iterar_registros(gimnasio['matriz_asistencia']):
+        asistencias_socio[socio_id] = asistencias_socio.get(socio_id, 0) + len(fechas)
+        asistencias_clase[clase_id] = asistencias_clase.get(clase_id, 0) + len(fechas)
+        asistencias += len(fechas)
+
+    return {
+        'socios': {'total': len(gimnasio['socios']),
+                   'activos': sum(map(bool, _valores_campo(gimnasio['socios'], 'activo')))},
+        'clases': {'total': len(gimnasio['clases']),
+                   'activos': sum(map(bool, _valores_campo(gimnasio['clases'], 'activa')))},
+        'inscripciones': sum(inscriptos.values()),
+        'inscriptos': crear_contador(inscriptos),
+        'asistencias': asistencias,
+        'asistencias_socio': crear_contador(asistencias_socio),
+        'asistencias_clase': crear_contador(asistencias_clase)
+    }
+
+def contar_alta(metricas, entidad, activo=True):
+    """
+    Registra el alta de un socio o una clase.
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        entidad (str): 'socios' o 'clases'
+        activo (bool, optional): Estado del registro dado de alta
+    """
+    metricas[entidad]['total'] += 1
+    metricas[entidad]['activos'] += bool(activo)
+
+def contar_baja(metricas, entidad, activo):
+    """
+    Registra la baja de un socio o una clase.
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        entidad (str): 'socios' o 'clases'
+        activo (bool): Estado que tenía el registro dado de baja
+    """
+    metricas[entidad]['total'] -= 1
+    metricas[entidad]['activos'] -= bool(activo)
+
+def contar_cambio_estado(metricas, entidad, anterior, nuevo):
+    """
+    Registra la activación o desactivación de un socio o una clase.
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        entidad (str): 'socios' o 'clases'
+        anterior (bool): Estado anterior
+        nuevo (bool): Estado nuevo
+    """
+    metricas[entidad]['activos'] += bool(nuevo) - bool(anterior)
+
+def contar_inscripcion(metricas, clase_id, cantidad=1):
+    """
+    Registra una inscripción (cantidad=1) o una desinscripción (cantidad=-1).
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        clase_id (int): ID de la clase
+        cantidad (int, optional): Inscripciones agregadas (negativo si se eliminaron)
+    """
+    metricas['inscripciones'] += cantidad
+    sumar_contador(metricas['inscriptos'], clase_id, cantidad)
+
+def contar_asistencia(metricas, socio_id, clase_id):
+    """
+    Registra una asistencia nueva.
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+    """
+    metricas['asistencias'] += 1
+    sumar_contador(metricas['asistencias_socio'], socio_id)
+    sumar_contador(metricas['asistencias_clase'], clase_id)
+
+def descontar_asistencias(metricas, socio_id, clase_id, cantidad):
+    """
+    Descuenta las asistencias de un par (socio, clase) eliminado.
+
+    Args:
+        metricas (dict): Métricas del gimnasio
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        cantidad (int): Asistencias eliminadas
+    """
+    metricas['asistencias'] -= cantidad
+    sumar_contador(metricas['asistencias_socio'], socio_id, -cantidad)
+    sumar_contador(metricas['asistencias_clase'], clase_id, -cantidad)
@@ -0,0 +1,154 @@
+"""
+Módulo de paginación de listados para los menús del gimnasio.
+Muestra los listados de a una página por vez, con un cursor sobre los índices de
+listado (ver listados.py), y arma cada página en un buffer que se escribe con
+una sola llamada, así mostrar una página cuesta O(tamaño de página) y no O(N).
+"""
+
+import sys
+
+from listados import TAMANO_PAGINA
+
+# Comandos del selector: filtrar por nombre, buscar por DNI y cambiar de estado
+COMANDO_NOMBRE = '/'
+COMANDO_DNI = '#'
+COMANDO_ESTADO = '+'
+# Estados que se eligen con el comando '+'
+ESTADOS_COMANDO = {'a': 'activos', 'i': 'inactivos', 't': None}
+
+class SalidaBuffer:
+    """
+    Acumula líneas de salida y las escribe juntas al cerrarse (o con volcar).
+    Se usa como contexto: with SalidaBuffer() as salida: salida.escribir(...)
+    """
+
+    def __init__(self, destino=None):
+        self.destino = destino if destino is not None else sys.stdout
+        self.lineas = []
+
+    def escribir(self, linea=""):
+        self.lineas.append(linea)
+
+    def volcar(self):
+        if self.lineas:
+            self.destino.write("\n".join(self.lineas) + "\n")
+            self.destino.flush()
+            self.lineas = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.volcar()
+        return False
+
+def mostrar_pagina(filas, formatear, titulo=None, vacio="No hay resultados.", hay_mas=False):
+    """
+    Muestra una página de filas con una sola escritura.
+
+    Args:
+        filas (list): Filas (id, datos)
+        formatear (callable): Función (id, datos) -> str
+        titulo (str, optional): Título de la página
+        vacio (str, optional): Mensaje si no hay filas
+        hay_mas (bool, optional): Indica si hay una página siguiente
+    """
+    with SalidaBuffer() as salida:
+        if titulo:
+            salida.escribir(f"\n--- {titulo} ---")
+        if not filas:
+            salida.escribir(vacio)
+        for clave, datos in filas:
+            salida.escribir(formatear(clave, datos))
+        if hay_mas:
+            salida.escribir("(Enter: página siguiente)")
+
+def _ayuda(comandos, con_busqueda=False):
+    """
+    Devuelve la línea de ayuda de los comandos habilitados.
+
+    Args:
+        comandos (str): Comandos habilitados
+        con_busqueda (bool, optional): Indica si un texto libre busca
+
+    Returns:
+        str: Ayuda
+    """
+    partes = []
+    if con_busqueda:
+        partes.append("texto: buscar")
+    if COMANDO_NOMBRE in comandos:
+        partes.append("/texto: filtrar por nombre")
+    if COMANDO_DNI in comandos:
+        partes.append("#DNI: buscar por DNI")
+    if COMANDO_ESTADO in comandos:
+        partes.append("+a / +i / +t: activos, inactivos o todos")
+    return f"({' | '.join(partes)})" if partes else ""
+
+def elegir_id(paginar, formatear, mensaje, titulo=None, vacio="No hay resultados.", estado=None,
+              comandos=COMANDO_NOMBRE + COMANDO_ESTADO, tamano=TAMANO_PAGINA, buscar=None, listar=True):
+    """
+    Muestra un listado paginado y pide un ID. Además del ID se puede avanzar de
+    página con Enter, cambiar los filtros con los comandos habilitados y, si hay
+    búsqueda, escribir un texto para ver los mejores resultados. En la última
+    página, Enter (como cualquier texto que no sea un número, si no hay búsqueda)
+    lanza ValueError.
+
+    Args:
+        paginar (callable): Función de servicios (estado=, prefijo=, dni=, cursor=, tamano=) -> (filas, cursor)
+        formatear (callable): Función (id, datos) -> str
+        mensaje (str): Texto del input
+        titulo (str, optional): Título del listado
+        vacio (str, optional): Mensaje si el listado está vacío
+        estado (str, optional): Estado inicial (None, 'activos' o 'inactivos')
+        comandos (str, optional): Comandos habilitados ('/', '#', '+')
+        tamano (int, optional): Filas por página
+        buscar (callable, optional): Función (texto, estado) -> filas de la búsqueda libre
+        listar (bool, optional): Mostrar el listado antes de pedir el ID
+
+    Returns:
+        int: ID ingresado, o None si el listado inicial está vacío
+
+    Raises:
+        ValueError: Si la respuesta no es un número ni un comando
+    """
+    filtros = {'estado': estado}
+    cursor = None
+    siguiente = None
+    primera = True
+    mostrar = listar
+    ayuda = _ayuda(comandos, buscar is not None)
+    while True:
+        if mostrar:
+            filas, siguiente = paginar(cursor=cursor, tamano=tamano, **filtros)
+            if primera and not filas and cursor is None:
+                print(vacio)
+                return None
+            mostrar_pagina(filas, formatear, titulo, vacio, siguiente is not None)
+        if primera and ayuda:
+            print(ayuda)
+        primera = False
+        mostrar = True
+
+        respuesta = input(mensaje).strip()
+        if not respuesta and siguiente is not None:
+            cursor = siguiente
+            continue
+        comando, argumento = respuesta[:1], respuesta[1:].strip()
+        if comando == COMANDO_NOMBRE and comando in comandos:
+            filtros = {'estado': filtros['estado'], 'prefijo': argumento or None}
+        elif comando == COMANDO_DNI and comando in comandos and argumento:
+            filtros = {'estado': filtros['estado'], 'dni': argumento}
+        elif comando == COMANDO_ESTADO and comando in comandos and argumento.lower() in ESTADOS_COMANDO:
+            filtros = dict(filtros, estado=ESTADOS_COMANDO[argumento.lower()])
+        else:
+            try:
+                return int(respuesta)
+            except ValueError:
+                if buscar is None or not respuesta:
+                    raise
+            # Texto libre: mostrar los mejores resultados y volver a pedir el ID
+            mostrar_pagina(buscar(respuesta, filtros['estado']), formatear, "RESULTADOS", vacio)
+            siguiente = None
+            mostrar = False
+        cursor = None
@@ -0,0 +1,478 @@
+"""
+Módulo de persistencia para el sistema de gimnasio.
+Combina un diario de escritura anticipada (append-only, una línea JSON por cambio)
+con snapshots compactados periódicos en formato binario (ver snapshot_binario.py).
+Al iniciar se mapea el último snapshot y solo se reproduce la cola del diario
+posterior a él.
+"""
+
+import json
+import os
+import re
+
+from agenda import (crear_agenda, agendar_clase, quitar_clase_de_agenda, desagendar_profesor, agendar_inscripcion,
+                    desagendar_inscripcion)
+from almacen_inscripciones import crear_inscripciones, agregar_inscripcion, eliminar_inscripcion
+from almacen_asistencia import crear_asistencia, agregar_fecha
+from secuencias import crear_secuencias, avanzar_secuencia
+from indices_socios import crear_indices_socios, indexar_socio, desindexar_socio, reindexar_campo, CAMPOS_UNICOS
+from snapshot_binario import escribir_snapshot_binario, cargar_snapshot_binario, remapear_snapshot_binario
+from diferido import aplicar_en, Diferido
+from metricas import (calcular_metricas, contar_alta, contar_baja, contar_cambio_estado, contar_inscripcion,
+                      contar_asistencia)
+from registro_asistencia import registro_desde_matriz, agregar_registro
+from busqueda import crear_busqueda, agregar_a_busqueda, quitar_de_busqueda, CAMPOS_BUSQUEDA
+from cascada import crear_historico, dar_de_baja
+from indices_clases import crear_indices_clases, indexar_clase, desindexar_clase, reindexar_clase, contar_lugar
+from registros_compactos import crear_socios, crear_clases
+from listados import (crear_listados, agregar_a_listado, quitar_de_listado, mover_en_listado, crear_orden_nombres,
+                      agregar_por_nombre, quitar_por_nombre)
+from cubo import calcular_cubo, contar_asistencia_cubo, contar_inscripcion_cubo, contar_hechos_de
+
+DIRECTORIO_DATOS = 'datos'
+ARCHIVO_DIARIO = 'diario.jsonl'
+# Snapshots numerados por generación: el nuevo se escribe al lado del que está
+# mapeado y el anterior se borra después de remapear (en Windows un archivo
+# mapeado no se puede reemplazar ni borrar)
+ARCHIVO_GENERACION = 'snapshot-{:06d}.bin'
+PATRON_GENERACION = re.compile(r'snapshot-(\d+)\.bin')
+
+# Cantidad de eventos pendientes que dispara un fsync (commit en grupo)
+TAMANO_GRUPO = 64
+# Cantidad de eventos en el diario que dispara un snapshot compactado
+EVENTOS_POR_SNAPSHOT = 5000
+
+def crear_gimnasio():
+    """
+    Crea el estado vacío del gimnasio con todas sus estructuras.
+
+    Returns:
+        dict: Estado {'socios', 'clases', 'inscripciones', 'matriz_asistencia',
+              'secuencias', 'indices_socios', 'historico', 'metricas', 'registro_asistencia', 'cubo',
+              'listados', 'orden_nombres', 'busqueda_socios', 'indices_clases', 'agenda'}
+    """
+    # Socios y clases en columnas compactas (ver registros_compactos.py)
+    socios = crear_socios()
+    clases = crear_clases()
+    gimnasio = {
+        'socios': socios,
+        'clases': clases,
+        'inscripciones': crear_inscripciones(),
+        'matriz_asistencia': crear_asistencia(),
+        'secuencias': crear_secuencias(socios, clases),
+        'indices_socios': crear_indices_socios(socios),
+        'historico': crear_historico()
+    }
+    # Las métricas se calculan la primera vez que se consultan y desde ahí se
+    # actualizan en cada escritura
+    gimnasio['metricas'] = Diferido(lambda: calcular_metricas(gimnasio), reproducir=False)
+    # El registro columnar de asistencias se arma desde la matriz cuando se pide un reporte
+    gimnasio['registro_asistencia'] = Diferido(lambda: registro_desde_matriz(gimnasio['matriz_asistencia']),
+                                               reproducir=False)
+    # Los rollups de reportes se calculan con el primer reporte que los pide
+    gimnasio['cubo'] = Diferido(lambda: calcular_cubo(gimnasio), reproducir=False)
+    # Los índices de listado se arman con el primer listado paginado
+    gimnasio['listados'] = Diferido(lambda: crear_listados(gimnasio['socios'], gimnasio['clases']), reproducir=False)
+    gimnasio['orden_nombres'] = Diferido(lambda: crear_orden_nombres(gimnasio['socios']), reproducir=False)
+    # El índice de búsqueda por prefijo se arma con la primera búsqueda
+    gimnasio['busqueda_socios'] = Diferido(lambda: crear_busqueda(gimnasio['socios']), reproducir=False)
+    # Los índices de clases (profesor, horario, lugares libres) se arman con la primera consulta
+    gimnasio['indices_clases'] = Diferido(lambda: crear_indices_clases(gimnasio['clases'], gimnasio['inscripciones']),
+                                          reproducir=False)
+    # La agenda semanal de socios y profesores se arma con la primera verificación de horarios
+    gimnasio['agenda'] = Diferido(lambda: crear_agenda(gimnasio['clases'], gimnasio['inscripciones']), reproducir=False)
+    return gimnasio
+
+def aplicar_evento(gimnasio, evento):
+    """
+    Aplica un evento del diario sobre el estado (usado al reproducir el diario).
+    Los cambios sobre almacenes que todavía no se leyeron del snapshot se postergan
+    hasta su primer uso, para no perder el arranque diferido.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        evento (dict): Evento con la clave 'op' y sus datos
+    """
+    op = evento['op']
+    socios = gimnasio['socios']
+    clases = gimnasio['clases']
+
+    if op == 'alta_socio':
+        socios[evento['id']] = evento['datos']
+        aplicar_en(gimnasio['metricas'], contar_alta, 'socios', evento['datos']['activo'])
+        aplicar_en(gimnasio['indices_socios'], indexar_socio, evento['id'], evento['datos'])
+        aplicar_en(gimnasio['listados'], agregar_a_listado, 'socios', evento['id'], evento['datos']['activo'])
+        aplicar_en(gimnasio['orden_nombres'], agregar_por_nombre, socios, evento['id'])
+        aplicar_en(gimnasio['busqueda_socios'], agregar_a_busqueda, socios, evento['id'])
+        avanzar_secuencia(gimnasio['secuencias'], 'socios', evento['id'])
+    elif op == 'baja_socio':
+        if evento['id'] in socios:
+            aplicar_en(gimnasio['indices_socios'], desindexar_socio, evento['id'], socios[evento['id']])
+            aplicar_en(gimnasio['metricas'], contar_baja, 'socios', socios[evento['id']]['activo'])
+            aplicar_en(gimnasio['listados'], quitar_de_listado, 'socios', evento['id'], socios[evento['id']]['activo'])
+            aplicar_en(gimnasio['orden_nombres'], quitar_por_nombre, socios, evento['id'])
+            aplicar_en(gimnasio['busqueda_socios'], quitar_de_busqueda, socios, evento['id'])
+            dar_de_baja(gimnasio, 'socios', evento['id'], evento.get('historial', False))
+    elif op == 'modificar_socio':
+        socio = socios[evento['id']]
+        if evento['campo'] in CAMPOS_UNICOS:
+            aplicar_en(gimnasio['indices_socios'], reindexar_campo, evento['id'], evento['campo'],
+                       socio[evento['campo']], evento['valor'])
+        elif evento['campo'] == 'activo':
+            aplicar_en(gimnasio['metricas'], contar_cambio_estado, 'socios', socio['activo'], evento['valor'])
+            aplicar_en(gimnasio['listados'], mover_en_listado, 'socios', evento['id'], socio['activo'], evento['valor'])
+        reatribuir = evento['campo'] == 'fecha_alta'
+        reordenar = evento['campo'] in ('nombre', 'apellido')
+        reindexar = evento['campo'] in CAMPOS_BUSQUEDA
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, -1, evento['id'])
+        if reordenar:
+            aplicar_en(gimnasio['orden_nombres'], quitar_por_nombre, socios, evento['id'])
+        if reindexar:
+            aplicar_en(gimnasio['busqueda_socios'], quitar_de_busqueda, socios, evento['id'], (evento['campo'],))
+        socio[evento['campo']] = evento['valor']
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, 1, evento['id'])
+        if reordenar:
+            aplicar_en(gimnasio['orden_nombres'], agregar_por_nombre, socios, evento['id'])
+        if reindexar:
+            aplicar_en(gimnasio['busqueda_socios'], agregar_a_busqueda, socios, evento['id'], (evento['campo'],))
+    elif op == 'alta_clase':
+        clases[evento['id']] = evento['datos']
+        aplicar_en(gimnasio['metricas'], contar_alta, 'clases', evento['datos']['activa'])
+        aplicar_en(gimnasio['listados'], agregar_a_listado, 'clases', evento['id'], evento['datos']['activa'])
+        aplicar_en(gimnasio['indices_clases'], indexar_clase, evento['id'], evento['datos'])
+        aplicar_en(gimnasio['agenda'], agendar_clase, gimnasio['inscripciones'], evento['id'], evento['datos'])
+        avanzar_secuencia(gimnasio['secuencias'], 'clases', evento['id'])
+    elif op == 'baja_clase':
+        if evento['id'] in clases:
+            aplicar_en(gimnasio['metricas'], contar_baja, 'clases', clases[evento['id']]['activa'])
+            aplicar_en(gimnasio['listados'], quitar_de_listado, 'clases', evento['id'], clases[evento['id']]['activa'])
+            aplicar_en(gimnasio['indices_clases'], desindexar_clase, evento['id'], clases[evento['id']])
+            aplicar_en(gimnasio['agenda'], desagendar_profesor, evento['id'], clases[evento['id']])
+            dar_de_baja(gimnasio, 'clases', evento['id'], evento.get('historial', False))
+    elif op == 'modificar_clase':
+        clase = clases[evento['id']]
+        if evento['campo'] == 'activa':
+            aplicar_en(gimnasio['metricas'], contar_cambio_estado, 'clases', clase['activa'], evento['valor'])
+            aplicar_en(gimnasio['listados'], mover_en_listado, 'clases', evento['id'], clase['activa'], evento['valor'])
+        reatribuir = evento['campo'] == 'profesor'
+        reagendar = evento['campo'] in ('profesor', 'horario', 'duracion', 'activa')
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, -1, None, evento['id'])
+        if reagendar:
+            aplicar_en(gimnasio['agenda'], quitar_clase_de_agenda, gimnasio['inscripciones'], evento['id'], clase)
+        aplicar_en(gimnasio['indices_clases'], reindexar_clase, evento['id'], evento['campo'],
+                   clase[evento['campo']], evento['valor'])
+        clase[evento['campo']] = evento['valor']
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, 1, None, evento['id'])
+        if reagendar:
+            aplicar_en(gimnasio['agenda'], agendar_clase, gimnasio['inscripciones'], evento['id'], clase)
+    elif op == 'reservar_ids':
+        avanzar_secuencia(gimnasio['secuencias'], evento['entidad'], evento['hasta'])
+    elif op == 'inscribir':
+        aplicar_en(gimnasio['inscripciones'], agregar_inscripcion, evento['socio_id'], evento['clase_id'])
+        aplicar_en(gimnasio['metricas'], contar_inscripcion, evento['clase_id'], 1)
+        aplicar_en(gimnasio['cubo'], contar_inscripcion_cubo, gimnasio, evento['socio_id'], evento['clase_id'], 1)
+        aplicar_en(gimnasio['indices_clases'], contar_lugar, evento['clase_id'], 1)
+        aplicar_en(gimnasio['agenda'], agendar_inscripcion, clases, evento['socio_id'], evento['clase_id'])
+    elif op == 'desinscribir':
+        aplicar_en(gimnasio['inscripciones'], eliminar_inscripcion, evento['socio_id'], evento['clase_id'])
+        aplicar_en(gimnasio['metricas'], contar_inscripcion, evento['clase_id'], -1)
+        aplicar_en(gimnasio['cubo'], contar_inscripcion_cubo, gimnasio, evento['socio_id'], evento['clase_id'], -1)
+        aplicar_en(gimnasio['indices_clases'], contar_lugar, evento['clase_id'], -1)
+        aplicar_en(gimnasio['agenda'], desagendar_inscripcion, clases, evento['socio_id'], evento['clase_id'])
+    elif op == 'asistencia':
+        dia = evento['dia']
+        aplicar_en(gimnasio['matriz_asistencia'], agregar_fecha, evento['socio_id'], evento['clase_id'], dia)
+        aplicar_en(gimnasio['metricas'], contar_asistencia, evento['socio_id'], evento['clase_id'])
+        aplicar_en(gimnasio['registro_asistencia'], agregar_registro, evento['socio_id'], evento['clase_id'], dia)
+        aplicar_en(gimnasio['cubo'], contar_asistencia_cubo, gimnasio, evento['socio_id'], evento['clase_id'], dia)
+    else:
+        raise ValueError(f"Evento desconocido en el diario: {op}")
+
+def registrar_evento(diario, op, **datos):
+    """
+    Registra un cambio en el diario. Si no hay diario (modo en memoria) no hace nada.
+    Los eventos se acumulan y se escriben con un único fsync por grupo.
+
+    Args:
+        diario (dict): Diario abierto, o None
+        op (str): Operación ('alta_socio', 'inscribir', 'asistencia', ...)
+        **datos: Datos del evento
+    """
+    if diario is None:
+        return
+    diario['seq'] += 1
+    evento = {'seq': diario['seq'], 'op': op}
+    evento.update(datos)
+    if diario['lote'] is not None:
+        evento['lote'] = diario['lote']
+    diario['pendientes'].append(json.dumps(evento, ensure_ascii=False))
+    # Dentro de un lote no se confirma por tamaño: el lote se escribe entero al cerrarlo
+    if len(diario['pendientes']) >= diario['tamano_grupo'] and diario['lote'] is None:
+        confirmar_diario(diario)
+
+def iniciar_lote(diario):
+    """
+    Abre un lote de eventos que se confirma de forma atómica: al reproducir el
+    diario, un lote sin su marca de cierre (caída a mitad de la escritura) se
+    descarta completo.
+
+    Args:
+        diario (dict): Diario abierto, o None
+    """
+    if diario is None:
+        return
+    _escribir_pendientes(diario)
+    diario['lote'] = diario['seq'] + 1
+
+def confirmar_lote(diario):
+    """
+    Cierra el lote abierto: escribe sus eventos y la marca de cierre con un solo fsync.
+    No toma snapshots; quien carga muchos lotes decide cuándo compactar.
+
+    Args:
+        diario (dict): Diario abierto, o None
+    """
+    if diario is None or diario['lote'] is None:
+        return
+    lote, diario['lote'] = diario['lote'], None
+    if diario['pendientes']:
+        diario['seq'] += 1
+        diario['pendientes'].append(json.dumps({'seq': diario['seq'], 'op': 'fin_lote', 'lote': lote}))
+        _escribir_pendientes(diario)
+
+def _escribir_pendientes(diario):
+    """
+    Escribe los eventos pendientes y los hace durables con un solo fsync.
+
+    Args:
+        diario (dict): Diario abierto
+    """
+    if not diario['pendientes']:
+        return
+    archivo = diario['archivo']
+    archivo.write('\n'.join(diario['pendientes']) + '\n')
+    archivo.flush()
+    os.fsync(archivo.fileno())
+    diario['eventos_en_diario'] += len(diario['pendientes'])
+    diario['pendientes'] = []
+
+def confirmar_diario(diario):
+    """
+    Confirma los eventos pendientes (commit en grupo).
+    Si el diario creció lo suficiente, toma un snapshot compactado.
+
+    Args:
+        diario (dict): Diario abierto, o None
+    """
+    if diario is None or not diario['pendientes']:
+        return
+    _escribir_pendientes(diario)
+    if diario['eventos_en_diario'] >= diario['eventos_por_snapshot']:
+        tomar_snapshot(diario)
+
+def _escribir_atomico(ruta, escribir):
+    """
+    Escribe un archivo binario de forma atómica (archivo temporal + fsync + rename).
+
+    Args:
+        ruta (str): Ruta destino
+        escribir (callable): Función que recibe el archivo abierto y escribe el contenido
+    """
+    ruta_temporal = ruta + '.tmp'
+    with open(ruta_temporal, 'wb') as archivo:
+        escribir(archivo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(ruta_temporal, ruta)
+
+def _snapshots(directorio):
+    """
+    Lista los snapshots binarios de un directorio.
+
+    Args:
+        directorio (str): Directorio de datos
+
+    Returns:
+        list: Tuplas (generacion, ruta), de la más vieja a la más nueva
+    """
+    snapshots = []
+    for nombre in os.listdir(directorio):
+        coincidencia = PATRON_GENERACION.fullmatch(nombre)
+        if coincidencia:
+            snapshots.append((int(coincidencia.group(1)), os.path.join(directorio, nombre)))
+    return sorted(snapshots)
+
+def _borrar_snapshots_anteriores(directorio, generacion):
+    """
+    Borra los snapshots de generaciones anteriores a una dada.
+    Si uno no se puede borrar (sigue mapeado en Windows) queda para la próxima carga.
+
+    Args:
+        directorio (str): Directorio de datos
+        generacion (int): Generación vigente
+    """
+    for numero, ruta in _snapshots(directorio):
+        if numero < generacion:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+def escribir_snapshot(diario):
+    """
+    Escribe un snapshot compactado del estado como la generación siguiente, sin
+    tocar el snapshot vigente ni el diario. Solo lee el estado: puede correr en
+    otro hilo mientras nadie lo modifique. Lo completa adoptar_snapshot.
+
+    Args:
+        diario (dict): Diario abierto
+
+    Returns:
+        str: Ruta del snapshot escrito
+    """
+    _escribir_pendientes(diario)
+    ruta = os.path.join(diario['directorio'], ARCHIVO_GENERACION.format(diario['generacion'] + 1))
+    _escribir_atomico(ruta, lambda archivo: escribir_snapshot_binario(archivo, diario['gimnasio'], diario['seq']))
+    return ruta
+
+def adoptar_snapshot(diario, ruta):
+    """
+    Pasa el estado a leer del snapshot recién escrito por escribir_snapshot,
+    borra los anteriores y vacía el diario. Entre las dos llamadas no puede
+    haber cambios: el diario se vacía entero.
+    El snapshot registra el último número de secuencia que contiene, así una
+    caída entre el snapshot y el vaciado del diario no duplica eventos.
+
+    Args:
+        diario (dict): Diario abierto
+        ruta (str): Ruta devuelta por escribir_snapshot
+    """
+    remapear_snapshot_binario(diario['gimnasio'], ruta)
+    diario['generacion'] += 1
+    _borrar_snapshots_anteriores(diario['directorio'], diario['generacion'])
+
+    # Vaciar el diario: todo su contenido ya está en el snapshot
+    diario['archivo'].close()
+    diario['archivo'] = open(os.path.join(diario['directorio'], ARCHIVO_DIARIO), 'w', encoding='utf-8')
+    diario['eventos_en_diario'] = 0
+
+def tomar_snapshot(diario):
+    """
+    Guarda un snapshot compactado del estado y vacía el diario.
+
+    Args:
+        diario (dict): Diario abierto
+    """
+    adoptar_snapshot(diario, escribir_snapshot(diario))
+
+def _leer_diario(ruta):
+    """
+    Lee los eventos del diario. Una última línea incompleta (escritura
+    interrumpida por una caída) se descarta y se recorta del archivo para
+    que los eventos nuevos no queden pegados a ella. Lo mismo pasa con un
+    lote final sin su marca de cierre.
+
+    Args:
+        ruta (str): Ruta del diario
+
+    Returns:
+        list: Eventos leídos
+    """
+    eventos = []
+    if not os.path.exists(ruta):
+        return eventos
+    posicion_valida = 0
+    inicio_lote = None
+    eventos_lote = []
+    with open(ruta, 'rb') as archivo:
+        for linea in archivo:
+            if not linea.endswith(b'\n'):
+                break
+            try:
+                evento = json.loads(linea) if linea.strip() else None
+            except json.JSONDecodeError:
+                break
+            if evento is None:
+                pass
+            elif evento['op'] == 'fin_lote':
+                eventos.extend(eventos_lote)
+                inicio_lote, eventos_lote = None, []
+            elif 'lote' in evento:
+                if inicio_lote is None:
+                    inicio_lote = posicion_valida
+                eventos_lote.append(evento)
+            else:
+                eventos.append(evento)
+            posicion_valida += len(linea)
+    if inicio_lote is not None:
+        posicion_valida = inicio_lote
+    if posicion_valida < os.path.getsize(ruta):
+        os.truncate(ruta, posicion_valida)
+    return eventos
+
+def cargar_gimnasio(directorio=DIRECTORIO_DATOS, tamano_grupo=TAMANO_GRUPO,
+                    eventos_por_snapshot=EVENTOS_POR_SNAPSHOT):
+    """
+    Carga el estado persistido: último snapshot más la cola del diario.
+    Devuelve también el diario abierto para registrar los cambios siguientes.
+
+    Args:
+        directorio (str): Directorio de datos
+        tamano_grupo (int): Eventos por fsync
+        eventos_por_snapshot (int): Eventos del diario que disparan un snapshot
+
+    Returns:
+        tuple: (gimnasio, diario)
+    """
+    os.makedirs(directorio, exist_ok=True)
+    snapshots = _snapshots(directorio)
+    ruta_diario = os.path.join(directorio, ARCHIVO_DIARIO)
+
+    generacion = 0
+    if snapshots:
+        generacion, ruta_snapshot = snapshots[-1]
+        gimnasio, seq = cargar_snapshot_binario(ruta_snapshot)
+        # Restos de una compactación que se cortó antes de borrar los anteriores
+        _borrar_snapshots_anteriores(directorio, generacion)
+    else:
+        gimnasio, seq = crear_gimnasio(), 0
+
+    # Reproducir solo los eventos posteriores al snapshot
+    eventos_en_diario = 0
+    for evento in _leer_diario(ruta_diario):
+        if evento['seq'] > seq:
+            aplicar_evento(gimnasio, evento)
+            seq = evento['seq']
+        eventos_en_diario += 1
+
+    diario = {
+        'directorio': directorio,
+        'archivo': open(ruta_diario, 'a', encoding='utf-8'),
+        'gimnasio': gimnasio,
+        'seq': seq,
+        'pendientes': [],
+        'lote': None,
+        'eventos_en_diario': eventos_en_diario,
+        'tamano_grupo': tamano_grupo,
+        'eventos_por_snapshot': eventos_por_snapshot,
+        'generacion': generacion
+    }
+    return gimnasio, diario
+
+def cerrar_diario(diario):
+    """
+    Confirma los eventos pendientes, compacta si hubo cambios y cierra el diario.
+
+    Args:
+        diario (dict): Diario abierto
+    """
+    if diario is None:
+        return
+    _escribir_pendientes(diario)
+    if diario['eventos_en_diario']:
+        tomar_snapshot(diario)
+    diario['archivo'].close()
@@ -0,0 +1,282 @@
+"""
+Módulo del registro columnar de asistencias para el sistema de gimnasio.
+Guarda cada asistencia como una fila en tres columnas paralelas (socio_id,
+clase_id, día como ordinal) que solo crecen, para calcular estadísticas de
+todo el historial o de un rango de fechas con agrupaciones vectorizadas
+(bincount, argmax) en lugar de recorrer la matriz de asistencia.
+
+Cada asistencia queda guardada dos veces: en los bitmaps por (socio, clase) de
+almacen_asistencia.py, que responden "¿asistió tal día?" y evitan duplicados, y
+en estas columnas, unos 12 bytes por fila. Se acepta esa memoria extra porque
+las agregaciones sobre las columnas son vectorizables y sobre los bitmaps no; el
+registro siempre se puede reconstruir desde la matriz (registro_desde_matriz).
+
+NumPy es opcional: si no está instalado las columnas son array('I') y las
+agregaciones se hacen en Python puro, con los mismos resultados.
+"""
+
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from almacen_asistencia import iterar_registros
+from instrumentacion import contar_escaneados
+
+COLUMNAS = ('socio', 'clase', 'dia')
+# Capacidad inicial de las columnas NumPy (se duplica al llenarse)
+CAPACIDAD_INICIAL = 1024
+
+def crear_registro(socios=(), clases=(), dias=()):
+    """
+    Crea el registro columnar, opcionalmente con filas iniciales.
+
+    Args:
+        socios (iterable, optional): Columna de IDs de socios
+        clases (iterable, optional): Columna de IDs de clases
+        dias (iterable, optional): Columna de días (ordinales)
+
+    Returns:
+        dict: Registro {'socio', 'clase', 'dia', 'cantidad', 'socios_borrados',
+              'clases_borradas'}; con NumPy las columnas tienen capacidad de sobra
+              y solo valen las primeras 'cantidad' filas
+    """
+    if np is None:
+        registro = {columna: _arreglo(valores) for columna, valores in zip(COLUMNAS, (socios, clases, dias))}
+    else:
+        # np.array copia: con asarray, sobre las secciones de un snapshot mapeado la
+        # columna sería una vista que mantendría vivo el mapeo y no se podría remapear
+        registro = {columna: np.array(valores, dtype=np.uint32)
+                    for columna, valores in zip(COLUMNAS, (socios, clases, dias))}
+    registro['cantidad'] = len(registro['dia'])
+    # Filas de socios y clases eliminados en cascada: se descartan al leer
+    registro['socios_borrados'] = set()
+    registro['clases_borradas'] = set()
+    if np is not None:
+        _reservar(registro, max(CAPACIDAD_INICIAL, registro['cantidad']))
+    return registro
+
+def _arreglo(valores):
+    """
+    Copia una columna a un array('I'); las vistas de memoria (secciones de un
+    snapshot mapeado) se copian en bloque.
+
+    Args:
+        valores (iterable): Valores de la columna
+
+    Returns:
+        array: Columna
+    """
+    columna = array('I')
+    if isinstance(valores, memoryview):
+        columna.frombytes(valores.cast('B'))
+    else:
+        columna.extend(valores)
+    return columna
+
+def registro_desde_matriz(matriz_asistencia):
+    """
+    Construye el registro a partir de la matriz de asistencia.
+
+    Args:
+        matriz_asistencia (dict): Almacén de asistencia
+
+    Returns:
+        dict: Registro columnar
+    """
+    socios, clases, dias = array('I'), array('I'), array('I')
+    for (socio_id, clase_id), dias_par in iterar_registros(matriz_asistencia):
+        socios.extend([socio_id] * len(dias_par))
+        clases.extend([clase_id] * len(dias_par))
+        dias.extend(dias_par)
+    return crear_registro(socios, clases, dias)
+
+def _reservar(registro, capacidad):
+    """
+    Agranda las columnas NumPy hasta la capacidad pedida, conservando las filas.
+
+    Args:
+        registro (dict): Registro columnar
+        capacidad (int): Filas mínimas
+    """
+    for columna in COLUMNAS:
+        actual = registro[columna]
+        if len(actual) < capacidad:
+            nueva = np.empty(capacidad, dtype=np.uint32)
+            nueva[:registro['cantidad']] = actual[:registro['cantidad']]
+            registro[columna] = nueva
+
+def agregar_registro(registro, socio_id, clase_id, dia):
+    """
+    Agrega una asistencia al final del registro (O(1) amortizado).
+
+    Args:
+        registro (dict): Registro columnar
+        socio_id (int): ID del socio
+        clase_id (int): ID de la clase
+        dia (int): Ordinal del día
+    """
+    fila = registro['cantidad']
+    if np is None:
+        registro['socio'].append(socio_id)
+        registro['clase'].append(clase_id)
+        registro['dia'].append(dia)
+    else:
+        if fila == len(registro['dia']):
+            _reservar(registro, 2 * fila)
+        registro['socio'][fila] = socio_id
+        registro['clase'][fila] = clase_id
+        registro['dia'][fila] = dia
+    registro['cantidad'] = fila + 1
+
+def quitar_filas_de(registro, socio_id=None, clase_id=None):
+    """
+    Descarta las filas de un socio o de una clase eliminados en cascada.
+    Las columnas solo crecen, así que las filas quedan marcadas y se filtran al
+    leer; desaparecen del todo con el próximo snapshot.
+
+    Args:
+        registro (dict): Registro columnar
+        socio_id (int, optional): ID del socio
+        clase_id (int, optional): ID de la clase (si no se indica socio_id)
+    """
+    if socio_id is not None:
+        registro['socios_borrados'].add(socio_id)
+    else:
+        registro['clases_borradas'].add(clase_id)
+
+def _filas(registro, desde=None, hasta=None):
+    """
+    Devuelve las columnas de las filas válidas (sin las de socios y clases
+    eliminados), filtradas por rango de días.
+
+    Args:
+        registro (dict): Registro columnar
+        desde (int, optional): Primer día del rango (incluido)
+        hasta (int, optional): Último día del rango (incluido)
+
+    Returns:
+        tuple: (socios, clases, dias)
+    """
+    cantidad = registro['cantidad']
+    socios, clases, dias = (registro[columna][:cantidad] for columna in COLUMNAS)
+    socios_borrados = registro['socios_borrados']
+    clases_borradas = registro['clases_borradas']
+    if desde is None and hasta is None and not socios_borrados and not clases_borradas:
+        return socios, clases, dias
+
+    if np is None:
+        filas = [fila for fila, dia in enumerate(dias)
+                 if (desde is None or dia >= desde) and (hasta is None or dia <= hasta)
+                 and socios[fila] not in socios_borrados and clases[fila] not in clases_borradas]
+        return ([columna[fila] for fila in filas] for columna in (socios, clases, dias))
+
+    mascara = np.ones(cantidad, dtype=bool)
+    if desde is not None:
+        mascara &= dias >= desde
+    if hasta is not None:
+        mascara &= dias <= hasta
+    if socios_borrados:
+        mascara &= ~np.isin(socios, list(socios_borrados))
+    if clases_borradas:
+        mascara &= ~np.isin(clases, list(clases_borradas))
+    return socios[mascara], clases[mascara], dias[mascara]
+
+def _conteos(valores):
+    """
+    Cuenta las filas por valor (bincount con NumPy).
+
+    Args:
+        valores: Columna de IDs
+
+    Returns:
+        array | Counter: Conteo por ID (índice = ID con NumPy)
+    """
+    if np is None:
+        return Counter(valores)
+    return np.bincount(valores)
+
+def _mayor(conteos, existe):
+    """
+    Devuelve el ID con más filas entre los que siguen existiendo.
+    Ante empates gana el menor ID.
+
+    Args:
+        conteos (array | Counter): Conteo por ID
+        existe (callable): Indica si un ID sigue existiendo
+
+    Returns:
+        tuple: (id, cantidad), o (None, 0) si no hay ninguno
+    """
+    if np is None:
+        candidatos = sorted(conteos.items(), key=lambda item: (-item[1], item[0]))
+    else:
+        if not len(conteos):
+            return None, 0
+        # Caso común: el máximo (argmax) existe y no hace falta ordenar
+        primero = int(np.argmax(conteos))
+        if existe(primero):
+            return (primero, int(conteos[primero])) if conteos[primero] else (None, 0)
+        orden = np.argsort(-conteos.astype(np.int64), kind='stable')
+        candidatos = ((int(clave), int(conteos[clave])) for clave in orden)
+    for clave, cantidad in candidatos:
+        if not cantidad:
+            break
+        if existe(clave):
+            return clave, cantidad
+    return None, 0
+
+def _distintos(conteos):
+    """
+    Cuenta los IDs con al menos una fila.
+
+    Args:
+        conteos (array | Counter): Conteo por ID
+
+    Returns:
+        int: Cantidad de IDs distintos
+    """
+    if np is None:
+        return len(conteos)
+    return int(np.count_nonzero(conteos))
+
+def estadisticas_registro(registro, desde=None, hasta=None, socio_existe=None, clase_existe=None):
+    """
+    Calcula las estadísticas de asistencia de un rango de días (o de todo el historial)
+    con agrupaciones por socio, por clase y por día de la semana.
+
+    Args:
+        registro (dict): Registro columnar
+        desde (int, optional): Primer día del rango (incluido)
+        hasta (int, optional): Último día del rango (incluido)
+        socio_existe (callable, optional): Filtro de socios para el máximo (los dados de baja no cuentan)
+        clase_existe (callable, optional): Filtro de clases para el máximo
+
+    Returns:
+        dict: {'total', 'socios_distintos', 'clases_distintas', 'max_socio', 'max_clase',
+               'por_dia_semana'} con los máximos como (id, cantidad) y
+               'por_dia_semana' como lista de 7 totales (lunes a domingo)
+    """
+    contar_escaneados(registro['cantidad'])
+    socios, clases, dias = _filas(registro, desde, hasta)
+    if np is None:
+        socios, clases, dias = list(socios), list(clases), list(dias)
+        # El ordinal 1 (01/01/0001) fue lunes: (ordinal - 1) % 7 da 0 = lunes
+        por_dia = Counter((dia - 1) % 7 for dia in dias)
+        por_dia_semana = [por_dia.get(dia_semana, 0) for dia_semana in range(7)]
+    else:
+        por_dia_semana = np.bincount((dias - 1) % 7, minlength=7).tolist()
+
+    por_socio = _conteos(socios)
+    por_clase = _conteos(clases)
+    return {
+        'total': len(dias),
+        'socios_distintos': _distintos(por_socio),
+        'clases_distintas': _distintos(por_clase),
+        'max_socio': _mayor(por_socio, socio_existe or (lambda clave: True)),
+        'max_clase': _mayor(por_clase, clase_existe or (lambda clave: True)),
+        'por_dia_semana': por_dia_semana
+    }
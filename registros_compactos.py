@@ -0,0 +1,379 @@
+"""
+Módulo de almacenamiento compacto de socios y clases.
+Guarda los registros en columnas paralelas (struct-of-arrays) en lugar de un
+diccionario por registro: los textos únicos (DNI, email, teléfono) van a un
+único bytearray con su desplazamiento y largo, y los valores que se repiten
+(nombres, profesores, horarios, fechas, la ciudad de la dirección) se codifican
+con un diccionario de valores y se guarda solo su código.
+
+RegistrosCompactos se usa como un diccionario {id: datos}; cada registro se
+devuelve como una vista que lee y escribe directamente en las columnas, así las
+modificaciones sobre el registro devuelto persisten igual que con un dict.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+# Tipos de columna:
+#   texto      Bytes UTF-8 en el bytearray compartido (desplazamiento y largo)
+#   categoria  Código en el diccionario de valores de la columna
+#   direccion  Calle como texto y ciudad (lo que sigue a la última coma) como categoría
+#   bool       Un byte
+#   int        Entero de 64 bits
+ESQUEMA_SOCIOS = (
+    ('nombre', 'categoria'), ('apellido', 'categoria'), ('dni', 'texto'), ('email', 'texto'),
+    ('telefono', 'texto'), ('fecha_nacimiento', 'categoria'), ('direccion', 'direccion'),
+    ('fecha_alta', 'categoria'), ('activo', 'bool')
+)
+ESQUEMA_CLASES = (
+    ('nombre', 'categoria'), ('profesor', 'categoria'), ('cupo', 'int'),
+    ('horario', 'categoria'), ('duracion', 'categoria'), ('activa', 'bool')
+)
+
+# Código de ciudad para las direcciones sin coma
+SIN_CIUDAD = 0
+
+class DiccionarioValores:
+    """
+    Codificación por diccionario de una columna: cada valor distinto se guarda
+    una sola vez y los registros guardan su código (desde 1).
+    """
+
+    __slots__ = ('valores', 'codigos')
+
+    def __init__(self):
+        self.valores = [None]   # El código 0 queda reservado
+        self.codigos = {}
+
+    def codificar(self, valor):
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def __len__(self):
+        return len(self.valores) - 1
+
+class VistaRegistro(MutableMapping):
+    """
+    Registro de un RegistrosCompactos visto como diccionario. No copia datos:
+    cada lectura y escritura va a las columnas del almacén.
+    """
+
+    __slots__ = ('_almacen', '_fila')
+
+    def __init__(self, almacen, fila):
+        self._almacen = almacen
+        self._fila = fila
+
+    def __getitem__(self, campo):
+        return self._almacen._lectores[campo](self._fila)
+
+    def __setitem__(self, campo, valor):
+        self._almacen._escribir(self._fila, campo, valor)
+
+    def __delitem__(self, campo):
+        raise TypeError("Los campos de un registro compacto no se pueden quitar.")
+
+    def __iter__(self):
+        return iter(self._almacen._campos)
+
+    def __len__(self):
+        return len(self._almacen._campos)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+class RegistrosCompactos(MutableMapping):
+    """
+    Diccionario {id: datos} de socios o clases guardado en columnas.
+    Los IDs se guardan en un array y se buscan por bisección (las secuencias
+    solo avanzan, así que las altas se agregan al final en orden; las pocas que
+    llegan fuera de orden se ubican con un diccionario aparte). Las filas
+    dadas de baja se marcan y sus datos se conservan, para que las vistas ya
+    devueltas sigan siendo válidas; los registros que no respetan el esquema
+    se guardan tal cual aparte.
+    """
+
+    def __init__(self, esquema, registros=None):
+        self._esquema = dict(esquema)
+        self._campos = tuple(campo for campo, _ in esquema)
+        self._ids = array('I')
+        self._vivos = bytearray()
+        self._cantidad = 0
+        self._ordenadas = 0         # Filas iniciales con los IDs en orden ascendente
+        self._fuera_de_orden = {}   # {id: fila} de las filas siguientes
+        self._irregulares = {}      # {id: dict} registros con otros campos
+        self._textos = bytearray()
+        self._desperdicio = 0       # Bytes de textos reemplazados
+        self._columnas = {}
+        for campo, tipo in esquema:
+            if tipo == 'texto':
+                self._columnas[campo] = (array('Q'), array('I'))
+            elif tipo == 'categoria':
+                self._columnas[campo] = (array('I'), DiccionarioValores())
+            elif tipo == 'direccion':
+                self._columnas[campo] = (array('Q'), array('I'), array('I'), DiccionarioValores())
+            elif tipo == 'bool':
+                self._columnas[campo] = bytearray()
+            elif tipo == 'int':
+                self._columnas[campo] = array('q')
+            else:
+                raise ValueError(f"Tipo de columna desconocido: {tipo}")
+        self._lectores = {campo: self._crear_lector(campo, tipo) for campo, tipo in esquema}
+        if registros:
+            self.update(registros)
+
+    # ---- Filas ----
+
+    def _fila(self, clave):
+        if not isinstance(clave, int):
+            return -1
+        fila = bisect_left(self._ids, clave, 0, self._ordenadas)
+        if fila < self._ordenadas and self._ids[fila] == clave:
+            return fila
+        return self._fuera_de_orden.get(clave, -1)
+
+    def _guardar_texto(self, texto):
+        datos = texto.encode('utf-8')
+        inicio = len(self._textos)
+        self._textos += datos
+        return inicio, len(datos)
+
+    def _leer_texto(self, inicio, largo):
+        return self._textos[inicio:inicio + largo].decode('utf-8')
+
+    def _agregar_fila(self, clave, datos):
+        fila = len(self._ids)
+        en_orden = fila == self._ordenadas and (not fila or clave > self._ids[-1])
+        self._vivos.append(1)
+        for campo, tipo in self._esquema.items():
+            columna = self._columnas[campo]
+            valor = datos[campo]
+            if tipo == 'texto':
+                inicio, largo = self._guardar_texto(valor)
+                columna[0].append(inicio)
+                columna[1].append(largo)
+            elif tipo == 'categoria':
+                columna[0].append(columna[1].codificar(valor))
+            elif tipo == 'direccion':
+                calle, ciudad = self._partir_direccion(valor, columna[3])
+                inicio, largo = self._guardar_texto(calle)
+                columna[0].append(inicio)
+                columna[1].append(largo)
+                columna[2].append(ciudad)
+            elif tipo == 'bool':
+                columna.append(bool(valor))
+            else:
+                columna.append(valor)
+        # La clave se publica al final: quien lee desde otro hilo (el que escribe
+        # un snapshot) no encuentra la fila o la encuentra completa
+        self._ids.append(clave)
+        if en_orden:
+            self._ordenadas += 1
+        else:
+            self._fuera_de_orden[clave] = fila
+
+    @staticmethod
+    def _partir_direccion(direccion, ciudades):
+        coma = direccion.rfind(',')
+        if coma < 0:
+            return direccion, SIN_CIUDAD
+        return direccion[:coma], ciudades.codificar(direccion[coma + 1:])
+
+    # ---- Campos ----
+
+    def _crear_lector(self, campo, tipo):
+        # Un lector por campo evita despachar por tipo en cada lectura
+        columna = self._columnas[campo]
+        if tipo == 'texto':
+            inicios, largos = columna
+            return lambda fila: self._leer_texto(inicios[fila], largos[fila])
+        if tipo == 'categoria':
+            codigos, diccionario = columna
+            return lambda fila: diccionario.valores[codigos[fila]]
+        if tipo == 'direccion':
+            inicios, largos, ciudades, diccionario = columna
+
+            def leer_direccion(fila):
+                calle = self._leer_texto(inicios[fila], largos[fila])
+                ciudad = ciudades[fila]
+                return calle if ciudad == SIN_CIUDAD else f"{calle},{diccionario.valores[ciudad]}"
+            return leer_direccion
+        if tipo == 'bool':
+            return lambda fila: bool(columna[fila])
+        return columna.__getitem__
+
+    def _leer(self, fila, campo):
+        return self._lectores[campo](fila)
+
+    def _escribir(self, fila, campo, valor):
+        tipo = self._esquema.get(campo)
+        if tipo is None:
+            raise KeyError(campo)
+        columna = self._columnas[campo]
+        if tipo in ('texto', 'direccion'):
+            if tipo == 'direccion':
+                valor, columna[2][fila] = self._partir_direccion(valor, columna[3])
+            self._desperdicio += columna[1][fila]
+            columna[0][fila], columna[1][fila] = self._guardar_texto(valor)
+            if self._desperdicio > len(self._textos) // 2:
+                self._compactar_textos()
+        elif tipo == 'categoria':
+            columna[0][fila] = columna[1].codificar(valor)
+        elif tipo == 'bool':
+            columna[fila] = bool(valor)
+        else:
+            columna[fila] = valor
+
+    def _compactar_textos(self):
+        # Reescribe los textos vigentes (también los de filas dadas de baja,
+        # que pueden tener vistas abiertas) sin los reemplazados
+        textos = bytearray()
+        for campo, tipo in self._esquema.items():
+            if tipo not in ('texto', 'direccion'):
+                continue
+            inicios, largos = self._columnas[campo][:2]
+            for fila, (inicio, largo) in enumerate(zip(inicios, largos)):
+                inicios[fila] = len(textos)
+                textos += self._textos[inicio:inicio + largo]
+        self._textos = textos
+        self._desperdicio = 0
+
+    def _respeta_esquema(self, datos):
+        if len(datos) != len(self._campos):
+            return False
+        for campo, tipo in self._esquema.items():
+            if campo not in datos:
+                return False
+            valor = datos[campo]
+            if tipo == 'int' and not isinstance(valor, int):
+                return False
+            if tipo in ('texto', 'categoria', 'direccion') and not isinstance(valor, str):
+                return False
+        return True
+
+    # ---- Interfaz de diccionario ----
+
+    def __getitem__(self, clave):
+        if clave in self._irregulares:
+            return self._irregulares[clave]
+        fila = self._fila(clave)
+        if fila < 0 or not self._vivos[fila]:
+            raise KeyError(clave)
+        return VistaRegistro(self, fila)
+
+    def __setitem__(self, clave, datos):
+        if not self._respeta_esquema(datos):
+            if clave in self:
+                del self[clave]
+            self._irregulares[clave] = datos
+            self._cantidad += 1
+            return
+        if clave in self._irregulares:
+            del self._irregulares[clave]
+            self._cantidad -= 1
+        fila = self._fila(clave)
+        if fila < 0:
+            self._agregar_fila(clave, datos)
+            self._cantidad += 1
+            return
+        # Se copian los valores antes de escribir por si datos es una vista de esta misma fila
+        valores = {campo: datos[campo] for campo in self._campos}
+        for campo, valor in valores.items():
+            self._escribir(fila, campo, valor)
+        if not self._vivos[fila]:
+            self._vivos[fila] = 1
+            self._cantidad += 1
+
+    def __delitem__(self, clave):
+        if clave in self._irregulares:
+            del self._irregulares[clave]
+            self._cantidad -= 1
+            return
+        fila = self._fila(clave)
+        if fila < 0 or not self._vivos[fila]:
+            raise KeyError(clave)
+        self._vivos[fila] = 0
+        self._cantidad -= 1
+
+    def __contains__(self, clave):
+        if clave in self._irregulares:
+            return True
+        fila = self._fila(clave)
+        return fila >= 0 and bool(self._vivos[fila])
+
+    def __iter__(self):
+        for fila, clave in enumerate(self._ids):
+            if self._vivos[fila]:
+                yield clave
+        yield from list(self._irregulares)
+
+    def __len__(self):
+        return self._cantidad
+
+    def __repr__(self):
+        return f"RegistrosCompactos({len(self)} registros)"
+
+    def columna(self, campo):
+        """
+        Recorre un solo campo de todos los registros sin armar las vistas.
+
+        Args:
+            campo (str): Campo a recorrer
+
+        Yields:
+            tuple: (id, valor)
+        """
+        for fila, clave in enumerate(self._ids):
+            if self._vivos[fila]:
+                yield clave, self._leer(fila, campo)
+        for clave, datos in list(self._irregulares.items()):
+            yield clave, datos[campo]
+
+    def tamanos(self):
+        """
+        Devuelve los bytes ocupados por las columnas, para comparar con otros almacenes.
+
+        Returns:
+            dict: {'textos', 'columnas', 'diccionarios'} en bytes
+        """
+        columnas = self._ids.itemsize * len(self._ids) + len(self._vivos)
+        diccionarios = 0
+        for campo, tipo in self._esquema.items():
+            columna = self._columnas[campo]
+            partes = columna if isinstance(columna, tuple) else (columna,)
+            for parte in partes:
+                if isinstance(parte, DiccionarioValores):
+                    diccionarios += sum(len(valor.encode('utf-8')) for valor in parte.valores[1:])
+                elif isinstance(parte, array):
+                    columnas += parte.itemsize * len(parte)
+                else:
+                    columnas += len(parte)
+        return {'textos': len(self._textos), 'columnas': columnas, 'diccionarios': diccionarios}
+
+def crear_socios(registros=None):
+    """
+    Crea el almacén compacto de socios.
+
+    Args:
+        registros (dict, optional): Socios iniciales {id: datos}
+
+    Returns:
+        RegistrosCompactos: Socios
+    """
+    return RegistrosCompactos(ESQUEMA_SOCIOS, registros)
+
+def crear_clases(registros=None):
+    """
+    Crea el almacén compacto de clases.
+
+    Args:
+        registros (dict, optional): Clases iniciales {id: datos}
+
+    Returns:
+        RegistrosCompactos: Clases
+    """
+    return RegistrosCompactos(ESQUEMA_CLASES, registros)
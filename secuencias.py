@@ -0,0 +1,71 @@
+"""
+Módulo de secuencias de IDs para el sistema de gimnasio.
+Cada entidad (socios, clases) tiene una secuencia que guarda el próximo ID a
+asignar. Las secuencias solo avanzan: un ID dado de baja nunca se reutiliza,
+aunque puedan quedar huecos en la numeración.
+"""
+
+def crear_secuencias(socios, clases):
+    """
+    Crea las secuencias de IDs por entidad.
+    Cada secuencia guarda el próximo ID a asignar y solo avanza, de modo que
+    un ID dado de baja nunca se reutiliza. El diccionario es serializable
+    para poder persistirlo junto con los datos.
+
+    Args:
+        socios (dict): Diccionario de socios existentes
+        clases (dict): Diccionario de clases existentes
+
+    Returns:
+        dict: Secuencias {entidad: proximo_id}
+    """
+    return {
+        'socios': max(socios.keys(), default=0) + 1,
+        'clases': max(clases.keys(), default=0) + 1
+    }
+
+def siguiente_id(secuencias, entidad):
+    """
+    Asigna el próximo ID de una entidad en O(1).
+
+    Args:
+        secuencias (dict): Secuencias de IDs
+        entidad (str): Entidad ('socios' o 'clases')
+
+    Returns:
+        int: ID asignado
+    """
+    id_nuevo = secuencias[entidad]
+    secuencias[entidad] = id_nuevo + 1
+    return id_nuevo
+
+def reservar_ids(secuencias, entidad, cantidad):
+    """
+    Reserva un bloque de IDs consecutivos avanzando la secuencia una sola vez
+    (para cargas masivas). Los IDs del bloque que no se usen quedan como huecos.
+
+    Args:
+        secuencias (dict): Secuencias de IDs
+        entidad (str): Entidad ('socios' o 'clases')
+        cantidad (int): Cantidad de IDs a reservar
+
+    Returns:
+        range: IDs reservados
+    """
+    if cantidad < 0:
+        raise ValueError("La cantidad de IDs a reservar no puede ser negativa.")
+    inicio = secuencias[entidad]
+    secuencias[entidad] = inicio + cantidad
+    return range(inicio, inicio + cantidad)
+
+def avanzar_secuencia(secuencias, entidad, id_usado):
+    """
+    Asegura que la secuencia quede por encima de un ID asignado externamente.
+
+    Args:
+        secuencias (dict): Secuencias de IDs
+        entidad (str): Entidad ('socios' o 'clases')
+        id_usado (int): ID ya utilizado
+    """
+    if id_usado >= secuencias[entidad]:
+        secuencias[entidad] = id_usado + 1
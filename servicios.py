@@ -0,0 +1,988 @@
+"""
+Módulo de servicios del sistema de gimnasio.
+Contiene las operaciones del negocio sin input() ni print(): reciben y devuelven
+valores estructurados y lanzan errores tipados (ver errores.py). Los menús
+interactivos y cualquier otro cliente (cargas masivas, kioscos, benchmarks)
+trabajan sobre estas funciones.
+
+Todas las operaciones reciben el estado del gimnasio (ver persistencia.crear_gimnasio)
+y, las que modifican datos, un diario opcional donde registrar el cambio.
+"""
+
+from bisect import bisect_right
+
+from almacen_inscripciones import (agregar_inscripcion, eliminar_inscripcion, esta_inscripto,
+                                   cantidad_inscriptos, clases_de_socio, socios_de_clase)
+from agenda import (superposicion_socio, superposicion_profesor, buscar_superposicion, intervalos_de_clase,
+                    agendar_inscripcion, desagendar_inscripcion, agendar_clase, quitar_clase_de_agenda,
+                    desagendar_profesor)
+from almacen_asistencia import (agregar_fecha, fechas_de, contar_en_rango, dias_de_socio, clases_con_asistencia,
+                                socios_con_asistencia)
+from busqueda import agregar_a_busqueda, quitar_de_busqueda, buscar_en_indice, CAMPOS_BUSQUEDA, LIMITE_RESULTADOS
+from cascada import dar_de_baja, existe_con_historial
+from cubo import contar_asistencia_cubo, contar_inscripcion_cubo, contar_hechos_de
+from instrumentacion import instrumentar, contar_escaneados
+from indices_clases import indexar_clase, desindexar_clase, reindexar_clase, contar_lugar, candidatos_clases
+from listados import (agregar_a_listado, quitar_de_listado, mover_en_listado, recorrer_desde, agregar_por_nombre,
+                      quitar_por_nombre, recorrer_por_nombre, ESTADOS, TAMANO_PAGINA)
+from errores import (SocioNoEncontrado, ClaseNoEncontrada, DatoInvalido, DatoDuplicado, SocioInactivo,
+                     ClaseInactiva, YaInscripto, NoInscripto, CupoCompleto, HorarioSuperpuesto, ProfesorOcupado)
+from metricas import contar_alta, contar_baja, contar_cambio_estado, contar_inscripcion, contar_asistencia
+from persistencia import registrar_evento
+from registro_asistencia import agregar_registro, estadisticas_registro
+from diferido import aplicar_en
+from validaciones import (validar_email, validar_dni, validar_telefono, validar_fecha, fecha_a_ordinal,
+                          dia_de_semana, minutos_de_hora, interpretar_horario, interpretar_duracion)
+from secuencias import siguiente_id, reservar_ids
+from indices_socios import (indexar_socio, desindexar_socio, reindexar_campo, buscar_socio_por_dni,
+                            verificar_duplicado, CAMPOS_UNICOS)
+
+# Campos de cada entidad con su normalización al ingresar
+CAMPOS_SOCIO = {
+    'nombre': lambda valor: valor.strip().title(),
+    'apellido': lambda valor: valor.strip().title(),
+    'dni': lambda valor: valor.strip(),
+    'email': lambda valor: valor.strip().lower(),
+    'telefono': lambda valor: valor.strip(),
+    'fecha_nacimiento': lambda valor: valor.strip(),
+    'direccion': lambda valor: valor.strip(),
+    'fecha_alta': lambda valor: valor.strip(),
+    'activo': bool
+}
+CAMPOS_CLASE = {
+    'nombre': lambda valor: valor.strip().title(),
+    'profesor': lambda valor: valor.strip().title(),
+    'cupo': int,
+    'horario': lambda valor: valor.strip(),
+    'duracion': lambda valor: str(valor).strip(),
+    'activa': bool
+}
+# Campos de clase que ubican la clase en la agenda semanal
+CAMPOS_AGENDA = ('profesor', 'horario', 'duracion', 'activa')
+
+# Validaciones de formato de los campos de socio
+VALIDADORES_SOCIO = {
+    'dni': (validar_dni, "DNI inválido."),
+    'email': (validar_email, "Email inválido."),
+    'telefono': (validar_telefono, "Teléfono inválido.")
+}
+# Fechas opcionales: si se informan deben ser DD/MM/AAAA válidas
+FECHAS_SOCIO = {
+    'fecha_nacimiento': "Fecha de nacimiento inválida (DD/MM/AAAA).",
+    'fecha_alta': "Fecha de alta inválida (DD/MM/AAAA)."
+}
+
+def _normalizar(campos, datos):
+    """
+    Normaliza los campos conocidos de una entidad y rechaza los desconocidos.
+
+    Args:
+        campos (dict): Campos válidos con su función de normalización
+        datos (dict): Datos recibidos
+
+    Returns:
+        dict: Datos normalizados
+    """
+    normalizados = {}
+    for campo, valor in datos.items():
+        if campo not in campos:
+            raise DatoInvalido(campo, f"Campo desconocido: {campo}.")
+        try:
+            normalizados[campo] = campos[campo](valor)
+        except (TypeError, ValueError):
+            raise DatoInvalido(campo, f"Valor inválido para {campo}.")
+    return normalizados
+
+def _validar_socio(datos):
+    """
+    Valida el formato de los campos de socio presentes en datos.
+
+    Args:
+        datos (dict): Datos normalizados
+    """
+    for campo in ('nombre', 'apellido'):
+        if campo in datos and not datos[campo]:
+            raise DatoInvalido(campo, f"El {campo} no puede estar vacío.")
+    for campo, (validar, mensaje) in VALIDADORES_SOCIO.items():
+        if campo in datos and not validar(datos[campo]):
+            raise DatoInvalido(campo, mensaje)
+    for campo, mensaje in FECHAS_SOCIO.items():
+        if datos.get(campo) and not validar_fecha(datos[campo]):
+            raise DatoInvalido(campo, mensaje)
+
+def _validar_clase(datos):
+    """
+    Valida los campos de clase presentes en datos.
+
+    Args:
+        datos (dict): Datos normalizados
+    """
+    for campo in ('nombre', 'profesor'):
+        if campo in datos and not datos[campo]:
+            raise DatoInvalido(campo, f"El {campo} no puede estar vacío.")
+    if 'cupo' in datos and datos['cupo'] <= 0:
+        raise DatoInvalido('cupo', "El cupo debe ser mayor a 0.")
+    if datos.get('horario') and not interpretar_horario(datos['horario']):
+        raise DatoInvalido('horario', "Horario inválido (ej: Lunes 18:00).")
+    if datos.get('duracion') and interpretar_duracion(datos['duracion']) is None:
+        raise DatoInvalido('duracion', "Duración inválida (ej: 60 o 1h30).")
+
+def _verificar_agenda(gimnasio, id_clase, datos, anterior=None):
+    """
+    Verifica que una clase nueva o modificada no deje a su profesor con dos
+    clases activas a la vez ni, si cambia de horario, a sus inscriptos.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase (None si todavía no existe)
+        datos (dict): Datos (nuevos) de la clase
+        anterior (dict, optional): Datos actuales de la clase, si se modifica
+    """
+    intervalos = intervalos_de_clase(datos)
+    if not intervalos:
+        # Sin horario o sin duración la clase no ocupa la agenda
+        return
+    agenda = gimnasio['agenda']
+    if datos['activa']:
+        otra = superposicion_profesor(agenda, datos, id_clase)
+        if otra is not None:
+            raise ProfesorOcupado(datos['profesor'], id_clase, otra)
+    if anterior is None or intervalos == intervalos_de_clase(anterior):
+        return
+    for id_socio in socios_de_clase(gimnasio['inscripciones'], id_clase):
+        otra = buscar_superposicion(agenda['socios'].get(id_socio, ()), intervalos, id_clase)
+        if otra is not None:
+            raise HorarioSuperpuesto(id_socio, id_clase, otra)
+
+def _verificar_unicos(gimnasio, datos, id_excluir=None):
+    """
+    Verifica que los campos únicos presentes en datos no pertenezcan a otro socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        datos (dict): Datos normalizados
+        id_excluir (int, optional): Socio que se está modificando
+    """
+    indices = gimnasio['indices_socios']
+    for campo, normalizar in CAMPOS_UNICOS.items():
+        if campo in datos and verificar_duplicado(campo, datos[campo], indices, id_excluir):
+            raise DatoDuplicado(campo, indices[campo][normalizar(datos[campo])])
+
+# ---- Socios ----
+
+def obtener_socio(gimnasio, id_socio):
+    """
+    Devuelve los datos de un socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+
+    Returns:
+        dict: Datos del socio
+    """
+    if id_socio not in gimnasio['socios']:
+        raise SocioNoEncontrado(id_socio)
+    return gimnasio['socios'][id_socio]
+
+def obtener_socio_por_dni(gimnasio, dni):
+    """
+    Busca un socio por DNI usando el índice único.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        dni (str): DNI a buscar
+
+    Returns:
+        int: ID del socio
+    """
+    id_socio = buscar_socio_por_dni(dni, gimnasio['indices_socios'])
+    if id_socio is None or id_socio not in gimnasio['socios']:
+        raise SocioNoEncontrado(dni)
+    return id_socio
+
+def reservar_bloque_ids(gimnasio, entidad, cantidad, diario=None):
+    """
+    Reserva un bloque de IDs para altas masivas y lo registra en el diario,
+    así un ID reservado no se vuelve a asignar aunque quede sin usar.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        entidad (str): 'socios' o 'clases'
+        cantidad (int): Cantidad de IDs a reservar
+        diario (dict, optional): Diario donde registrar la reserva
+
+    Returns:
+        range: IDs reservados
+    """
+    ids = reservar_ids(gimnasio['secuencias'], entidad, cantidad)
+    if ids:
+        registrar_evento(diario, 'reservar_ids', entidad=entidad, hasta=ids[-1])
+    return ids
+
+def preparar_socio(datos):
+    """
+    Normaliza y valida los datos de un socio nuevo sin consultar el estado.
+    No verifica duplicados: eso depende de los socios existentes (ver crear_socio).
+
+    Args:
+        datos (dict): Datos del socio (nombre, apellido, dni, email y teléfono obligatorios)
+
+    Returns:
+        dict: Socio completo con todos sus campos
+    """
+    socio = {'fecha_nacimiento': '', 'direccion': '', 'fecha_alta': '', 'activo': True}
+    socio.update(_normalizar(CAMPOS_SOCIO, datos))
+    for campo in ('nombre', 'apellido', 'dni', 'email', 'telefono'):
+        socio.setdefault(campo, '')
+    _validar_socio(socio)
+
+    # Mantener el orden de campos de siempre
+    return {campo: socio[campo] for campo in CAMPOS_SOCIO}
+
+@instrumentar
+def crear_socio(gimnasio, datos, diario=None, preparado=False, id_socio=None):
+    """
+    Da de alta un socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        datos (dict): Datos del socio (nombre, apellido, dni, email y teléfono obligatorios)
+        diario (dict, optional): Diario donde registrar el cambio
+        preparado (bool, optional): True si datos ya es el resultado de preparar_socio()
+        id_socio (int, optional): ID ya reservado con reservar_bloque_ids (por defecto, el siguiente)
+
+    Returns:
+        int: ID asignado
+    """
+    socio = datos if preparado else preparar_socio(datos)
+    _verificar_unicos(gimnasio, socio)
+
+    if id_socio is None:
+        id_socio = siguiente_id(gimnasio['secuencias'], 'socios')
+    gimnasio['socios'][id_socio] = socio
+    indexar_socio(gimnasio['indices_socios'], id_socio, socio)
+    aplicar_en(gimnasio['listados'], agregar_a_listado, 'socios', id_socio, socio['activo'])
+    aplicar_en(gimnasio['orden_nombres'], agregar_por_nombre, gimnasio['socios'], id_socio)
+    aplicar_en(gimnasio['busqueda_socios'], agregar_a_busqueda, gimnasio['socios'], id_socio)
+    aplicar_en(gimnasio['metricas'], contar_alta, 'socios', socio['activo'])
+    registrar_evento(diario, 'alta_socio', id=id_socio, datos=socio)
+    return id_socio
+
+@instrumentar
+def actualizar_socio(gimnasio, id_socio, cambios, diario=None):
+    """
+    Modifica uno o más campos de un socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        cambios (dict): Campos a modificar con su nuevo valor
+        diario (dict, optional): Diario donde registrar el cambio
+
+    Returns:
+        dict: Datos actualizados del socio
+    """
+    socio = obtener_socio(gimnasio, id_socio)
+    cambios = _normalizar(CAMPOS_SOCIO, cambios)
+    _validar_socio(cambios)
+    _verificar_unicos(gimnasio, cambios, id_socio)
+
+    for campo, valor in cambios.items():
+        if socio[campo] == valor:
+            continue
+        if campo in CAMPOS_UNICOS:
+            reindexar_campo(gimnasio['indices_socios'], id_socio, campo, socio[campo], valor)
+        elif campo == 'activo':
+            aplicar_en(gimnasio['metricas'], contar_cambio_estado, 'socios', socio[campo], valor)
+            aplicar_en(gimnasio['listados'], mover_en_listado, 'socios', id_socio, socio[campo], valor)
+        # La fecha de alta define la cohorte: reatribuir los hechos del socio en el cubo
+        reatribuir = campo == 'fecha_alta'
+        reordenar = campo in ('nombre', 'apellido')
+        reindexar = campo in CAMPOS_BUSQUEDA
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, -1, id_socio)
+        if reordenar:
+            aplicar_en(gimnasio['orden_nombres'], quitar_por_nombre, gimnasio['socios'], id_socio)
+        if reindexar:
+            aplicar_en(gimnasio['busqueda_socios'], quitar_de_busqueda, gimnasio['socios'], id_socio, (campo,))
+        socio[campo] = valor
+        if reatribuir:
+            aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, 1, id_socio)
+        if reordenar:
+            aplicar_en(gimnasio['orden_nombres'], agregar_por_nombre, gimnasio['socios'], id_socio)
+        if reindexar:
+            aplicar_en(gimnasio['busqueda_socios'], agregar_a_busqueda, gimnasio['socios'], id_socio, (campo,))
+        registrar_evento(diario, 'modificar_socio', id=id_socio, campo=campo, valor=valor)
+    return socio
+
+@instrumentar
+def eliminar_socio(gimnasio, id_socio, diario=None, conservar_historial=False):
+    """
+    Da de baja un socio junto con sus inscripciones y, salvo que se conserve
+    el historial, sus asistencias.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        diario (dict, optional): Diario donde registrar el cambio
+        conservar_historial (bool, optional): Pasar el socio al histórico y
+            mantener sus asistencias para los reportes
+
+    Returns:
+        dict: Datos del socio eliminado
+    """
+    socio = obtener_socio(gimnasio, id_socio)
+    desindexar_socio(gimnasio['indices_socios'], id_socio, socio)
+    aplicar_en(gimnasio['metricas'], contar_baja, 'socios', socio['activo'])
+    aplicar_en(gimnasio['listados'], quitar_de_listado, 'socios', id_socio, socio['activo'])
+    aplicar_en(gimnasio['orden_nombres'], quitar_por_nombre, gimnasio['socios'], id_socio)
+    aplicar_en(gimnasio['busqueda_socios'], quitar_de_busqueda, gimnasio['socios'], id_socio)
+    dar_de_baja(gimnasio, 'socios', id_socio, conservar_historial)
+    registrar_evento(diario, 'baja_socio', id=id_socio, historial=conservar_historial)
+    return socio
+
+def _pagina(registros, candidatos, tamano, aceptar=None):
+    """
+    Arma una página a partir de los candidatos de un índice de listado.
+
+    Args:
+        registros (dict): Socios o clases
+        candidatos (iterable): Tuplas (posicion_de_cursor, id) en el orden del listado
+        tamano (int): Filas por página
+        aceptar (callable, optional): Filtro adicional (id, datos) -> bool
+
+    Returns:
+        tuple: (filas, cursor) con las filas (id, datos) y el cursor de la página
+               siguiente, o None si no hay más
+    """
+    if tamano < 1:
+        raise DatoInvalido('tamano', "El tamaño de página debe ser mayor a 0.")
+    filas = []
+    cursor = None
+    recorridos = 0
+    for posicion, clave in candidatos:
+        recorridos += 1
+        datos = registros[clave]
+        if aceptar is not None and not aceptar(clave, datos):
+            continue
+        if len(filas) == tamano:
+            contar_escaneados(recorridos)
+            return filas, cursor
+        filas.append((clave, datos))
+        cursor = posicion
+    contar_escaneados(recorridos)
+    return filas, None
+
+@instrumentar
+def paginar_socios(gimnasio, estado=None, prefijo=None, dni=None, filtro=None, cursor=None, tamano=TAMANO_PAGINA):
+    """
+    Devuelve una página de socios usando los índices de listado: por ID con el
+    filtro de estado, en orden alfabético si se filtra por prefijo de 'apellido
+    nombre', o el único socio con un DNI.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        estado (str, optional): None (todos), 'activos' o 'inactivos'
+        prefijo (str, optional): Prefijo de 'apellido nombre' (sin distinguir mayúsculas)
+        dni (str, optional): DNI exacto
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+        cursor (optional): Cursor devuelto por la página anterior
+        tamano (int, optional): Filas por página
+
+    Returns:
+        tuple: (filas, cursor) con las filas (id, datos) y el cursor de la página
+               siguiente, o None si no hay más
+    """
+    if estado not in ESTADOS:
+        raise DatoInvalido('estado', "Estado inválido (activos o inactivos).")
+    socios = gimnasio['socios']
+    activos = ESTADOS[estado]
+
+    def aceptar(clave, datos):
+        return bool(datos['activo']) in activos and (filtro is None or filtro(clave, datos))
+
+    if dni:
+        id_socio = buscar_socio_por_dni(dni, gimnasio['indices_socios'])
+        candidatos = [(id_socio, id_socio)] if id_socio in socios and cursor is None else []
+        return _pagina(socios, candidatos, tamano, aceptar)
+    if prefijo:
+        candidatos = recorrer_por_nombre(gimnasio['orden_nombres'], socios, prefijo, cursor)
+        return _pagina(socios, candidatos, tamano, aceptar)
+    candidatos = ((clave, clave) for clave in recorrer_desde(gimnasio['listados'], 'socios', estado, cursor))
+    return _pagina(socios, candidatos, tamano, filtro)
+
+@instrumentar
+def buscar_socios(gimnasio, texto, limite=LIMITE_RESULTADOS, estado=None, filtro=None):
+    """
+    Busca socios mientras se escribe: cada palabra del texto debe empezar alguna
+    palabra del nombre, apellido, DNI o email, sin distinguir acentos ni mayúsculas.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        texto (str): Texto buscado
+        limite (int, optional): Cantidad máxima de resultados
+        estado (str, optional): None (todos), 'activos' o 'inactivos'
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+
+    Returns:
+        list: Tuplas (id, datos) de los mejores resultados
+    """
+    if estado not in ESTADOS:
+        raise DatoInvalido('estado', "Estado inválido (activos o inactivos).")
+    socios = gimnasio['socios']
+    activos = ESTADOS[estado]
+
+    def aceptar(clave, datos):
+        return bool(datos['activo']) in activos and (filtro is None or filtro(clave, datos))
+
+    ids = buscar_en_indice(gimnasio['busqueda_socios'], socios, texto, limite, aceptar)
+    return [(id_socio, socios[id_socio]) for id_socio in ids]
+
+def listar_socios(gimnasio, solo_activos=False):
+    """
+    Recorre los socios.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        solo_activos (bool, optional): Si es True, omite los inactivos
+
+    Yields:
+        tuple: (id_socio, datos)
+    """
+    for id_socio, datos in gimnasio['socios'].items():
+        if not solo_activos or datos['activo']:
+            yield id_socio, datos
+
+# ---- Clases ----
+
+def obtener_clase(gimnasio, id_clase):
+    """
+    Devuelve los datos de una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase
+
+    Returns:
+        dict: Datos de la clase
+    """
+    if id_clase not in gimnasio['clases']:
+        raise ClaseNoEncontrada(id_clase)
+    return gimnasio['clases'][id_clase]
+
+def preparar_clase(datos):
+    """
+    Normaliza y valida los datos de una clase nueva sin consultar el estado.
+
+    Args:
+        datos (dict): Datos de la clase (nombre, profesor y cupo obligatorios)
+
+    Returns:
+        dict: Clase completa con todos sus campos
+    """
+    clase = {'nombre': '', 'profesor': '', 'cupo': 0, 'horario': '', 'duracion': '', 'activa': True}
+    clase.update(_normalizar(CAMPOS_CLASE, datos))
+    _validar_clase(clase)
+    return clase
+
+@instrumentar
+def crear_clase(gimnasio, datos, diario=None, preparado=False, id_clase=None):
+    """
+    Da de alta una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        datos (dict): Datos de la clase (nombre, profesor y cupo obligatorios)
+        diario (dict, optional): Diario donde registrar el cambio
+        preparado (bool, optional): True si datos ya es el resultado de preparar_clase()
+        id_clase (int, optional): ID ya reservado con reservar_bloque_ids (por defecto, el siguiente)
+
+    Returns:
+        int: ID asignado
+    """
+    clase = datos if preparado else preparar_clase(datos)
+    _verificar_agenda(gimnasio, None, clase)
+
+    if id_clase is None:
+        id_clase = siguiente_id(gimnasio['secuencias'], 'clases')
+    gimnasio['clases'][id_clase] = clase
+    aplicar_en(gimnasio['metricas'], contar_alta, 'clases', clase['activa'])
+    aplicar_en(gimnasio['listados'], agregar_a_listado, 'clases', id_clase, clase['activa'])
+    aplicar_en(gimnasio['indices_clases'], indexar_clase, id_clase, clase)
+    aplicar_en(gimnasio['agenda'], agendar_clase, gimnasio['inscripciones'], id_clase, clase)
+    registrar_evento(diario, 'alta_clase', id=id_clase, datos=clase)
+    return id_clase
+
+@instrumentar
+def actualizar_clase(gimnasio, id_clase, cambios, diario=None):
+    """
+    Modifica uno o más campos de una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase
+        cambios (dict): Campos a modificar con su nuevo valor
+        diario (dict, optional): Diario donde registrar el cambio
+
+    Returns:
+        dict: Datos actualizados de la clase
+    """
+    clase = obtener_clase(gimnasio, id_clase)
+    cambios = _normalizar(CAMPOS_CLASE, cambios)
+    _validar_clase(cambios)
+    reagendar = any(campo in CAMPOS_AGENDA and clase[campo] != valor for campo, valor in cambios.items())
+    if reagendar:
+        anterior = {campo: clase[campo] for campo in CAMPOS_AGENDA}
+        _verificar_agenda(gimnasio, id_clase, dict(anterior, **cambios), anterior)
+        aplicar_en(gimnasio['agenda'], quitar_clase_de_agenda, gimnasio['inscripciones'], id_clase, anterior)
+
+    for campo, valor in cambios.items():
+        if clase[campo] != valor:
+            if campo == 'activa':
+                aplicar_en(gimnasio['metricas'], contar_cambio_estado, 'clases', clase[campo], valor)
+                aplicar_en(gimnasio['listados'], mover_en_listado, 'clases', id_clase, clase[campo], valor)
+            # Los hechos de la clase se reatribuyen al nuevo profesor en el cubo
+            reatribuir = campo == 'profesor'
+            if reatribuir:
+                aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, -1, None, id_clase)
+            aplicar_en(gimnasio['indices_clases'], reindexar_clase, id_clase, campo, clase[campo], valor)
+            clase[campo] = valor
+            if reatribuir:
+                aplicar_en(gimnasio['cubo'], contar_hechos_de, gimnasio, 1, None, id_clase)
+            registrar_evento(diario, 'modificar_clase', id=id_clase, campo=campo, valor=valor)
+    if reagendar:
+        aplicar_en(gimnasio['agenda'], agendar_clase, gimnasio['inscripciones'], id_clase, clase)
+    return clase
+
+@instrumentar
+def eliminar_clase(gimnasio, id_clase, diario=None, conservar_historial=False):
+    """
+    Da de baja una clase junto con sus inscripciones y, salvo que se conserve
+    el historial, sus asistencias.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase
+        diario (dict, optional): Diario donde registrar el cambio
+        conservar_historial (bool, optional): Pasar la clase al histórico y
+            mantener sus asistencias para los reportes
+
+    Returns:
+        dict: Datos de la clase eliminada
+    """
+    clase = obtener_clase(gimnasio, id_clase)
+    aplicar_en(gimnasio['metricas'], contar_baja, 'clases', clase['activa'])
+    aplicar_en(gimnasio['listados'], quitar_de_listado, 'clases', id_clase, clase['activa'])
+    aplicar_en(gimnasio['indices_clases'], desindexar_clase, id_clase, clase)
+    aplicar_en(gimnasio['agenda'], desagendar_profesor, id_clase, clase)
+    dar_de_baja(gimnasio, 'clases', id_clase, conservar_historial)
+    registrar_evento(diario, 'baja_clase', id=id_clase, historial=conservar_historial)
+    return clase
+
+def _dia_consulta(dia):
+    """
+    Convierte el día de una consulta (número 0-6 o nombre) en día de la semana.
+
+    Args:
+        dia (int | str): Día, o None
+
+    Returns:
+        int: Día de la semana (0 = lunes), o None
+    """
+    if dia is None or dia == '':
+        return None
+    if isinstance(dia, int) and 0 <= dia <= 6:
+        return dia
+    numero = dia_de_semana(dia) if isinstance(dia, str) else None
+    if numero is None:
+        raise DatoInvalido('dia', "Día inválido (Lunes a Domingo).")
+    return numero
+
+def _hora_consulta(hora, campo):
+    """
+    Convierte una hora de consulta (HH:MM o minutos del día) en minutos del día.
+
+    Args:
+        hora (str | int): Hora, o None
+        campo (str): Campo informado en el error
+
+    Returns:
+        int: Minuto del día, o None
+    """
+    if hora is None or hora == '':
+        return None
+    if isinstance(hora, int):
+        return hora
+    try:
+        return minutos_de_hora(hora)
+    except (AttributeError, ValueError):
+        raise DatoInvalido(campo, "Hora inválida (HH:MM).")
+
+@instrumentar
+def consultar_clases(gimnasio, profesor=None, dia=None, desde=None, hasta=None, cupo_minimo=None, estado=None):
+    """
+    Consulta clases por profesor, día y rango horario de inicio y lugares libres
+    usando los índices secundarios (ver indices_clases.py), por ejemplo las
+    clases activas del lunes desde las 18:00 con lugar de un profesor.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        profesor (str, optional): Profesor (sin distinguir acentos ni mayúsculas)
+        dia (int | str, optional): Día de la semana (0 = lunes, o su nombre)
+        desde (str | int, optional): Inicio mínimo (HH:MM)
+        hasta (str | int, optional): Inicio máximo (HH:MM)
+        cupo_minimo (int, optional): Lugares libres mínimos
+        estado (str, optional): None (todas), 'activos' o 'inactivos'
+
+    Returns:
+        list: Tuplas (id, datos) ordenadas por ID
+    """
+    filas, _ = paginar_clases(gimnasio, estado, profesor=profesor, dia=dia, desde=desde, hasta=hasta,
+                              cupo_minimo=cupo_minimo, tamano=len(gimnasio['clases']) or 1)
+    return filas
+
+@instrumentar
+def paginar_clases(gimnasio, estado=None, prefijo=None, filtro=None, cursor=None, tamano=TAMANO_PAGINA,
+                   profesor=None, dia=None, desde=None, hasta=None, cupo_minimo=None):
+    """
+    Devuelve una página de clases en orden de ID usando los índices de listado.
+    El prefijo de nombre se aplica sobre las clases del estado pedido. Si se
+    consulta por profesor, horario o lugares libres se parte de los índices
+    secundarios de clases.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        estado (str, optional): None (todas), 'activos' o 'inactivos'
+        prefijo (str, optional): Prefijo del nombre (sin distinguir mayúsculas)
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+        cursor (optional): Cursor devuelto por la página anterior
+        tamano (int, optional): Filas por página
+        profesor (str, optional): Profesor (sin distinguir acentos ni mayúsculas)
+        dia (int | str, optional): Día de la semana (0 = lunes, o su nombre)
+        desde (str | int, optional): Inicio mínimo (HH:MM)
+        hasta (str | int, optional): Inicio máximo (HH:MM)
+        cupo_minimo (int, optional): Lugares libres mínimos
+
+    Returns:
+        tuple: (filas, cursor) con las filas (id, datos) y el cursor de la página
+               siguiente, o None si no hay más
+    """
+    if estado not in ESTADOS:
+        raise DatoInvalido('estado', "Estado inválido (activos o inactivos).")
+    prefijo = prefijo.casefold() if prefijo else None
+    activas = ESTADOS[estado]
+
+    def aceptar(clave, datos):
+        return ((prefijo is None or datos['nombre'].casefold().startswith(prefijo))
+                and (filtro is None or filtro(clave, datos)))
+
+    ids = candidatos_clases(gimnasio['indices_clases'], gimnasio['clases'], profesor, _dia_consulta(dia),
+                            _hora_consulta(desde, 'desde'), _hora_consulta(hasta, 'hasta'), cupo_minimo)
+    if ids is None:
+        candidatos = ((clave, clave) for clave in recorrer_desde(gimnasio['listados'], 'clases', estado, cursor))
+        return _pagina(gimnasio['clases'], candidatos, tamano, aceptar)
+
+    def aceptar_con_estado(clave, datos):
+        return bool(datos['activa']) in activas and aceptar(clave, datos)
+
+    inicio = bisect_right(ids, cursor) if cursor is not None else 0
+    candidatos = ((ids[posicion], ids[posicion]) for posicion in range(inicio, len(ids)))
+    return _pagina(gimnasio['clases'], candidatos, tamano, aceptar_con_estado)
+
+def listar_clases(gimnasio, solo_activas=False):
+    """
+    Recorre las clases.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        solo_activas (bool, optional): Si es True, omite las inactivas
+
+    Yields:
+        tuple: (id_clase, datos)
+    """
+    for id_clase, datos in gimnasio['clases'].items():
+        if not solo_activas or datos['activa']:
+            yield id_clase, datos
+
+# ---- Inscripciones ----
+
+@instrumentar
+def inscribir(gimnasio, id_socio, id_clase, diario=None):
+    """
+    Inscribe un socio activo en una clase activa con cupo disponible que no se
+    superponga con otra clase del socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+        diario (dict, optional): Diario donde registrar el cambio
+    """
+    verificar_inscripcion(gimnasio, id_socio, id_clase)
+    registrar_inscripcion(gimnasio, id_socio, id_clase, diario)
+
+def verificar_inscripcion(gimnasio, id_socio, id_clase):
+    """
+    Verifica que un socio se pueda inscribir en una clase, sin modificar el estado.
+    Entre la verificación y registrar_inscripcion nadie debe poder inscribir en
+    la misma clase ni al mismo socio (ver concurrencia.py).
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+    """
+    socio = obtener_socio(gimnasio, id_socio)
+    if not socio['activo']:
+        raise SocioInactivo(id_socio)
+    clase = obtener_clase(gimnasio, id_clase)
+    if not clase['activa']:
+        raise ClaseInactiva(id_clase)
+
+    inscripciones = gimnasio['inscripciones']
+    if esta_inscripto(inscripciones, id_socio, id_clase):
+        raise YaInscripto(id_socio, id_clase)
+    if cantidad_inscriptos(inscripciones, id_clase) >= clase['cupo']:
+        raise CupoCompleto(id_clase)
+    otra = superposicion_socio(gimnasio['agenda'], id_socio, clase)
+    if otra is not None:
+        raise HorarioSuperpuesto(id_socio, id_clase, otra)
+
+def registrar_inscripcion(gimnasio, id_socio, id_clase, diario=None):
+    """
+    Registra una inscripción ya verificada con verificar_inscripcion.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+        diario (dict, optional): Diario donde registrar el cambio
+    """
+    agregar_inscripcion(gimnasio['inscripciones'], id_socio, id_clase)
+    aplicar_en(gimnasio['metricas'], contar_inscripcion, id_clase, 1)
+    aplicar_en(gimnasio['cubo'], contar_inscripcion_cubo, gimnasio, id_socio, id_clase, 1)
+    aplicar_en(gimnasio['indices_clases'], contar_lugar, id_clase, 1)
+    aplicar_en(gimnasio['agenda'], agendar_inscripcion, gimnasio['clases'], id_socio, id_clase)
+    registrar_evento(diario, 'inscribir', socio_id=id_socio, clase_id=id_clase)
+
+@instrumentar
+def desinscribir(gimnasio, id_socio, id_clase, diario=None):
+    """
+    Elimina la inscripción de un socio en una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+        diario (dict, optional): Diario donde registrar el cambio
+    """
+    obtener_socio(gimnasio, id_socio)
+    if not eliminar_inscripcion(gimnasio['inscripciones'], id_socio, id_clase):
+        raise NoInscripto(id_socio, id_clase)
+    aplicar_en(gimnasio['metricas'], contar_inscripcion, id_clase, -1)
+    aplicar_en(gimnasio['cubo'], contar_inscripcion_cubo, gimnasio, id_socio, id_clase, -1)
+    aplicar_en(gimnasio['indices_clases'], contar_lugar, id_clase, -1)
+    aplicar_en(gimnasio['agenda'], desagendar_inscripcion, gimnasio['clases'], id_socio, id_clase)
+    registrar_evento(diario, 'desinscribir', socio_id=id_socio, clase_id=id_clase)
+
+@instrumentar
+def clases_inscriptas(gimnasio, id_socio):
+    """
+    Devuelve las clases en las que está inscripto un socio.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+
+    Returns:
+        list: Tuplas (id_clase, datos) de clases existentes
+    """
+    obtener_socio(gimnasio, id_socio)
+    clases = gimnasio['clases']
+    ids = clases_de_socio(gimnasio['inscripciones'], id_socio)
+    contar_escaneados(len(ids))
+    return [(id_clase, clases[id_clase]) for id_clase in ids if id_clase in clases]
+
+@instrumentar
+def socios_inscriptos(gimnasio, id_clase):
+    """
+    Devuelve los socios inscriptos en una clase.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase
+
+    Returns:
+        list: Tuplas (id_socio, datos) de socios existentes
+    """
+    obtener_clase(gimnasio, id_clase)
+    socios = gimnasio['socios']
+    ids = socios_de_clase(gimnasio['inscripciones'], id_clase)
+    contar_escaneados(len(ids))
+    return [(id_socio, socios[id_socio]) for id_socio in ids if id_socio in socios]
+
+# ---- Asistencia ----
+
+def convertir_fecha(fecha, campo='fecha'):
+    """
+    Convierte una fecha DD/MM/AAAA (o un ordinal ya convertido) en ordinal de día.
+
+    Args:
+        fecha (str | int): Fecha en texto u ordinal
+        campo (str, optional): Campo informado en el error
+
+    Returns:
+        int: Ordinal del día
+    """
+    if isinstance(fecha, int):
+        return fecha
+    try:
+        return fecha_a_ordinal(fecha.strip())
+    except (AttributeError, ValueError):
+        raise DatoInvalido(campo, "Fecha inválida (DD/MM/AAAA).")
+
+def _rango(desde, hasta):
+    """
+    Convierte los extremos opcionales de un rango de fechas en ordinales.
+
+    Args:
+        desde (str | int): Primer día, o None
+        hasta (str | int): Último día, o None
+
+    Returns:
+        tuple: (desde, hasta) como ordinales o None
+    """
+    desde = convertir_fecha(desde, 'desde') if desde is not None else None
+    hasta = convertir_fecha(hasta, 'hasta') if hasta is not None else None
+    if desde is not None and hasta is not None and desde > hasta:
+        raise DatoInvalido('hasta', "La fecha final es anterior a la inicial.")
+    return desde, hasta
+
+@instrumentar
+def marcar_asistencia(gimnasio, id_socio, id_clase, fecha, diario=None):
+    """
+    Registra la asistencia de un socio a una clase en una fecha.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        id_clase (int): ID de la clase
+        fecha (str | int): Fecha de asistencia (DD/MM/AAAA) u ordinal del día
+        diario (dict, optional): Diario donde registrar el cambio
+
+    Returns:
+        bool: True si se registró, False si ya estaba registrada
+    """
+    obtener_socio(gimnasio, id_socio)
+    obtener_clase(gimnasio, id_clase)
+    dia = convertir_fecha(fecha)
+    if not agregar_fecha(gimnasio['matriz_asistencia'], id_socio, id_clase, dia):
+        return False
+    aplicar_en(gimnasio['metricas'], contar_asistencia, id_socio, id_clase)
+    aplicar_en(gimnasio['registro_asistencia'], agregar_registro, id_socio, id_clase, dia)
+    aplicar_en(gimnasio['cubo'], contar_asistencia_cubo, gimnasio, id_socio, id_clase, dia)
+    registrar_evento(diario, 'asistencia', socio_id=id_socio, clase_id=id_clase, dia=dia)
+    return True
+
+@instrumentar
+def asistencia_de_socio(gimnasio, id_socio, desde=None, hasta=None, solo_totales=False):
+    """
+    Devuelve las asistencias de un socio agrupadas por clase, opcionalmente en un rango de fechas.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        desde (str | int, optional): Primer día del rango (incluido)
+        hasta (str | int, optional): Último día del rango (incluido)
+        solo_totales (bool, optional): Devolver solo la cantidad, sin listar los días
+
+    Returns:
+        list: Tuplas (id_clase, dias) de clases existentes con asistencias en el rango,
+              con los días como ordinales ordenados (o su cantidad si solo_totales);
+              incluye las clases dadas de baja con el historial conservado
+    """
+    obtener_socio(gimnasio, id_socio)
+    desde, hasta = _rango(desde, hasta)
+    matriz_asistencia = gimnasio['matriz_asistencia']
+    resultado = []
+    leer = contar_en_rango if solo_totales else fechas_de
+    existe = existe_con_historial(gimnasio, 'clases')
+    ids = clases_con_asistencia(matriz_asistencia, id_socio)
+    contar_escaneados(len(ids))
+    for id_clase in ids:
+        if existe(id_clase):
+            dias = leer(matriz_asistencia, id_socio, id_clase, desde, hasta)
+            if dias:
+                resultado.append((id_clase, dias))
+    return resultado
+
+@instrumentar
+def asistencia_de_clase(gimnasio, id_clase, desde=None, hasta=None, solo_totales=False):
+    """
+    Devuelve las asistencias a una clase agrupadas por socio, opcionalmente en un rango de fechas.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_clase (int): ID de la clase
+        desde (str | int, optional): Primer día del rango (incluido)
+        hasta (str | int, optional): Último día del rango (incluido)
+        solo_totales (bool, optional): Devolver solo la cantidad, sin listar los días
+
+    Returns:
+        list: Tuplas (id_socio, dias) de socios existentes con asistencias en el rango,
+              con los días como ordinales ordenados (o su cantidad si solo_totales);
+              incluye a los socios dados de baja con el historial conservado
+    """
+    obtener_clase(gimnasio, id_clase)
+    desde, hasta = _rango(desde, hasta)
+    matriz_asistencia = gimnasio['matriz_asistencia']
+    resultado = []
+    leer = contar_en_rango if solo_totales else fechas_de
+    existe = existe_con_historial(gimnasio, 'socios')
+    ids = socios_con_asistencia(matriz_asistencia, id_clase)
+    contar_escaneados(len(ids))
+    for id_socio in ids:
+        if existe(id_socio):
+            dias = leer(matriz_asistencia, id_socio, id_clase, desde, hasta)
+            if dias:
+                resultado.append((id_socio, dias))
+    return resultado
+
+@instrumentar
+def estadisticas_de_asistencia(gimnasio, desde=None, hasta=None):
+    """
+    Calcula las estadísticas de asistencia de un rango de fechas sobre el registro columnar.
+    Los socios y clases borrados no compiten por el máximo; los dados de baja
+    con el historial conservado sí.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        desde (str | int, optional): Primer día del rango (incluido)
+        hasta (str | int, optional): Último día del rango (incluido)
+
+    Returns:
+        dict: Ver registro_asistencia.estadisticas_registro
+    """
+    desde, hasta = _rango(desde, hasta)
+    return estadisticas_registro(gimnasio['registro_asistencia'], desde, hasta,
+                                 socio_existe=existe_con_historial(gimnasio, 'socios'),
+                                 clase_existe=existe_con_historial(gimnasio, 'clases'))
+
+def dias_con_asistencia(gimnasio, id_socio, desde=None, hasta=None):
+    """
+    Cuenta los días distintos en que un socio asistió a alguna clase
+    (un día con dos clases cuenta una vez).
+
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        id_socio (int): ID del socio
+        desde (str | int, optional): Primer día del rango (incluido)
+        hasta (str | int, optional): Último día del rango (incluido)
+
+    Returns:
+        int: Cantidad de días distintos
+    """
+    obtener_socio(gimnasio, id_socio)
+    desde, hasta = _rango(desde, hasta)
+    return dias_de_socio(gimnasio['matriz_asistencia'], id_socio).contar(desde, hasta)
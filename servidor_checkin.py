@@ -0,0 +1,333 @@
+"""
+Servidor HTTP/JSON de check-in para molinetes y terminales del gimnasio.
+Expone sobre asyncio (sin dependencias externas) el registro de asistencia,
+las inscripciones y la consulta de socios y clases, usando las mismas
+operaciones de servicios.py que los menús de asistencia.py e inscripciones.py.
+
+Las escrituras no se aplican en cada conexión: se encolan en una cola acotada
+y una única tarea escritora las toma de a lotes, las aplica y confirma el
+diario con un solo fsync por lote (commit en grupo). Cada cliente recibe su
+respuesta recién cuando su cambio es durable. El fsync y la escritura de los
+snapshots corren en un hilo aparte mientras el escritor espera: el bucle de
+eventos sigue leyendo solicitudes y respondiendo consultas. Si la cola está llena la
+conexión espera (el servidor deja de leerla) y, si la espera supera un límite,
+responde 503 para que el molinete reintente: así una ráfaga no hace crecer la
+memoria sin control ni demora indefinidamente a todos. Las consultas se
+responden en el momento, sin pasar por la cola.
+
+Rutas:
+    POST   /asistencias        {"socio_id", "clase_id", "fecha" (DD/MM/AAAA, opcional: hoy)}
+    POST   /inscripciones      {"socio_id", "clase_id"}
+    DELETE /inscripciones      {"socio_id", "clase_id"}
+    GET    /socios?dni=DNI
+    GET    /socios/ID
+    GET    /socios/ID/clases
+    GET    /clases/ID
+    GET    /estado             Estadísticas del servidor (cola, lotes, rechazos)
+
+Uso:
+    python servidor_checkin.py [--host 127.0.0.1] [--puerto 8080] [--directorio datos]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+from datetime import date
+from urllib.parse import urlsplit, parse_qs
+
+from errores import ErrorGimnasio, SocioNoEncontrado, ClaseNoEncontrada, DatoInvalido
+from persistencia import (cargar_gimnasio, confirmar_diario, cerrar_diario, escribir_snapshot, adoptar_snapshot,
+                          DIRECTORIO_DATOS)
+from diferido import Diferido
+from servicios import (obtener_socio, obtener_socio_por_dni, obtener_clase, clases_inscriptas, inscribir,
+                       desinscribir, marcar_asistencia)
+from almacen_inscripciones import cantidad_inscriptos
+
+# Solicitudes de escritura en espera antes de frenar a los clientes
+TAMANO_COLA = 4096
+# Escrituras aplicadas y confirmadas con un solo fsync
+TAMANO_LOTE = 256
+# Segundos que una escritura puede esperar lugar en la cola antes del 503
+ESPERA_COLA = 2.0
+# Tamaño máximo del cuerpo de una solicitud
+MAXIMO_CUERPO = 64 * 1024
+
+# Estado HTTP de cada error de servicios (el resto de ErrorGimnasio es un conflicto)
+ESTADOS_ERROR = {SocioNoEncontrado: 404, ClaseNoEncontrada: 404, DatoInvalido: 400}
+TEXTOS_ESTADO = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                 409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+class SolicitudInvalida(Exception):
+    """La solicitud HTTP no se puede interpretar o no corresponde a ninguna ruta."""
+
+    def __init__(self, mensaje, estado=400, cerrar=False):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.cerrar = cerrar
+
+class Saturado(Exception):
+    """La cola de escrituras siguió llena durante toda la espera."""
+
+def _entero(datos, campo):
+    """
+    Lee un campo entero de los datos de una solicitud.
+
+    Args:
+        datos (dict): Datos de la solicitud
+        campo (str): Campo a leer
+
+    Returns:
+        int: Valor del campo
+    """
+    try:
+        return int(datos[campo])
+    except (KeyError, TypeError, ValueError):
+        raise SolicitudInvalida(f"Falta o no es válido el campo {campo}.")
+
+def _registrar_asistencia(gimnasio, socio_id, clase_id, fecha, diario=None):
+    # Marca la asistencia y responde si era nueva (como asistencia.registrar_asistencia)
+    return {'registrada': marcar_asistencia(gimnasio, socio_id, clase_id, fecha, diario)}
+
+def _inscribir(gimnasio, socio_id, clase_id, diario=None):
+    inscribir(gimnasio, socio_id, clase_id, diario)
+    return {'inscripto': True}
+
+def _desinscribir(gimnasio, socio_id, clase_id, diario=None):
+    desinscribir(gimnasio, socio_id, clase_id, diario)
+    return {'inscripto': False}
+
+class ServidorCheckin:
+    """
+    Servidor de check-in sobre un estado del gimnasio y su diario.
+    Una sola tarea escritora modifica el estado; las conexiones solo leen y encolan.
+    """
+
+    def __init__(self, gimnasio, diario, tamano_cola=TAMANO_COLA, tamano_lote=TAMANO_LOTE, espera_cola=ESPERA_COLA):
+        self.gimnasio = gimnasio
+        self.diario = diario
+        # La compactación la decide el escritor (ver _compactar): confirmar_diario solo escribe y hace fsync
+        self.eventos_por_snapshot = diario['eventos_por_snapshot']
+        diario['eventos_por_snapshot'] = math.inf
+        self.tamano_cola = tamano_cola
+        self.tamano_lote = tamano_lote
+        self.espera_cola = espera_cola
+        self.cola = None
+        self.escritor = None
+        self.servidor = None
+        self.estadisticas = {'conexiones': 0, 'solicitudes': 0, 'escrituras': 0, 'lotes': 0, 'rechazadas': 0}
+
+    async def iniciar(self, host='127.0.0.1', puerto=8080):
+        # Los almacenes diferidos se construyen ahora: una consulta no puede
+        # modificarlos mientras otro hilo los recorre para escribir un snapshot
+        for almacen in self.gimnasio.values():
+            if isinstance(almacen, Diferido):
+                almacen.construir()
+        self.cola = asyncio.Queue(self.tamano_cola)
+        self.escritor = asyncio.create_task(self._escribir())
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self.servidor
+
+    async def detener(self):
+        # Dejar de aceptar conexiones, terminar las escrituras encoladas y confirmar
+        self.servidor.close()
+        await self.cola.join()
+        self.escritor.cancel()
+        await asyncio.get_running_loop().run_in_executor(None, confirmar_diario, self.diario)
+
+    async def _compactar(self):
+        # El snapshot se escribe en otro hilo (solo lee el estado y el escritor no
+        # aplica nada hasta que termine); el remapeo y el vaciado del diario son
+        # cortos y se hacen acá, sin consultas en curso
+        try:
+            ruta = await asyncio.get_running_loop().run_in_executor(None, escribir_snapshot, self.diario)
+            adoptar_snapshot(self.diario, ruta)
+        except OSError as error:
+            # El diario sigue teniendo todo: se reintenta después del próximo lote
+            print(f"No se pudo compactar el diario: {error}", flush=True)
+
+    async def _escribir(self):
+        bucle = asyncio.get_running_loop()
+        while True:
+            lote = [await self.cola.get()]
+            while len(lote) < self.tamano_lote and not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+            resultados = []
+            for operacion, argumentos, futuro in lote:
+                try:
+                    resultados.append((futuro, operacion(self.gimnasio, *argumentos, diario=self.diario), None))
+                except Exception as error:
+                    # El error vuelve solo al cliente que lo causó; el escritor sigue
+                    resultados.append((futuro, None, error))
+            # Un solo fsync por lote; las respuestas salen después de que el lote es durable
+            try:
+                await bucle.run_in_executor(None, confirmar_diario, self.diario)
+            except OSError as error:
+                resultados = [(futuro, None, error) for futuro, _, _ in resultados]
+            for futuro, resultado, error in resultados:
+                if not futuro.done():
+                    if error is None:
+                        futuro.set_result(resultado)
+                    else:
+                        futuro.set_exception(error)
+            self.estadisticas['escrituras'] += len(lote)
+            self.estadisticas['lotes'] += 1
+            if self.diario['eventos_en_diario'] >= self.eventos_por_snapshot:
+                await self._compactar()
+            # Recién ahora: detener() no debe cortar una compactación a medias
+            for _ in lote:
+                self.cola.task_done()
+
+    async def _encolar(self, operacion, *argumentos):
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.cola.put((operacion, argumentos, futuro)), self.espera_cola)
+        except asyncio.TimeoutError:
+            self.estadisticas['rechazadas'] += 1
+            raise Saturado()
+        return await futuro
+
+    async def _atender(self, lector, escritor):
+        self.estadisticas['conexiones'] += 1
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                seguir = True
+                try:
+                    metodo, ruta, encabezados, cuerpo = await self._leer_solicitud(lector, linea)
+                    seguir = encabezados.get('connection', '').lower() != 'close'
+                    estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                except SolicitudInvalida as error:
+                    estado, respuesta = error.estado, {'error': str(error)}
+                    # Si no se pudo leer la solicitud entera, la conexión quedó desincronizada
+                    seguir = seguir and not error.cerrar
+                except Saturado:
+                    estado, respuesta = 503, {'error': "Servidor ocupado, reintente."}
+                except Exception as error:
+                    estado, respuesta = 500, {'error': str(error)}
+                self.estadisticas['solicitudes'] += 1
+                escritor.write(self._respuesta(estado, respuesta, seguir))
+                await escritor.drain()
+                if not seguir:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _leer_solicitud(self, lector, linea):
+        try:
+            metodo, ruta, _ = linea.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise SolicitudInvalida("Línea de solicitud inválida.", cerrar=True)
+        encabezados = {}
+        while True:
+            encabezado = await lector.readline()
+            if encabezado in (b'\r\n', b'\n', b''):
+                break
+            nombre, _, valor = encabezado.decode('latin-1').partition(':')
+            encabezados[nombre.strip().lower()] = valor.strip()
+        try:
+            largo = int(encabezados.get('content-length', 0))
+        except ValueError:
+            raise SolicitudInvalida("Content-Length inválido.", cerrar=True)
+        if largo > MAXIMO_CUERPO:
+            raise SolicitudInvalida("Cuerpo demasiado grande.", 413, cerrar=True)
+        cuerpo = await lector.readexactly(largo) if largo else b''
+        return metodo.upper(), ruta, encabezados, cuerpo
+
+    def _respuesta(self, estado, datos, seguir=True):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        encabezados = [f"HTTP/1.1 {estado} {TEXTOS_ESTADO.get(estado, '')}",
+                       "Content-Type: application/json; charset=utf-8",
+                       f"Content-Length: {len(cuerpo)}",
+                       "Connection: " + ("keep-alive" if seguir else "close")]
+        if estado == 503:
+            encabezados.append("Retry-After: 1")
+        return ('\r\n'.join(encabezados) + '\r\n\r\n').encode('latin-1') + cuerpo
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        partes = urlsplit(ruta)
+        segmentos = [segmento for segmento in partes.path.split('/') if segmento]
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+        except ValueError:
+            raise SolicitudInvalida("El cuerpo no es JSON válido.")
+        if not isinstance(datos, dict):
+            raise SolicitudInvalida("El cuerpo debe ser un objeto JSON.")
+
+        try:
+            if segmentos == ['asistencias'] and metodo == 'POST':
+                fecha = datos.get('fecha') or date.today().strftime('%d/%m/%Y')
+                resultado = await self._encolar(_registrar_asistencia, _entero(datos, 'socio_id'),
+                                                _entero(datos, 'clase_id'), fecha)
+                return (201 if resultado['registrada'] else 200), resultado
+            if segmentos == ['inscripciones'] and metodo in ('POST', 'DELETE'):
+                operacion = _inscribir if metodo == 'POST' else _desinscribir
+                estado = 201 if metodo == 'POST' else 200
+                return estado, await self._encolar(operacion, _entero(datos, 'socio_id'), _entero(datos, 'clase_id'))
+            if metodo != 'GET':
+                raise SolicitudInvalida("Método no permitido.", 405)
+            return 200, self._consultar(segmentos, parse_qs(partes.query))
+        except ErrorGimnasio as error:
+            return ESTADOS_ERROR.get(type(error), 409), {'error': str(error)}
+        except ValueError as error:
+            return 400, {'error': str(error)}
+
+    def _consultar(self, segmentos, parametros):
+        gimnasio = self.gimnasio
+        if segmentos == ['estado']:
+            return dict(self.estadisticas, en_cola=self.cola.qsize())
+        if segmentos == ['socios'] and 'dni' in parametros:
+            id_socio = obtener_socio_por_dni(gimnasio, parametros['dni'][0])
+            return {'id': id_socio, 'socio': dict(gimnasio['socios'][id_socio])}
+        if len(segmentos) in (2, 3) and segmentos[0] == 'socios' and segmentos[1].isdigit():
+            id_socio = int(segmentos[1])
+            if len(segmentos) == 2:
+                return {'id': id_socio, 'socio': dict(obtener_socio(gimnasio, id_socio))}
+            if segmentos[2] == 'clases':
+                return {'id': id_socio, 'clases': [{'id': id_clase, 'clase': dict(datos)}
+                                                   for id_clase, datos in clases_inscriptas(gimnasio, id_socio)]}
+        if len(segmentos) == 2 and segmentos[0] == 'clases' and segmentos[1].isdigit():
+            id_clase = int(segmentos[1])
+            clase = dict(obtener_clase(gimnasio, id_clase))
+            return {'id': id_clase, 'clase': clase,
+                    'inscriptos': cantidad_inscriptos(gimnasio['inscripciones'], id_clase)}
+        raise SolicitudInvalida("Ruta inexistente.", 404)
+
+async def servir(directorio=DIRECTORIO_DATOS, host='127.0.0.1', puerto=8080):
+    """
+    Carga el gimnasio y atiende solicitudes hasta que se interrumpe el proceso.
+
+    Args:
+        directorio (str, optional): Directorio de datos
+        host (str, optional): Dirección donde escuchar
+        puerto (int, optional): Puerto donde escuchar
+    """
+    # El diario se confirma por lote desde el escritor, no por cantidad de eventos
+    gimnasio, diario = cargar_gimnasio(directorio, tamano_grupo=TAMANO_LOTE + 1)
+    servidor = ServidorCheckin(gimnasio, diario)
+    sockets = (await servidor.iniciar(host, puerto)).sockets
+    # Con puerto 0 el sistema elige uno libre: se informa el real
+    print(f"Servidor de check-in escuchando en http://{host}:{sockets[0].getsockname()[1]}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.detener()
+        cerrar_diario(diario)
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON de check-in del gimnasio.")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección donde escuchar")
+    parser.add_argument('--puerto', type=int, default=8080, help="Puerto donde escuchar")
+    parser.add_argument('--directorio', default=DIRECTORIO_DATOS, help="Directorio de datos")
+    argumentos = parser.parse_args()
+    try:
+        asyncio.run(servir(argumentos.directorio, argumentos.host, argumentos.puerto))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
+
+if __name__ == "__main__":
+    main()
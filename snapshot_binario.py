@@ -0,0 +1,443 @@
+"""
+Módulo de snapshots binarios para el sistema de gimnasio.
+Define un formato versionado que se abre con mmap: los socios y las clases se
+guardan en columnas de ancho fijo, los textos en una tabla de cadenas sin
+repeticiones y las inscripciones y asistencias en arreglos contiguos de enteros.
+Al cargar no se decodifica nada: cada registro se lee la primera vez que se usa.
+"""
+
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+from almacen_inscripciones import crear_inscripciones, iterar_inscripciones
+from almacen_asistencia import crear_asistencia, iterar_registros
+from bitmap_dias import BitmapDias
+from indices_socios import CAMPOS_UNICOS
+from metricas import calcular_metricas
+from registro_asistencia import crear_registro
+from cubo import calcular_cubo
+from listados import crear_listados, crear_orden_nombres
+from busqueda import crear_busqueda
+from indices_clases import crear_indices_clases
+from agenda import crear_agenda
+from registros_compactos import RegistrosCompactos, ESQUEMA_SOCIOS, ESQUEMA_CLASES
+from diferido import Diferido
+
+MAGICO = b'GIMSNAP\0'
+VERSION_BINARIO = 3
+
+# Cabecera: mágico, versión, orden de bytes, seq, próximo ID de socios y de clases
+FORMATO_CABECERA = '<8sIIQQQ'
+# Entrada del directorio de secciones: nombre, desplazamiento, bytes
+FORMATO_SECCION = '<32sQQ'
+
+# Columnas de cada entidad: (campo, tipo). Los textos se guardan como índice en la tabla de cadenas.
+COLUMNAS_SOCIOS = [
+    ('nombre', 'str'), ('apellido', 'str'), ('dni', 'str'), ('email', 'str'),
+    ('telefono', 'str'), ('fecha_nacimiento', 'str'), ('direccion', 'str'),
+    ('fecha_alta', 'str'), ('activo', 'bool')
+]
+COLUMNAS_CLASES = [
+    ('nombre', 'str'), ('profesor', 'str'), ('cupo', 'int'),
+    ('horario', 'str'), ('duracion', 'str'), ('activa', 'bool')
+]
+
+# Código de array para cada tipo de columna
+CODIGO_TIPO = {'str': 'I', 'int': 'I', 'bool': 'B'}
+# Almacenes diferidos que se construyen leyendo las secciones del snapshot mapeado
+ALMACENES_MAPEADOS = ('inscripciones', 'matriz_asistencia', 'registro_asistencia')
+
+def _secciones():
+    """
+    Devuelve el orden fijo de las secciones del archivo con su código de array.
+
+    Returns:
+        list: Tuplas (nombre_seccion, codigo_array)
+    """
+    secciones = [('cadenas.offsets', 'Q'), ('cadenas.datos', 'B'), ('socios.id', 'I')]
+    secciones += [(f'socios.{campo}', CODIGO_TIPO[tipo]) for campo, tipo in COLUMNAS_SOCIOS]
+    secciones.append(('clases.id', 'I'))
+    secciones += [(f'clases.{campo}', CODIGO_TIPO[tipo]) for campo, tipo in COLUMNAS_CLASES]
+    secciones += [('insc.socio', 'I'), ('insc.clase', 'I'),
+                  ('asis.socio', 'I'), ('asis.clase', 'I'), ('asis.dia', 'I')]
+    # Socios y clases dados de baja con el historial conservado
+    for prefijo, definicion in (('hist.socios', COLUMNAS_SOCIOS), ('hist.clases', COLUMNAS_CLASES)):
+        secciones.append((f'{prefijo}.id', 'I'))
+        secciones += [(f'{prefijo}.{campo}', CODIGO_TIPO[tipo]) for campo, tipo in definicion]
+    return secciones
+
+class TablaCadenas:
+    """
+    Tabla de cadenas internadas sobre el archivo mapeado.
+    Cada cadena se decodifica una sola vez y queda en caché.
+    """
+
+    def __init__(self, offsets, datos):
+        self._offsets = offsets
+        self._datos = datos
+        self._cache = {}
+
+    def __getitem__(self, indice):
+        cadena = self._cache.get(indice)
+        if cadena is None:
+            inicio, fin = self._offsets[indice], self._offsets[indice + 1]
+            cadena = self._cache[indice] = bytes(self._datos[inicio:fin]).decode('utf-8')
+        return cadena
+
+class RegistrosMapeados(MutableMapping):
+    """
+    Diccionario {id: {...}} respaldado por las columnas de un snapshot mapeado.
+    Un registro se decodifica la primera vez que se accede y desde entonces vive
+    en memoria (en un almacén compacto con el esquema de la entidad), así las
+    modificaciones sobre el registro devuelto persisten. Las altas y bajas
+    posteriores al snapshot se guardan aparte. La decodificación toma un
+    candado: dos hilos que leen registros distintos (ver concurrencia.py) no
+    pueden agregar filas a la vez al almacén compacto.
+    """
+
+    def __init__(self, ids, columnas, cadenas, esquema):
+        self._ids = ids                # IDs del snapshot, en orden ascendente
+        self._columnas = columnas      # {campo: (tipo, columna)}
+        self._cadenas = cadenas
+        self._decodificados = RegistrosCompactos(esquema)   # Registros del snapshot ya leídos
+        self._nuevos = RegistrosCompactos(esquema)          # Registros agregados después del snapshot
+        self._borrados = set()         # IDs del snapshot dados de baja
+        self._candado = threading.Lock()
+
+    def _fila(self, clave):
+        fila = bisect_left(self._ids, clave) if isinstance(clave, int) else len(self._ids)
+        if fila < len(self._ids) and self._ids[fila] == clave:
+            return fila
+        return -1
+
+    def _valor(self, campo, fila):
+        tipo, columna = self._columnas[campo]
+        valor = columna[fila]
+        if tipo == 'str':
+            return self._cadenas[valor]
+        if tipo == 'bool':
+            return bool(valor)
+        return valor
+
+    def _decodificar(self, fila):
+        return {campo: self._valor(campo, fila) for campo in self._columnas}
+
+    def __getitem__(self, clave):
+        if clave in self._nuevos:
+            return self._nuevos[clave]
+        if clave in self._decodificados:
+            return self._decodificados[clave]
+        fila = self._fila(clave)
+        if fila < 0 or clave in self._borrados:
+            raise KeyError(clave)
+        with self._candado:
+            # Otro hilo pudo decodificarlo mientras se esperaba el candado
+            if clave not in self._decodificados:
+                self._decodificados[clave] = self._decodificar(fila)
+        return self._decodificados[clave]
+
+    def __setitem__(self, clave, valor):
+        if self._fila(clave) >= 0:
+            self._borrados.discard(clave)
+            self._decodificados[clave] = valor
+        else:
+            self._nuevos[clave] = valor
+
+    def __delitem__(self, clave):
+        if clave in self._nuevos:
+            del self._nuevos[clave]
+            return
+        if self._fila(clave) < 0 or clave in self._borrados:
+            raise KeyError(clave)
+        self._borrados.add(clave)
+        self._decodificados.pop(clave, None)
+
+    def __contains__(self, clave):
+        if clave in self._nuevos:
+            return True
+        return self._fila(clave) >= 0 and clave not in self._borrados
+
+    def __iter__(self):
+        # Los IDs nuevos siempre son mayores que los del snapshot (secuencias monótonas)
+        for clave in self._ids:
+            if clave not in self._borrados:
+                yield clave
+        yield from list(self._nuevos)
+
+    def __len__(self):
+        return len(self._ids) - len(self._borrados) + len(self._nuevos)
+
+    def registros(self):
+        """
+        Recorre los registros sin dejarlos en caché (para escribir snapshots).
+
+        Yields:
+            tuple: (id, datos)
+        """
+        for fila, clave in enumerate(self._ids):
+            if clave in self._borrados:
+                continue
+            registro = self._decodificados.get(clave)
+            yield clave, registro if registro is not None else self._decodificar(fila)
+        yield from list(self._nuevos.items())
+
+    def remapear(self, otro):
+        """
+        Pasa a leer las columnas de otro almacén mapeado con los mismos registros
+        (el de un snapshot recién escrito). Lo decodificado y las altas y bajas
+        guardadas aparte ya están en esas columnas: se descartan.
+
+        Args:
+            otro (RegistrosMapeados): Almacén del snapshot nuevo
+        """
+        self._ids, self._columnas, self._cadenas = otro._ids, otro._columnas, otro._cadenas
+        self._decodificados, self._nuevos, self._borrados = otro._decodificados, otro._nuevos, otro._borrados
+
+    def columna(self, campo):
+        """
+        Recorre un solo campo de todos los registros sin decodificar el resto.
+
+        Args:
+            campo (str): Campo a recorrer
+
+        Yields:
+            tuple: (id, valor)
+        """
+        tipo, columna = self._columnas[campo]
+        if not self._borrados and not self._decodificados:
+            # Camino rápido: ningún registro del snapshot fue tocado todavía
+            if tipo == 'str':
+                yield from zip(self._ids, map(self._cadenas.__getitem__, columna))
+            elif tipo == 'bool':
+                yield from zip(self._ids, map(bool, columna))
+            else:
+                yield from zip(self._ids, columna)
+        else:
+            for fila, clave in enumerate(self._ids):
+                if clave in self._borrados:
+                    continue
+                registro = self._decodificados.get(clave)
+                yield clave, registro[campo] if registro is not None else self._valor(campo, fila)
+        for clave, registro in list(self._nuevos.items()):
+            yield clave, registro[campo]
+
+def escribir_snapshot_binario(archivo, gimnasio, seq):
+    """
+    Escribe el estado en formato binario. Los registros se ordenan por ID para
+    poder buscarlos por bisección sin construir índices al cargar.
+
+    Args:
+        archivo (file): Archivo binario abierto para escritura
+        gimnasio (dict): Estado del gimnasio
+        seq (int): Último número de secuencia del diario incluido
+    """
+    cadenas = {}
+    datos_cadenas = bytearray()
+    offsets = array('Q', [0])
+
+    def internar(texto):
+        indice = cadenas.get(texto)
+        if indice is None:
+            indice = cadenas[texto] = len(offsets) - 1
+            datos_cadenas.extend(texto.encode('utf-8'))
+            offsets.append(len(datos_cadenas))
+        return indice
+
+    columnas = {nombre: array(codigo) for nombre, codigo in _secciones()}
+
+    def volcar(prefijo, registros, definicion):
+        for clave, datos in sorted(registros, key=lambda par: par[0]):
+            columnas[f'{prefijo}.id'].append(clave)
+            for campo, tipo in definicion:
+                valor = datos[campo]
+                columnas[f'{prefijo}.{campo}'].append(internar(valor) if tipo == 'str' else int(valor))
+
+    historico = gimnasio.get('historico', {})
+    for prefijo, entidad, definicion in (('socios', gimnasio['socios'], COLUMNAS_SOCIOS),
+                                         ('clases', gimnasio['clases'], COLUMNAS_CLASES),
+                                         ('hist.socios', historico.get('socios', {}), COLUMNAS_SOCIOS),
+                                         ('hist.clases', historico.get('clases', {}), COLUMNAS_CLASES)):
+        registros = entidad.registros() if isinstance(entidad, RegistrosMapeados) else entidad.items()
+        volcar(prefijo, registros, definicion)
+
+    for socio_id, clase_id in sorted(iterar_inscripciones(gimnasio['inscripciones'])):
+        columnas['insc.socio'].append(socio_id)
+        columnas['insc.clase'].append(clase_id)
+
+    for (socio_id, clase_id), dias in sorted(iterar_registros(gimnasio['matriz_asistencia'])):
+        columnas['asis.socio'].extend([socio_id] * len(dias))
+        columnas['asis.clase'].extend([clase_id] * len(dias))
+        columnas['asis.dia'].extend(dias)
+
+    columnas['cadenas.offsets'] = offsets
+    columnas['cadenas.datos'] = array('B', datos_cadenas)
+
+    secciones = _secciones()
+    desplazamiento = struct.calcsize(FORMATO_CABECERA) + struct.calcsize(FORMATO_SECCION) * len(secciones)
+    directorio = []
+    for nombre, _ in secciones:
+        desplazamiento += -desplazamiento % 8  # alinear cada sección a 8 bytes
+        tamano = len(columnas[nombre]) * columnas[nombre].itemsize
+        directorio.append((nombre, desplazamiento, tamano))
+        desplazamiento += tamano
+
+    orden = 1 if sys.byteorder == 'little' else 2
+    archivo.write(struct.pack(FORMATO_CABECERA, MAGICO, VERSION_BINARIO, orden, seq,
+                              gimnasio['secuencias']['socios'], gimnasio['secuencias']['clases']))
+    for nombre, inicio, tamano in directorio:
+        archivo.write(struct.pack(FORMATO_SECCION, nombre.encode('ascii'), inicio, tamano))
+    for nombre, inicio, tamano in directorio:
+        archivo.write(b'\0' * (inicio - archivo.tell()))
+        columnas[nombre].tofile(archivo)
+
+def _construir_indices(socios):
+    """
+    Construye los índices únicos leyendo solo las columnas necesarias.
+
+    Args:
+        socios (RegistrosMapeados): Socios mapeados
+
+    Returns:
+        dict: Índices {campo: {valor_normalizado: id_socio}}
+    """
+    indices = {}
+    for campo, normalizar in CAMPOS_UNICOS.items():
+        indices[campo] = {normalizar(valor): id_socio for id_socio, valor in socios.columna(campo)}
+    return indices
+
+def cargar_snapshot_binario(ruta):
+    """
+    Abre un snapshot binario con mmap. Solo se lee la cabecera: los registros,
+    índices, inscripciones y asistencias se decodifican al usarlos por primera vez.
+
+    Args:
+        ruta (str): Ruta del snapshot
+
+    Returns:
+        tuple: (gimnasio, seq)
+    """
+    with open(ruta, 'rb') as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+    vista = memoryview(mapa)
+
+    magico, version, orden, seq, sig_socio, sig_clase = struct.unpack_from(FORMATO_CABECERA, mapa, 0)
+    if magico != MAGICO:
+        raise ValueError(f"{ruta} no es un snapshot binario del gimnasio.")
+    if version != VERSION_BINARIO:
+        raise ValueError(f"Versión de snapshot binario no soportada: {version}")
+    if orden != (1 if sys.byteorder == 'little' else 2):
+        raise ValueError("El snapshot se generó en una plataforma con otro orden de bytes.")
+
+    secciones = {}
+    posicion = struct.calcsize(FORMATO_CABECERA)
+    for nombre, codigo in _secciones():
+        nombre_guardado, inicio, tamano = struct.unpack_from(FORMATO_SECCION, mapa, posicion)
+        if nombre_guardado.rstrip(b'\0').decode('ascii') != nombre:
+            raise ValueError(f"Sección inesperada en el snapshot: {nombre_guardado!r}")
+        secciones[nombre] = vista[inicio:inicio + tamano].cast(codigo)
+        posicion += struct.calcsize(FORMATO_SECCION)
+
+    cadenas = TablaCadenas(secciones['cadenas.offsets'], secciones['cadenas.datos'])
+    socios = RegistrosMapeados(secciones['socios.id'],
+                               {campo: (tipo, secciones[f'socios.{campo}']) for campo, tipo in COLUMNAS_SOCIOS},
+                               cadenas, ESQUEMA_SOCIOS)
+    clases = RegistrosMapeados(secciones['clases.id'],
+                               {campo: (tipo, secciones[f'clases.{campo}']) for campo, tipo in COLUMNAS_CLASES},
+                               cadenas, ESQUEMA_CLASES)
+    historico = {}
+    for entidad, definicion, esquema in (('socios', COLUMNAS_SOCIOS, ESQUEMA_SOCIOS),
+                                         ('clases', COLUMNAS_CLASES, ESQUEMA_CLASES)):
+        historico[entidad] = RegistrosMapeados(
+            secciones[f'hist.{entidad}.id'],
+            {campo: (tipo, secciones[f'hist.{entidad}.{campo}']) for campo, tipo in definicion},
+            cadenas, esquema)
+
+    def construir_inscripciones():
+        return crear_inscripciones(zip(secciones['insc.socio'], secciones['insc.clase']))
+
+    def construir_asistencia():
+        # Las filas están ordenadas por (socio, clase, día): se agrupan en una sola pasada
+        matriz_asistencia = crear_asistencia()
+        registros = matriz_asistencia['registros']
+        por_socio = matriz_asistencia['por_socio']
+        por_clase = matriz_asistencia['por_clase']
+
+        def cerrar(clave, dias):
+            registros[clave] = BitmapDias.desde_ordenados(dias)
+            por_socio.setdefault(clave[0], set()).add(clave[1])
+            por_clase.setdefault(clave[1], set()).add(clave[0])
+
+        clave_actual, dias = None, []
+        for socio_id, clase_id, dia in zip(secciones['asis.socio'], secciones['asis.clase'], secciones['asis.dia']):
+            if (socio_id, clase_id) != clave_actual:
+                if clave_actual is not None:
+                    cerrar(clave_actual, dias)
+                clave_actual, dias = (socio_id, clase_id), []
+            dias.append(dia)
+        if clave_actual is not None:
+            cerrar(clave_actual, dias)
+        matriz_asistencia['total'] = sum(map(len, registros.values()))
+        return matriz_asistencia
+
+    gimnasio = {
+        'socios': socios,
+        'clases': clases,
+        'inscripciones': Diferido(construir_inscripciones),
+        'matriz_asistencia': Diferido(construir_asistencia),
+        'secuencias': {'socios': sig_socio, 'clases': sig_clase},
+        # Los índices se construyen desde los socios actuales: no hace falta reproducir cambios
+        'indices_socios': Diferido(lambda: _construir_indices(socios), reproducir=False),
+        'historico': historico
+    }
+    # Las métricas se calculan desde el estado ya actualizado la primera vez que se consultan
+    gimnasio['metricas'] = Diferido(lambda: calcular_metricas(gimnasio), reproducir=False)
+    # Las columnas de asistencia del snapshot ya son el registro columnar: se copian en bloque
+    gimnasio['registro_asistencia'] = Diferido(
+        lambda: crear_registro(secciones['asis.socio'], secciones['asis.clase'], secciones['asis.dia']))
+    gimnasio['cubo'] = Diferido(lambda: calcular_cubo(gimnasio), reproducir=False)
+    gimnasio['listados'] = Diferido(lambda: crear_listados(gimnasio['socios'], gimnasio['clases']), reproducir=False)
+    gimnasio['orden_nombres'] = Diferido(lambda: crear_orden_nombres(gimnasio['socios']), reproducir=False)
+    gimnasio['busqueda_socios'] = Diferido(lambda: crear_busqueda(gimnasio['socios']), reproducir=False)
+    gimnasio['indices_clases'] = Diferido(lambda: crear_indices_clases(gimnasio['clases'], gimnasio['inscripciones']),
+                                          reproducir=False)
+    gimnasio['agenda'] = Diferido(lambda: crear_agenda(gimnasio['clases'], gimnasio['inscripciones']), reproducir=False)
+    return gimnasio, seq
+
+def remapear_snapshot_binario(gimnasio, ruta):
+    """
+    Pasa un estado cargado de un snapshot mapeado a leer de otro recién escrito
+    con su mismo contenido y cierra el mapeo anterior, para poder borrar su
+    archivo. Los almacenes diferidos que todavía leerían del mapeo anterior se
+    reemplazan por los del snapshot nuevo.
+
+    Args:
+        gimnasio (dict): Estado del gimnasio, igual al guardado en ruta
+        ruta (str): Ruta del snapshot recién escrito
+    """
+    historico = gimnasio.get('historico', {})
+    mapeados = [(contenedor, entidad) for contenedor in (gimnasio, historico) for entidad in ('socios', 'clases')
+                if isinstance(contenedor.get(entidad), RegistrosMapeados)]
+    if not mapeados:
+        # El estado no viene de un snapshot mapeado: no hay nada que soltar
+        return
+    mapa = mapeados[0][0][mapeados[0][1]]._ids.obj
+    nuevo, _ = cargar_snapshot_binario(ruta)
+    for contenedor, entidad in mapeados:
+        origen = nuevo if contenedor is gimnasio else nuevo['historico']
+        contenedor[entidad].remapear(origen[entidad])
+    for nombre in ALMACENES_MAPEADOS:
+        if isinstance(gimnasio[nombre], Diferido) and gimnasio[nombre].pendiente:
+            gimnasio[nombre] = nuevo[nombre]
+    # Lo que no se usó del estado nuevo se referencia a sí mismo: sin esto sus
+    # vistas esperarían al recolector de ciclos y el próximo remapeo no podría cerrar
+    nuevo.clear()
+    try:
+        mapa.close()
+    except BufferError:
+        # Alguien conserva una vista del mapeo anterior: se libera cuando la suelte
+        pass
@@ -1,35 +1,66 @@
 """
 Módulo de gestión de socios para el sistema de gimnasio.
-Implementa todas las operaciones CRUD para socios.
+Implementa los menús CRUD de socios sobre las operaciones de servicios.py.
 """
 
-from validaciones import validar_email, validar_dni, validar_telefono, generar_id_unico, verificar_dni_duplicado
+from validaciones import validar_email, validar_dni, validar_telefono, validar_fecha
+from indices_socios import verificar_dni_duplicado, verificar_duplicado
+from errores import ErrorGimnasio
+from instrumentacion import instrumentar_menu
+from paginacion import elegir_id, COMANDO_NOMBRE, COMANDO_DNI, COMANDO_ESTADO
+from servicios import (crear_socio, eliminar_socio, actualizar_socio, obtener_socio, obtener_socio_por_dni,
+                       clases_inscriptas, paginar_socios, buscar_socios)
 
-def mostrar_socios(socios):
+def fila_socio(id_socio, datos):
     """
-    Muestra la lista de socios disponibles.
+    Devuelve la línea de listado de un socio.
     
     Args:
-        socios (dict): Diccionario de socios
+        id_socio (int): ID del socio
+        datos (dict): Datos del socio
+    
+    Returns:
+        str: Línea con ID, nombre, DNI y estado
     """
-    if not socios:
-        print("No hay socios registrados.")
-        return
+    estado = "Activo" if datos['activo'] else "Inactivo"
+    return f"ID: {id_socio} | {datos['nombre']} {datos['apellido']} | DNI: {datos['dni']} | Estado: {estado}"
+
+def elegir_socio(gimnasio, mensaje, estado=None, filtro=None, formato=fila_socio, titulo="SOCIOS DISPONIBLES",
+                 comandos=COMANDO_NOMBRE + COMANDO_DNI + COMANDO_ESTADO, listar=True):
+    """
+    Muestra los socios de a una página (con filtros por nombre, DNI y estado) y pide un ID.
+    Un texto que no es un ID busca por nombre, apellido, DNI o email.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+        mensaje (str): Texto del input
+        estado (str, optional): Estado inicial (None, 'activos' o 'inactivos')
+        filtro (callable, optional): Filtro adicional (id, datos) -> bool
+        formato (callable, optional): Función (id, datos) -> str de cada fila
+        titulo (str, optional): Título del listado
+        comandos (str, optional): Comandos de filtro habilitados
+        listar (bool, optional): Mostrar el listado antes de pedir el ID
+    
+    Returns:
+        int: ID ingresado, o None si no hay socios para elegir
+    """
+    def paginar(**filtros):
+        return paginar_socios(gimnasio, filtro=filtro, **filtros)
+    
+    def buscar(texto, estado_actual):
+        return buscar_socios(gimnasio, texto, estado=estado_actual, filtro=filtro)
     
-    print("\n--- SOCIOS DISPONIBLES ---")
-    for id_socio, datos in socios.items():
-        estado = "Activo" if datos['activo'] else "Inactivo"
-        print(f"ID: {id_socio} | {datos['nombre']} {datos['apellido']} | DNI: {datos['dni']} | Estado: {estado}")
+    return elegir_id(paginar, formato, mensaje, titulo, "No hay socios para mostrar.", estado, comandos,
+                     buscar=buscar, listar=listar)
 
-def altaSocio(socios):
+@instrumentar_menu
+def altaSocio(gimnasio, diario=None):
     """
     Dar de alta un socio (CRUD - Create).
     
     Args:
-        socios (dict): Diccionario de socios
-        
-    Returns:
-        dict: Diccionario de socios actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- ALTA DE SOCIO ---")
     
@@ -47,222 +78,227 @@ def altaSocio(socios):
     while not validar_dni(dni):
         dni = input("DNI inválido. Ingrese el DNI (7-8 dígitos): ").strip()
     
-    # Verificar DNI duplicado
-    if verificar_dni_duplicado(dni, socios):
+    # Verificar DNI duplicado antes de seguir pidiendo datos
+    if verificar_dni_duplicado(dni, gimnasio['indices_socios']):
         print("Error: Ya existe un socio con ese DNI.")
-        return socios
+        return
     
     # Validar email
     email = input("Ingrese el email: ").strip().lower()
     while not validar_email(email):
         email = input("Email inválido. Ingrese el email: ").strip().lower()
     
+    # Verificar email duplicado
+    if verificar_duplicado('email', email, gimnasio['indices_socios']):
+        print("Error: Ya existe un socio con ese email.")
+        return
+    
     # Validar teléfono
     telefono = input("Ingrese el teléfono: ").strip()
     while not validar_telefono(telefono):
         telefono = input("Teléfono inválido. Ingrese el teléfono: ").strip()
     
+    # Verificar teléfono duplicado
+    if verificar_duplicado('telefono', telefono, gimnasio['indices_socios']):
+        print("Error: Ya existe un socio con ese teléfono.")
+        return
+    
+    # Validar fechas (pueden quedar vacías)
     fecha_nacimiento = input("Ingrese la fecha de nacimiento (DD/MM/AAAA): ").strip()
+    while fecha_nacimiento and not validar_fecha(fecha_nacimiento):
+        fecha_nacimiento = input("Fecha inválida. Ingrese la fecha de nacimiento (DD/MM/AAAA): ").strip()
+    
     direccion = input("Ingrese la dirección: ").strip()
+    
     fecha_alta = input("Ingrese la fecha de alta (DD/MM/AAAA): ").strip()
+    while fecha_alta and not validar_fecha(fecha_alta):
+        fecha_alta = input("Fecha inválida. Ingrese la fecha de alta (DD/MM/AAAA): ").strip()
     
-    # Generar ID único
-    id_socio = generar_id_unico(socios)
-    
-    # Crear el socio
-    socios[id_socio] = {
-        'nombre': nombre,
-        'apellido': apellido,
-        'dni': dni,
-        'email': email,
-        'telefono': telefono,
-        'fecha_nacimiento': fecha_nacimiento,
-        'direccion': direccion,
-        'fecha_alta': fecha_alta,
-        'activo': True
-    }
-    
-    print(f"Socio registrado exitosamente con ID: {id_socio}")
-    return socios
+    # Crear el socio (verifica DNI, email y teléfono duplicados)
+    try:
+        id_socio = crear_socio(gimnasio, {
+            'nombre': nombre,
+            'apellido': apellido,
+            'dni': dni,
+            'email': email,
+            'telefono': telefono,
+            'fecha_nacimiento': fecha_nacimiento,
+            'direccion': direccion,
+            'fecha_alta': fecha_alta
+        }, diario)
+        print(f"Socio registrado exitosamente con ID: {id_socio}")
+    except ErrorGimnasio as error:
+        print(f"Error: {error}")
 
-def bajaSocio(socios):
+@instrumentar_menu
+def bajaSocio(gimnasio, diario=None):
     """
     Dar de baja un socio (CRUD - Delete).
     
     Args:
-        socios (dict): Diccionario de socios
-        
-    Returns:
-        dict: Diccionario de socios actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- BAJA DE SOCIO ---")
     
-    if not socios:
+    if not gimnasio['socios']:
         print("No hay socios registrados.")
-        return socios
-    
-    mostrar_socios(socios)
+        return
     
     try:
-        id_socio = int(input("\nIngrese el ID del socio a dar de baja: "))
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio a dar de baja: ")
+        if id_socio is None:
+            return
+        socio = obtener_socio(gimnasio, id_socio)
+        print(f"\nSocio a dar de baja:")
+        print(f"Nombre: {socio['nombre']} {socio['apellido']}")
+        print(f"DNI: {socio['dni']}")
         
-        if id_socio in socios:
-            socio = socios[id_socio]
-            print(f"\nSocio a dar de baja:")
-            print(f"Nombre: {socio['nombre']} {socio['apellido']}")
-            print(f"DNI: {socio['dni']}")
-            
-            confirmar = input("¿Está seguro de dar de baja este socio? (s/n): ").lower()
-            if confirmar == 's':
-                del socios[id_socio]
-                print("Socio dado de baja exitosamente.")
-            else:
-                print("Operación cancelada.")
+        confirmar = input("¿Está seguro de dar de baja este socio? (s/n): ").lower()
+        if confirmar == 's':
+            conservar = input("¿Conservar el historial de asistencia para los reportes? (s/n): ").lower() == 's'
+            eliminar_socio(gimnasio, id_socio, diario, conservar_historial=conservar)
+            print("Socio dado de baja exitosamente.")
         else:
-            print("No se encontró un socio con ese ID.")
+            print("Operación cancelada.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return socios
+    except ErrorGimnasio as error:
+        print(error)
 
-def modificarSocio(socios):
+@instrumentar_menu
+def modificarSocio(gimnasio, diario=None):
     """
     Modificar datos de un socio (CRUD - Update).
     
     Args:
-        socios (dict): Diccionario de socios
-        
-    Returns:
-        dict: Diccionario de socios actualizado
+        gimnasio (dict): Estado del gimnasio
+        diario (dict, optional): Diario donde registrar el cambio
     """
     print("\n--- MODIFICAR SOCIO ---")
     
-    if not socios:
+    if not gimnasio['socios']:
         print("No hay socios registrados.")
-        return socios
-    
-    mostrar_socios(socios)
+        return
     
     try:
-        id_socio = int(input("\nIngrese el ID del socio a modificar: "))
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio a modificar: ")
+        if id_socio is None:
+            return
+        socio = obtener_socio(gimnasio, id_socio)
+        print(f"\nDatos actuales del socio:")
+        print(f"1. Nombre: {socio['nombre']}")
+        print(f"2. Apellido: {socio['apellido']}")
+        print(f"3. DNI: {socio['dni']}")
+        print(f"4. Email: {socio['email']}")
+        print(f"5. Teléfono: {socio['telefono']}")
+        print(f"6. Fecha de nacimiento: {socio['fecha_nacimiento']}")
+        print(f"7. Dirección: {socio['direccion']}")
+        print(f"8. Estado: {'Activo' if socio['activo'] else 'Inactivo'}")
+        
+        campo = input("\nIngrese el número del campo a modificar (1-8): ")
         
-        if id_socio in socios:
-            socio = socios[id_socio]
-            print(f"\nDatos actuales del socio:")
-            print(f"1. Nombre: {socio['nombre']}")
-            print(f"2. Apellido: {socio['apellido']}")
-            print(f"3. DNI: {socio['dni']}")
-            print(f"4. Email: {socio['email']}")
-            print(f"5. Teléfono: {socio['telefono']}")
-            print(f"6. Fecha de nacimiento: {socio['fecha_nacimiento']}")
-            print(f"7. Dirección: {socio['direccion']}")
-            print(f"8. Estado: {'Activo' if socio['activo'] else 'Inactivo'}")
-            
-            campo = input("\nIngrese el número del campo a modificar (1-8): ")
-            
-            if campo == "1":
-                nuevo_valor = input("Ingrese el nuevo nombre: ").strip().title()
-                if nuevo_valor:
-                    socio['nombre'] = nuevo_valor
-            elif campo == "2":
-                nuevo_valor = input("Ingrese el nuevo apellido: ").strip().title()
-                if nuevo_valor:
-                    socio['apellido'] = nuevo_valor
-            elif campo == "3":
-                nuevo_valor = input("Ingrese el nuevo DNI: ").strip()
-                if validar_dni(nuevo_valor):
-                    if not verificar_dni_duplicado(nuevo_valor, socios, id_socio):
-                        socio['dni'] = nuevo_valor
-                    else:
-                        print("Error: Ya existe otro socio con ese DNI.")
-                else:
-                    print("DNI inválido.")
-            elif campo == "4":
-                nuevo_valor = input("Ingrese el nuevo email: ").strip().lower()
-                if validar_email(nuevo_valor):
-                    socio['email'] = nuevo_valor
-                else:
-                    print("Email inválido.")
-            elif campo == "5":
-                nuevo_valor = input("Ingrese el nuevo teléfono: ").strip()
-                if validar_telefono(nuevo_valor):
-                    socio['telefono'] = nuevo_valor
-                else:
-                    print("Teléfono inválido.")
-            elif campo == "6":
-                nuevo_valor = input("Ingrese la nueva fecha de nacimiento: ").strip()
-                if nuevo_valor:
-                    socio['fecha_nacimiento'] = nuevo_valor
-            elif campo == "7":
-                nuevo_valor = input("Ingrese la nueva dirección: ").strip()
-                if nuevo_valor:
-                    socio['direccion'] = nuevo_valor
-            elif campo == "8":
-                nuevo_valor = input("¿Activar socio? (s/n): ").lower()
-                socio['activo'] = (nuevo_valor == 's')
-            else:
-                print("Campo inválido.")
-                return socios
-            
-            print("Socio modificado exitosamente.")
+        cambios = {}
+        if campo == "1":
+            nuevo_valor = input("Ingrese el nuevo nombre: ").strip().title()
+            if nuevo_valor:
+                cambios['nombre'] = nuevo_valor
+        elif campo == "2":
+            nuevo_valor = input("Ingrese el nuevo apellido: ").strip().title()
+            if nuevo_valor:
+                cambios['apellido'] = nuevo_valor
+        elif campo == "3":
+            cambios['dni'] = input("Ingrese el nuevo DNI: ").strip()
+        elif campo == "4":
+            cambios['email'] = input("Ingrese el nuevo email: ").strip().lower()
+        elif campo == "5":
+            cambios['telefono'] = input("Ingrese el nuevo teléfono: ").strip()
+        elif campo == "6":
+            nuevo_valor = input("Ingrese la nueva fecha de nacimiento: ").strip()
+            if nuevo_valor:
+                cambios['fecha_nacimiento'] = nuevo_valor
+        elif campo == "7":
+            nuevo_valor = input("Ingrese la nueva dirección: ").strip()
+            if nuevo_valor:
+                cambios['direccion'] = nuevo_valor
+        elif campo == "8":
+            nuevo_valor = input("¿Activar socio? (s/n): ").lower()
+            cambios['activo'] = (nuevo_valor == 's')
         else:
-            print("No se encontró un socio con ese ID.")
+            print("Campo inválido.")
+            return
+        
+        actualizar_socio(gimnasio, id_socio, cambios, diario)
+        print("Socio modificado exitosamente.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
-    
-    return socios
+    except ErrorGimnasio as error:
+        print(f"Error: {error}")
 
-def consultarSocio(socios, inscripciones, clases):
+@instrumentar_menu
+def consultarSocio(gimnasio):
     """
     Consultar un socio y las clases en las que está inscripto.
     
     Args:
-        socios (dict): Diccionario de socios
-        inscripciones (list): Lista de inscripciones
-        clases (dict): Diccionario de clases
+        gimnasio (dict): Estado del gimnasio
     """
     print("\n--- CONSULTAR SOCIO ---")
     
-    if not socios:
+    if not gimnasio['socios']:
         print("No hay socios registrados.")
         return
     
-    mostrar_socios(socios)
-    
     try:
-        id_socio = int(input("\nIngrese el ID del socio a consultar: "))
+        id_socio = elegir_socio(gimnasio, "\nIngrese el ID del socio a consultar: ")
+        if id_socio is None:
+            return
+        socio = obtener_socio(gimnasio, id_socio)
+        print(f"\n--- DATOS DEL SOCIO ---")
+        print(f"ID: {id_socio}")
+        print(f"Nombre: {socio['nombre']} {socio['apellido']}")
+        print(f"DNI: {socio['dni']}")
+        print(f"Email: {socio['email']}")
+        print(f"Teléfono: {socio['telefono']}")
+        print(f"Fecha de nacimiento: {socio['fecha_nacimiento']}")
+        print(f"Dirección: {socio['direccion']}")
+        print(f"Estado: {'Activo' if socio['activo'] else 'Inactivo'}")
+        print(f"Fecha de alta: {socio['fecha_alta']}")
+        
+        # Buscar clases del socio
+        clases_socio = clases_inscriptas(gimnasio, id_socio)
         
-        if id_socio in socios:
-            socio = socios[id_socio]
-            print(f"\n--- DATOS DEL SOCIO ---")
-            print(f"ID: {id_socio}")
-            print(f"Nombre: {socio['nombre']} {socio['apellido']}")
-            print(f"DNI: {socio['dni']}")
-            print(f"Email: {socio['email']}")
-            print(f"Teléfono: {socio['telefono']}")
-            print(f"Fecha de nacimiento: {socio['fecha_nacimiento']}")
-            print(f"Dirección: {socio['direccion']}")
-            print(f"Estado: {'Activo' if socio['activo'] else 'Inactivo'}")
-            print(f"Fecha de alta: {socio['fecha_alta']}")
-            
-            # Buscar clases del socio
-            clases_socio = []
-            for inscripcion in inscripciones:
-                if inscripcion[0] == id_socio:  # inscripcion es (socio_id, clase_id)
-                    clases_socio.append(inscripcion[1])
-            
-            print(f"\n--- CLASES INSCRIPTAS ---")
-            if clases_socio:
-                for clase_id in clases_socio:
-                    if clase_id in clases:
-                        clase = clases[clase_id]
-                        print(f"- {clase['nombre']} (Profesor: {clase['profesor']})")
-            else:
-                print("El socio no está inscripto en ninguna clase.")
+        print(f"\n--- CLASES INSCRIPTAS ---")
+        if clases_socio:
+            for clase_id, clase in clases_socio:
+                print(f"- {clase['nombre']} (Profesor: {clase['profesor']})")
         else:
-            print("No se encontró un socio con ese ID.")
+            print("El socio no está inscripto en ninguna clase.")
     
     except ValueError:
         print("Error: Debe ingresar un número válido.")
+    except ErrorGimnasio as error:
+        print(error)
+
+@instrumentar_menu
+def buscarSocioPorDni(gimnasio):
+    """
+    Buscar un socio por DNI usando el índice único, sin listar todos los socios.
+    
+    Args:
+        gimnasio (dict): Estado del gimnasio
+    """
+    print("\n--- BUSCAR SOCIO POR DNI ---")
+    
+    dni = input("Ingrese el DNI: ").strip()
+    try:
+        id_socio = obtener_socio_por_dni(gimnasio, dni)
+    except ErrorGimnasio as error:
+        print(error)
+        return
+    
+    socio = obtener_socio(gimnasio, id_socio)
+    estado = "Activo" if socio['activo'] else "Inactivo"
+    print(f"ID: {id_socio} | {socio['nombre']} {socio['apellido']} | DNI: {socio['dni']} | Email: {socio['email']} | Estado: {estado}")
@@ -1,9 +1,135 @@
 """
 Módulo de validaciones para el sistema de gimnasio.
-Contiene funciones de validación usando expresiones regulares.
+Contiene funciones de validación usando expresiones regulares precompiladas,
+con chequeos rápidos (longitud, dígitos, separadores) antes de recurrir a la
+expresión regular, y una API por lotes que valida columnas enteras.
 """
 
 import re
+from datetime import date
+from functools import lru_cache
+from operator import not_
+
+# Patrón para validar email: usuario@dominio.extension
+PATRON_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Patrón para DNI argentino: 7 u 8 dígitos
+PATRON_DNI = re.compile(r'^\d{7,8}$')
+# Patrón para teléfono argentino (con código de país opcional)
+PATRON_TELEFONO = re.compile(r'^(\+54\s?)?(\d{2,4}\s?)?\d{4}\s?\d{4}$')
+# Patrón para fecha DD/MM/AAAA (solo dígitos ASCII)
+PATRON_FECHA = re.compile(r'(\d{2})/(\d{2})/(\d{4})\Z', re.ASCII)
+
+# Códigos de motivo de rechazo de la validación por lotes
+MOTIVO_TIPO = 'tipo'                          # El valor no es un texto
+MOTIVO_VACIO = 'vacio'                        # Texto vacío
+MOTIVO_LONGITUD = 'longitud'                  # Solo dígitos, pero cantidad incorrecta
+MOTIVO_CARACTERES = 'caracteres'              # Contiene caracteres no permitidos
+MOTIVO_FORMATO = 'formato'                    # No respeta el formato esperado
+MOTIVO_FECHA_INEXISTENTE = 'fecha_inexistente'  # DD/MM/AAAA bien formada pero inexistente
+
+# Días de cada mes en un año no bisiesto
+DIAS_POR_MES = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def motivo_email(email):
+    """
+    Clasifica un email: devuelve None si es válido o el código del motivo de rechazo.
+    
+    Args:
+        email (str): Email a validar
+    
+    Returns:
+        str: Código de motivo, o None si es válido
+    """
+    if not isinstance(email, str):
+        return MOTIVO_TIPO
+    if not email:
+        return MOTIVO_VACIO
+    # Camino rápido: sin arroba no hace falta correr la expresión regular
+    if '@' not in email:
+        return MOTIVO_FORMATO
+    return None if PATRON_EMAIL.match(email) else MOTIVO_FORMATO
+
+def motivo_dni(dni):
+    """
+    Clasifica un DNI: devuelve None si es válido o el código del motivo de rechazo.
+    
+    Args:
+        dni (str): DNI a validar
+    
+    Returns:
+        str: Código de motivo, o None si es válido
+    """
+    if not isinstance(dni, str):
+        return MOTIVO_TIPO
+    if not dni:
+        return MOTIVO_VACIO
+    # Camino rápido: solo dígitos ASCII, alcanza con mirar la longitud
+    if dni.isdigit() and dni.isascii():
+        return None if 7 <= len(dni) <= 8 else MOTIVO_LONGITUD
+    return None if PATRON_DNI.match(dni) else MOTIVO_CARACTERES
+
+def motivo_telefono(telefono):
+    """
+    Clasifica un teléfono: devuelve None si es válido o el código del motivo de rechazo.
+    
+    Args:
+        telefono (str): Teléfono a validar
+    
+    Returns:
+        str: Código de motivo, o None si es válido
+    """
+    if not isinstance(telefono, str):
+        return MOTIVO_TIPO
+    if not telefono:
+        return MOTIVO_VACIO
+    # Camino rápido: solo dígitos ASCII son válidos con 8 dígitos o con 10 a 12
+    # (característica de 2 a 4 dígitos más el número)
+    if telefono.isdigit() and telefono.isascii():
+        return None if len(telefono) in (8, 10, 11, 12) else MOTIVO_LONGITUD
+    return None if PATRON_TELEFONO.match(telefono) else MOTIVO_FORMATO
+
+@lru_cache(maxsize=1 << 16)
+def _clasificar_fecha(fecha):
+    """
+    Clasifica un texto de fecha DD/MM/AAAA. Las fechas se repiten mucho (hay
+    pocas decenas de miles de días posibles), así que el resultado se cachea.
+    
+    Args:
+        fecha (str): Fecha a validar
+    
+    Returns:
+        str: Código de motivo, o None si es válida
+    """
+    coincidencia = PATRON_FECHA.match(fecha)
+    if coincidencia is None:
+        return MOTIVO_FORMATO
+    dia, mes, anio = map(int, coincidencia.groups())
+    if not 1 <= mes <= 12 or dia < 1 or anio < 1:
+        return MOTIVO_FECHA_INEXISTENTE
+    bisiesto = anio % 4 == 0 and (anio % 100 != 0 or anio % 400 == 0)
+    if dia > DIAS_POR_MES[mes - 1] + (mes == 2 and bisiesto):
+        return MOTIVO_FECHA_INEXISTENTE
+    return None
+
+def motivo_fecha(fecha):
+    """
+    Clasifica una fecha DD/MM/AAAA: devuelve None si es una fecha existente
+    o el código del motivo de rechazo.
+    
+    Args:
+        fecha (str): Fecha a validar
+    
+    Returns:
+        str: Código de motivo, o None si es válida
+    """
+    if not isinstance(fecha, str):
+        return MOTIVO_TIPO
+    if not fecha:
+        return MOTIVO_VACIO
+    # Camino rápido: sin el largo de DD/MM/AAAA no hace falta mirar más
+    if len(fecha) != 10:
+        return MOTIVO_FORMATO
+    return _clasificar_fecha(fecha)
 
 def validar_email(email):
     """
@@ -11,13 +137,11 @@ def validar_email(email):
     
     Args:
         email (str): Email a validar
-        
+    
     Returns:
         bool: True si el email es válido, False en caso contrario
     """
-    # Patrón para validar email: usuario@dominio.extension
-    patron = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(patron, email) is not None
+    return motivo_email(email) is None
 
 def validar_dni(dni):
     """
@@ -25,13 +149,11 @@ def validar_dni(dni):
     
     Args:
         dni (str): DNI a validar
-        
+    
     Returns:
         bool: True si el DNI es válido, False en caso contrario
     """
-    # Patrón para DNI argentino: 7 u 8 dígitos
-    patron = r'^\d{7,8}$'
-    return re.match(patron, dni) is not None
+    return motivo_dni(dni) is None
 
 def validar_telefono(telefono):
     """
@@ -39,42 +161,246 @@ def validar_telefono(telefono):
     
     Args:
         telefono (str): Teléfono a validar
-        
+    
     Returns:
         bool: True si el teléfono es válido, False en caso contrario
     """
-    # Patrón para teléfono argentino (con código de país opcional)
-    patron = r'^(\+54\s?)?(\d{2,4}\s?)?\d{4}\s?\d{4}$'
-    return re.match(patron, telefono) is not None
+    return motivo_telefono(telefono) is None
 
-def generar_id_unico(diccionario):
+def validar_fecha(fecha):
     """
-    Genera un ID único para un nuevo elemento en un diccionario.
+    Valida que una fecha tenga el formato DD/MM/AAAA y exista en el calendario.
     
     Args:
-        diccionario (dict): Diccionario del cual generar el ID
-        
+        fecha (str): Fecha a validar
+    
     Returns:
-        int: ID único generado
+        bool: True si la fecha es válida, False en caso contrario
     """
-    if not diccionario:
-        return 1
-    return max(diccionario.keys()) + 1
+    return motivo_fecha(fecha) is None
 
-def verificar_dni_duplicado(dni, socios, id_excluir=None):
+@lru_cache(maxsize=1 << 16)
+def fecha_a_ordinal(fecha):
     """
-    Verifica si un DNI ya existe en el sistema.
+    Convierte una fecha DD/MM/AAAA en su ordinal de día (1 = 01/01/0001).
+    El resultado se cachea: las mismas fechas se repiten en muchas asistencias.
     
     Args:
-        dni (str): DNI a verificar
-        socios (dict): Diccionario de socios
-        id_excluir (int, optional): ID a excluir de la verificación (para modificaciones)
-        
+        fecha (str): Fecha a convertir
+    
+    Returns:
+        int: Ordinal del día
+    
+    Raises:
+        ValueError: Si la fecha no es una DD/MM/AAAA válida
+    """
+    if motivo_fecha(fecha) is not None:
+        raise ValueError(f"Fecha inválida: {fecha!r}")
+    return date(int(fecha[6:]), int(fecha[3:5]), int(fecha[:2])).toordinal()
+
+@lru_cache(maxsize=1 << 16)
+def ordinal_a_fecha(dia):
+    """
+    Convierte un ordinal de día en texto DD/MM/AAAA.
+    
+    Args:
+        dia (int): Ordinal del día
+    
+    Returns:
+        str: Fecha DD/MM/AAAA
+    """
+    dia = date.fromordinal(dia)
+    return f"{dia.day:02d}/{dia.month:02d}/{dia.year:04d}"
+
+# Días de la semana en los horarios de clases (0 = lunes), sin acentos
+DIAS_HORARIO = ('lunes', 'martes', 'miercoles', 'jueves', 'viernes', 'sabado', 'domingo')
+# Palabras y horas de un horario: "Lunes y Miércoles 18:30", "Mar 9hs"
+PATRON_HORARIO = re.compile(r'([^\W\d_]+)|(\d{1,2})(?:[:.h](\d{2}))?')
+SIN_ACENTOS = str.maketrans('áéíóúü', 'aeiouu')
+
+def dia_de_semana(palabra):
+    """
+    Interpreta el nombre (o una abreviatura de al menos 2 letras) de un día de la semana.
+    
+    Args:
+        palabra (str): Nombre del día ("Miércoles", "mie", "sab")
+    
+    Returns:
+        int: Día de la semana (0 = lunes), o None si no es un día
+    """
+    palabra = palabra.lower().translate(SIN_ACENTOS)
+    if len(palabra) < 2:
+        return None
+    for numero, dia in enumerate(DIAS_HORARIO):
+        if dia.startswith(palabra):
+            return numero
+    return None
+
+@lru_cache(maxsize=4096)
+def interpretar_rangos(horario):
+    """
+    Interpreta un horario de clase en texto libre como días, horas de inicio y,
+    si se indican, horas de fin.
+    Cada hora se aplica a los días nombrados antes de ella ("Lunes y Jueves 18:00",
+    "Lunes 18:00 y Miércoles 19:30"); las palabras que no son días se ignoran, y
+    una segunda hora seguida ("18:00 a 19:00") se toma como fin del rango.
+    
+    Args:
+        horario (str): Horario de la clase
+    
+    Returns:
+        tuple: Ternas (dia_semana, minuto_del_dia, minutos_de_duracion) ordenadas, con
+               la duración en None si no hay hora de fin; vacía si no se reconoce
+    """
+    rangos = {}
+    dias = []
+    hora_suelta = None
+    # Inicios que toman la próxima hora como fin, si no se nombra otro día antes
+    abiertos = []
+    for palabra, hora, minutos in PATRON_HORARIO.findall(horario or ''):
+        if palabra:
+            dia = dia_de_semana(palabra)
+            if dia is not None:
+                dias.append(dia)
+                abiertos = []
+            continue
+        hora, minutos = int(hora), int(minutos or 0)
+        if hora > 23 or minutos > 59:
+            continue
+        minuto = hora * 60 + minutos
+        if dias:
+            abiertos = [(dia, minuto) for dia in dias]
+            rangos.update((inicio, None) for inicio in abiertos)
+            dias = []
+        elif abiertos:
+            # Fin del rango; si es menor que el inicio, termina al día siguiente
+            rangos.update((inicio, (minuto - inicio[1]) % (24 * 60) or None) for inicio in abiertos)
+            abiertos = []
+        elif not rangos and hora_suelta is None:
+            # Hora antes de los días ("18:00 lunes y jueves")
+            hora_suelta = [minuto, None]
+        elif not rangos and hora_suelta[1] is None:
+            hora_suelta[1] = (minuto - hora_suelta[0]) % (24 * 60) or None
+    if dias and hora_suelta is not None:
+        rangos.update(((dia, hora_suelta[0]), hora_suelta[1]) for dia in dias)
+    return tuple(sorted((dia, minuto, duracion) for (dia, minuto), duracion in rangos.items()))
+
+def interpretar_horario(horario):
+    """
+    Interpreta un horario de clase en texto libre como días y horas de inicio
+    (ver interpretar_rangos).
+    
+    Args:
+        horario (str): Horario de la clase
+    
+    Returns:
+        tuple: Pares (dia_semana, minuto_del_dia) ordenados; vacía si no se reconoce
+    """
+    return tuple((dia, minuto) for dia, minuto, _ in interpretar_rangos(horario))
+
+# Minutos de una semana: los intervalos semanales van de 0 (lunes 00:00) a MINUTOS_SEMANA
+MINUTOS_SEMANA = 7 * 24 * 60
+# Duración en texto libre: "60", "60 min", "1h", "1h30", "1:30", "90'"
+PATRON_DURACION = re.compile(r'(\d{1,3})\s*(?:(h|hs|hora|horas|:)\s*(\d{1,2})?\s*(?:m|min|minutos)?|(?:m|min|mins|minutos|\'))?\s*\Z',
+                             re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def interpretar_duracion(duracion):
+    """
+    Interpreta la duración de una clase en texto libre.
+    
+    Args:
+        duracion (str | int): Duración ("60", "60 min", "1h", "1h30", "1:30")
+    
+    Returns:
+        int: Minutos (mayor a 0), o None si no se reconoce
+    """
+    coincidencia = PATRON_DURACION.match(str(duracion).strip())
+    if coincidencia is None:
+        return None
+    cantidad, horas, minutos = coincidencia.group(1, 2, 3)
+    total = int(cantidad) * 60 + int(minutos or 0) if horas else int(cantidad)
+    return total if 0 < total <= MINUTOS_SEMANA else None
+
+@lru_cache(maxsize=4096)
+def intervalos_semanales(horario, duracion):
+    """
+    Convierte el horario y la duración de una clase en intervalos semanales
+    [inicio, fin) en minutos desde el lunes 00:00. Los rangos con hora de fin
+    ("Lunes 18:00 a 19:30") usan esa hora en lugar de la duración. Un intervalo
+    que pasa del domingo al lunes se parte en dos.
+    
+    Args:
+        horario (str): Horario de la clase
+        duracion (str | int): Duración de la clase
+    
+    Returns:
+        tuple: Intervalos (inicio, fin) ordenados y disjuntos; vacía si falta el horario o,
+               para algún rango sin hora de fin, la duración
+    """
+    minutos = interpretar_duracion(duracion)
+    intervalos = []
+    for dia, minuto, duracion_rango in interpretar_rangos(horario):
+        if duracion_rango is None and minutos is None:
+            return ()
+        inicio = dia * 24 * 60 + minuto
+        fin = inicio + (duracion_rango or minutos)
+        if fin > MINUTOS_SEMANA:
+            intervalos.append((0, fin - MINUTOS_SEMANA))
+            fin = MINUTOS_SEMANA
+        intervalos.append((inicio, fin))
+    # Unir los intervalos que se tocan, así los de una misma clase no se superponen
+    unidos = []
+    for inicio, fin in sorted(intervalos):
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return tuple(unidos)
+
+def minutos_de_hora(hora):
+    """
+    Convierte una hora HH:MM (o HH) en minutos desde la medianoche.
+    
+    Args:
+        hora (str): Hora a convertir
+    
+    Returns:
+        int: Minuto del día
+    
+    Raises:
+        ValueError: Si la hora no es válida
+    """
+    partes = hora.strip().replace('.', ':').split(':')
+    if len(partes) > 2 or not all(parte.isdigit() for parte in partes):
+        raise ValueError(f"Hora inválida: {hora!r}")
+    horas, minutos = int(partes[0]), int(partes[1]) if len(partes) == 2 else 0
+    if horas > 23 or minutos > 59:
+        raise ValueError(f"Hora inválida: {hora!r}")
+    return horas * 60 + minutos
+
+# Clasificador de cada tipo de dato para la validación por lotes
+CLASIFICADORES = {
+    'email': motivo_email,
+    'dni': motivo_dni,
+    'telefono': motivo_telefono,
+    'fecha': motivo_fecha
+}
+
+def validar_lote(tipo, valores):
+    """
+    Valida una columna entera de valores de un mismo tipo.
+    
+    Args:
+        tipo (str): 'email', 'dni', 'telefono' o 'fecha'
+        valores (iterable): Valores a validar
+    
     Returns:
-        bool: True si el DNI está duplicado, False en caso contrario
+        tuple: (mascara, motivos) donde mascara es un bytearray con 1 para cada
+               valor válido y 0 para cada inválido, y motivos es una lista paralela
+               con None o el código del motivo de rechazo
     """
-    for id_socio, datos in socios.items():
-        if id_excluir is None or id_socio != id_excluir:
-            if datos['dni'] == dni:
-                return True
-    return False
+    if tipo not in CLASIFICADORES:
+        raise ValueError(f"Tipo de dato desconocido: {tipo}")
+    motivos = list(map(CLASIFICADORES[tipo], valores))
+    return bytearray(map(not_, motivos)), motivos